@@ -89,6 +89,16 @@ def tmp_git_repo(tmp_path):
     return repo_path
 
 
+@pytest.fixture(autouse=True)
+def clear_git_metadata():
+    """Fixture that resets cached default branch and remote URL values between tests."""
+    from yellhorn_mcp.utils.git_utils import clear_git_metadata_cache
+
+    clear_git_metadata_cache()
+    yield
+    clear_git_metadata_cache()
+
+
 @pytest_asyncio.fixture(autouse=True)
 async def patch_gh_commands(monkeypatch):
     """Fixture that automatically patches GitHub CLI commands for all tests.
@@ -2,6 +2,8 @@
 
 import contextlib
 import os
+import subprocess
+from pathlib import Path
 from unittest.mock import patch
 
 
@@ -51,3 +53,57 @@ def patch_env(env_vars, clear=False):
     """
     with patch.dict(os.environ, env_vars, clear=clear):
         yield
+
+
+def run_git(repo_path: Path, *args: str) -> str:
+    """
+    Run a git command in a test repository.
+
+    Args:
+        repo_path: Repository to run the command in
+        *args: Arguments passed to git
+
+    Returns:
+        The command's stripped standard output
+    """
+    result = subprocess.run(["git", *args], cwd=repo_path, check=True, capture_output=True)
+    return result.stdout.decode().strip()
+
+
+def write_files(repo_path: Path, files: dict[str, str]) -> Path:
+    """
+    Write files into a directory, creating parent directories as needed.
+
+    Args:
+        repo_path: Directory to write into
+        files: Mapping of relative path to file content
+
+    Returns:
+        The directory path
+    """
+    for rel_path, content in files.items():
+        full_path = repo_path / rel_path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text(content)
+    return repo_path
+
+
+def init_git_repo(repo_path: Path, files: dict[str, str]) -> Path:
+    """
+    Create a git repository whose first commit holds the given files.
+
+    Args:
+        repo_path: Directory for the repository
+        files: Mapping of relative path to file content
+
+    Returns:
+        The repository path
+    """
+    repo_path.mkdir(parents=True, exist_ok=True)
+    run_git(repo_path, "init", "-q")
+    run_git(repo_path, "config", "user.email", "test@example.com")
+    run_git(repo_path, "config", "user.name", "Test")
+    write_files(repo_path, files)
+    run_git(repo_path, "add", ".")
+    run_git(repo_path, "commit", "-q", "-m", "init")
+    return repo_path
@@ -0,0 +1,129 @@
+"""Tests for the offline benchmark suite and synthetic repository generator."""
+
+import argparse
+import json
+import subprocess
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from yellhorn_mcp.benchmarks.suite import (
+    BENCHMARKS,
+    compare_results,
+    main,
+    parse_sizes,
+    run_suite,
+)
+from yellhorn_mcp.benchmarks.synthetic_repo import generate_repository, load_or_generate
+
+
+def fake_counter() -> MagicMock:
+    counter = MagicMock()
+    counter.count_tokens.side_effect = lambda text, model: len(text) // 4
+    return counter
+
+
+class TestSyntheticRepository:
+    """Test the synthetic repository generator."""
+
+    def test_generates_mixed_repository(self, tmp_path: Path):
+        """The repository mixes file kinds, ignore files and two commits."""
+        repository = generate_repository(tmp_path / "repo", 120)
+
+        tracked = subprocess.run(
+            ["git", "ls-files"], cwd=repository.path, capture_output=True, text=True, check=True
+        ).stdout.split()
+        suffixes = {Path(path).suffix for path in tracked}
+        assert {".py", ".go", ".md", ".bin"} <= suffixes
+        assert ".yellhornignore" in tracked
+        assert any(path.endswith("/.gitignore") for path in tracked)
+        assert not any(path.endswith("build.log") for path in tracked)
+        assert repository.base_ref != repository.head_ref
+        assert repository.changed_files
+
+    def test_is_deterministic(self, tmp_path: Path):
+        """The same seed and size give identical file contents."""
+        first = generate_repository(tmp_path / "a", 60, seed=3)
+        second = generate_repository(tmp_path / "b", 60, seed=3)
+
+        assert first.changed_files == second.changed_files
+        for path in first.changed_files:
+            assert (first.path / path).read_text() == (second.path / path).read_text()
+
+    def test_reuses_generated_repository(self, tmp_path: Path):
+        """A repository generated earlier is reused rather than rebuilt."""
+        first = load_or_generate(tmp_path / "repo", 60)
+        second = load_or_generate(tmp_path / "repo", 60)
+
+        assert second.head_ref == first.head_ref
+        with pytest.raises(ValueError):
+            load_or_generate(tmp_path / "repo", 80)
+
+
+class TestBenchmarkSuite:
+    """Test the benchmark runner and its JSON results."""
+
+    @pytest.mark.asyncio
+    async def test_run_suite_times_every_benchmark(self, tmp_path: Path):
+        """Every benchmark is timed for every size."""
+        counter = fake_counter()
+        with patch(
+            "yellhorn_mcp.formatters.context_fetcher.get_token_counter", return_value=counter
+        ):
+            results = await run_suite(
+                {"60": 60}, tmp_path, repeat=2, token_limit=2_000, token_counter=counter
+            )
+
+        result = results["sizes"]["60"]
+        assert set(result["benchmarks"]) == set(BENCHMARKS)
+        assert all(timing["runs"] == 2 for timing in result["benchmarks"].values())
+        assert result["files"] > 0 and result["chunks"] > 0
+        json.dumps(results)
+
+    def test_compare_results(self):
+        """The comparison shows the change in median time."""
+
+        def timing(median: float) -> dict:
+            return {"runs": 1, "min": median, "median": median, "max": median}
+
+        baseline = {"sizes": {"1k": {"benchmarks": {"get_lsp_diff": timing(2.0)}}}}
+        current = {"sizes": {"1k": {"benchmarks": {"get_lsp_diff": timing(1.0)}}}}
+
+        report = compare_results(baseline, current)
+
+        assert "get_lsp_diff" in report
+        assert "-50.0%" in report
+
+    def test_parse_sizes(self):
+        """Size labels and plain file counts are accepted."""
+        assert parse_sizes("1k, 250") == {"1k": 1_000, "250": 250}
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_sizes("huge")
+
+    def test_main_writes_json(self, tmp_path: Path):
+        """The command writes JSON results to --output."""
+        counter = fake_counter()
+        output = tmp_path / "results.json"
+        with (
+            patch(
+                "yellhorn_mcp.formatters.context_fetcher.get_token_counter", return_value=counter
+            ),
+            patch("yellhorn_mcp.benchmarks.suite.TokenCounter", return_value=counter),
+        ):
+            main(
+                [
+                    "--sizes",
+                    "50",
+                    "--repeat",
+                    "1",
+                    "--workdir",
+                    str(tmp_path / "repos"),
+                    "--output",
+                    str(output),
+                ]
+            )
+
+        results = json.loads(output.read_text())
+        assert results["schema"] == 1
+        assert "get_codebase_snapshot" in results["sizes"]["50"]["benchmarks"]
@@ -1,5 +1,6 @@
 """Tests for the Yellhorn MCP CLI module."""
 
+import os
 import sys
 from pathlib import Path
 from unittest.mock import patch
@@ -203,3 +204,63 @@ def test_main_not_git_repo(mock_mcp_run, mock_is_dir, mock_exists, mock_getenv,
 
     # Ensure mcp.run was not called
     mock_mcp_run.assert_not_called()
+
+
+@patch("yellhorn_mcp.cli.is_git_repository", return_value=True)
+@patch("yellhorn_mcp.server.mcp.run")
+def test_main_accepts_compact_and_relevant_reasoning(mock_mcp_run, mock_is_git_repo, tmp_path):
+    """Test that the compact and relevant reasoning modes can be chosen."""
+    for mode in ("compact", "relevant"):
+        argv = ["yellhorn-mcp", "--repo-path", str(tmp_path), "--codebase-reasoning", mode]
+        with (
+            patch.object(sys, "argv", argv),
+            patch.dict("os.environ", {"GEMINI_API_KEY": "mock-gemini-api-key"}),
+        ):
+            main()
+            assert os.environ["YELLHORN_MCP_REASONING"] == mode
+
+    assert mock_mcp_run.call_count == 2
+
+
+@patch("yellhorn_mcp.server.mcp.run")
+@patch("yellhorn_mcp.benchmarks.suite.main")
+def test_main_bench_subcommand(mock_bench_main, mock_mcp_run):
+    """Test that `yellhorn-mcp bench` runs the benchmark suite instead of the server."""
+    with patch.object(sys, "argv", ["yellhorn-mcp", "bench", "--sizes", "1k"]):
+        main()
+
+    mock_bench_main.assert_called_once_with(["--sizes", "1k"])
+    mock_mcp_run.assert_not_called()
+
+
+@patch("yellhorn_mcp.server.mcp.run")
+@patch("yellhorn_mcp.benchmarks.mock_llm_server.main")
+def test_main_mock_llm_subcommand(mock_server_main, mock_mcp_run):
+    """Test that `yellhorn-mcp mock-llm` runs the mock provider instead of the server."""
+    with patch.object(sys, "argv", ["yellhorn-mcp", "mock-llm", "--port", "9000"]):
+        main()
+
+    mock_server_main.assert_called_once_with(["--port", "9000"])
+    mock_mcp_run.assert_not_called()
+
+
+@patch("yellhorn_mcp.server.mcp.run")
+@patch("yellhorn_mcp.benchmarks.import_time.main")
+def test_main_import_time_subcommand(mock_import_time_main, mock_mcp_run):
+    """Test that `yellhorn-mcp import-time` runs the import-time benchmark."""
+    with patch.object(sys, "argv", ["yellhorn-mcp", "import-time", "--runs", "1"]):
+        main()
+
+    mock_import_time_main.assert_called_once_with(["--runs", "1"])
+    mock_mcp_run.assert_not_called()
+
+
+@patch("yellhorn_mcp.server.mcp.run")
+@patch("yellhorn_mcp.utils.precomputed_index.main")
+def test_main_index_subcommand(mock_index_main, mock_mcp_run):
+    """Test that `yellhorn-mcp index` builds the precomputed index instead of the server."""
+    with patch.object(sys, "argv", ["yellhorn-mcp", "index", "--ref", "origin/main"]):
+        main()
+
+    mock_index_main.assert_called_once_with(["--ref", "origin/main"])
+    mock_mcp_run.assert_not_called()
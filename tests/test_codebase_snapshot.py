@@ -0,0 +1,141 @@
+"""Tests for repository enumeration and ignore matching in codebase_snapshot.py."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from yellhorn_mcp.formatters.codebase_snapshot import (
+    ALWAYS_IGNORE_PATTERNS,
+    IgnoreMatcher,
+    enumerate_repository_files,
+    get_codebase_snapshot,
+    list_git_files,
+    matches_pattern,
+)
+
+
+def _init_git_repo(repo_path: Path) -> None:
+    """Initialise a bare-bones git repository with a single commit."""
+    subprocess.run(["git", "init", "-q"], cwd=repo_path, check=True)
+    subprocess.run(["git", "config", "user.email", "test@example.com"], cwd=repo_path, check=True)
+    subprocess.run(["git", "config", "user.name", "Test"], cwd=repo_path, check=True)
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Create a git repository with ignored, tracked and untracked files."""
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    _init_git_repo(repo_path)
+
+    (repo_path / "src").mkdir()
+    (repo_path / "src" / "main.py").write_text("def main(): pass\n")
+    (repo_path / "src" / "util.py").write_text("def util(): pass\n")
+    (repo_path / "build").mkdir()
+    (repo_path / "build" / "out.py").write_text("generated = True\n")
+    (repo_path / "debug.log").write_text("log line\n")
+    (repo_path / "README.md").write_text("# Repo\n")
+    (repo_path / "poetry.lock").write_text("lock\n")
+    (repo_path / ".gitignore").write_text("build/\n*.log\n")
+
+    subprocess.run(["git", "add", "src/main.py", ".gitignore"], cwd=repo_path, check=True)
+    subprocess.run(["git", "commit", "-q", "-m", "init"], cwd=repo_path, check=True)
+    return repo_path
+
+
+class TestIgnoreMatcher:
+    """Test the compiled ignore matcher."""
+
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "src/main.py",
+            "node_modules/pkg/index.js",
+            "pkg/node_modules/index.js",
+            "dist/app.min.js",
+            "assets/logo.png",
+            "docs/guide.md",
+            "a/b/__pycache__/mod.pyc",
+            "Cargo.lock",
+        ],
+    )
+    def test_matches_same_as_matches_pattern(self, path):
+        """Compiled matcher agrees with per-pattern matching."""
+        matcher = IgnoreMatcher(ALWAYS_IGNORE_PATTERNS)
+        expected = any(matches_pattern(path, p) for p in ALWAYS_IGNORE_PATTERNS)
+        assert matcher.matches(path) == expected
+
+    def test_empty_matcher(self):
+        """An empty matcher is falsy and matches nothing."""
+        matcher = IgnoreMatcher([])
+        assert not matcher
+        assert not matcher.matches("anything.py")
+
+    def test_directory_and_file_patterns(self):
+        """Directory patterns match by prefix and glob, file patterns by glob."""
+        matcher = IgnoreMatcher(["vendor/", "*.tmp"])
+        assert matcher.matches("vendor/lib.py")
+        assert matcher.matches("notes.tmp")
+        assert not matcher.matches("src/vendor.py")
+
+
+class TestListGitFiles:
+    """Test git-based enumeration."""
+
+    @pytest.mark.asyncio
+    async def test_respects_gitignore(self, git_repo):
+        """Tracked and untracked files are listed, gitignored ones are not."""
+        files = await list_git_files(git_repo)
+        assert "src/main.py" in files
+        assert "src/util.py" in files
+        assert "README.md" in files
+        assert "build/out.py" not in files
+        assert "debug.log" not in files
+
+    @pytest.mark.asyncio
+    async def test_raises_outside_git(self, tmp_path):
+        """A non-repository directory raises so callers can fall back."""
+        from yellhorn_mcp.utils.git_utils import YellhornMCPError
+
+        with pytest.raises(YellhornMCPError):
+            await list_git_files(tmp_path)
+
+
+class TestEnumerateRepositoryFiles:
+    """Test enumeration shared by snapshot and curation."""
+
+    @pytest.mark.asyncio
+    async def test_applies_yellhornignore(self, git_repo):
+        """The ignore file blacklists files unless whitelisted with '!'."""
+        (git_repo / ".yellhornignore").write_text("src/\n!src/main.py\n")
+        files = await enumerate_repository_files(git_repo, log_function=lambda msg: None)
+        assert "src/main.py" in files
+        assert "src/util.py" not in files
+        assert "build/out.py" not in files
+
+    @pytest.mark.asyncio
+    async def test_always_ignore_applied(self, git_repo):
+        """Always-ignored files such as lock files are excluded."""
+        files = await enumerate_repository_files(git_repo, log_function=lambda msg: None)
+        assert "poetry.lock" not in files
+        assert "README.md" in files
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_walk(self, tmp_path):
+        """Directories that are not git repositories are walked instead."""
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "mod.py").write_text("x = 1\n")
+        (tmp_path / ".hidden").mkdir()
+        (tmp_path / ".hidden" / "secret.py").write_text("y = 2\n")
+        files = await enumerate_repository_files(tmp_path, log_function=lambda msg: None)
+        assert files == ["pkg/mod.py"]
+
+    @pytest.mark.asyncio
+    async def test_snapshot_uses_git_enumeration(self, git_repo):
+        """get_codebase_snapshot never returns gitignored files."""
+        file_paths, _ = await get_codebase_snapshot(
+            git_repo, just_paths=True, log_function=lambda msg: None
+        )
+        assert "src/main.py" in file_paths
+        assert "build/out.py" not in file_paths
@@ -8,6 +8,7 @@ from yellhorn_mcp.models.metadata_models import CompletionMetadata, SubmissionMe
 from yellhorn_mcp.utils.comment_utils import (
     extract_urls,
     format_completion_comment,
+    format_omitted_files_warning,
     format_submission_comment,
 )
 
@@ -188,6 +189,54 @@ class TestFormatCompletionComment:
         # Should not show "gemini-2.5-pro" or similar
         assert "gemini-2.5-pro" not in result
 
+    def test_phase_timings(self):
+        """Test that phase timings are listed with nested phases indented."""
+        metadata = CompletionMetadata(
+            model_name="gpt-4o",
+            status="✅ Workplan generated successfully",
+            generation_time_seconds=12.0,
+            phase_timings={
+                "codebase_context": 2.5,
+                "codebase_context/snapshot": 1.25,
+                "llm_call": 9.0,
+                "llm_call/retry_wait": 4.0,
+            },
+        )
+
+        result = format_completion_comment(metadata)
+
+        assert "**Phase Timings**:" in result
+        assert "- `codebase_context`: 2.50s" in result
+        assert "\n  - `snapshot`: 1.25s" in result
+        assert "\n  - `retry_wait`: 4.00s" in result
+        assert result.index("`llm_call`") < result.index("`retry_wait`")
+
+    def test_no_phase_timings_section_without_timings(self):
+        """Test that the phase section is omitted when timing is off."""
+        metadata = CompletionMetadata(
+            model_name="gpt-4o", status="✅ Done", generation_time_seconds=1.0
+        )
+
+        assert "Phase Timings" not in format_completion_comment(metadata)
+
+
+class TestFormatOmittedFilesWarning:
+    """Test suite for format_omitted_files_warning function."""
+
+    def test_lists_all_files_when_few(self):
+        """A short list names every omitted file."""
+        result = format_omitted_files_warning(["a.py", "b.py"])
+        assert result.startswith("2 files were left out")
+        assert "`a.py`, `b.py`" in result
+        assert "more" not in result
+
+    def test_counts_files_beyond_the_listed_ones(self):
+        """Long lists name the first files and count the rest."""
+        result = format_omitted_files_warning([f"f{i}.py" for i in range(15)])
+        assert "`f9.py`" in result
+        assert "`f10.py`" not in result
+        assert result.endswith("and 5 more")
+
 
 class TestExtractUrls:
     """Test cases for extract_urls function."""
@@ -0,0 +1,160 @@
+"""Tests for source compaction and the "compact" reasoning mode."""
+
+import ast
+import subprocess
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from yellhorn_mcp.benchmarks.compaction import format_report, measure_compaction
+from yellhorn_mcp.formatters.context_fetcher import get_codebase_context
+from yellhorn_mcp.utils.compact_utils import (
+    collapse_whitespace,
+    compact_source,
+    strip_c_style_comments,
+    strip_hash_comments,
+    strip_license_header,
+    strip_python_comments,
+)
+
+PY_SOURCE = '''#!/usr/bin/env python
+# Copyright 2024 Example Corp.
+# Licensed under the Apache License, Version 2.0.
+
+"""Session helpers.
+
+Long module description.
+"""
+
+import os  # needed for paths
+
+
+class Store:
+    """Stores sessions.
+
+    Details that the model does not need.
+    """
+
+    marker = "# not a comment"
+
+    def load(self, key):
+        """
+        Load a session.
+        """
+        # Look it up
+        return os.environ[key]
+'''
+
+GO_SOURCE = """// Copyright 2020 Example Authors. All rights reserved.
+// Use of this source code is governed by a BSD-style license.
+
+package main
+
+/* Block
+   comment */
+func main() {
+	url := "http://example.com" // trailing
+	raw := `// kept`
+}
+"""
+
+
+class TestCompaction:
+    """Test the individual compaction steps."""
+
+    def test_license_header_removed_and_shebang_kept(self):
+        """Leading license comments go; the shebang and code stay."""
+        result = strip_license_header("app.py", PY_SOURCE)
+        assert result.startswith('#!/usr/bin/env python\n"""Session helpers.')
+        assert "Copyright" not in result
+
+    def test_non_license_header_kept(self):
+        """Leading comments without license text are not a license header."""
+        source = "# Helpers for the CLI\nimport os\n"
+        assert strip_license_header("cli.py", source) == source
+        assert strip_license_header("README.md", "Copyright me\n") == "Copyright me\n"
+
+    def test_python_comments_and_docstrings(self):
+        """Comments go, docstrings shrink to their summary and code still parses."""
+        result = strip_python_comments(PY_SOURCE)
+        assert "#" not in result.replace('"# not a comment"', "")
+        assert '"""Session helpers."""' in result
+        assert '    """Stores sessions."""' in result
+        assert '        """Load a session."""' in result
+        assert "Details" not in result
+        assert "import os\n" in result
+        ast.parse(result)
+
+    def test_python_syntax_error_left_unchanged(self):
+        """Unparsable sources are returned as is."""
+        assert strip_python_comments("def broken(:  # x\n") == "def broken(:  # x\n"
+
+    def test_c_style_comments_skip_strings(self):
+        """Line and block comments go; comment markers inside strings stay."""
+        result = strip_c_style_comments(GO_SOURCE)
+        assert "Block" not in result and "trailing" not in result
+        assert '"http://example.com"' in result
+        assert "`// kept`" in result
+        assert result.count("\n") == GO_SOURCE.count("\n")
+
+    def test_hash_comments(self):
+        """Only whole-line comments are removed."""
+        source = "#!/bin/sh\n# comment\necho '#hi' # keep\n"
+        assert strip_hash_comments(source) == "#!/bin/sh\necho '#hi' # keep\n"
+
+    def test_collapse_whitespace(self):
+        """Trailing spaces and blank runs collapse; indentation is kept."""
+        assert collapse_whitespace("\n\na = 1   \n\n\n\n    b = 2\n\n") == "a = 1\n\n    b = 2\n"
+
+    def test_compact_source_without_comment_stripping(self):
+        """With strip_comments=False only headers and whitespace change."""
+        result = compact_source("main.go", GO_SOURCE, strip_comments=False)
+        assert "Copyright" not in result
+        assert "// trailing" in result
+
+
+class TestCompactReasoningMode:
+    """Test the "compact" mode of get_codebase_context."""
+
+    @pytest.mark.asyncio
+    async def test_compacts_and_deduplicates(self, tmp_path: Path):
+        """Files are compacted and identical copies are referenced, not repeated."""
+        (tmp_path / "app.py").write_text(PY_SOURCE)
+        (tmp_path / "vendor").mkdir()
+        (tmp_path / "vendor" / "app.py").write_text(PY_SOURCE)
+        (tmp_path / "main.go").write_text(GO_SOURCE)
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+
+        context = await get_codebase_context(tmp_path, "compact", log_function=lambda msg: None)
+
+        assert "Copyright" not in context
+        assert "Look it up" not in context
+        assert context.count("return os.environ[key]") == 1
+        assert "--- File: vendor/app.py ---\n(identical to app.py)" in context
+        assert 'url := "http://example.com"' in context
+
+
+class TestCompactionBenchmark:
+    """Test the compaction benchmark."""
+
+    @pytest.mark.asyncio
+    async def test_reports_savings(self, tmp_path: Path):
+        """Compaction never grows the context and the report shows the savings."""
+        (tmp_path / "app.py").write_text(PY_SOURCE)
+        (tmp_path / "copy.py").write_text(PY_SOURCE)
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+        counter = MagicMock()
+        counter.count_tokens.side_effect = lambda text, model: len(text)
+
+        result = await measure_compaction(tmp_path, "model", counter)
+
+        assert result["files"] == 2
+        # The identical copy is counted in the baseline and referenced once deduplicated
+        assert result["deduplicated_tokens"] < result["full_tokens"]
+        assert (
+            result["compact_tokens"] < result["whitespace_tokens"] < result["deduplicated_tokens"]
+        )
+        report = format_report({"repo": result})
+        assert report.splitlines()[1].startswith("repo")
+        assert report.endswith("%")
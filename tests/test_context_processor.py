@@ -7,7 +7,12 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from yellhorn_mcp.llm_manager import LLMManager
-from yellhorn_mcp.processors.context_processor import process_context_curation_async
+from yellhorn_mcp.processors.context_processor import (
+    PARTITION_SYSTEM_MESSAGE,
+    REDUCE_SYSTEM_MESSAGE,
+    partition_file_paths,
+    process_context_curation_async,
+)
 from yellhorn_mcp.utils.git_utils import YellhornMCPError
 
 
@@ -150,7 +155,7 @@ src
             )
 
             # Verify LSP snapshot was used
-            mock_lsp.assert_called_once_with(repo_path)
+            mock_lsp.assert_called_once_with(repo_path, ["src/main.py"])
 
     @pytest.mark.asyncio
     async def test_process_context_curation_full_mode(self, tmp_path):
@@ -707,3 +712,144 @@ yellhorn_mcp/integrations
         assert (
             len(pattern_lines) == 4
         )  # './', 'src/', 'yellhorn_mcp/', 'yellhorn_mcp/integrations/'
+
+
+class TestPartitionFilePaths:
+    """Test suite for partition_file_paths."""
+
+    def test_groups_by_top_level_directory(self):
+        """Small subsystems are packed together, large ones stay separate."""
+        files = [f"api/mod{i}.py" for i in range(3)] + [f"web/page{i}.js" for i in range(3)]
+        files += ["setup.py"]
+        partitions = partition_file_paths(files, max_files=4)
+
+        assert sorted(f for p in partitions for f in p) == sorted(files)
+        assert all(len(p) <= 4 for p in partitions)
+        # No top-level subsystem is split across partitions when it fits
+        for prefix in ("api/", "web/"):
+            assert sum(any(f.startswith(prefix) for f in p) for p in partitions) == 1
+
+    def test_splits_oversized_subsystem(self):
+        """A subsystem larger than the limit is split by its next directory level."""
+        files = [f"src/a/f{i}.py" for i in range(5)] + [f"src/b/f{i}.py" for i in range(5)]
+        partitions = partition_file_paths(files, max_files=5)
+
+        assert len(partitions) == 2
+        assert {p[0].split("/")[1] for p in partitions} == {"a", "b"}
+
+    def test_splits_flat_directory(self):
+        """A flat directory larger than the limit is chunked."""
+        files = [f"f{i}.py" for i in range(7)]
+        partitions = partition_file_paths(files, max_files=3)
+
+        assert [len(p) for p in partitions] == [3, 3, 1]
+
+
+class TestHierarchicalCuration:
+    """Test suite for hierarchical (map-reduce) context curation."""
+
+    @staticmethod
+    def _make_repo(tmp_path):
+        repo_path = tmp_path / "repo"
+        for subsystem in ("api", "web", "docs_site"):
+            (repo_path / subsystem / "core").mkdir(parents=True)
+            (repo_path / subsystem / "__init__.py").write_text("")
+            for i in range(3):
+                (repo_path / subsystem / "core" / f"f{i}.py").write_text("x = 1")
+        return repo_path
+
+    @pytest.mark.asyncio
+    async def test_map_and_reduce_passes(self, tmp_path):
+        """Each partition is queried separately and the reduce pass picks the final set."""
+        repo_path = self._make_repo(tmp_path)
+
+        async def fake_call_llm(model, prompt, system_message, **kwargs):
+            # Partition content comes first and the task last
+            assert prompt.endswith("Task: Add an endpoint")
+            if system_message == PARTITION_SYSTEM_MESSAGE:
+                for subsystem in ("api", "web", "docs_site"):
+                    if f"── {subsystem}/" in prompt:
+                        return f"```context\n{subsystem}/core\n```"
+                return "```context\n```"
+            assert system_message == REDUCE_SYSTEM_MESSAGE
+            assert "api/core (3 files)" in prompt
+            return "```context\napi/core\nweb/core\nnot/a/candidate\n```"
+
+        mock_llm_manager = MagicMock(spec=LLMManager)
+        mock_llm_manager.call_llm.side_effect = fake_call_llm
+
+        with patch("yellhorn_mcp.processors.context_processor.PARTITION_MAX_FILES", 4):
+            result = await process_context_curation_async(
+                repo_path=repo_path,
+                llm_manager=mock_llm_manager,
+                model="gpt-4o",
+                user_task="Add an endpoint",
+                curation_mode="hierarchical",
+            )
+
+        # Three partitions plus one reduce call
+        assert mock_llm_manager.call_llm.call_count == 4
+        assert "2 important directories" in result
+        content = (repo_path / ".yellhorncontext").read_text()
+        assert "api/core/" in content
+        assert "web/core/" in content
+        assert "docs_site" not in content
+        assert "not/a/candidate" not in content
+
+    @pytest.mark.asyncio
+    async def test_failed_partition_keeps_its_directories(self, tmp_path):
+        """A failing partition call falls back to keeping that partition."""
+        repo_path = self._make_repo(tmp_path)
+
+        async def fake_call_llm(model, prompt, system_message, **kwargs):
+            if system_message == PARTITION_SYSTEM_MESSAGE:
+                if "── web/" in prompt:
+                    raise RuntimeError("rate limited")
+                return "```context\n```"
+            raise RuntimeError("reduce failed")
+
+        mock_llm_manager = MagicMock(spec=LLMManager)
+        mock_llm_manager.call_llm.side_effect = fake_call_llm
+
+        with patch("yellhorn_mcp.processors.context_processor.PARTITION_MAX_FILES", 4):
+            await process_context_curation_async(
+                repo_path=repo_path,
+                llm_manager=mock_llm_manager,
+                model="gpt-4o",
+                user_task="Add an endpoint",
+                curation_mode="hierarchical",
+            )
+
+        content = (repo_path / ".yellhorncontext").read_text()
+        assert "web/core/" in content
+        assert "api/" not in content
+
+    @pytest.mark.asyncio
+    async def test_auto_mode_uses_single_pass_for_small_repos(self, tmp_path):
+        """Auto mode issues a single call below the file threshold."""
+        repo_path = self._make_repo(tmp_path)
+        mock_llm_manager = MagicMock(spec=LLMManager)
+        mock_llm_manager.call_llm.return_value = "```context\napi\n```"
+
+        await process_context_curation_async(
+            repo_path=repo_path,
+            llm_manager=mock_llm_manager,
+            model="gpt-4o",
+            user_task="Add an endpoint",
+        )
+
+        mock_llm_manager.call_llm.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_invalid_curation_mode(self, tmp_path):
+        """Unknown curation modes are rejected."""
+        repo_path = self._make_repo(tmp_path)
+
+        with pytest.raises(YellhornMCPError, match="Invalid curation_mode"):
+            await process_context_curation_async(
+                repo_path=repo_path,
+                llm_manager=MagicMock(spec=LLMManager),
+                model="gpt-4o",
+                user_task="Add an endpoint",
+                curation_mode="bogus",
+            )
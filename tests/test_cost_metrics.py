@@ -223,3 +223,55 @@ def test_format_metrics_section_gemini_usage():
 
     for line in expected_lines:
         assert line in result
+
+
+def test_calculate_cost_with_cached_input_tokens():
+    """Test that cached input tokens are billed at the model's cached rate."""
+    # gpt-4.1: 60k uncached at $2.00/M + 40k cached at $0.50/M + 50k output at $8.00/M
+    cost = calculate_cost("gpt-4.1", 100_000, 50_000, cached_input_tokens=40_000)
+    assert cost is not None
+    assert round(cost, 4) == 0.54
+
+    # gemini-2.5-flash uses its context cache rate: 0.015 + 0.00375 + 0.125
+    cost = calculate_cost("gemini-2.5-flash", 100_000, 50_000, cached_input_tokens=50_000)
+    assert cost is not None
+    assert round(cost, 5) == 0.14375
+
+
+def test_calculate_cost_cached_tokens_without_cached_rate():
+    """Test that cached tokens are billed at the full rate when no cached rate is known."""
+    assert calculate_cost("gpt-4o", 100_000, 50_000, cached_input_tokens=40_000) == 1.25
+
+
+def test_calculate_cost_with_cache_storage():
+    """Test that storage of explicitly cached content is billed at the cache storage rate."""
+    # gemini-2.5-pro: 100k cached tokens kept for 5 minutes at $4.50 per 1M tokens per hour
+    base = calculate_cost("gemini-2.5-pro", 100_000, 1_000, cached_input_tokens=100_000)
+    cost = calculate_cost(
+        "gemini-2.5-pro",
+        100_000,
+        1_000,
+        cached_input_tokens=100_000,
+        cache_storage_token_hours=100_000 * 300 / 3600,
+    )
+    assert round(cost - base, 4) == 0.0375
+
+    # OpenAI prompt caching has no storage charge
+    assert calculate_cost("gpt-4.1", 1_000, 0, cache_storage_token_hours=1_000) == 0.002
+
+
+def test_format_metrics_section_cached_tokens():
+    """Test that format_metrics_section reports and prices cached input tokens."""
+    usage = UsageMetadata(
+        {
+            "prompt_tokens": 100_000,
+            "completion_tokens": 50_000,
+            "total_tokens": 150_000,
+            "cached_tokens": 40_000,
+        }
+    )
+
+    result = format_metrics_section("gpt-4.1", usage)
+
+    assert "*   **Input Tokens**: 100000 (40000 cached)" in result
+    assert "*   **Estimated Cost**: $0.5400" in result
@@ -0,0 +1,100 @@
+"""Tests for duplicate detection in prompt assembly."""
+
+import pytest
+
+from yellhorn_mcp.formatters import build_codebase_prompt
+from yellhorn_mcp.formatters.context_fetcher import near_duplicate_threshold
+from yellhorn_mcp.utils.dedup_utils import (
+    DuplicateDetector,
+    estimate_similarity,
+    minhash_signature,
+    shingles,
+)
+
+BASE = "\n".join(
+    f"def handler_{i}(request):\n    return render(request, 'page_{i}')" for i in range(30)
+)
+EDITED = BASE.replace("page_7'", "page_seven'")
+UNRELATED = "\n".join(f"CONSTANT_{i} = compute_value({i}) * factor" for i in range(30))
+
+
+class TestMinHash:
+    """Test shingling and similarity estimation."""
+
+    def test_similar_texts_have_similar_signatures(self):
+        """Signatures estimate Jaccard similarity."""
+        base = minhash_signature(shingles(BASE))
+        assert estimate_similarity(base, base) == 1.0
+        assert estimate_similarity(base, minhash_signature(shingles(EDITED))) > 0.8
+        assert estimate_similarity(base, minhash_signature(shingles(UNRELATED))) < 0.2
+
+
+class TestDuplicateDetector:
+    """Test exact and near-duplicate matching."""
+
+    def test_exact_duplicates_only_by_default(self):
+        """Without a threshold only identical files match."""
+        detector = DuplicateDetector()
+        assert detector.check("a.py", BASE) is None
+        assert detector.check("b.py", BASE) == ("a.py", 1.0)
+        assert detector.check("c.py", EDITED) is None
+
+    def test_near_duplicates_with_threshold(self):
+        """With a threshold, similar files match their first copy."""
+        detector = DuplicateDetector(near_duplicate_threshold=0.8)
+        assert detector.check("a.py", BASE) is None
+        original, similarity = detector.check("b.py", EDITED)
+        assert original == "a.py"
+        assert 0.8 <= similarity < 1.0
+        assert detector.check("c.py", UNRELATED) is None
+        # A copy of a near-duplicate refers to the file that is actually shown
+        assert detector.check("d.py", EDITED) == ("a.py", similarity)
+
+    def test_short_files_are_only_matched_exactly(self):
+        """Files too short for meaningful shingles are never near-duplicates."""
+        detector = DuplicateDetector(near_duplicate_threshold=0.1)
+        assert detector.check("a.py", "x = 1\n") is None
+        assert detector.check("b.py", "x = 2\n") is None
+
+
+class TestDeduplicatedPrompt:
+    """Test duplicate handling in build_codebase_prompt."""
+
+    def test_identical_files_cost_tokens_once(self):
+        """Later copies are replaced by a reference to the first."""
+        contents = {"vendor/a/util.py": BASE, "lib/util.py": BASE, "main.py": UNRELATED}
+        builder = build_codebase_prompt(list(contents), contents)
+        prompt = builder.build()
+
+        assert prompt.count("handler_29") == 1
+        assert "--- File: vendor/a/util.py ---\n(identical to lib/util.py)" in prompt
+        assert builder.duplicates == {"vendor/a/util.py": "lib/util.py"}
+
+    def test_near_duplicates_reference_the_similar_file(self):
+        """With a threshold, near-duplicates are referenced with their similarity."""
+        contents = {"a.py": BASE, "b.py": EDITED}
+        prompt = build_codebase_prompt(
+            list(contents), contents, near_duplicate_threshold=0.8
+        ).build()
+        assert "--- File: b.py ---\n(near-duplicate of a.py, " in prompt
+
+    def test_deduplication_can_be_disabled(self):
+        """deduplicate=False includes every copy."""
+        contents = {"a.py": BASE, "b.py": BASE}
+        prompt = build_codebase_prompt(list(contents), contents, deduplicate=False).build()
+        assert prompt.count("handler_29") == 2
+
+
+class TestNearDuplicateThreshold:
+    """Test the YELLHORN_MCP_NEAR_DUPLICATES setting."""
+
+    @pytest.mark.parametrize(
+        "value, expected", [(None, None), ("", None), ("0.9", 0.9), ("abc", None), ("2", None)]
+    )
+    def test_parsing(self, monkeypatch, value, expected):
+        """Valid thresholds are in (0, 1]; anything else disables detection."""
+        if value is None:
+            monkeypatch.delenv("YELLHORN_MCP_NEAR_DUPLICATES", raising=False)
+        else:
+            monkeypatch.setenv("YELLHORN_MCP_NEAR_DUPLICATES", value)
+        assert near_duplicate_threshold() == expected
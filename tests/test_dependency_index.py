@@ -0,0 +1,145 @@
+"""Tests for the persistent dependency-graph index."""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from tests.helpers import write_files
+from yellhorn_mcp.utils.dependency_index import (
+    DEPENDENCY_INDEX_VERSION,
+    DependencyIndex,
+    get_shared_dependency_index,
+    git_blob_id,
+)
+from yellhorn_mcp.utils.dependency_utils import extract_imports
+
+FILES = {
+    "pkg/__init__.py": "",
+    "pkg/a.py": "import pkg.b\n",
+    "pkg/b.py": "import pkg.c\n",
+    "pkg/c.py": "X = 1\n",
+    "go.mod": "module example.com/m\n",
+    "cmd/main.go": 'package main\n\nimport "example.com/m/lib"\n',
+    "lib/lib.go": "package lib\n",
+    "README.md": "docs\n",
+}
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a repository directory holding FILES."""
+    return write_files(tmp_path / "repo", FILES)
+
+
+def _count_extractions():
+    return patch("yellhorn_mcp.utils.dependency_index.extract_imports", side_effect=extract_imports)
+
+
+class TestDependencyIndex:
+    """Test index construction, incremental updates and queries."""
+
+    def test_git_blob_id_matches_git(self):
+        """Blob IDs match ``git hash-object``."""
+        assert git_blob_id(b"") == "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"
+
+    def test_edges_and_queries(self, repo: Path):
+        """Forward, reverse and k-hop queries reflect the imports."""
+        index = DependencyIndex()
+        index.update(repo, list(FILES))
+
+        assert index.edges["pkg/a.py"] == {"pkg/b.py"}
+        assert index.reverse_edges["pkg/c.py"] == {"pkg/b.py"}
+        assert index.edges["cmd/main.go"] == {"lib/lib.go"}
+        assert index.resolve_module("pkg.c") == "pkg/c.py"
+        assert index.resolve_module("missing") is None
+
+        assert index.neighbors(["pkg/c.py"], hops=1) == {"pkg/c.py", "pkg/b.py"}
+        assert index.neighbors(["pkg/c.py"], hops=2) == {"pkg/c.py", "pkg/b.py", "pkg/a.py"}
+
+    def test_only_changed_files_are_parsed(self, repo: Path):
+        """A second update parses only the edited file."""
+        index = DependencyIndex()
+        index.update(repo, list(FILES))
+
+        (repo / "pkg" / "c.py").write_text("import pkg.a\n")
+        with _count_extractions() as extractor:
+            changed = index.update(repo, list(FILES))
+
+        assert changed == ["pkg/c.py"]
+        assert extractor.call_count == 1
+        assert index.edges["pkg/c.py"] == {"pkg/a.py"}
+
+    def test_touched_file_with_same_blob_is_not_parsed(self, repo: Path):
+        """A new mtime with identical contents reuses the stored imports."""
+        index = DependencyIndex()
+        index.update(repo, list(FILES))
+
+        path = repo / "pkg" / "a.py"
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+        with _count_extractions() as extractor:
+            changed = index.update(repo, list(FILES))
+
+        assert changed == []
+        assert extractor.call_count == 0
+
+    def test_removed_files_drop_edges(self, repo: Path):
+        """Files missing from the file list are removed with their edges."""
+        index = DependencyIndex()
+        index.update(repo, list(FILES))
+
+        remaining = [p for p in FILES if p != "pkg/b.py"]
+        changed = index.update(repo, remaining)
+
+        assert changed == ["pkg/b.py"]
+        assert "pkg/a.py" not in index.edges
+        assert index.neighbors(["pkg/c.py"], hops=3) == {"pkg/c.py"}
+
+    def test_persisted_between_instances(self, repo: Path, tmp_path: Path):
+        """A reloaded index answers queries without parsing anything."""
+        cache_path = tmp_path / "cache" / "index.json"
+        first = DependencyIndex(cache_path)
+        first.update(repo, list(FILES))
+        assert cache_path.exists()
+
+        second = DependencyIndex(cache_path)
+        second.load()
+        assert second.edges == first.edges
+        with _count_extractions() as extractor:
+            assert second.update(repo, list(FILES)) == []
+        assert extractor.call_count == 0
+
+    def test_outdated_version_is_ignored(self, repo: Path, tmp_path: Path):
+        """Indexes written by another format version are discarded."""
+        cache_path = tmp_path / "index.json"
+        cache_path.write_text(
+            json.dumps({"version": DEPENDENCY_INDEX_VERSION + 1, "entries": {"x.py": {}}})
+        )
+        index = DependencyIndex(cache_path)
+        index.load()
+        assert index.edges == {}
+        assert set(index.update(repo, list(FILES))) == {
+            p for p in FILES if p.endswith((".py", ".go", "go.mod"))
+        }
+
+
+class TestGetSharedDependencyIndex:
+    """Test lookup of the shared index from the lifespan context."""
+
+    def test_uses_lifespan_index(self, repo: Path):
+        """The lifespan index is returned when present."""
+        index = DependencyIndex()
+        ctx = MagicMock()
+        ctx.request_context.lifespan_context = {"dependency_index": index}
+        assert get_shared_dependency_index(ctx, repo) is index
+
+    def test_loads_index_without_server(self, repo: Path, monkeypatch, tmp_path: Path):
+        """Without a server context the repository's persisted index is loaded."""
+        monkeypatch.setenv("YELLHORN_MCP_CACHE_DIR", str(tmp_path / "cache"))
+        index = get_shared_dependency_index(None, repo)
+        assert isinstance(index, DependencyIndex)
+        assert index.cache_path.name == "index.json"
+        assert str(tmp_path / "cache") in str(index.cache_path)
@@ -0,0 +1,152 @@
+"""Tests for import-graph extraction and diff-scoped codebase context."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from yellhorn_mcp.formatters.context_fetcher import get_diff_scoped_context
+from yellhorn_mcp.utils.dependency_utils import (
+    build_dependency_edges,
+    dependency_closure,
+    extract_go_imports,
+    extract_python_imports,
+    find_referenced_paths,
+    python_module_names,
+)
+
+REPO_FILES = {
+    "app/__init__.py": "",
+    "app/core.py": "from app import helpers\n\nCORE = 'core body'\n",
+    "app/helpers.py": "HELPERS = 'helpers body'\n",
+    "app/cli.py": "from .core import CORE\n\nCLI = 'cli body'\n",
+    "app/unrelated.py": "UNRELATED = 'unrelated body'\n",
+    "docs/guide.md": "guide body\n",
+    "go.mod": "module example.com/svc\n\ngo 1.22\n",
+    "svc/server.go": 'package svc\n\nimport (\n\t"fmt"\n\t"example.com/svc/store"\n)\n',
+    "svc/routes.go": "package svc\n",
+    "store/db.go": "package store\n",
+    "other/tool.go": 'package other\n\nimport "fmt"\n',
+}
+
+
+def _read(path: str) -> str | None:
+    return REPO_FILES.get(path)
+
+
+class TestExtraction:
+    """Test per-language import extraction."""
+
+    def test_python_module_names(self):
+        """Module names strip __init__ and source roots."""
+        assert python_module_names("pkg/mod.py") == ["pkg.mod"]
+        assert python_module_names("pkg/__init__.py") == ["pkg"]
+        assert python_module_names("src/pkg/mod.py") == ["src.pkg.mod", "pkg.mod"]
+
+    def test_python_imports_resolve_relative_imports(self):
+        """Relative imports resolve against the file's package."""
+        source = "import os\nfrom . import sibling\nfrom ..base import thing\nfrom x import *\n"
+        imports = extract_python_imports(source, "pkg/sub/mod.py")
+        assert "os" in imports
+        assert "pkg.sub" in imports
+        assert "pkg.sub.sibling" in imports
+        assert "pkg.base" in imports
+        assert "pkg.base.thing" in imports
+        assert "x" in imports
+        assert "x.*" not in imports
+
+    def test_python_imports_ignore_syntax_errors(self):
+        """Unparsable files have no imports."""
+        assert extract_python_imports("def broken(:\n", "mod.py") == []
+
+    def test_go_imports(self):
+        """Single, aliased and block imports are all found."""
+        source = 'package x\n\nimport "fmt"\nimport alias "example.com/a"\nimport (\n\t"os"\n\tb "example.com/b"\n)\n'
+        assert sorted(extract_go_imports(source)) == [
+            "example.com/a",
+            "example.com/b",
+            "fmt",
+            "os",
+        ]
+
+
+class TestDependencyGraph:
+    """Test edge construction and neighborhood queries."""
+
+    def test_edges(self):
+        """Python and Go imports resolve to repository files."""
+        edges = build_dependency_edges(list(REPO_FILES), _read)
+        assert edges["app/core.py"] == {"app/__init__.py", "app/helpers.py"}
+        assert edges["app/cli.py"] == {"app/core.py"}
+        # Go files link to their package and to imported packages in the module
+        assert edges["svc/server.go"] == {"svc/routes.go", "store/db.go"}
+        assert "other/tool.go" not in edges
+
+    def test_closure_follows_both_directions(self):
+        """Importers and imports are both neighbors."""
+        edges = build_dependency_edges(list(REPO_FILES), _read)
+        assert dependency_closure(edges, ["app/core.py"], hops=1) == {
+            "app/core.py",
+            "app/__init__.py",
+            "app/helpers.py",
+            "app/cli.py",
+        }
+        assert dependency_closure(edges, ["app/helpers.py"], hops=1) == {
+            "app/helpers.py",
+            "app/core.py",
+        }
+        assert "app/cli.py" in dependency_closure(edges, ["app/helpers.py"], hops=2)
+        assert dependency_closure(edges, ["app/helpers.py"], hops=0) == {"app/helpers.py"}
+
+    def test_find_referenced_paths(self):
+        """File and directory references are matched against the tree."""
+        text = "Edit `app/unrelated.py`. Also see ./docs/guide.md and the store/ package."
+        assert find_referenced_paths(text, list(REPO_FILES)) == {
+            "app/unrelated.py",
+            "docs/guide.md",
+            "store/db.go",
+        }
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Create a git repository holding REPO_FILES."""
+    repo_path = tmp_path / "repo"
+    for rel_path, content in REPO_FILES.items():
+        full_path = repo_path / rel_path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text(content)
+    subprocess.run(["git", "init", "-q"], cwd=repo_path, check=True)
+    return repo_path
+
+
+class TestDiffScopedContext:
+    """Test codebase context scoped to a diff."""
+
+    @pytest.mark.asyncio
+    async def test_full_mode_includes_only_closure(self, git_repo: Path):
+        """Only the closure is inlined; other files are only listed."""
+        context = await get_diff_scoped_context(
+            git_repo,
+            "full",
+            ["app/helpers.py"],
+            workplan_content="Touches docs/guide.md",
+            log_function=lambda msg: None,
+        )
+        assert "helpers body" in context
+        assert "core body" in context
+        assert "guide body" in context
+        assert "cli body" not in context
+        assert "unrelated body" not in context
+        # The rest of the tree is still listed
+        assert "unrelated.py" in context
+        assert "<codebase_tree>" in context
+
+    @pytest.mark.asyncio
+    async def test_file_structure_mode_is_unscoped(self, git_repo: Path):
+        """Modes without file contents fall back to the regular context."""
+        context = await get_diff_scoped_context(
+            git_repo, "file_structure", ["app/helpers.py"], log_function=lambda msg: None
+        )
+        assert "helpers body" not in context
+        assert "unrelated.py" in context
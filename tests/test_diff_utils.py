@@ -0,0 +1,81 @@
+"""Tests for diff_utils.py module."""
+
+from yellhorn_mcp.utils.diff_utils import FileDiff, batch_file_diffs, split_diff_by_file
+
+
+class CharTokenCounter:
+    """Token counter stand-in that counts one token per character."""
+
+    def count_tokens(self, text: str, model: str) -> int:
+        return len(text)
+
+
+def make_file_diff(path: str, hunks: list[str]) -> str:
+    """Build a unified diff section for one file."""
+    header = f"diff --git a/{path} b/{path}\nindex 123..456 100644\n--- a/{path}\n+++ b/{path}\n"
+    return header + "".join(f"@@ -1,1 +1,1 @@\n{hunk}\n" for hunk in hunks)
+
+
+class TestSplitDiffByFile:
+    """Test suite for split_diff_by_file."""
+
+    def test_splits_files_and_hunks(self):
+        """Each file becomes one FileDiff with its hunks."""
+        diff = make_file_diff("a.py", ["+one", "+two"]) + make_file_diff("pkg/b.py", ["+three"])
+        file_diffs = split_diff_by_file(diff)
+
+        assert [fd.path for fd in file_diffs] == ["a.py", "pkg/b.py"]
+        assert len(file_diffs[0].hunks) == 2
+        assert all(h.startswith("@@ ") for h in file_diffs[0].hunks)
+        assert "".join(fd.text for fd in file_diffs) == diff
+
+    def test_new_deleted_and_binary_files(self):
+        """Paths are resolved for added, deleted and binary files."""
+        diff = (
+            "diff --git a/new.py b/new.py\nnew file mode 100644\n--- /dev/null\n+++ b/new.py\n"
+            "@@ -0,0 +1 @@\n+x = 1\n"
+            "diff --git a/old.py b/old.py\ndeleted file mode 100644\n--- a/old.py\n+++ /dev/null\n"
+            "@@ -1 +0,0 @@\n-x = 1\n"
+            "diff --git a/logo.png b/logo.png\nBinary files a/logo.png and b/logo.png differ\n"
+        )
+        assert [fd.path for fd in split_diff_by_file(diff)] == ["new.py", "old.py", "logo.png"]
+
+    def test_ignores_non_diff_text(self):
+        """Input without diff headers yields no files."""
+        assert split_diff_by_file("Changed files between main and HEAD:\na.py") == []
+
+
+class TestBatchFileDiffs:
+    """Test suite for batch_file_diffs."""
+
+    def test_batches_respect_budget_and_order(self):
+        """Whole files are packed into batches under the budget, in diff order."""
+        diff = "".join(make_file_diff(f"f{i}.py", ["+" + "x" * 40]) for i in range(5))
+        file_diffs = split_diff_by_file(diff)
+        size = len(file_diffs[0].text)
+
+        batches = batch_file_diffs(file_diffs, size * 2, CharTokenCounter(), "model")
+
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert [fd.path for b in batches for fd in b] == [f"f{i}.py" for i in range(5)]
+
+    def test_oversized_file_split_at_hunks(self):
+        """A file larger than the budget is split at hunk boundaries with its header repeated."""
+        file_diff = split_diff_by_file(make_file_diff("big.py", ["+" + "y" * 50] * 4))[0]
+        budget = len(file_diff.header) + 2 * len(file_diff.hunks[0])
+
+        batches = batch_file_diffs([file_diff], budget, CharTokenCounter(), "model")
+
+        assert len(batches) == 2
+        for batch in batches:
+            assert batch[0].path == "big.py"
+            assert batch[0].text.startswith("diff --git a/big.py")
+            assert len(batch[0].hunks) == 2
+
+    def test_single_huge_hunk_kept_whole(self):
+        """A hunk that alone exceeds the budget is not cut."""
+        file_diff = FileDiff("huge.py", "diff --git a/huge.py b/huge.py\n", ["@@ x\n" + "+z" * 100])
+
+        batches = batch_file_diffs([file_diff], 10, CharTokenCounter(), "model")
+
+        assert batches == [[file_diff]]
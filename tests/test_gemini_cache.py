@@ -0,0 +1,316 @@
+"""Tests for explicit Gemini context caching – gemini_cache.py and its use in LLMManager."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from yellhorn_mcp.gemini_cache import (
+    DEFAULT_TTL_SECONDS,
+    MIN_CACHED_PREFIX_CHARS,
+    GeminiContextCache,
+)
+from yellhorn_mcp.llm_manager import LLMManager
+
+PREFIX = "# Codebase Context\n" + "x" * MIN_CACHED_PREFIX_CHARS + "\n\n"
+
+
+class FakeCaches:
+    """Local fake of the Gemini cached-content endpoints (``client.aio.caches``)."""
+
+    def __init__(self, fail_create: bool = False):
+        self.fail_create = fail_create
+        self.objects: dict[str, dict] = {}
+        self.created: list[dict] = []
+        self.updated: list[str] = []
+        self.deleted: list[str] = []
+
+    async def create(self, model, config):
+        if self.fail_create:
+            raise RuntimeError("caching unavailable")
+        name = f"cachedContents/{len(self.created) + 1}"
+        obj = {
+            "model": model,
+            "contents": config.contents,
+            "ttl": config.ttl,
+            "tools": config.tools,
+        }
+        self.objects[name] = obj
+        self.created.append(obj)
+        return SimpleNamespace(name=name)
+
+    async def update(self, name, config):
+        self.objects[name]["ttl"] = config.ttl
+        self.updated.append(name)
+
+    async def delete(self, name):
+        self.objects.pop(name, None)
+        self.deleted.append(name)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_client(caches: FakeCaches) -> MagicMock:
+    client = MagicMock()
+    client.aio.caches = caches
+    return client
+
+
+async def get_twice(cache: GeminiContextCache, model: str, scope: str, prefix: str):
+    """Request a prefix twice, so that the second request creates the cached object."""
+    await cache.get(model, scope, prefix)
+    return await cache.get(model, scope, prefix)
+
+
+class TestGeminiContextCache:
+    """Test suite for GeminiContextCache."""
+
+    @pytest.mark.asyncio
+    async def test_first_request_is_not_cached(self):
+        """Test that a prefix seen once does not create a cached object."""
+        caches = FakeCaches()
+        cache = GeminiContextCache(make_client(caches))
+
+        assert await cache.get("gemini-2.5-pro", "repo:full", PREFIX) is None
+        assert caches.created == []
+
+    @pytest.mark.asyncio
+    async def test_creates_on_second_request_and_reuses(self):
+        """Test that the second request creates one cached object that later calls reuse."""
+        caches = FakeCaches()
+        cache = GeminiContextCache(make_client(caches), ttl_seconds=600, clock=FakeClock())
+
+        first = await get_twice(cache, "gemini-2.5-pro", "repo:full", PREFIX)
+        second = await cache.get("gemini-2.5-pro", "repo:full", PREFIX)
+
+        # Creation buys one TTL of storage; an immediate reuse extends it by nothing
+        assert first == ("cachedContents/1", 600.0)
+        assert second == ("cachedContents/1", 0.0)
+        assert len(caches.created) == 1
+        assert caches.created[0]["model"] == "models/gemini-2.5-pro"
+        assert caches.created[0]["contents"] == [PREFIX]
+        assert caches.created[0]["ttl"] == "600s"
+
+    @pytest.mark.asyncio
+    async def test_second_request_after_ttl_is_not_cached(self):
+        """Test that a repeat sighting after the TTL counts as a new first request."""
+        caches = FakeCaches()
+        clock = FakeClock()
+        cache = GeminiContextCache(make_client(caches), ttl_seconds=600, clock=clock)
+
+        await cache.get("gemini-2.5-pro", "repo:full", PREFIX)
+        clock.now = 700
+
+        assert await cache.get("gemini-2.5-pro", "repo:full", PREFIX) is None
+        assert caches.created == []
+
+    @pytest.mark.asyncio
+    async def test_evicts_when_prefix_changes(self):
+        """Test that a new prefix for the same scope replaces the old cached object."""
+        caches = FakeCaches()
+        cache = GeminiContextCache(make_client(caches))
+
+        await get_twice(cache, "gemini-2.5-pro", "repo:full", PREFIX)
+        assert await cache.get("gemini-2.5-pro", "repo:full", PREFIX + "new commit") is None
+        assert caches.deleted == ["cachedContents/1"]
+
+        cached = await cache.get("gemini-2.5-pro", "repo:full", PREFIX + "new commit")
+        assert cached.name == "cachedContents/2"
+        assert list(caches.objects) == ["cachedContents/2"]
+
+    @pytest.mark.asyncio
+    async def test_scopes_and_models_are_separate(self):
+        """Test that each (model, scope) pair gets its own cached object."""
+        caches = FakeCaches()
+        cache = GeminiContextCache(make_client(caches))
+
+        await get_twice(cache, "gemini-2.5-pro", "repo:full", PREFIX)
+        await get_twice(cache, "gemini-2.5-pro", "repo:lsp", PREFIX)
+        await get_twice(cache, "gemini-2.5-flash", "repo:full", PREFIX)
+
+        assert len(caches.created) == 3
+        assert caches.deleted == []
+
+    @pytest.mark.asyncio
+    async def test_refreshes_ttl_on_every_hit(self):
+        """Test that each reuse of the cached object extends its TTL and reports the extension."""
+        caches = FakeCaches()
+        clock = FakeClock()
+        cache = GeminiContextCache(make_client(caches), ttl_seconds=600, clock=clock)
+
+        await get_twice(cache, "gemini-2.5-pro", "repo:full", PREFIX)
+        assert caches.updated == []
+
+        clock.now = 400
+        assert await cache.get("gemini-2.5-pro", "repo:full", PREFIX) == (
+            "cachedContents/1",
+            400.0,
+        )
+        assert caches.updated == ["cachedContents/1"]
+
+        # The refreshed object lives until 1000, so it is still used at 900
+        clock.now = 900
+        assert await cache.get("gemini-2.5-pro", "repo:full", PREFIX) == (
+            "cachedContents/1",
+            500.0,
+        )
+        assert caches.updated == ["cachedContents/1", "cachedContents/1"]
+        assert len(caches.created) == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_object_is_dropped(self):
+        """Test that an object past its TTL is deleted and recreated on the next repeat."""
+        caches = FakeCaches()
+        clock = FakeClock()
+        cache = GeminiContextCache(make_client(caches), ttl_seconds=600, clock=clock)
+
+        await get_twice(cache, "gemini-2.5-pro", "repo:full", PREFIX)
+        clock.now = 700
+
+        assert await cache.get("gemini-2.5-pro", "repo:full", PREFIX) is None
+        assert caches.deleted == ["cachedContents/1"]
+        assert (await cache.get("gemini-2.5-pro", "repo:full", PREFIX)).name == "cachedContents/2"
+
+    @pytest.mark.asyncio
+    async def test_short_prefix_is_not_cached(self):
+        """Test that prefixes below the minimum cache size are sent normally."""
+        caches = FakeCaches()
+        cache = GeminiContextCache(make_client(caches))
+
+        assert await get_twice(cache, "gemini-2.5-pro", "repo:full", "# Codebase Context\n") is None
+        assert caches.created == []
+
+    @pytest.mark.asyncio
+    async def test_create_failure_returns_none(self):
+        """Test that a failing create falls back to an uncached call."""
+        cache = GeminiContextCache(make_client(FakeCaches(fail_create=True)))
+
+        assert await get_twice(cache, "gemini-2.5-pro", "repo:full", PREFIX) is None
+
+    @pytest.mark.asyncio
+    async def test_clear_deletes_objects(self):
+        """Test that clear deletes every cached object."""
+        caches = FakeCaches()
+        cache = GeminiContextCache(make_client(caches))
+        await get_twice(cache, "gemini-2.5-pro", "repo:full", PREFIX)
+        await get_twice(cache, "gemini-2.5-pro", "repo:lsp", PREFIX)
+
+        await cache.clear()
+
+        assert sorted(caches.deleted) == ["cachedContents/1", "cachedContents/2"]
+        assert caches.objects == {}
+
+
+class TestLLMManagerContextCache:
+    """Test suite for cached-content use in LLMManager._call_gemini."""
+
+    def make_manager(self, caches: FakeCaches, enabled: bool = True) -> LLMManager:
+        client = make_client(caches)
+        response = MagicMock()
+        response.text = "Generated"
+        client.aio.models.generate_content = AsyncMock(return_value=response)
+        manager = LLMManager(gemini_client=client, config={"gemini_context_cache": enabled})
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_call_references_cached_prefix(self):
+        """Test that a repeated prefix is referenced from the cache and only the rest is sent."""
+        caches = FakeCaches()
+        manager = self.make_manager(caches)
+        prompt = PREFIX + "# Task Title\nAdd caching"
+        generate = manager.gemini_client.aio.models.generate_content
+
+        with patch.object(manager.token_counter, "can_fit_in_context", return_value=True):
+            for _ in range(2):
+                result = await manager.call_llm(
+                    prompt=prompt,
+                    model="gemini-2.5-pro",
+                    cacheable_prefix_length=len(PREFIX),
+                    cache_scope="repo:full",
+                )
+
+        assert result == "Generated"
+        first_call = generate.call_args_list[0][1]
+        assert first_call["contents"] == prompt
+        assert first_call["config"].cached_content is None
+        assert len(caches.created) == 1
+        call = manager.gemini_client.aio.models.generate_content.call_args[1]
+        assert call["contents"] == "# Task Title\nAdd caching"
+        assert call["config"].cached_content == "cachedContents/1"
+
+    @pytest.mark.asyncio
+    async def test_usage_reports_cache_storage(self):
+        """Test that the call creating the cached object reports the storage it bought."""
+        caches = FakeCaches()
+        manager = self.make_manager(caches)
+        generate = manager.gemini_client.aio.models.generate_content
+        generate.return_value.usage_metadata = SimpleNamespace(
+            prompt_token_count=5000,
+            candidates_token_count=10,
+            total_token_count=5010,
+            cached_content_token_count=4000,
+        )
+        usages = []
+
+        with patch.object(manager.token_counter, "can_fit_in_context", return_value=True):
+            for _ in range(2):
+                response = await manager.call_llm_with_usage(
+                    prompt=PREFIX + "task",
+                    model="gemini-2.5-pro",
+                    cacheable_prefix_length=len(PREFIX),
+                    cache_scope="repo:full",
+                )
+                usages.append(response["usage_metadata"])
+
+        assert usages[0].cache_storage_token_hours == 0.0
+        assert usages[1].cache_storage_token_hours == 4000 * DEFAULT_TTL_SECONDS / 3600
+
+    @pytest.mark.asyncio
+    async def test_tools_move_into_cached_object(self):
+        """Test that tools are stored with the cached content rather than sent per call."""
+        caches = FakeCaches()
+        manager = self.make_manager(caches)
+        tools = [{"google_search": {}}]
+
+        with patch.object(manager.token_counter, "can_fit_in_context", return_value=True):
+            for _ in range(2):
+                await manager.call_llm(
+                    prompt=PREFIX + "task",
+                    model="gemini-2.5-pro",
+                    tools=tools,
+                    cacheable_prefix_length=len(PREFIX),
+                    cache_scope="repo:full",
+                )
+
+        assert caches.created[0]["tools"] is not None
+        call = manager.gemini_client.aio.models.generate_content.call_args[1]
+        assert call["config"].tools is None
+
+    @pytest.mark.asyncio
+    async def test_disabled_sends_full_prompt(self):
+        """Test that without the cache enabled the full prompt is sent."""
+        caches = FakeCaches()
+        manager = self.make_manager(caches, enabled=False)
+        prompt = PREFIX + "task"
+
+        with patch.object(manager.token_counter, "can_fit_in_context", return_value=True):
+            await manager.call_llm(
+                prompt=prompt,
+                model="gemini-2.5-pro",
+                cacheable_prefix_length=len(PREFIX),
+                cache_scope="repo:full",
+            )
+
+        assert manager.gemini_cache is None
+        assert caches.created == []
+        call = manager.gemini_client.aio.models.generate_content.call_args[1]
+        assert call["contents"] == prompt
+        assert call["config"].cached_content is None
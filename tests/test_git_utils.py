@@ -11,9 +11,11 @@ from pydantic import FileUrl
 
 from yellhorn_mcp.utils.git_utils import (
     YellhornMCPError,
+    clear_git_metadata_cache,
     ensure_label_exists,
     get_default_branch,
     get_github_issue_body,
+    get_remote_url,
     is_git_repository,
     list_resources,
     read_resource,
@@ -196,6 +198,83 @@ class TestGetDefaultBranch:
             assert result == "main"
             assert mock_run.call_count == 2
 
+    @pytest.mark.asyncio
+    async def test_get_default_branch_strips_remote_prefix(self, mock_repo_path):
+        """Test that the origin/ prefix from symbolic-ref output is removed."""
+        with patch("yellhorn_mcp.utils.git_utils.run_git_command") as mock_run:
+            mock_run.return_value = "origin/develop"
+
+            result = await get_default_branch(mock_repo_path)
+
+            assert result == "develop"
+            mock_run.assert_called_once_with(
+                mock_repo_path, ["symbolic-ref", "--short", "refs/remotes/origin/HEAD"]
+            )
+
+    @pytest.mark.asyncio
+    async def test_get_default_branch_is_cached(self, mock_repo_path):
+        """Test that the default branch is resolved once per repository."""
+        with patch("yellhorn_mcp.utils.git_utils.run_git_command") as mock_run:
+            mock_run.return_value = "origin/main"
+
+            assert await get_default_branch(mock_repo_path) == "main"
+            assert await get_default_branch(mock_repo_path) == "main"
+            assert mock_run.call_count == 1
+
+            # An explicit refresh resolves the branch again
+            mock_run.return_value = "origin/trunk"
+            assert await get_default_branch(mock_repo_path, refresh=True) == "trunk"
+            assert mock_run.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_default_branch_guess_is_not_cached(self, mock_repo_path):
+        """Test that the "main" guess is not cached, so a later set-head is picked up."""
+        with patch("yellhorn_mcp.utils.git_utils.run_git_command") as mock_run:
+            mock_run.side_effect = YellhornMCPError("no such ref")
+            assert await get_default_branch(mock_repo_path) == "main"
+
+            mock_run.side_effect = None
+            mock_run.return_value = "origin/trunk"
+            assert await get_default_branch(mock_repo_path) == "trunk"
+
+    @pytest.mark.asyncio
+    async def test_get_default_branch_never_contacts_remote(self, mock_repo_path):
+        """Test that resolution does not run `git remote show`."""
+        with patch("yellhorn_mcp.utils.git_utils.run_git_command") as mock_run:
+            mock_run.side_effect = YellhornMCPError("no origin/HEAD")
+
+            await get_default_branch(mock_repo_path)
+
+            for call in mock_run.call_args_list:
+                assert call.args[1][:2] != ["remote", "show"]
+
+
+class TestGetRemoteUrl:
+    """Tests for get_remote_url function."""
+
+    @pytest.mark.asyncio
+    async def test_get_remote_url_is_cached(self, mock_repo_path):
+        """Test that the remote URL is looked up once per repository."""
+        with patch("yellhorn_mcp.utils.git_utils.run_git_command") as mock_run:
+            mock_run.return_value = "git@github.com:owner/repo.git"
+
+            assert await get_remote_url(mock_repo_path) == "git@github.com:owner/repo.git"
+            assert await get_remote_url(mock_repo_path) == "git@github.com:owner/repo.git"
+
+            mock_run.assert_called_once_with(mock_repo_path, ["remote", "get-url", "origin"])
+
+    @pytest.mark.asyncio
+    async def test_clear_git_metadata_cache(self, mock_repo_path):
+        """Test that clearing the cache forces a new lookup."""
+        with patch("yellhorn_mcp.utils.git_utils.run_git_command") as mock_run:
+            mock_run.return_value = "https://github.com/owner/repo.git"
+
+            await get_remote_url(mock_repo_path)
+            clear_git_metadata_cache(mock_repo_path)
+            await get_remote_url(mock_repo_path)
+
+            assert mock_run.call_count == 2
+
 
 class TestIsGitRepository:
     """Tests for is_git_repository function."""
@@ -0,0 +1,63 @@
+"""Tests for the import-time benchmark – benchmarks/import_time.py."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from yellhorn_mcp.benchmarks.import_time import (
+    check_budget,
+    main,
+    measure_import,
+    parse_importtime,
+)
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2000 |       2000 |     openai.types
+import time:      3000 |       5000 |   openai
+import time:       500 |       5620 | yellhorn_mcp.cli
+"""
+
+
+class TestImportTime:
+    """Test suite for the import-time benchmark."""
+
+    def test_parse_importtime(self):
+        """Test that the header is skipped and rows keep their order."""
+        rows = parse_importtime("some warning\n" + IMPORTTIME_OUTPUT)
+        assert rows[0] == ("_io", 120, 120)
+        assert rows[-1] == ("yellhorn_mcp.cli", 500, 5620)
+        assert len(rows) == 4
+
+    def test_check_budget(self):
+        """Test that slow imports and eagerly loaded SDKs are both reported."""
+        result = {"module": "m", "median_ms": 900.0, "lazy_modules_loaded": []}
+        assert check_budget(result, 1000) == []
+
+        result = {"module": "m", "median_ms": 1200.0, "lazy_modules_loaded": ["openai"]}
+        problems = check_budget(result, 1000)
+        assert problems == [
+            "m imports in 1200 ms (budget 1000 ms)",
+            "m imports lazily loaded modules: openai",
+        ]
+
+    def test_cli_startup_does_not_load_provider_sdks(self):
+        """Test that importing the CLI leaves SDKs, tokenizer and jedi for first use."""
+        result = measure_import("yellhorn_mcp.cli", runs=1)
+        assert result["lazy_modules_loaded"] == []
+        assert result["median_ms"] > 0
+
+    def test_main_fails_over_budget(self, tmp_path, capsys):
+        """Test the JSON output and non-zero exit when the budget is exceeded."""
+        with patch("yellhorn_mcp.benchmarks.import_time._import_once") as import_once:
+            import_once.return_value = parse_importtime(IMPORTTIME_OUTPUT)
+            with pytest.raises(SystemExit) as exc_info:
+                main(["--runs", "1", "--budget-ms", "1", "--output", str(tmp_path / "r.json")])
+
+        assert exc_info.value.code == 1
+        results = json.loads((tmp_path / "r.json").read_text())
+        assert results["modules"][0]["median_ms"] == pytest.approx(5.62)
+        assert results["modules"][0]["lazy_modules_loaded"] == ["openai", "openai.types"]
+        assert "Budget exceeded" in capsys.readouterr().err
@@ -0,0 +1,91 @@
+"""Tests for judgement_cache.py module."""
+
+from yellhorn_mcp.utils.cache_utils import get_cache_dir
+from yellhorn_mcp.utils.diff_utils import split_diff_by_file
+from yellhorn_mcp.utils.judgement_cache import (
+    JudgementFragmentStore,
+    fragment_key,
+    hash_workplan,
+)
+
+
+def make_diff(path: str, base: str, head: str) -> str:
+    """Build a single-file diff with the given blob IDs."""
+    return (
+        f"diff --git a/{path} b/{path}\nindex {base}..{head} 100644\n"
+        f"--- a/{path}\n+++ b/{path}\n@@ -1 +1 @@\n-old\n+new\n"
+    )
+
+
+class TestFragmentKey:
+    """Test suite for fragment_key."""
+
+    def test_key_uses_blob_ids(self):
+        """The key is (workplan hash, path, base blob, head blob)."""
+        file_diff = split_diff_by_file(make_diff("a.py", "1111111", "2222222"))[0]
+        workplan_hash = hash_workplan("plan")
+
+        assert fragment_key(workplan_hash, file_diff) == (
+            workplan_hash,
+            "a.py",
+            "1111111",
+            "2222222",
+        )
+
+    def test_no_index_line(self):
+        """Diffs without an index line (pure renames) are never cached."""
+        diff = "diff --git a/a.py b/b.py\nsimilarity index 100%\nrename from a.py\nrename to b.py\n"
+        file_diff = split_diff_by_file(diff)[0]
+
+        assert fragment_key(hash_workplan("plan"), file_diff) is None
+
+
+class TestJudgementFragmentStore:
+    """Test suite for JudgementFragmentStore."""
+
+    def test_round_trip(self, tmp_path):
+        """Stored fragments are returned for the same key only."""
+        store = JudgementFragmentStore(tmp_path / "judgements")
+        key = ("hash", "a.py", "111", "222")
+
+        assert store.get(key) is None
+        store.put(key, "- **Issues**: none")
+
+        assert store.get(key) == "- **Issues**: none"
+        assert store.get(("hash", "a.py", "111", "333")) is None
+        # A fresh store on the same directory sees persisted fragments
+        assert JudgementFragmentStore(tmp_path / "judgements").get(key) == "- **Issues**: none"
+
+    def test_directory_created_lazily(self, tmp_path):
+        """The cache directory is only created on first write."""
+        store = JudgementFragmentStore(tmp_path / "judgements")
+        assert not store.cache_dir.exists()
+        store.put(("h", "p", "b", "h2"), "x")
+        assert store.cache_dir.is_dir()
+
+    def test_corrupt_file_ignored(self, tmp_path):
+        """Unreadable fragment files are treated as cache misses."""
+        store = JudgementFragmentStore(tmp_path)
+        key = ("hash", "a.py", "111", "222")
+        store.put(key, "fragment")
+        store._path_for(key).write_text("{not json")
+
+        assert store.get(key) is None
+
+
+class TestGetCacheDir:
+    """Test suite for get_cache_dir."""
+
+    def test_inside_git_dir(self, tmp_path):
+        """Caches live under .git/yellhorn when .git is a directory."""
+        (tmp_path / ".git").mkdir()
+        assert (
+            get_cache_dir(tmp_path, "judgements") == tmp_path / ".git" / "yellhorn" / "judgements"
+        )
+
+    def test_env_override(self, tmp_path, monkeypatch):
+        """YELLHORN_MCP_CACHE_DIR takes precedence."""
+        monkeypatch.setenv("YELLHORN_MCP_CACHE_DIR", str(tmp_path / "cache"))
+        cache_dir = get_cache_dir(tmp_path / "repo", "judgements", create=False)
+        assert cache_dir.parent.parent == tmp_path / "cache"
+        assert not cache_dir.exists()
@@ -1,6 +1,7 @@
 """Unit tests for judgement_processor module."""
 
 import re
+from datetime import datetime, timezone
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -712,3 +713,367 @@ Follow the patterns from https://github.com/example/auth-library
 
             # Note: GitHub integration complex to test due to dependencies
             # Core URL extraction and processing logic verified by LLM call
+
+
+class TestBatchedJudgement:
+    """Test suite for per-file parallel judgement of large diffs."""
+
+    @staticmethod
+    def _make_diff(paths):
+        return "".join(
+            f"diff --git a/{p} b/{p}\n--- a/{p}\n+++ b/{p}\n@@ -1 +1 @@\n+{'x' * 60}\n"
+            for p in paths
+        )
+
+    @staticmethod
+    def _make_llm_manager():
+        mock_llm_manager = MagicMock(spec=LLMManager)
+        mock_llm_manager._is_openai_model.return_value = True
+        mock_llm_manager.token_counter = MagicMock()
+        mock_llm_manager.token_counter.count_tokens.side_effect = lambda text, model: len(text)
+        return mock_llm_manager
+
+    async def _run(self, tmp_path, mock_llm_manager, diff_content):
+        with (
+            patch("yellhorn_mcp.processors.judgement_processor.JUDGEMENT_BATCH_MAX_TOKENS", 200),
+            patch("yellhorn_mcp.processors.judgement_processor.update_github_issue"),
+            patch(
+                "yellhorn_mcp.processors.judgement_processor.get_remote_url",
+                new_callable=AsyncMock,
+                return_value="https://github.com/owner/repo",
+            ),
+            patch("yellhorn_mcp.processors.judgement_processor.add_issue_comment"),
+        ):
+            await process_judgement_async(
+                repo_path=tmp_path,
+                llm_manager=mock_llm_manager,
+                model="gpt-4o",
+                workplan_content="# Workplan\n\nUpdate all modules.",
+                diff_content=diff_content,
+                base_ref="main",
+                head_ref="feature",
+                base_commit_hash="abc123",
+                head_commit_hash="def456",
+                parent_workplan_issue_number="123",
+                subissue_to_update="124",
+                codebase_reasoning="none",
+                _meta={"start_time": datetime.now(timezone.utc)},
+                ctx=None,
+            )
+
+    @pytest.mark.asyncio
+    async def test_batches_judged_then_synthesized(self, tmp_path):
+        """Each batch gets its own call and the synthesis prompt carries the findings."""
+        paths = [f"mod{i}.py" for i in range(4)]
+        mock_llm_manager = self._make_llm_manager()
+
+        async def fake_call(prompt, model, **kwargs):
+            usage = UsageMetadata({"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15})
+            if "# Code Diff (batch" in prompt:
+                reviewed = [p for p in paths if f"+++ b/{p}" in prompt]
+                sections = "\n\n".join(f"### `{p}`\n- **Issues**: none in {p}" for p in reviewed)
+                return {"content": sections, "usage_metadata": usage}
+            return {"content": "## Judgement Summary\nAPPROVED", "usage_metadata": usage}
+
+        mock_llm_manager.call_llm_with_usage.side_effect = fake_call
+
+        with patch(
+            "yellhorn_mcp.processors.judgement_processor.format_completion_comment",
+            return_value="done",
+        ) as mock_format:
+            await self._run(tmp_path, mock_llm_manager, self._make_diff(paths))
+
+        prompts = [c.kwargs["prompt"] for c in mock_llm_manager.call_llm_with_usage.call_args_list]
+        batch_prompts = [p for p in prompts if "# Code Diff (batch" in p]
+        synthesis_prompts = [p for p in prompts if "# Per-File Review Findings" in p]
+        assert len(batch_prompts) > 1
+        assert len(synthesis_prompts) == 1
+
+        # Every file is reviewed in exactly one batch and never cut mid-file
+        for path in paths:
+            assert sum(f"+++ b/{path}" in p for p in batch_prompts) == 1
+            assert f"### `{path}`\n- **Issues**: none in {path}" in synthesis_prompts[0]
+        assert "diff --git" not in synthesis_prompts[0]
+
+        # Usage from batches is added to the synthesis usage
+        completion_metadata = mock_format.call_args[0][0]
+        assert completion_metadata.input_tokens == 10 * len(prompts)
+        assert completion_metadata.output_tokens == 5 * len(prompts)
+
+    @pytest.mark.asyncio
+    async def test_small_diff_uses_single_prompt(self, tmp_path):
+        """Diffs under the batch budget keep the single-prompt path."""
+        mock_llm_manager = self._make_llm_manager()
+        mock_llm_manager.call_llm_with_usage.return_value = {
+            "content": "## Judgement Summary\nAPPROVED",
+            "usage_metadata": UsageMetadata(),
+        }
+        diff_content = self._make_diff(["one.py"])
+
+        await self._run(tmp_path, mock_llm_manager, diff_content)
+
+        mock_llm_manager.call_llm_with_usage.assert_called_once()
+        prompt = mock_llm_manager.call_llm_with_usage.call_args.kwargs["prompt"]
+        assert f"# Code Diff\n{diff_content}" in prompt
+
+    @pytest.mark.asyncio
+    async def test_single_prompt_keeps_unknown_usage(self, tmp_path):
+        """Without batch judgements, token counts the provider did not report stay unknown."""
+        mock_llm_manager = self._make_llm_manager()
+        usage = UsageMetadata()
+        usage.prompt_tokens = usage.completion_tokens = usage.total_tokens = None
+        mock_llm_manager.call_llm_with_usage.return_value = {
+            "content": "## Judgement Summary\nAPPROVED",
+            "usage_metadata": usage,
+        }
+
+        with patch(
+            "yellhorn_mcp.processors.judgement_processor.format_completion_comment",
+            return_value="done",
+        ) as mock_format:
+            await self._run(tmp_path, mock_llm_manager, self._make_diff(["one.py"]))
+
+        completion_metadata = mock_format.call_args[0][0]
+        assert completion_metadata.input_tokens is None
+        assert completion_metadata.total_tokens is None
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_reported_to_synthesis(self, tmp_path):
+        """A failing batch is marked unreviewed instead of aborting the judgement."""
+        paths = [f"mod{i}.py" for i in range(4)]
+        mock_llm_manager = self._make_llm_manager()
+        calls = {"batches": 0}
+
+        async def fake_call(prompt, model, **kwargs):
+            if "# Code Diff (batch 1 of" in prompt:
+                raise RuntimeError("rate limited")
+            if "# Code Diff (batch" in prompt:
+                calls["batches"] += 1
+                return {"content": "### `mod3.py`\nNone", "usage_metadata": UsageMetadata()}
+            return {
+                "content": "## Judgement Summary\nNEEDS_WORK",
+                "usage_metadata": UsageMetadata(),
+            }
+
+        mock_llm_manager.call_llm_with_usage.side_effect = fake_call
+
+        await self._run(tmp_path, mock_llm_manager, self._make_diff(paths))
+
+        synthesis_prompt = mock_llm_manager.call_llm_with_usage.call_args.kwargs["prompt"]
+        assert "Review of this file failed (RuntimeError)" in synthesis_prompt
+        assert calls["batches"] >= 1
+
+
+class TestIncrementalJudgement:
+    """Test suite for re-judgement with cached per-file fragments."""
+
+    @staticmethod
+    def _make_diff(blobs):
+        return "".join(
+            f"diff --git a/{p} b/{p}\nindex {base}..{head} 100644\n--- a/{p}\n+++ b/{p}\n"
+            f"@@ -1 +1 @@\n-old\n+new\n"
+            for p, (base, head) in blobs.items()
+        )
+
+    @pytest.mark.asyncio
+    async def test_only_changed_files_are_rejudged(self, tmp_path):
+        """Judging a small diff again sends only the file whose head blob changed."""
+        from yellhorn_mcp.utils.judgement_cache import JudgementFragmentStore
+
+        store = JudgementFragmentStore(tmp_path / "cache")
+        mock_llm_manager = MagicMock(spec=LLMManager)
+        mock_llm_manager._is_openai_model.return_value = True
+        mock_llm_manager.token_counter = MagicMock()
+        mock_llm_manager.token_counter.count_tokens.side_effect = lambda text, model: len(text)
+        batch_prompts = []
+
+        async def fake_call(prompt, model, **kwargs):
+            if "# Code Diff (batch" in prompt:
+                batch_prompts.append(prompt)
+                reviewed = re.findall(r"\+\+\+ b/(\S+)", prompt)
+                content = "\n\n".join(
+                    f"### `{p}`\nfindings for {p} v{len(batch_prompts)}" for p in reviewed
+                )
+                return {"content": content, "usage_metadata": UsageMetadata()}
+            return {"content": "## Judgement Summary\nAPPROVED", "usage_metadata": UsageMetadata()}
+
+        mock_llm_manager.call_llm_with_usage.side_effect = fake_call
+
+        async def judge(diff_content):
+            with (
+                patch("yellhorn_mcp.processors.judgement_processor.update_github_issue"),
+                patch(
+                    "yellhorn_mcp.processors.judgement_processor.get_remote_url",
+                    new_callable=AsyncMock,
+                    return_value="https://github.com/owner/repo",
+                ),
+                patch("yellhorn_mcp.processors.judgement_processor.add_issue_comment"),
+            ):
+                await process_judgement_async(
+                    repo_path=tmp_path,
+                    llm_manager=mock_llm_manager,
+                    model="gpt-4o",
+                    workplan_content="# Workplan",
+                    diff_content=diff_content,
+                    base_ref="main",
+                    head_ref="feature",
+                    base_commit_hash="abc123",
+                    head_commit_hash="def456",
+                    parent_workplan_issue_number="123",
+                    subissue_to_update="124",
+                    codebase_reasoning="none",
+                    fragment_store=store,
+                )
+            return mock_llm_manager.call_llm_with_usage.call_args.kwargs["prompt"]
+
+        first_diff = self._make_diff({"a.py": ("aaa1", "aaa2"), "b.py": ("bbb1", "bbb2")})
+        second_diff = self._make_diff({"a.py": ("aaa1", "aaa2"), "b.py": ("bbb1", "bbb3")})
+
+        # A small first judgement still fits in one batch, but leaves per-file findings
+        synthesis = await judge(first_diff)
+        assert len(batch_prompts) == 1
+        assert "+++ b/a.py" in batch_prompts[0]
+        assert "+++ b/b.py" in batch_prompts[0]
+        assert "findings for a.py v1" in synthesis
+        assert "Findings for" not in synthesis
+
+        # Only the file whose head blob changed is sent again
+        synthesis = await judge(second_diff)
+
+        assert len(batch_prompts) == 2
+        assert "+++ b/b.py" in batch_prompts[1]
+        assert "+++ b/a.py" not in batch_prompts[1]
+        assert "findings for a.py v1" in synthesis
+        assert "findings for b.py v2" in synthesis
+        assert "Findings for 1 of 2 files are unchanged" in synthesis
+
+        # Nothing changed: no batch calls at all, only the synthesis
+        await judge(second_diff)
+        assert len(batch_prompts) == 2
+
+    @pytest.mark.asyncio
+    async def test_partially_failed_file_is_not_stored(self, tmp_path):
+        """A file whose later piece fails is marked unreviewed and never cached."""
+        from yellhorn_mcp.processors.judgement_processor import judge_file_diffs
+        from yellhorn_mcp.utils.diff_utils import split_diff_by_file
+        from yellhorn_mcp.utils.judgement_cache import (
+            JudgementFragmentStore,
+            fragment_key,
+            hash_workplan,
+        )
+
+        store = JudgementFragmentStore(tmp_path / "cache")
+        mock_llm_manager = MagicMock(spec=LLMManager)
+        mock_llm_manager.token_counter = MagicMock()
+        mock_llm_manager.token_counter.count_tokens.side_effect = lambda text, model: len(text)
+        file_diffs = split_diff_by_file(
+            "diff --git a/big.py b/big.py\nindex aaa1..aaa2 100644\n--- a/big.py\n+++ b/big.py\n"
+            f"@@ -1 +1 @@\n+first {'x' * 60}\n@@ -50 +50 @@\n+second {'y' * 60}\n"
+        )
+
+        async def fake_call(prompt, model, **kwargs):
+            if "+second" in prompt:
+                raise RuntimeError("rate limited")
+            return {
+                "content": "### `big.py`\nfirst hunk is fine",
+                "usage_metadata": UsageMetadata(),
+            }
+
+        mock_llm_manager.call_llm_with_usage.side_effect = fake_call
+
+        with patch("yellhorn_mcp.processors.judgement_processor.JUDGEMENT_BATCH_MAX_TOKENS", 120):
+            fragments, _, _, _ = await judge_file_diffs(
+                mock_llm_manager, "gpt-4o", "# Workplan", file_diffs, fragment_store=store
+            )
+
+        assert mock_llm_manager.call_llm_with_usage.call_count == 2
+        assert "first hunk is fine" in fragments["big.py"]
+        assert "Review of part of this file failed (RuntimeError)" in fragments["big.py"]
+        assert store.get(fragment_key(hash_workplan("# Workplan"), file_diffs[0])) is None
+
+
+class TestDiffScopedJudgement:
+    """Test codebase context scoping for judgements."""
+
+    @pytest.mark.asyncio
+    async def test_context_limited_to_changed_files_and_neighbors(self, tmp_path):
+        """Only the changed file and its importers are inlined in the prompt."""
+        import subprocess
+
+        repo_path = tmp_path / "repo"
+        (repo_path / "pkg").mkdir(parents=True)
+        (repo_path / "pkg" / "__init__.py").write_text("")
+        (repo_path / "pkg" / "models.py").write_text("MODELS = 'models body'\n")
+        (repo_path / "pkg" / "views.py").write_text(
+            "from pkg import models\nVIEWS = 'views body'\n"
+        )
+        (repo_path / "pkg" / "other.py").write_text("OTHER = 'other body'\n")
+        subprocess.run(["git", "init", "-q"], cwd=repo_path, check=True)
+
+        mock_llm_manager = MagicMock(spec=LLMManager)
+        mock_llm_manager._is_openai_model.return_value = True
+        mock_llm_manager.token_counter = MagicMock()
+        mock_llm_manager.token_counter.count_tokens.side_effect = lambda text, model: len(text)
+        mock_llm_manager.call_llm_with_usage.return_value = {
+            "content": "## Judgement Summary\nAPPROVED",
+            "usage_metadata": UsageMetadata(),
+        }
+        diff_content = (
+            "diff --git a/pkg/models.py b/pkg/models.py\n--- a/pkg/models.py\n"
+            "+++ b/pkg/models.py\n@@ -1 +1 @@\n-old\n+MODELS = 'models body'\n"
+        )
+
+        fake_counter = MagicMock()
+        fake_counter.get_model_limit.return_value = 100_000
+        fake_counter.count_tokens.side_effect = lambda text, model: len(text)
+
+        async def judge(context_scope, codebase_reasoning="full", workplan="# Workplan"):
+            with (
+                patch(
+                    "yellhorn_mcp.processors.judgement_processor.get_token_counter",
+                    return_value=fake_counter,
+                ),
+                patch(
+                    "yellhorn_mcp.formatters.context_fetcher.get_token_counter",
+                    return_value=fake_counter,
+                ),
+                patch("yellhorn_mcp.processors.judgement_processor.update_github_issue"),
+                patch(
+                    "yellhorn_mcp.processors.judgement_processor.get_remote_url",
+                    new_callable=AsyncMock,
+                    return_value="https://github.com/owner/repo",
+                ),
+                patch("yellhorn_mcp.processors.judgement_processor.add_issue_comment"),
+            ):
+                await process_judgement_async(
+                    repo_path=repo_path,
+                    llm_manager=mock_llm_manager,
+                    model="gpt-4o",
+                    workplan_content=workplan,
+                    diff_content=diff_content,
+                    base_ref="main",
+                    head_ref="feature",
+                    base_commit_hash="abc123",
+                    head_commit_hash="def456",
+                    parent_workplan_issue_number="123",
+                    subissue_to_update="124",
+                    codebase_reasoning=codebase_reasoning,
+                    context_scope=context_scope,
+                )
+            return mock_llm_manager.call_llm_with_usage.call_args.kwargs["prompt"]
+
+        prompt = await judge("diff")
+        assert "VIEWS = 'views body'" in prompt
+        assert "OTHER = 'other body'" not in prompt
+        assert "other.py" in prompt
+
+        prompt = await judge("repository")
+        assert "OTHER = 'other body'" in prompt
+
+        # "relevant" inlines the diff neighborhood, or the files matching the workplan
+        prompt = await judge("diff", "relevant")
+        assert "VIEWS = 'views body'" in prompt
+        assert "OTHER = 'other body'" not in prompt
+
+        prompt = await judge("repository", "relevant", "# Workplan\n\nRename OTHER in other.py")
+        assert "OTHER = 'other body'" in prompt
@@ -16,6 +16,7 @@ from yellhorn_mcp.llm_manager import (
     log_retry_attempt,
 )
 from yellhorn_mcp.token_counter import TokenCounter
+from yellhorn_mcp.utils.timing_utils import PhaseTimer, phase
 
 
 class MockGeminiUsage:
@@ -847,6 +848,59 @@ class TestUsageMetadata:
         assert usage.completion_tokens == 75
         assert usage.total_tokens == 225
 
+    def test_cached_tokens_from_responses_api(self):
+        """Test that cached prompt tokens are read from Responses API usage."""
+
+        class MockDetails:
+            cached_tokens = 1024
+
+        class MockResponseUsage:
+            input_tokens = 2000
+            output_tokens = 100
+            total_tokens = 2100
+            input_tokens_details = MockDetails()
+
+        usage = UsageMetadata(MockResponseUsage())
+        assert usage.cached_tokens == 1024
+        assert usage.to_dict()["cached_tokens"] == 1024
+
+    def test_cached_tokens_from_openai_format(self):
+        """Test that cached prompt tokens are read from Chat Completions usage."""
+
+        class MockDetails:
+            cached_tokens = 512
+
+        class MockOpenAIUsage:
+            prompt_tokens = 1000
+            completion_tokens = 100
+            total_tokens = 1100
+            prompt_tokens_details = MockDetails()
+
+        assert UsageMetadata(MockOpenAIUsage()).cached_tokens == 512
+
+    def test_cached_tokens_from_gemini_format(self):
+        """Test that cached content tokens are read from Gemini usage."""
+
+        class MockGeminiUsage:
+            prompt_token_count = 1000
+            candidates_token_count = 100
+            total_token_count = 1100
+            cached_content_token_count = 800
+
+        assert UsageMetadata(MockGeminiUsage()).cached_tokens == 800
+
+    def test_cached_tokens_missing(self):
+        """Test that missing or non-integer cached counts are treated as 0."""
+
+        class MockGeminiUsage:
+            prompt_token_count = 1000
+            candidates_token_count = 100
+            total_token_count = 1100
+            cached_content_token_count = None
+
+        assert UsageMetadata(MockGeminiUsage()).cached_tokens == 0
+        assert UsageMetadata(MagicMock()).cached_tokens == 0
+
     def test_gemini_properties(self):
         """Test Gemini-style properties."""
         usage = UsageMetadata({"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150})
@@ -1062,6 +1116,26 @@ class TestRetryFunctions:
         assert "attempt 3" in call_args
         assert "Test error" in call_args
 
+    @patch("yellhorn_mcp.llm_manager.logger")
+    def test_log_retry_attempt_records_wait_phase(self, mock_logger):
+        """Test that the upcoming back-off is recorded as a phase of the running job."""
+        retry_state = MagicMock()
+        retry_state.attempt_number = 1
+        retry_state.outcome_timestamp = 1.0
+        retry_state.start_time = 0.0
+        retry_state.fn.__name__ = "_call_openai"
+        retry_state.outcome.exception.return_value = RuntimeError("rate limited")
+        retry_state.next_action.sleep = 4.0
+
+        timer = PhaseTimer().start()
+        try:
+            with phase("llm_call"):
+                log_retry_attempt(retry_state)
+        finally:
+            timer.finish("test")
+
+        assert timer.phases["llm_call/retry_wait"] == 4.0
+
     def test_log_retry_attempt_no_outcome(self):
         """Test log_retry_attempt with no outcome."""
         retry_state = MagicMock(spec=RetryCallState)
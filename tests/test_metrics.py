@@ -0,0 +1,192 @@
+"""Tests for the Prometheus metrics registry and endpoint – metrics.py."""
+
+import aiohttp
+import openai
+import pytest
+
+from yellhorn_mcp.benchmarks.mock_llm_server import MockLLMConfig, MockLLMServer
+from yellhorn_mcp.llm_manager import LLMManager, UsageMetadata
+from yellhorn_mcp.metrics import (
+    CONTENT_TYPE,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    job_finished,
+    job_started,
+    observe_snapshot,
+    observe_subprocess,
+    record_llm_usage,
+    start_metrics_server,
+)
+from yellhorn_mcp.utils.cost_tracker_utils import calculate_cost
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    REGISTRY.clear()
+    yield
+    REGISTRY.clear()
+
+
+def sample(text: str, series: str) -> float | None:
+    """Return the value of the sample line starting with ``series``."""
+    for line in text.splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+class TestMetricsRegistry:
+    """Test suite for the metric types and text rendering."""
+
+    def test_counter_and_gauge_rendering(self):
+        """Test HELP/TYPE headers and labelled samples."""
+        registry = MetricsRegistry()
+        calls = registry.register(Counter("calls_total", "Calls.", ("model",)))
+        jobs = registry.register(Gauge("jobs", "Jobs."))
+        calls.labels("gpt-4o").inc()
+        calls.labels("gpt-4o").inc(2)
+        jobs.inc()
+        jobs.inc()
+        jobs.dec()
+
+        text = registry.render()
+        assert "# HELP calls_total Calls.\n# TYPE calls_total counter\n" in text
+        assert 'calls_total{model="gpt-4o"} 3\n' in text
+        assert "# TYPE jobs gauge\njobs 1\n" in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket, sum and count samples of a histogram."""
+        registry = MetricsRegistry()
+        latency = registry.register(Histogram("latency", "Latency.", ("model",), (1, 5)))
+        for value in (0.5, 2.0, 10.0):
+            latency.labels("m").observe(value)
+
+        text = registry.render()
+        assert sample(text, 'latency_bucket{model="m",le="1"}') == 1
+        assert sample(text, 'latency_bucket{model="m",le="5"}') == 2
+        assert sample(text, 'latency_bucket{model="m",le="+Inf"}') == 3
+        assert sample(text, 'latency_sum{model="m"}') == 12.5
+        assert sample(text, 'latency_count{model="m"}') == 3
+
+    def test_label_values_are_escaped(self):
+        """Test that quotes, backslashes and newlines in label values are escaped."""
+        registry = MetricsRegistry()
+        counter = registry.register(Counter("c", "C.", ("name",)))
+        counter.labels('a"b\\c\nd').inc()
+
+        assert 'c{name="a\\"b\\\\c\\nd"} 1' in registry.render()
+
+    def test_invalid_use_is_rejected(self):
+        """Test label arity, counter decrements and duplicate registration."""
+        registry = MetricsRegistry()
+        counter = registry.register(Counter("c", "C.", ("model",)))
+        with pytest.raises(ValueError):
+            counter.labels("a", "b")
+        with pytest.raises(ValueError):
+            counter.labels("a").dec()
+        with pytest.raises(ValueError):
+            registry.register(Counter("c", "Again."))
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint(self):
+        """Test that GET /metrics serves the rendered registry."""
+        registry = MetricsRegistry()
+        registry.register(Counter("scrapes_total", "Scrapes.")).inc()
+        runner = await start_metrics_server("127.0.0.1", 0, registry)
+        try:
+            host, port = runner.addresses[0][:2]
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"http://{host}:{port}/metrics") as response:
+                    assert response.status == 200
+                    assert response.headers["Content-Type"] == CONTENT_TYPE
+                    assert "scrapes_total 1" in await response.text()
+        finally:
+            await runner.cleanup()
+
+
+class TestInstrumentation:
+    """Test suite for the helpers wired into the server."""
+
+    def test_record_llm_usage(self):
+        """Test that tokens and cost are counted per model."""
+        usage = UsageMetadata(
+            {"prompt_tokens": 1000, "completion_tokens": 200, "cached_tokens": 400}
+        )
+        record_llm_usage("gpt-4o", usage)
+
+        text = REGISTRY.render()
+        assert sample(text, 'yellhorn_llm_tokens_total{model="gpt-4o",type="input"}') == 1000
+        assert sample(text, 'yellhorn_llm_tokens_total{model="gpt-4o",type="output"}') == 200
+        assert sample(text, 'yellhorn_llm_tokens_total{model="gpt-4o",type="cached_input"}') == 400
+        assert sample(text, 'yellhorn_llm_cost_usd_total{model="gpt-4o"}') == pytest.approx(
+            calculate_cost("gpt-4o", 1000, 200, 400)
+        )
+
+    @pytest.mark.asyncio
+    async def test_observe_subprocess(self):
+        """Test that commands are counted by outcome."""
+
+        @observe_subprocess("git")
+        async def run(fail: bool) -> str:
+            if fail:
+                raise RuntimeError("boom")
+            return "ok"
+
+        assert await run(False) == "ok"
+        with pytest.raises(RuntimeError):
+            await run(True)
+
+        text = REGISTRY.render()
+        assert sample(text, 'yellhorn_subprocesses_total{command="git",outcome="success"}') == 1
+        assert sample(text, 'yellhorn_subprocesses_total{command="git",outcome="error"}') == 1
+        assert sample(text, 'yellhorn_subprocess_duration_seconds_count{command="git"}') == 2
+
+    @pytest.mark.asyncio
+    async def test_observe_snapshot(self):
+        """Test that snapshot file counts and durations are observed."""
+
+        @observe_snapshot
+        async def snapshot() -> tuple[list[str], dict[str, str]]:
+            return ["a.py", "b.py", "c.py"], {}
+
+        assert await snapshot() == (["a.py", "b.py", "c.py"], {})
+
+        text = REGISTRY.render()
+        assert sample(text, "yellhorn_snapshot_files_sum") == 3
+        assert sample(text, "yellhorn_snapshot_duration_seconds_count") == 1
+
+    def test_jobs_in_flight(self):
+        """Test the in-flight gauge and started counter of background jobs."""
+        job_started("workplan")
+        job_started("workplan")
+        job_finished("workplan")
+
+        text = REGISTRY.render()
+        assert sample(text, 'yellhorn_background_jobs_in_flight{kind="workplan"}') == 1
+        assert sample(text, 'yellhorn_background_jobs_total{kind="workplan"}') == 2
+
+    @pytest.mark.asyncio
+    async def test_llm_manager_calls_are_recorded(self):
+        """Test latency, outcome and token metrics of a real call through the LLM manager."""
+        server = MockLLMServer(MockLLMConfig(tokens_per_second=0, output_tokens=20))
+        url = await server.start()
+        try:
+            client = openai.AsyncOpenAI(base_url=f"{url}/v1", api_key="mock", max_retries=0)
+            manager = LLMManager(openai_client=client)
+            await manager._call_openai(
+                prompt="Describe the repository.",
+                model="gpt-4o",
+                temperature=0.0,
+                system_message=None,
+                response_format=None,
+            )
+        finally:
+            await server.stop()
+
+        text = REGISTRY.render()
+        assert sample(text, 'yellhorn_llm_calls_total{model="gpt-4o",outcome="success"}') == 1
+        assert sample(text, 'yellhorn_llm_call_duration_seconds_count{model="gpt-4o"}') == 1
+        assert sample(text, 'yellhorn_llm_tokens_total{model="gpt-4o",type="output"}') == 20
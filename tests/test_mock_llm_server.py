@@ -0,0 +1,175 @@
+"""Tests for the mock LLM provider – benchmarks/mock_llm_server.py, driven by the real SDKs."""
+
+import asyncio
+import random
+import time
+
+import openai
+import pytest
+from google import genai
+from google.genai import errors as genai_errors
+from google.genai import types
+
+from yellhorn_mcp.benchmarks.mock_llm_server import (
+    LatencyDistribution,
+    MockLLMConfig,
+    MockLLMServer,
+)
+
+
+async def start_server(**config) -> tuple[MockLLMServer, str]:
+    config.setdefault("tokens_per_second", 0)
+    config.setdefault("output_tokens", 20)
+    server = MockLLMServer(MockLLMConfig(**config))
+    return server, await server.start()
+
+
+def openai_client(url: str) -> openai.AsyncOpenAI:
+    return openai.AsyncOpenAI(base_url=f"{url}/v1", api_key="mock", max_retries=0)
+
+
+def gemini_client(url: str) -> genai.Client:
+    return genai.Client(api_key="mock", http_options=types.HttpOptions(base_url=url))
+
+
+class TestLatencyDistribution:
+    """Test suite for LatencyDistribution."""
+
+    def test_parse(self):
+        """Test that specifications are parsed into kind and parameters."""
+        latency = LatencyDistribution.parse("lognormal:0.8,0.5")
+        assert (latency.kind, latency.a, latency.b) == ("lognormal", 0.8, 0.5)
+        assert LatencyDistribution.parse("fixed:0.2").sample(random.Random(0)) == 0.2
+
+    def test_parse_rejects_unknown_kind(self):
+        """Test that an unknown distribution is rejected."""
+        with pytest.raises(ValueError):
+            LatencyDistribution.parse("pareto:1")
+
+    def test_samples_are_not_negative(self):
+        """Test that a wide normal distribution never yields negative delays."""
+        rng = random.Random(0)
+        latency = LatencyDistribution("normal", 0.0, 1.0)
+        assert min(latency.sample(rng) for _ in range(200)) == 0.0
+
+
+class TestMockLLMServer:
+    """Test suite for MockLLMServer."""
+
+    @pytest.mark.asyncio
+    async def test_openai_responses(self):
+        """Test that the OpenAI SDK parses a Responses API reply with usage."""
+        server, url = await start_server()
+        try:
+            response = await openai_client(url).responses.create(model="o3", input="x" * 400)
+        finally:
+            await server.stop()
+
+        assert "Mock response from o3" in response.output_text
+        assert response.usage.input_tokens == 100
+        assert response.usage.output_tokens == 20
+
+    @pytest.mark.asyncio
+    async def test_openai_streaming(self):
+        """Test that the OpenAI SDK consumes the streamed Responses API events."""
+        server, url = await start_server()
+        try:
+            stream = await openai_client(url).responses.create(
+                model="o3", input="hello", stream=True
+            )
+            events = [event async for event in stream]
+        finally:
+            await server.stop()
+
+        deltas = [event.delta for event in events if event.type == "response.output_text.delta"]
+        assert events[0].type == "response.created"
+        assert events[-1].type == "response.completed"
+        assert len(deltas) == 20
+        assert "".join(deltas) == events[-1].response.output_text
+
+    @pytest.mark.asyncio
+    async def test_gemini_generate_and_stream(self):
+        """Test that the Gemini SDK parses plain and streamed generateContent replies."""
+        server, url = await start_server()
+        client = gemini_client(url)
+        try:
+            response = await client.aio.models.generate_content(
+                model="gemini-2.5-pro", contents="x" * 400
+            )
+            chunks = [
+                chunk
+                async for chunk in await client.aio.models.generate_content_stream(
+                    model="gemini-2.5-pro", contents="hello"
+                )
+            ]
+        finally:
+            await server.stop()
+
+        assert "Mock response from gemini-2.5-pro" in response.text
+        assert response.usage_metadata.prompt_token_count == 100
+        assert len(chunks) == 20
+        assert "".join(chunk.text for chunk in chunks).startswith("## Summary")
+
+    @pytest.mark.asyncio
+    async def test_gemini_cached_content(self):
+        """Test that cached-content tokens are reported for calls referencing a cache."""
+        server, url = await start_server()
+        client = gemini_client(url)
+        try:
+            cached = await client.aio.caches.create(
+                model="gemini-2.5-pro",
+                config=types.CreateCachedContentConfig(contents=["x" * 4000], ttl="60s"),
+            )
+            response = await client.aio.models.generate_content(
+                model="gemini-2.5-pro",
+                contents="question",
+                config=types.GenerateContentConfig(cached_content=cached.name),
+            )
+            await client.aio.caches.delete(name=cached.name)
+        finally:
+            await server.stop()
+
+        assert response.usage_metadata.cached_content_token_count == 1000
+
+    @pytest.mark.asyncio
+    async def test_injected_errors(self):
+        """Test that injected 429 and 500 responses surface as SDK errors."""
+        server, url = await start_server(error_rate_429=1.0)
+        try:
+            with pytest.raises(openai.RateLimitError):
+                await openai_client(url).responses.create(model="o3", input="hello")
+            with pytest.raises(genai_errors.ClientError) as exc_info:
+                await gemini_client(url).aio.models.generate_content(
+                    model="gemini-2.5-pro", contents="hello"
+                )
+            assert exc_info.value.code == 429
+
+            server.config.error_rate_429 = 0.0
+            server.config.error_rate_500 = 1.0
+            with pytest.raises(openai.InternalServerError):
+                await openai_client(url).responses.create(model="o3", input="hello")
+        finally:
+            await server.stop()
+
+        assert server.stats["rate_limited"] == 2
+        assert server.stats["server_errors"] == 1
+        assert server.stats["completed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_paced(self):
+        """Test that concurrent requests overlap and output is paced at the throughput."""
+        server, url = await start_server(tokens_per_second=200, output_tokens=10)
+        client = openai_client(url)
+        try:
+            start = time.monotonic()
+            await asyncio.gather(
+                *(client.responses.create(model="o3", input="hello") for _ in range(10))
+            )
+            elapsed = time.monotonic() - start
+        finally:
+            await server.stop()
+
+        # Each response takes ~45 ms; run serially, ten would take ~450 ms
+        assert elapsed >= 0.04
+        assert server.stats["max_active"] > 1
+        assert server.stats["completed"] == 10
@@ -0,0 +1,205 @@
+"""Tests for the precomputed repository index – precomputed_index.py."""
+
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from tests.helpers import init_git_repo, run_git
+from yellhorn_mcp.formatters.context_fetcher import get_codebase_context
+from yellhorn_mcp.utils.git_utils import YellhornMCPError
+from yellhorn_mcp.utils.lsp_utils import get_lsp_snapshot
+from yellhorn_mcp.utils.precomputed_index import (
+    PrecomputedIndex,
+    build_precomputed_index,
+    close_precomputed_index,
+    get_precomputed_index,
+    index_path,
+    load_precomputed_index,
+    main,
+)
+from yellhorn_mcp.utils.retrieval_index import BM25Index
+from yellhorn_mcp.utils.symbol_index import SymbolIndex
+
+
+class FakeCounter:
+    """Token counter that counts one token per character."""
+
+    def __init__(self):
+        self.calls = []
+
+    def count_tokens(self, text, model):
+        self.calls.append(text)
+        return len(text)
+
+    def encoding_name(self, model):
+        return "fake"
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Create a git repository with two commits."""
+    repo_path = init_git_repo(
+        tmp_path / "repo",
+        {"app.py": "def serve_requests(port):\n    pass\n", "README.md": "# Demo\n"},
+    )
+    (repo_path / "util.py").write_text("def parse_config(path):\n    pass\n")
+    run_git(repo_path, "add", ".")
+    run_git(repo_path, "commit", "-q", "-m", "add util")
+    yield repo_path
+    close_precomputed_index(repo_path)
+
+
+async def _build(repo_path: Path, ref: str = "HEAD") -> dict:
+    return await build_precomputed_index(
+        repo_path, ref, "gpt-4o", token_counter=FakeCounter(), log_function=lambda msg: None
+    )
+
+
+class TestBuildPrecomputedIndex:
+    """Test suite for build_precomputed_index."""
+
+    @pytest.mark.asyncio
+    async def test_indexes_files_at_head(self, git_repo):
+        """Test that every file's tokens, signatures and the search indexes are stored."""
+        summary = await _build(git_repo)
+
+        assert summary["commit"] == run_git(git_repo, "rev-parse", "HEAD")
+        assert summary["files"] == 3
+        index = PrecomputedIndex(git_repo, index_path(git_repo))
+        try:
+            assert index.metadata["encoding"] == "fake"
+            assert index.metadata["commit"] == summary["commit"]
+            assert index.tokens("README.md", "# Demo\n") == len("# Demo\n")
+            assert "serve_requests" in index.signatures("app.py")
+            assert index.signatures("README.md") is None
+        finally:
+            index.close()
+        assert BM25Index.for_repository(git_repo).search("parse_config")[0][0] == "util.py"
+        symbols = SymbolIndex.for_repository(git_repo)
+        try:
+            assert len(symbols) == 2
+        finally:
+            symbols.close()
+
+    @pytest.mark.asyncio
+    async def test_indexes_older_ref_in_worktree(self, git_repo):
+        """Test that a ref other than HEAD is read from a temporary worktree."""
+        (git_repo / "app.py").write_text("def edited():\n    pass\n")
+
+        summary = await _build(git_repo, "HEAD~1")
+
+        assert summary["files"] == 2
+        index = PrecomputedIndex(git_repo, index_path(git_repo))
+        try:
+            assert index.metadata["ref"] == "HEAD~1"
+            # The worktree edit is not what was indexed
+            assert index.signatures("app.py") is None
+            run_git(git_repo, "checkout", "--", "app.py")
+            assert "serve_requests" in index.signatures("app.py")
+        finally:
+            index.close()
+        assert "worktree" not in run_git(git_repo, "worktree", "list").split("\n", 1)[-1]
+
+    @pytest.mark.asyncio
+    async def test_unknown_ref(self, git_repo):
+        """Test that a ref that does not resolve raises."""
+        with pytest.raises(YellhornMCPError):
+            await _build(git_repo, "no-such-branch")
+
+    def test_main(self, git_repo, capsys):
+        """Test the `yellhorn-mcp index` command line."""
+        with patch(
+            "yellhorn_mcp.utils.precomputed_index.get_token_counter", return_value=FakeCounter()
+        ):
+            main(["--repo-path", str(git_repo), "--model", "gpt-4o"])
+
+        assert "Indexed 3 files" in capsys.readouterr().out
+        assert index_path(git_repo).is_file()
+
+
+class TestLoadPrecomputedIndex:
+    """Test suite for loading and validating a precomputed index."""
+
+    @pytest.mark.asyncio
+    async def test_missing_index(self, git_repo):
+        """Test that nothing is loaded without an index."""
+        assert await load_precomputed_index(git_repo) is None
+        assert get_precomputed_index(git_repo) is None
+
+    @pytest.mark.asyncio
+    async def test_validated_against_head(self, git_repo):
+        """Test that an index of an older commit is loaded while some files still match."""
+        await _build(git_repo, "HEAD~1")
+        (git_repo / "app.py").write_text("def serve_requests(port, host):\n    pass\n")
+        run_git(git_repo, "commit", "-q", "-am", "change app")
+
+        index = await load_precomputed_index(git_repo)
+
+        assert get_precomputed_index(git_repo) is index
+        assert await index.validate() == 1
+        assert index.signatures("app.py") is None
+        assert index.tokens("README.md", "# Demo\n") == 7
+
+    @pytest.mark.asyncio
+    async def test_version_mismatch(self, git_repo, caplog):
+        """Test that an index written in another format version is rejected."""
+        await _build(git_repo)
+        conn = sqlite3.connect(index_path(git_repo))
+        conn.execute("PRAGMA user_version = 999")
+        conn.close()
+
+        with pytest.raises(YellhornMCPError, match="format version 999"):
+            PrecomputedIndex(git_repo, index_path(git_repo))
+        assert await load_precomputed_index(git_repo) is None
+        assert "format version 999" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_token_lookup_requires_same_encoding(self, git_repo):
+        """Test that token counts are only reused for the encoding they were counted with."""
+        await _build(git_repo)
+        index = await load_precomputed_index(git_repo)
+
+        assert index.token_lookup("gpt-4o", FakeCounter()) == index.tokens
+        assert index.token_lookup("gpt-4o") is None
+
+
+class TestPrecomputedIndexUse:
+    """Test suite for the consumers of a loaded precomputed index."""
+
+    @pytest.mark.asyncio
+    async def test_lsp_snapshot_uses_stored_signatures(self, git_repo):
+        """Test that unchanged files are not parsed again and edited files are."""
+        await _build(git_repo)
+        await load_precomputed_index(git_repo)
+        (git_repo / "util.py").write_text("def load_settings(path):\n    pass\n")
+
+        with patch(
+            "yellhorn_mcp.utils.lsp_utils.extract_python_api", return_value=["def load_settings"]
+        ) as extract:
+            _, contents = await get_lsp_snapshot(git_repo, ["app.py", "util.py"])
+
+        assert "serve_requests" in contents["app.py"]
+        assert contents["util.py"] == "def load_settings"
+        extract.assert_called_once_with(git_repo / "util.py")
+
+    @pytest.mark.asyncio
+    async def test_full_context_reuses_token_counts(self, git_repo):
+        """Test that budgeted "full" context does not tokenize unchanged file contents."""
+        await _build(git_repo)
+        await load_precomputed_index(git_repo)
+        counter = FakeCounter()
+
+        with (
+            patch(
+                "yellhorn_mcp.formatters.context_fetcher.get_token_counter", return_value=counter
+            ),
+            patch("yellhorn_mcp.utils.precomputed_index.get_token_counter", return_value=counter),
+        ):
+            context = await get_codebase_context(
+                git_repo, "full", lambda msg: None, token_limit=100_000, model="gpt-4o"
+            )
+
+        assert "def parse_config(path):" in context
+        assert not any("def parse_config(path):" in text for text in counter.calls)
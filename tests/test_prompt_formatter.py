@@ -0,0 +1,162 @@
+"""Tests for budget-aware prompt assembly."""
+
+import subprocess
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from yellhorn_mcp.formatters import (
+    PromptBuilder,
+    build_codebase_prompt,
+    format_codebase_for_prompt,
+    get_codebase_context,
+    join_codebase_prompt,
+    stream_codebase_prompt,
+)
+from yellhorn_mcp.formatters.prompt_formatter import TRUNCATION_NOTICE
+
+
+def _char_counter():
+    """A token counter that counts one token per character."""
+    counter = MagicMock()
+    counter.count_tokens.side_effect = lambda text, model: len(text)
+    return counter
+
+
+class TestPromptBuilder:
+    """Test fragment collection and budget enforcement."""
+
+    def test_without_budget_nothing_is_counted(self):
+        """Without a budget every fragment is accepted and none are counted."""
+        builder = PromptBuilder()
+        assert builder.add("a" * 1000)
+        assert builder.add("b")
+        assert builder.build() == "a" * 1000 + "b"
+        assert builder.fragment_tokens == [0, 0]
+
+    def test_budget_refuses_optional_fragments(self):
+        """Optional fragments past the budget are refused; required ones are not."""
+        builder = PromptBuilder(10, "model", _char_counter())
+        assert builder.add("12345")
+        assert not builder.add("123456")
+        assert not builder.add("1234", reserve=2)
+        assert builder.add("1234")
+        assert builder.fragment_tokens == [5, 4]
+        assert builder.remaining() == 1
+        assert not builder.over_budget
+
+        assert builder.add("123", required=True)
+        assert builder.over_budget
+        assert builder.build() == "123451234123"
+
+
+class TestJoinCodebasePrompt:
+    """Test joining the codebase context with request-specific sections."""
+
+    def test_codebase_context_is_the_prefix(self):
+        """The prompt opens with the codebase section, whose length is returned."""
+        prompt, prefix_length = join_codebase_prompt("tree and files", "# Task\n", "Do it")
+
+        assert prompt == "# Codebase Context\ntree and files\n\n# Task\nDo it"
+        assert prompt[:prefix_length] == "# Codebase Context\ntree and files\n\n"
+
+
+class TestBuildCodebasePrompt:
+    """Test codebase prompt assembly."""
+
+    FILES = {"a.py": "A" * 40, "b.py": "B" * 40, "c.py": "C" * 40}
+
+    @pytest.mark.asyncio
+    async def test_matches_format_codebase_for_prompt(self):
+        """Without a budget the builder output equals the formatted prompt."""
+        builder = build_codebase_prompt(list(self.FILES), self.FILES)
+        assert builder.build() == await format_codebase_for_prompt(list(self.FILES), self.FILES)
+        assert not builder.truncated
+
+    def test_stops_adding_files_at_the_budget(self):
+        """Files that would exceed the budget are left out whole."""
+        unlimited = build_codebase_prompt(list(self.FILES), self.FILES).build()
+        limit = len(unlimited) + len(TRUNCATION_NOTICE) - 10
+
+        builder = build_codebase_prompt(
+            list(self.FILES), self.FILES, limit, "model", _char_counter()
+        )
+        content = builder.build()
+
+        assert builder.truncated
+        assert builder.total_tokens <= limit
+        assert "A" * 40 in content and "B" * 40 in content
+        assert "--- File: c.py ---" not in content
+        assert content.endswith(TRUNCATION_NOTICE + "</file_contents>")
+        assert builder.omitted_files == ["c.py"]
+
+    def test_streaming_stops_reading_at_the_budget(self):
+        """Files after the first one that does not fit are never read."""
+        read = []
+
+        def read_file(path):
+            read.append(path)
+            return None if path == "skip.py" else self.FILES[path]
+
+        paths = ["b.py", "skip.py", "a.py", "c.py"]
+        tree_tokens = len(build_codebase_prompt(paths, {}).build())
+        limit = tree_tokens + 170
+
+        builder = stream_codebase_prompt(paths, read_file, limit, "model", _char_counter())
+
+        assert read == ["b.py", "skip.py", "a.py"]
+        assert builder.omitted_files == ["a.py", "c.py"]
+        content = builder.build()
+        assert content.index("--- File: b.py ---") < content.index(TRUNCATION_NOTICE)
+        assert "c.py ---" not in content
+
+
+class TestBudgetedCodebaseContext:
+    """Test that get_codebase_context enforces the budget while assembling."""
+
+    @pytest.mark.asyncio
+    async def test_full_mode_leaves_out_whole_files(self, tmp_path):
+        """Full mode keeps whole files and does not truncate mid-file."""
+        for name, content in TestBuildCodebasePrompt.FILES.items():
+            (tmp_path / name).write_text(content)
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+
+        with (
+            patch("yellhorn_mcp.formatters.context_fetcher.get_token_counter", _char_counter),
+            patch("yellhorn_mcp.formatters.context_fetcher.apply_token_limit") as truncate,
+        ):
+            context = await get_codebase_context(
+                tmp_path, "full", log_function=lambda msg: None, token_limit=250, model="model"
+            )
+
+        truncate.assert_not_called()
+        assert len(context) <= 250
+        assert "A" * 40 in context
+        assert TRUNCATION_NOTICE in context
+
+    @pytest.mark.asyncio
+    async def test_full_mode_records_omitted_files_without_reading_them(self, tmp_path):
+        """Files past the budget are reported and never read from disk."""
+        for name, content in TestBuildCodebasePrompt.FILES.items():
+            (tmp_path / name).write_text(content)
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+
+        omitted: list[str] = []
+        with (
+            patch("yellhorn_mcp.formatters.context_fetcher.get_token_counter", _char_counter),
+            patch(
+                "yellhorn_mcp.formatters.context_fetcher._read_file_text",
+                side_effect=lambda repo, path, snapshot: TestBuildCodebasePrompt.FILES[path],
+            ) as reader,
+        ):
+            await get_codebase_context(
+                tmp_path,
+                "full",
+                log_function=lambda msg: None,
+                token_limit=250,
+                model="model",
+                omitted_files=omitted,
+            )
+
+        assert omitted == ["b.py", "c.py"]
+        assert [call.args[1] for call in reader.call_args_list] == ["a.py", "b.py"]
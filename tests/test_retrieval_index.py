@@ -0,0 +1,142 @@
+"""Tests for the BM25 retrieval index and the "relevant" reasoning mode."""
+
+import json
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from yellhorn_mcp.formatters.context_fetcher import get_codebase_context
+from yellhorn_mcp.utils.retrieval_index import (
+    RETRIEVAL_INDEX_VERSION,
+    BM25Index,
+    tokenize,
+)
+
+FILES = {
+    "auth/session.py": "class SessionStore:\n    def refresh_token(self):\n        '''Refresh the session token.'''\n",
+    "auth/password.py": "def hash_password(password):\n    return password\n",
+    "billing/invoice.py": "def render_invoice(invoice):\n    return invoice.total\n",
+    "billing/tax.go": "package billing\n\nfunc ComputeTax(amount float64) float64 { return amount }\n",
+    "README.md": "Example service with auth and billing.\n",
+}
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a repository directory holding FILES."""
+    repo_path = tmp_path / "repo"
+    for rel_path, content in FILES.items():
+        full_path = repo_path / rel_path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text(content)
+    return repo_path
+
+
+class TestTokenize:
+    """Test identifier tokenization."""
+
+    def test_splits_snake_and_camel_case(self):
+        """Compound identifiers yield their parts and the whole identifier."""
+        assert tokenize("parseHTTPResponse") == ["parse", "http", "response", "parsehttpresponse"]
+        assert tokenize("refresh_token x") == ["refresh", "token", "refresh_token"]
+
+    def test_ignores_numbers_and_single_characters(self):
+        """Numbers and one-letter names carry no signal."""
+        assert tokenize("a = 42 + b") == []
+
+
+class TestBM25Index:
+    """Test ranking, incremental updates and persistence."""
+
+    def test_ranks_matching_files_first(self, repo: Path):
+        """Files sharing identifiers with the query rank highest."""
+        index = BM25Index()
+        index.update(repo, list(FILES))
+
+        results = index.search("Refresh session tokens on expiry", top_k=2)
+        assert results[0][0] == "auth/session.py"
+        assert all(score > 0 for _, score in results)
+
+        assert index.search("computeTax rounding")[0][0] == "billing/tax.go"
+        assert index.search("zzz unknown words") == []
+
+    def test_only_changed_files_are_tokenized(self, repo: Path):
+        """A second update re-tokenizes only edited files."""
+        index = BM25Index()
+        index.update(repo, list(FILES))
+
+        (repo / "billing" / "invoice.py").write_text("def refresh_invoice_session():\n    pass\n")
+        with patch(
+            "yellhorn_mcp.utils.retrieval_index.tokenize", side_effect=tokenize
+        ) as tokenizer:
+            changed = index.update(repo, list(FILES))
+
+        assert changed == ["billing/invoice.py"]
+        # The path and the contents of the one changed file
+        assert tokenizer.call_count == 2
+        assert "billing/invoice.py" in [p for p, _ in index.search("invoice session")][:1]
+
+    def test_removed_files_leave_index(self, repo: Path):
+        """Files missing from the file list are no longer returned."""
+        index = BM25Index()
+        index.update(repo, list(FILES))
+        changed = index.update(repo, [p for p in FILES if p != "auth/session.py"])
+
+        assert changed == ["auth/session.py"]
+        assert "auth/session.py" not in [p for p, _ in index.search("session token")]
+        assert len(index) == len(FILES) - 1
+
+    def test_binary_files_are_skipped(self, repo: Path):
+        """Binary files are recorded but never scored."""
+        (repo / "logo.bin").write_bytes(b"session\0\x01\x02")
+        index = BM25Index()
+        index.update(repo, [*FILES, "logo.bin"])
+        assert len(index) == len(FILES)
+        assert "logo.bin" not in [p for p, _ in index.search("session logo")]
+
+    def test_persisted_between_instances(self, repo: Path, tmp_path: Path):
+        """A reloaded index returns the same ranking without re-tokenizing."""
+        cache_path = tmp_path / "cache" / "bm25.json"
+        first = BM25Index(cache_path)
+        first.update(repo, list(FILES))
+
+        second = BM25Index(cache_path)
+        second.load()
+        with patch(
+            "yellhorn_mcp.utils.retrieval_index.tokenize", side_effect=tokenize
+        ) as tokenizer:
+            assert second.update(repo, list(FILES)) == []
+        assert tokenizer.call_count == 0
+        assert second.search("hash password") == first.search("hash password")
+
+    def test_outdated_version_is_ignored(self, tmp_path: Path):
+        """Indexes written by another format version are discarded."""
+        cache_path = tmp_path / "bm25.json"
+        cache_path.write_text(json.dumps({"version": RETRIEVAL_INDEX_VERSION + 1, "entries": {}}))
+        index = BM25Index(cache_path)
+        index.load()
+        assert len(index) == 0
+
+
+class TestRelevantReasoningMode:
+    """Test the "relevant" mode of get_codebase_context."""
+
+    @pytest.mark.asyncio
+    async def test_top_files_in_full_rest_as_signatures(self, repo: Path):
+        """The best match is inlined; other Python files contribute signatures only."""
+        subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+        with patch("yellhorn_mcp.formatters.context_fetcher.RELEVANT_TOP_K", 1):
+            context = await get_codebase_context(
+                repo,
+                "relevant",
+                log_function=lambda msg: None,
+                query="Render the invoice total",
+                retrieval_index=BM25Index(),
+            )
+
+        assert "return invoice.total" in context
+        assert "def hash_password(password)" in context
+        assert "return password" not in context
+        assert "auth/session.py" in context
@@ -386,24 +386,26 @@ async def test_get_codebase_snapshot_integration():
 @pytest.mark.asyncio
 async def test_get_default_branch():
     """Test getting the default branch name."""
-    # Test when remote show origin works
+    # Test when origin/HEAD is set locally
     with patch("yellhorn_mcp.utils.git_utils.run_git_command") as mock_git:
-        mock_git.return_value = "* remote origin\n  Fetch URL: https://github.com/user/repo.git\n  Push  URL: https://github.com/user/repo.git\n  HEAD branch: main"
+        mock_git.return_value = "origin/main"
 
-        result = await get_default_branch(Path("/mock/repo"))
+        result = await get_default_branch(Path("/mock/repo"), refresh=True)
 
         assert result == "main"
-        mock_git.assert_called_once_with(Path("/mock/repo"), ["remote", "show", "origin"])
+        mock_git.assert_called_once_with(
+            Path("/mock/repo"), ["symbolic-ref", "--short", "refs/remotes/origin/HEAD"]
+        )
 
     # Test fallback to main
     with patch("yellhorn_mcp.utils.git_utils.run_git_command") as mock_git:
-        # First call fails (remote show origin)
+        # First call fails (symbolic-ref origin/HEAD)
         mock_git.side_effect = [
             YellhornMCPError("Command failed"),
             "main exists",  # Second call succeeds (show-ref main)
         ]
 
-        result = await get_default_branch(Path("/mock/repo"))
+        result = await get_default_branch(Path("/mock/repo"), refresh=True)
 
         assert result == "main"
         assert mock_git.call_count == 2
@@ -412,12 +414,12 @@ async def test_get_default_branch():
     with patch("yellhorn_mcp.utils.git_utils.run_git_command") as mock_git:
         # First two calls fail
         mock_git.side_effect = [
-            YellhornMCPError("Command failed"),  # remote show origin
+            YellhornMCPError("Command failed"),  # symbolic-ref origin/HEAD
             YellhornMCPError("Command failed"),  # show-ref main
             "master exists",  # show-ref master
         ]
 
-        result = await get_default_branch(Path("/mock/repo"))
+        result = await get_default_branch(Path("/mock/repo"), refresh=True)
 
         assert result == "master"
         assert mock_git.call_count == 3
@@ -426,9 +428,9 @@ async def test_get_default_branch():
     with patch("yellhorn_mcp.utils.git_utils.run_git_command") as mock_git:
         mock_git.side_effect = YellhornMCPError("Command failed")
 
-        result = await get_default_branch(Path("/mock/repo"))
+        result = await get_default_branch(Path("/mock/repo"), refresh=True)
         assert result == "main"
-        assert mock_git.call_count == 3  # remote show origin + main + master attempts
+        assert mock_git.call_count == 3  # symbolic-ref + main + master attempts
 
 
 def test_is_git_repository():
@@ -2010,7 +2012,7 @@ async def test_app_lifespan_gemini_model():
         patch("os.getenv") as mock_getenv,
         patch("pathlib.Path.resolve") as mock_resolve,
         patch("yellhorn_mcp.server.is_git_repository", return_value=True),
-        patch("yellhorn_mcp.server.genai.Client") as mock_gemini_client,
+        patch("google.genai.Client") as mock_gemini_client,
     ):
 
         # Mock environment variables for Gemini model
@@ -2049,7 +2051,7 @@ async def test_app_lifespan_openai_model():
         patch("pathlib.Path.resolve") as mock_resolve,
         patch("yellhorn_mcp.server.is_git_repository", return_value=True),
         patch("httpx.AsyncClient") as mock_httpx,
-        patch("yellhorn_mcp.server.AsyncOpenAI") as mock_openai_client,
+        patch("openai.AsyncOpenAI") as mock_openai_client,
     ):
 
         # Mock environment variables for OpenAI model
@@ -2170,7 +2172,7 @@ async def test_app_lifespan_search_grounding_disabled():
         patch("os.getenv") as mock_getenv,
         patch("pathlib.Path.resolve") as mock_resolve,
         patch("yellhorn_mcp.server.is_git_repository", return_value=True),
-        patch("yellhorn_mcp.server.genai.Client") as mock_gemini_client,
+        patch("google.genai.Client") as mock_gemini_client,
     ):
 
         # Mock environment variables with search grounding disabled
@@ -2204,7 +2206,7 @@ async def test_app_lifespan_o_series_model():
         patch("pathlib.Path.resolve") as mock_resolve,
         patch("yellhorn_mcp.server.is_git_repository", return_value=True),
         patch("httpx.AsyncClient") as mock_httpx,
-        patch("yellhorn_mcp.server.AsyncOpenAI") as mock_openai_client,
+        patch("openai.AsyncOpenAI") as mock_openai_client,
     ):
 
         # Mock environment variables for 'o' series model
@@ -2415,6 +2417,7 @@ async def test_curate_context_with_optional_params():
             depth_limit=3,
             ignore_file_path=".myignore",
             output_path=".mycontext",
+            curation_mode="hierarchical",
         )
 
         result_data = json.loads(result)
@@ -2424,6 +2427,7 @@ async def test_curate_context_with_optional_params():
         assert call_args.kwargs["depth_limit"] == 3
         assert call_args.kwargs["ignore_file_path"] == ".myignore"
         assert call_args.kwargs["output_path"] == ".mycontext"
+        assert call_args.kwargs["curation_mode"] == "hierarchical"
 
 
 @pytest.mark.asyncio
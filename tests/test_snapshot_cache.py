@@ -0,0 +1,257 @@
+"""Tests for the shared per-HEAD repository snapshot."""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from tests.helpers import init_git_repo, run_git
+from yellhorn_mcp.formatters.codebase_snapshot import get_codebase_snapshot
+from yellhorn_mcp.formatters.snapshot_cache import (
+    SnapshotCache,
+    _stat_key,
+    _status_paths,
+    compute_repository_fingerprint,
+    get_shared_snapshot,
+)
+from yellhorn_mcp.llm_manager import LLMManager
+from yellhorn_mcp.processors.context_processor import process_context_curation_async
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Create a git repository with one commit."""
+    return init_git_repo(
+        tmp_path / "repo",
+        {"src/main.py": "def main(): pass\n", "src/util.py": "def util(): pass\n"},
+    )
+
+
+def _ctx_with_cache(repo_path: Path, cache: SnapshotCache) -> MagicMock:
+    ctx = MagicMock()
+    ctx.log = AsyncMock()
+    ctx.request_context.lifespan_context = {"repo_path": repo_path, "snapshot_cache": cache}
+    return ctx
+
+
+class TestStatusPaths:
+    """Test parsing of porcelain v2 status output."""
+
+    def test_parses_entry_kinds(self):
+        """Ordinary, renamed, unmerged and untracked entries are all extracted."""
+        output = "\0".join(
+            [
+                "# branch.oid abc123",
+                "1 .M N... 100644 100644 100644 aaa bbb src/with space.py",
+                "2 R. N... 100644 100644 100644 aaa bbb R100 new.py",
+                "old.py",
+                "u UU N... 100644 100644 100644 100644 aaa bbb ccc conflict.py",
+                "? untracked.txt",
+                "",
+            ]
+        )
+        assert _status_paths(output) == [
+            "src/with space.py",
+            "new.py",
+            "old.py",
+            "conflict.py",
+            "untracked.txt",
+        ]
+
+
+class TestSnapshotCache:
+    """Test snapshot reuse and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_reused_while_repository_unchanged(self, git_repo):
+        """Back-to-back calls return the same snapshot."""
+        cache = SnapshotCache()
+        first = await cache.get(git_repo)
+        second = await cache.get(git_repo)
+        assert first is second
+        assert first.file_paths == ["src/main.py", "src/util.py"]
+
+    @pytest.mark.asyncio
+    async def test_invalidated_by_worktree_changes(self, git_repo):
+        """New files, edits and commits produce a new snapshot."""
+        cache = SnapshotCache()
+        first = await cache.get(git_repo)
+
+        (git_repo / "src" / "new.py").write_text("x = 1\n")
+        second = await cache.get(git_repo)
+        assert second is not first
+        assert "src/new.py" in second.file_paths
+
+        run_git(git_repo, "add", ".")
+        third = await cache.get(git_repo)
+        assert third is not second
+
+        run_git(git_repo, "commit", "-q", "-m", "add new")
+        fourth = await cache.get(git_repo)
+        assert fourth is not third
+
+    @pytest.mark.asyncio
+    async def test_detects_repeated_edits_to_modified_file(self, git_repo):
+        """Editing an already-modified file changes the fingerprint."""
+        (git_repo / "src" / "main.py").write_text("def main(): return 1\n")
+        before = await compute_repository_fingerprint(git_repo)
+        (git_repo / "src" / "main.py").write_text("def main(): return 22\n")
+        after = await compute_repository_fingerprint(git_repo)
+        assert before != after
+
+    @pytest.mark.asyncio
+    async def test_expired_snapshot_is_rebuilt(self, git_repo):
+        """Snapshots older than max_age are rebuilt."""
+        cache = SnapshotCache(max_age=0.0)
+        first = await cache.get(git_repo)
+        with patch("yellhorn_mcp.formatters.snapshot_cache.time.monotonic") as mock_time:
+            mock_time.return_value = first.created_at + 1
+            second = await cache.get(git_repo)
+        assert second is not first
+
+    @pytest.mark.asyncio
+    async def test_contents_cached_until_file_changes(self, git_repo):
+        """File contents are read once and re-read only after modification."""
+        snapshot = await SnapshotCache().get(git_repo)
+
+        with patch.object(Path, "read_text", autospec=True, side_effect=Path.read_text) as reader:
+            assert snapshot.read_text("src/main.py") == "def main(): pass\n"
+            assert snapshot.read_text("src/main.py") == "def main(): pass\n"
+            assert reader.call_count == 1
+
+            (git_repo / "src" / "main.py").write_text("def main(): return 1\n")
+            assert snapshot.read_text("src/main.py") == "def main(): return 1\n"
+            assert reader.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_contents_of_removed_files_not_carried_over(self, git_repo):
+        """A new snapshot keeps cached contents only for files it still lists."""
+        cache = SnapshotCache()
+        first = await cache.get(git_repo)
+        first.read_text("src/main.py")
+        first.read_text("src/util.py")
+
+        run_git(git_repo, "rm", "-q", "src/util.py")
+        second = await cache.get(git_repo)
+
+        assert second is not first
+        assert set(second._contents) == {"src/main.py"}
+
+    @pytest.mark.asyncio
+    async def test_get_codebase_snapshot_matches_uncached(self, git_repo):
+        """Using a snapshot yields the same paths and contents as reading directly."""
+        snapshot = await SnapshotCache().get(git_repo)
+        expected = await get_codebase_snapshot(git_repo, log_function=lambda msg: None)
+        actual = await get_codebase_snapshot(
+            git_repo, log_function=lambda msg: None, snapshot=snapshot
+        )
+        assert actual == expected
+
+
+class TestWatchedSnapshotCache:
+    """Test snapshot reuse driven by a watcher's change reports."""
+
+    @pytest.mark.asyncio
+    async def test_reused_without_git_until_change(self, git_repo):
+        """A watched snapshot is returned without git status until a change is reported."""
+        cache = SnapshotCache()
+        cache.watch(git_repo)
+        first = await cache.get(git_repo)
+        assert first.watched
+
+        with patch(
+            "yellhorn_mcp.formatters.snapshot_cache.compute_repository_fingerprint"
+        ) as fingerprint:
+            assert await cache.get(git_repo) is first
+            fingerprint.assert_not_called()
+
+        (git_repo / "src" / "new.py").write_text("x = 1\n")
+        cache.mark_changed(git_repo, ["src/new.py"])
+        second = await cache.get(git_repo)
+        assert "src/new.py" in second.file_paths
+
+    @pytest.mark.asyncio
+    async def test_content_change_only_rereads_changed_file(self, git_repo):
+        """Editing a listed file keeps the snapshot and drops only that file's contents."""
+        cache = SnapshotCache()
+        cache.watch(git_repo)
+        snapshot = await cache.get(git_repo)
+        snapshot.read_text("src/main.py")
+        snapshot.read_text("src/util.py")
+
+        (git_repo / "src" / "main.py").write_text("def main(): return 1\n")
+        cache.mark_changed(git_repo, ["src/main.py"])
+
+        with patch("yellhorn_mcp.formatters.snapshot_cache._stat_key", wraps=_stat_key) as stat:
+            assert await cache.get(git_repo) is snapshot
+            assert snapshot.read_text("src/util.py") == "def util(): pass\n"
+            stat.assert_not_called()
+            assert snapshot.read_text("src/main.py") == "def main(): return 1\n"
+            assert stat.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_changes_and_unwatch(self, git_repo):
+        """Unknown changes discard the snapshot; unwatching validates with git again."""
+        cache = SnapshotCache()
+        cache.watch(git_repo)
+        first = await cache.get(git_repo)
+        cache.mark_changed(git_repo, None)
+        assert cache.current(git_repo) is None
+
+        second = await cache.get(git_repo)
+        assert second is not first
+        cache.unwatch(git_repo)
+        assert not second.watched
+        with patch(
+            "yellhorn_mcp.formatters.snapshot_cache.compute_repository_fingerprint",
+            return_value=second.fingerprint,
+        ) as fingerprint:
+            assert await cache.get(git_repo) is second
+            fingerprint.assert_called_once()
+
+
+class TestGetSharedSnapshot:
+    """Test lookup of the shared snapshot from the lifespan context."""
+
+    @pytest.mark.asyncio
+    async def test_without_cache(self, git_repo):
+        """No ctx or no cache in the lifespan context yields None."""
+        assert await get_shared_snapshot(None, git_repo) is None
+        ctx = MagicMock()
+        ctx.request_context.lifespan_context = {}
+        assert await get_shared_snapshot(ctx, git_repo) is None
+
+    @pytest.mark.asyncio
+    async def test_not_a_git_repository(self, tmp_path):
+        """Directories git cannot inspect yield None instead of raising."""
+        ctx = _ctx_with_cache(tmp_path, SnapshotCache())
+        assert await get_shared_snapshot(ctx, tmp_path) is None
+
+    @pytest.mark.asyncio
+    async def test_curation_then_workplan_read_files_once(self, git_repo):
+        """Curation in full mode warms the contents used by the following workplan."""
+        cache = SnapshotCache()
+        ctx = _ctx_with_cache(git_repo, cache)
+        mock_llm_manager = MagicMock(spec=LLMManager)
+        mock_llm_manager.call_llm.return_value = "```context\nsrc\n```"
+
+        await process_context_curation_async(
+            repo_path=git_repo,
+            llm_manager=mock_llm_manager,
+            model="gpt-4o",
+            user_task="Refactor main",
+            codebase_reasoning="full",
+            ctx=ctx,
+        )
+
+        # Writing .yellhorncontext changes the worktree, so the file list is refreshed,
+        # but file contents carry over without being read again.
+        snapshot = await get_shared_snapshot(ctx, git_repo)
+        with patch.object(Path, "read_text", autospec=True, side_effect=Path.read_text) as reader:
+            _, contents = await get_codebase_snapshot(
+                git_repo, log_function=lambda msg: None, snapshot=snapshot
+            )
+        assert set(contents) == {"src/main.py", "src/util.py"}
+        read_paths = [call.args[0].name for call in reader.call_args_list]
+        assert "main.py" not in read_paths
+        assert "util.py" not in read_paths
@@ -0,0 +1,230 @@
+"""Tests for symbol extraction, the symbol index and the search_symbols tool."""
+
+import json
+import sqlite3
+import subprocess
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from tests.helpers import write_files
+from yellhorn_mcp.server import search_symbols
+from yellhorn_mcp.utils.lsp_utils import extract_go_symbols, extract_python_symbols
+from yellhorn_mcp.utils.symbol_index import SYMBOL_INDEX_VERSION, SymbolIndex
+
+PY_SOURCE = '''"""Module."""
+
+
+class SessionStore:
+    """Stores sessions."""
+
+    def refresh_token(self, user_id: int) -> str:
+        """Refresh a token.
+
+        Longer description.
+        """
+
+    def _private(self):
+        pass
+
+
+async def load_session(key):
+    pass
+
+
+def _helper():
+    pass
+'''
+
+GO_SOURCE = """package store
+
+// Server serves requests.
+// It is safe for concurrent use.
+type Server struct {
+	addr string
+}
+
+func (s *Server) Start() error {
+	return nil
+}
+
+func NewServer(addr string) *Server {
+	return &Server{addr: addr}
+}
+
+func helper() {}
+"""
+
+FILES = {"app/session.py": PY_SOURCE, "store/server.go": GO_SOURCE, "README.md": "Server\n"}
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a repository directory holding FILES."""
+    return write_files(tmp_path / "repo", FILES)
+
+
+class TestSymbolExtraction:
+    """Test per-language symbol extraction."""
+
+    def test_python_symbols(self):
+        """Public functions, classes and methods are extracted with lines and docs."""
+        symbols = {s["name"]: s for s in extract_python_symbols(PY_SOURCE)}
+        assert set(symbols) == {"SessionStore", "SessionStore.refresh_token", "load_session"}
+        assert symbols["SessionStore"]["kind"] == "class"
+        assert symbols["SessionStore"]["line"] == 4
+        assert symbols["SessionStore"]["doc"] == "Stores sessions."
+        method = symbols["SessionStore.refresh_token"]
+        assert method["kind"] == "method"
+        assert method["signature"] == "def SessionStore.refresh_token(self, user_id: int) -> str"
+        assert method["doc"] == "Refresh a token."
+        assert symbols["load_session"]["signature"] == "async def load_session(key)"
+
+    def test_python_syntax_error(self):
+        """Unparsable sources yield no symbols."""
+        assert extract_python_symbols("def broken(:\n") == []
+
+    def test_go_symbols(self):
+        """Exported types, functions and methods are extracted with doc comments."""
+        symbols = {s["name"]: s for s in extract_go_symbols(GO_SOURCE)}
+        assert set(symbols) == {"Server", "Server.Start", "NewServer"}
+        assert symbols["Server"]["kind"] == "struct"
+        assert symbols["Server"]["line"] == 5
+        assert symbols["Server"]["doc"] == "Server serves requests."
+        assert symbols["Server.Start"]["signature"] == "func (s *Server) Start() error"
+        assert symbols["NewServer"]["kind"] == "function"
+
+
+class TestSymbolIndex:
+    """Test lookups and incremental updates."""
+
+    def test_exact_prefix_and_fuzzy_search(self, repo: Path):
+        """Exact matches rank before prefix matches, then fuzzy matches."""
+        index = SymbolIndex()
+        index.update(repo, list(FILES))
+
+        names = [r["name"] for r in index.search("server")]
+        assert names[0] == "Server"
+
+        start = index.search("start")[0]
+        assert start["path"] == "store/server.go"
+        assert start["line"] == 9
+
+        assert [r["name"] for r in index.search("refresh")] == ["SessionStore.refresh_token"]
+        assert [r["name"] for r in index.search("load_sesion", fuzzy=True)] == ["load_session"]
+        assert index.search("load_sesion", fuzzy=False) == []
+
+    def test_qualifier_and_kind_filters(self, repo: Path):
+        """Qualified queries and kind filters narrow the results."""
+        index = SymbolIndex()
+        index.update(repo, list(FILES))
+
+        assert [r["name"] for r in index.search("Server.st")] == ["Server.Start"]
+        assert index.search("SessionStore.start", fuzzy=False) == []
+        assert [r["name"] for r in index.search("Server", kind="function")] == ["NewServer"]
+
+    def test_only_changed_files_are_parsed(self, repo: Path):
+        """A second update parses only edited files and drops removed ones."""
+        index = SymbolIndex()
+        index.update(repo, list(FILES))
+
+        (repo / "app" / "session.py").write_text("def rotate_keys():\n    pass\n")
+        with patch(
+            "yellhorn_mcp.utils.symbol_index.extract_python_symbols",
+            side_effect=extract_python_symbols,
+        ) as extractor:
+            changed = index.update(repo, list(FILES))
+        assert changed == ["app/session.py"]
+        assert extractor.call_count == 1
+        assert index.search("SessionStore", fuzzy=False) == []
+        assert index.search("rotate_keys")[0]["path"] == "app/session.py"
+
+        changed = index.update(repo, ["app/session.py"])
+        assert changed == ["store/server.go"]
+        assert index.search("Server", fuzzy=False) == []
+
+    def test_oversized_or_unreadable_files_are_dropped(self, repo: Path):
+        """Files that grow past the size limit or cannot be read lose their old symbols."""
+        index = SymbolIndex()
+        index.update(repo, list(FILES))
+
+        (repo / "app" / "session.py").write_text("def rotate_keys():\n    pass\n" + "#" * 1000)
+        with patch("yellhorn_mcp.utils.symbol_index.MAX_SYMBOL_FILE_SIZE", 1000):
+            assert index.update(repo, list(FILES)) == ["app/session.py"]
+            assert index.search("load_session", fuzzy=False) == []
+            assert index.search("rotate_keys", fuzzy=False) == []
+
+            (repo / "store" / "server.go").unlink()
+            assert index.update(repo, list(FILES)) == ["store/server.go"]
+            assert index.search("NewServer", fuzzy=False) == []
+
+    def test_persisted_between_instances(self, repo: Path, tmp_path: Path):
+        """A reopened index answers lookups without parsing anything."""
+        db_path = tmp_path / "cache" / "symbols.sqlite3"
+        first = SymbolIndex(db_path)
+        first.update(repo, list(FILES))
+        first.close()
+
+        second = SymbolIndex(db_path)
+        with patch(
+            "yellhorn_mcp.utils.symbol_index.extract_go_symbols", side_effect=extract_go_symbols
+        ) as extractor:
+            assert second.update(repo, list(FILES)) == []
+        assert extractor.call_count == 0
+        assert second.search("NewServer")[0]["path"] == "store/server.go"
+        second.close()
+
+    def test_outdated_version_is_rebuilt(self, tmp_path: Path):
+        """Databases from another format version are discarded."""
+        db_path = tmp_path / "symbols.sqlite3"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE symbols (legacy TEXT)")
+        conn.execute(f"PRAGMA user_version = {SYMBOL_INDEX_VERSION + 1}")
+        conn.commit()
+        conn.close()
+
+        index = SymbolIndex(db_path)
+        assert len(index) == 0
+        index.close()
+
+
+class TestSearchSymbolsTool:
+    """Test the search_symbols MCP tool."""
+
+    @pytest.mark.asyncio
+    async def test_returns_json_results(self, repo: Path):
+        """The tool indexes the repository and returns matching symbols as JSON."""
+        subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+        index = SymbolIndex()
+        ctx = MagicMock()
+        ctx.log = AsyncMock()
+        ctx.request_context.lifespan_context = {"repo_path": repo, "symbol_index": index}
+
+        result = json.loads(await search_symbols(ctx, query="NewServ"))
+
+        assert result[0]["name"] == "NewServer"
+        assert result[0]["path"] == "store/server.go"
+        assert result[0]["line"] == 13
+
+    @pytest.mark.asyncio
+    async def test_update_runs_off_the_event_loop(self, repo: Path):
+        """The index update runs in a worker thread so other requests are not blocked."""
+        import threading
+
+        subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+        index = SymbolIndex()
+        ctx = MagicMock()
+        ctx.log = AsyncMock()
+        ctx.request_context.lifespan_context = {"repo_path": repo, "symbol_index": index}
+        threads = []
+        update = index.update
+
+        def recording_update(*args):
+            threads.append(threading.get_ident())
+            return update(*args)
+
+        with patch.object(index, "update", side_effect=recording_update):
+            await search_symbols(ctx, query="NewServer")
+
+        assert threads and threads[0] != threading.get_ident()
@@ -0,0 +1,160 @@
+"""Tests for phase timing of background jobs – timing_utils.py."""
+
+import asyncio
+
+import pytest
+
+from yellhorn_mcp.utils.timing_utils import (
+    PhaseTimer,
+    current_timer,
+    phase,
+    phase_timing_enabled,
+    record_phase,
+    timed_phase,
+)
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestPhaseTimer:
+    """Test suite for PhaseTimer and the module-level phase helpers."""
+
+    def test_nested_phases_use_paths(self):
+        """Test that phases record durations under their parent's path, parents first."""
+        clock = FakeClock()
+        timer = PhaseTimer(clock=clock).start()
+        try:
+            with phase("codebase_context"):
+                with phase("snapshot"):
+                    clock.now += 1.5
+                clock.now += 0.5
+            with phase("llm_call"):
+                clock.now += 3.0
+        finally:
+            timer.finish("test")
+
+        assert timer.phases == {
+            "codebase_context": 2.0,
+            "codebase_context/snapshot": 1.5,
+            "llm_call": 3.0,
+        }
+        assert timer.format_summary().endswith("llm_call=3.00s, total=5.00s")
+
+    def test_repeated_phases_accumulate(self):
+        """Test that entering the same phase twice adds up the time."""
+        clock = FakeClock()
+        timer = PhaseTimer(clock=clock).start()
+        try:
+            for _ in range(3):
+                with phase("github"):
+                    clock.now += 0.25
+        finally:
+            timer.finish("test")
+
+        assert timer.phases == {"github": 0.75}
+
+    def test_record_phase_nests_under_current_phase(self):
+        """Test that externally measured time lands under the enclosing phase."""
+        timer = PhaseTimer(clock=FakeClock()).start()
+        try:
+            with phase("llm_call"):
+                record_phase("retry_wait", 4.0)
+            record_phase("retry_wait", 1.0)
+        finally:
+            timer.finish("test")
+
+        assert timer.phases["llm_call/retry_wait"] == 4.0
+        assert timer.phases["retry_wait"] == 1.0
+
+    def test_no_timer_is_noop(self):
+        """Test that phases outside a job record nothing and share one no-op manager."""
+        assert current_timer() is None
+        assert phase("a") is phase("b")
+        with phase("a"):
+            record_phase("b", 1.0)
+
+    def test_disabled_timer_records_nothing(self):
+        """Test that a disabled timer is never installed."""
+        timer = PhaseTimer(enabled=False).start()
+        try:
+            assert current_timer() is None
+            with phase("llm_call"):
+                pass
+        finally:
+            timer.finish("test")
+
+        assert timer.phases == {}
+
+    def test_finish_restores_previous_timer(self):
+        """Test that finishing a job's timer uninstalls it."""
+        timer = PhaseTimer().start()
+        assert current_timer() is timer
+        timer.finish("test")
+        assert current_timer() is None
+
+    def test_finish_logs_breakdown(self, caplog):
+        """Test that the breakdown is logged when the job finishes."""
+        timer = PhaseTimer(clock=FakeClock()).start()
+        with phase("llm_call"):
+            pass
+        with caplog.at_level("INFO", logger="yellhorn_mcp.utils.timing_utils"):
+            timer.finish("workplan #7")
+
+        assert "Phase timings for workplan #7: llm_call=0.00s" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_timed_phase_decorator(self):
+        """Test that the decorator times sync and async functions."""
+        clock = FakeClock()
+
+        @timed_phase("format")
+        def format_context() -> str:
+            clock.now += 1.0
+            return "formatted"
+
+        @timed_phase("github")
+        async def call_github() -> str:
+            clock.now += 2.0
+            return "ok"
+
+        timer = PhaseTimer(clock=clock).start()
+        try:
+            assert format_context() == "formatted"
+            assert await call_github() == "ok"
+        finally:
+            timer.finish("test")
+
+        assert timer.phases == {"format": 1.0, "github": 2.0}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_tasks_keep_their_own_paths(self):
+        """Test that concurrent tasks nest phases under their own parent only."""
+        timer = PhaseTimer().start()
+        try:
+
+            async def worker(name: str) -> None:
+                with phase(name):
+                    await asyncio.sleep(0)
+                    with phase("llm_call"):
+                        await asyncio.sleep(0)
+
+            await asyncio.gather(worker("batch_a"), worker("batch_b"))
+        finally:
+            timer.finish("test")
+
+        assert set(timer.phases) == {"batch_a", "batch_a/llm_call", "batch_b", "batch_b/llm_call"}
+
+    def test_phase_timing_enabled(self, monkeypatch):
+        """Test the YELLHORN_MCP_PHASE_TIMING switch."""
+        monkeypatch.delenv("YELLHORN_MCP_PHASE_TIMING", raising=False)
+        assert phase_timing_enabled()
+        monkeypatch.setenv("YELLHORN_MCP_PHASE_TIMING", "off")
+        assert not phase_timing_enabled()
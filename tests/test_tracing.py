@@ -0,0 +1,123 @@
+"""Tests for optional OpenTelemetry tracing – tracing.py."""
+
+import asyncio
+import json
+import sys
+
+import pytest
+
+from yellhorn_mcp import tracing
+from yellhorn_mcp.tracing import (
+    add_span_event,
+    configure_tracing,
+    set_span_attributes,
+    shutdown_tracing,
+    span,
+    traced,
+    traced_command,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_tracing(monkeypatch):
+    monkeypatch.delenv("YELLHORN_MCP_TRACING", raising=False)
+    yield
+    shutdown_tracing()
+
+
+@traced_command("git")
+async def fake_git(repo_path, command: list[str]) -> str:
+    return "a.py\nb.py"
+
+
+class TestTracingDisabled:
+    """Test suite for the no-op path used when tracing is not configured."""
+
+    def test_off_by_default(self, tmp_path):
+        """Test that nothing is configured without YELLHORN_MCP_TRACING."""
+        assert not configure_tracing(tmp_path)
+        assert span("a") is span("b")
+
+    @pytest.mark.asyncio
+    async def test_helpers_are_noops(self):
+        """Test that decorators and helpers pass through without a tracer."""
+
+        @traced("job")
+        async def job() -> str:
+            set_span_attributes({"yellhorn.issue_number": "1"})
+            add_span_event("retry")
+            with span("llm.chunk") as chunk_span:
+                chunk_span.set_attribute("yellhorn.chunk.index", 0)
+            return "done"
+
+        assert await job() == "done"
+        assert await fake_git(None, ["ls-files"]) == "a.py\nb.py"
+        assert job.__name__ == "job"
+
+    def test_unknown_mode(self, tmp_path, monkeypatch, caplog):
+        """Test that an unknown exporter name disables tracing with a warning."""
+        monkeypatch.setenv("YELLHORN_MCP_TRACING", "jaeger")
+        assert not configure_tracing(tmp_path)
+        assert "Unknown YELLHORN_MCP_TRACING value 'jaeger'" in caplog.text
+
+    def test_missing_opentelemetry(self, tmp_path, monkeypatch, caplog):
+        """Test that tracing is disabled with a warning when the extra is not installed."""
+        monkeypatch.setenv("YELLHORN_MCP_TRACING", "file")
+        monkeypatch.setitem(sys.modules, "opentelemetry", None)
+        assert not configure_tracing(tmp_path)
+        assert "install yellhorn-mcp[tracing]" in caplog.text
+        assert tracing._tracer is None
+
+
+class TestTracingEnabled:
+    """Test suite for spans recorded with the OpenTelemetry SDK."""
+
+    @pytest.mark.asyncio
+    async def test_background_job_joins_tool_trace(self, tmp_path):
+        """Test that a job launched from a tool is part of the tool's trace."""
+        pytest.importorskip("opentelemetry.sdk")
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+        exporter = InMemorySpanExporter()
+        assert configure_tracing(tmp_path, exporter=exporter)
+
+        @traced("job judgement")
+        async def job() -> None:
+            set_span_attributes({"yellhorn.issue_number": "7"})
+            with span("llm.chunk", {"yellhorn.chunk.index": 0}):
+                await fake_git(tmp_path, ["diff", "main...HEAD"])
+
+        background: list[asyncio.Task] = []
+
+        @traced("tool judge_workplan")
+        async def tool() -> str:
+            background.append(asyncio.create_task(job()))
+            return "submitted"
+
+        assert await tool() == "submitted"
+        await background[0]
+        shutdown_tracing()
+
+        spans = {s.name: s for s in exporter.get_finished_spans()}
+        assert set(spans) == {"tool judge_workplan", "job judgement", "llm.chunk", "git diff"}
+        assert len({s.context.trace_id for s in spans.values()}) == 1
+        assert spans["job judgement"].parent.span_id == spans["tool judge_workplan"].context.span_id
+        assert spans["git diff"].parent.span_id == spans["llm.chunk"].context.span_id
+        assert spans["job judgement"].attributes["yellhorn.issue_number"] == "7"
+        assert spans["git diff"].attributes["yellhorn.output.bytes"] == len("a.py\nb.py")
+
+    def test_file_exporter(self, tmp_path, monkeypatch):
+        """Test that the file exporter writes one JSON object per span."""
+        pytest.importorskip("opentelemetry.sdk")
+        trace_file = tmp_path / "spans.jsonl"
+        monkeypatch.setenv("YELLHORN_MCP_TRACING", "file")
+        monkeypatch.setenv("YELLHORN_MCP_TRACE_FILE", str(trace_file))
+        assert configure_tracing(tmp_path)
+
+        with span("codebase_snapshot", {"yellhorn.files": 3}):
+            pass
+        shutdown_tracing()
+
+        records = [json.loads(line) for line in trace_file.read_text().splitlines()]
+        assert [record["name"] for record in records] == ["codebase_snapshot"]
+        assert records[0]["attributes"]["yellhorn.files"] == 3
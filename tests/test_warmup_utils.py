@@ -0,0 +1,115 @@
+"""Tests for the startup warm-up – warmup_utils.py."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from tests.helpers import init_git_repo
+from yellhorn_mcp.formatters.snapshot_cache import SnapshotCache
+from yellhorn_mcp.token_counter import TokenCounter, get_token_counter
+from yellhorn_mcp.utils.dependency_index import DependencyIndex
+from yellhorn_mcp.utils.retrieval_index import BM25Index
+from yellhorn_mcp.utils.symbol_index import SymbolIndex
+from yellhorn_mcp.utils.warmup_utils import warm_up, warmup_enabled
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Create a git repository with one commit."""
+    return init_git_repo(
+        tmp_path / "repo",
+        {
+            "app.py": "import util\n\n\ndef serve_requests():\n    pass\n",
+            "util.py": "def parse_config():\n    pass\n",
+        },
+    )
+
+
+class TestWarmUp:
+    """Test suite for warm_up."""
+
+    @pytest.mark.asyncio
+    async def test_builds_caches_for_current_head(self, git_repo):
+        """Test that the tokenizer, snapshot and every index are warmed up."""
+        counter = MagicMock()
+        cache = SnapshotCache()
+        symbols = SymbolIndex()
+        dependencies = DependencyIndex()
+        retrieval = BM25Index()
+        try:
+            timings = await warm_up(
+                git_repo,
+                "gpt-4o",
+                cache,
+                [("symbol", symbols), ("dependency", dependencies), ("retrieval", retrieval)],
+                token_counter=counter,
+            )
+
+            assert set(timings) == {"tokenizer", "snapshot", "symbol", "dependency", "retrieval"}
+            counter.preload.assert_called_once_with("gpt-4o")
+            snapshot = await cache.get(git_repo)
+            assert sorted(snapshot.file_paths) == ["app.py", "util.py"]
+            assert len(symbols) == 2
+            assert dependencies.edges["app.py"] == {"util.py"}
+            assert retrieval.search("parse_config")[0][0] == "util.py"
+        finally:
+            symbols.close()
+
+    @pytest.mark.asyncio
+    async def test_failing_steps_are_skipped(self, git_repo, caplog):
+        """Test that a failing step is logged and the remaining steps still run."""
+        counter = MagicMock()
+        counter.preload.side_effect = RuntimeError("no network")
+        broken = MagicMock()
+        broken.update.side_effect = ValueError("corrupt")
+        retrieval = BM25Index()
+
+        timings = await warm_up(
+            git_repo,
+            "gpt-4o",
+            SnapshotCache(),
+            [("dependency", broken), ("retrieval", retrieval)],
+            token_counter=counter,
+        )
+
+        assert set(timings) == {"snapshot", "retrieval"}
+        assert "failed to preload the tokenizer" in caplog.text
+        assert "Failed to update the dependency index" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_stops_without_a_snapshot(self, tmp_path):
+        """Test that the indexes are not updated when the repository cannot be listed."""
+        index = MagicMock()
+
+        timings = await warm_up(
+            tmp_path, "gpt-4o", SnapshotCache(), [("symbol", index)], token_counter=MagicMock()
+        )
+
+        assert "snapshot" not in timings
+        index.update.assert_not_called()
+
+    def test_warmup_enabled(self, monkeypatch):
+        """Test the YELLHORN_MCP_WARMUP toggle."""
+        monkeypatch.delenv("YELLHORN_MCP_WARMUP", raising=False)
+        assert warmup_enabled() is True
+        monkeypatch.setenv("YELLHORN_MCP_WARMUP", "OFF")
+        assert warmup_enabled() is False
+
+
+class TestSharedTokenCounter:
+    """Test suite for the process-wide TokenCounter."""
+
+    def test_get_token_counter_returns_one_instance(self):
+        """Test that every caller gets the same counter."""
+        assert isinstance(get_token_counter(), TokenCounter)
+        assert get_token_counter() is get_token_counter()
+
+    def test_preload_loads_encoding(self):
+        """Test that preload fills the encoding cache for the model's encoding."""
+        counter = TokenCounter()
+        with patch("tiktoken.get_encoding", return_value=MagicMock()) as mock_get_encoding:
+            counter.preload("gpt-4o")
+            counter.preload("gpt-4o")
+
+        mock_get_encoding.assert_called_once_with("o200k_base")
+        assert "o200k_base" in counter._encoding_cache
@@ -0,0 +1,132 @@
+"""Tests for the filesystem watcher – watch_utils.py."""
+
+import asyncio
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from tests.helpers import init_git_repo
+from yellhorn_mcp.formatters.snapshot_cache import SnapshotCache
+from yellhorn_mcp.utils.retrieval_index import BM25Index
+from yellhorn_mcp.utils.watch_utils import RepositoryWatcher, _stat_tree, watch_mode
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Create a git repository with one commit."""
+    return init_git_repo(
+        tmp_path / "repo", {"src/main.py": "def main(): pass\n", "README.md": "# Demo\n"}
+    )
+
+
+def _touch(path: Path, content: str) -> None:
+    """Write a file and move its mtime forward so coarse timestamps still change."""
+    path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+
+async def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.02)
+
+
+class TestRepositoryWatcher:
+    """Test suite for RepositoryWatcher."""
+
+    def test_handle_changes_marks_paths_dirty(self, git_repo):
+        """Test that reported paths are recorded and forwarded to the snapshot cache."""
+        cache = MagicMock()
+        watcher = RepositoryWatcher(git_repo, cache)
+
+        watcher.handle_changes(["src/main.py", ".git/index", ".git"])
+
+        assert watcher.dirty == {"src/main.py"}
+        cache.mark_changed.assert_called_once_with(git_repo, ["src/main.py"])
+
+    def test_event_storm_discards_snapshot(self, git_repo):
+        """Test that exceeding the event rate stops tracking individual paths."""
+        cache = MagicMock()
+        watcher = RepositoryWatcher(git_repo, cache, max_events_per_second=3)
+
+        watcher.handle_changes(["a.py", "b.py"])
+        watcher.handle_changes(["c.py", "d.py"])
+        watcher.handle_changes(["e.py"])
+
+        assert watcher.overflowed
+        assert watcher.dirty == set()
+        cache.mark_changed.assert_called_with(git_repo, None)
+        assert cache.mark_changed.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_refresh_rereads_changed_files_and_updates_indexes(self, git_repo):
+        """Test that a refresh takes the snapshot, reads dirty files and updates indexes."""
+        cache = SnapshotCache()
+        cache.watch(git_repo)
+        index = BM25Index()
+        watcher = RepositoryWatcher(git_repo, cache, [("retrieval", index)])
+
+        (git_repo / "src" / "extra.py").write_text("def handle_webhook(): pass\n")
+        watcher.handle_changes(["src/extra.py"])
+        await watcher.refresh()
+
+        snapshot = cache.current(git_repo)
+        assert "src/extra.py" in snapshot.file_paths
+        assert "src/extra.py" in snapshot._contents
+        assert index.search("handle_webhook")[0][0] == "src/extra.py"
+        assert watcher.dirty == set()
+
+    @pytest.mark.asyncio
+    async def test_polling_reports_edits_and_new_files(self, git_repo):
+        """Test that the polling backend keeps a watched snapshot current."""
+        cache = SnapshotCache()
+        watcher = RepositoryWatcher(git_repo, cache, debounce=0.05, poll_interval=0.05)
+        await watcher.start()
+        try:
+            snapshot = await cache.get(git_repo)
+            assert snapshot.read_text("src/main.py") == "def main(): pass\n"
+            # Let the first scan take its baseline
+            await asyncio.sleep(0.2)
+
+            _touch(git_repo / "src" / "main.py", "def main(): return 1\n")
+            await _wait_for(lambda: "src/main.py" not in snapshot._contents)
+            assert snapshot.read_text("src/main.py") == "def main(): return 1\n"
+
+            _touch(git_repo / "src" / "new.py", "x = 1\n")
+            os.utime(git_repo / "src", ns=(0, (git_repo / "src").stat().st_mtime_ns + 10**10))
+            await _wait_for(lambda: "src/new.py" in (cache.current(git_repo) or snapshot))
+        finally:
+            await watcher.stop()
+
+        assert not cache.current(git_repo).watched
+
+    def test_stat_tree_includes_parent_directories(self, git_repo):
+        """Test that every directory above a file is stat'ed so additions are seen."""
+        state = _stat_tree(git_repo, ["src/main.py", "README.md", "missing/file.py"])
+
+        assert set(state) == {
+            "src/main.py",
+            "README.md",
+            "missing/file.py",
+            "src/",
+            "./",
+            "missing/",
+        }
+        assert state["missing/file.py"] is None
+        assert state["src/"] is not None
+
+    def test_watch_mode(self, monkeypatch):
+        """Test the YELLHORN_MCP_WATCH setting."""
+        monkeypatch.delenv("YELLHORN_MCP_WATCH", raising=False)
+        assert watch_mode() == "off"
+        monkeypatch.setenv("YELLHORN_MCP_WATCH", "poll")
+        assert watch_mode() == "poll"
+        monkeypatch.setenv("YELLHORN_MCP_WATCH", "on")
+        with patch("importlib.util.find_spec", return_value=None):
+            assert watch_mode() == "poll"
+        with patch("importlib.util.find_spec", return_value=MagicMock()):
+            assert watch_mode() == "watchfiles"
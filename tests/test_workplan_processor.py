@@ -372,6 +372,52 @@ class TestGenerateAndUpdateIssue:
         assert first_call[0][1][2] == "123"
         assert "Generated workplan content" in first_call[0][1][4]
 
+    @pytest.mark.asyncio
+    async def test_generate_and_update_issue_reports_cached_tokens(self, tmp_path):
+        """Test that cached input tokens are reported and priced in the completion comment."""
+        repo_path = tmp_path / "repo"
+        repo_path.mkdir()
+
+        mock_llm_manager = MagicMock(spec=LLMManager)
+        mock_llm_manager._is_openai_model.return_value = True
+        mock_llm_manager.call_llm_with_usage.return_value = {
+            "content": "Generated workplan content",
+            "usage_metadata": UsageMetadata(
+                {
+                    "prompt_tokens": 100_000,
+                    "completion_tokens": 10_000,
+                    "total_tokens": 110_000,
+                    "cached_tokens": 80_000,
+                }
+            ),
+        }
+        mock_github_command = AsyncMock(return_value="")
+
+        await _generate_and_update_issue(
+            repo_path=repo_path,
+            llm_manager=mock_llm_manager,
+            model="o3",
+            prompt="Test prompt",
+            issue_number="123",
+            title="Test Title",
+            content_prefix="# Test Title\n\n",
+            disable_search_grounding=False,
+            debug=False,
+            codebase_reasoning="full",
+            _meta={
+                "start_time": __import__("datetime").datetime.now(
+                    __import__("datetime").timezone.utc
+                )
+            },
+            ctx=None,
+            github_command_func=mock_github_command,
+        )
+
+        comment = mock_github_command.call_args_list[1][0][1][4]
+        assert "**Cached Input Tokens**: 80,000" in comment
+        # 20k uncached at $10/M + 80k cached at $2.50/M + 10k output at $40/M
+        assert "**Estimated Cost**: $0.8000" in comment
+
     @pytest.mark.asyncio
     async def test_generate_and_update_issue_success_gemini(self, tmp_path):
         """Test successful issue generation and update with Gemini."""
@@ -643,6 +689,89 @@ class TestProcessWorkplanAsync:
             assert call_args[4] == "123"  # issue_number is at index 4
             assert "Test description" in call_args[3]  # prompt is at index 3
 
+    @pytest.mark.asyncio
+    async def test_process_workplan_async_codebase_context_first(self, tmp_path):
+        """Test that prompts for different tasks share the codebase context as a prefix."""
+        repo_path = tmp_path / "repo"
+        repo_path.mkdir()
+
+        mock_llm_manager = MagicMock(spec=LLMManager)
+        mock_ctx = MagicMock()
+        mock_ctx.log = AsyncMock()
+
+        prompts = []
+        with (
+            patch(
+                "yellhorn_mcp.processors.workplan_processor.get_codebase_context"
+            ) as mock_codebase,
+            patch(
+                "yellhorn_mcp.processors.workplan_processor._generate_and_update_issue"
+            ) as mock_generate,
+        ):
+            mock_codebase.return_value = "Mock codebase context"
+            for title in ("First task", "Second task"):
+                await process_workplan_async(
+                    repo_path=repo_path,
+                    llm_manager=mock_llm_manager,
+                    model="gpt-4o",
+                    title=title,
+                    issue_number="123",
+                    codebase_reasoning="full",
+                    detailed_description=f"{title} description",
+                    ctx=mock_ctx,
+                )
+                prompts.append(mock_generate.call_args[0][3])
+
+        prefix = "# Codebase Context\nMock codebase context\n\n"
+        assert all(prompt.startswith(prefix) for prompt in prompts)
+        assert mock_generate.call_args[1]["cacheable_prefix_length"] == len(prefix)
+        assert prompts[0].index("Mock codebase context") < prompts[0].index("# Task Title")
+
+    @pytest.mark.asyncio
+    async def test_process_workplan_async_reports_phase_timings(self, tmp_path, monkeypatch):
+        """Test that the completion comment breaks the job down into timed phases."""
+        monkeypatch.delenv("YELLHORN_MCP_PHASE_TIMING", raising=False)
+        repo_path = tmp_path / "repo"
+        repo_path.mkdir()
+
+        mock_llm_manager = MagicMock(spec=LLMManager)
+        mock_llm_manager._is_openai_model.return_value = True
+        mock_llm_manager.call_llm_with_usage.return_value = {
+            "content": "## Summary\nPlan",
+            "usage_metadata": UsageMetadata(
+                {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150}
+            ),
+        }
+        mock_ctx = MagicMock()
+        mock_ctx.log = AsyncMock()
+        mock_github_command = AsyncMock(return_value="")
+
+        with patch(
+            "yellhorn_mcp.processors.workplan_processor.get_codebase_context"
+        ) as mock_codebase:
+            mock_codebase.return_value = "Mock codebase context"
+            await process_workplan_async(
+                repo_path=repo_path,
+                llm_manager=mock_llm_manager,
+                model="gpt-4o",
+                title="Test Workplan",
+                issue_number="123",
+                codebase_reasoning="full",
+                detailed_description="Test description",
+                _meta={
+                    "start_time": __import__("datetime").datetime.now(
+                        __import__("datetime").timezone.utc
+                    )
+                },
+                ctx=mock_ctx,
+                github_command_func=mock_github_command,
+            )
+
+        comment = mock_github_command.call_args_list[-1][0][1][4]
+        assert "**Phase Timings**:" in comment
+        for name in ("codebase_context", "llm_call", "update_issue"):
+            assert f"- `{name}`: " in comment
+
     @pytest.mark.asyncio
     async def test_process_workplan_async_error(self, tmp_path):
         """Test workplan processing with error."""
@@ -2,6 +2,21 @@
 
 __version__ = "0.7.0"
 
-from .server import *
-from .utils.lsp_utils import *
-from .utils.search_grounding_utils import *
+import importlib
+
+# Public names of these modules are re-exported from the package on first access, so that
+# importing a submodule (e.g. for the CLI or a benchmark) does not load the server and SDKs
+_REEXPORTED_MODULES = (".server", ".utils.lsp_utils", ".utils.search_grounding_utils")
+
+
+def __getattr__(name: str):
+    if not name.startswith("__"):
+        for module_name in _REEXPORTED_MODULES:
+            module = importlib.import_module(module_name, __name__)
+            public = getattr(module, "__all__", None)
+            if (name in public) if public is not None else not name.startswith("_"):
+                if hasattr(module, name):
+                    value = getattr(module, name)
+                    globals()[name] = value
+                    return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1 @@
+"""Offline benchmarks for Yellhorn MCP context building."""
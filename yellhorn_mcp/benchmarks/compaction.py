@@ -0,0 +1,100 @@
+"""Benchmark the token savings of the "compact" codebase reasoning mode.
+
+Run against one or more repositories::
+
+    python -m yellhorn_mcp.benchmarks.compaction /path/to/repo [/path/to/other] --model gpt-4o
+
+For each repository the report shows the tokens of the "full" context without
+deduplication, and then with each step of the "compact" mode added in turn: duplicate files
+referenced instead of repeated, license headers and blank-line runs removed, and comments
+stripped. The savings are relative to the first column.
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from yellhorn_mcp.formatters.codebase_snapshot import get_codebase_snapshot
+from yellhorn_mcp.formatters.prompt_formatter import build_codebase_prompt, stream_codebase_prompt
+from yellhorn_mcp.token_counter import TokenCounter
+from yellhorn_mcp.utils.compact_utils import compact_source
+
+
+async def measure_compaction(
+    repo_path: Path, model: str, token_counter: TokenCounter | None = None
+) -> dict:
+    """Measure the context size of a repository with and without compaction.
+
+    Args:
+        repo_path: Path to the repository.
+        model: Model name for token counting.
+        token_counter: Optional counter to reuse.
+
+    Returns:
+        Dict with "files", "full_tokens" (without deduplication), "deduplicated_tokens",
+        "whitespace_tokens" (also license headers and blank runs removed) and
+        "compact_tokens".
+    """
+    token_counter = token_counter or TokenCounter()
+    file_paths, file_contents = await get_codebase_snapshot(
+        repo_path, log_function=lambda msg: None
+    )
+
+    def compacted(strip_comments: bool):
+        def read_file(path: str) -> str | None:
+            content = file_contents.get(path)
+            return None if content is None else compact_source(path, content, strip_comments)
+
+        return stream_codebase_prompt(file_paths, read_file).build()
+
+    full = build_codebase_prompt(file_paths, file_contents, deduplicate=False).build()
+    deduplicated = build_codebase_prompt(file_paths, file_contents).build()
+    return {
+        "files": len(file_contents),
+        "full_tokens": token_counter.count_tokens(full, model),
+        "deduplicated_tokens": token_counter.count_tokens(deduplicated, model),
+        "whitespace_tokens": token_counter.count_tokens(compacted(False), model),
+        "compact_tokens": token_counter.count_tokens(compacted(True), model),
+    }
+
+
+def format_report(results: dict[str, dict]) -> str:
+    """Format measurements as a plain-text table.
+
+    Args:
+        results: Measurements from ``measure_compaction`` keyed by repository path.
+
+    Returns:
+        One header line and one line per repository.
+    """
+    lines = [
+        f"{'repository':<40} {'files':>7} {'full':>10} {'dedup':>10} {'headers+ws':>10} "
+        f"{'compact':>10} {'saved':>7}"
+    ]
+    for repo, result in results.items():
+        full = result["full_tokens"]
+        saved = 1 - result["compact_tokens"] / full if full else 0.0
+        lines.append(
+            f"{repo:<40} {result['files']:>7} {full:>10,} {result['deduplicated_tokens']:>10,} "
+            f"{result['whitespace_tokens']:>10,} {result['compact_tokens']:>10,} {saved:>7.1%}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the compaction benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Measure compact-mode token savings")
+    parser.add_argument("repos", nargs="+", help="Repository paths to measure")
+    parser.add_argument("--model", default="gpt-4o", help="Model whose tokenizer to use")
+    args = parser.parse_args(argv)
+
+    token_counter = TokenCounter()
+    results = {
+        repo: asyncio.run(measure_compaction(Path(repo).resolve(), args.model, token_counter))
+        for repo in args.repos
+    }
+    print(format_report(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Import-time benchmark for server and CLI startup.
+
+Imports each module in fresh interpreters with ``python -X importtime`` and reports its
+cumulative import time, the slowest individual imports, and any module that should only be
+loaded on first use (provider SDKs, the tokenizer, jedi)::
+
+    yellhorn-mcp import-time --budget-ms 1500
+    yellhorn-mcp import-time --module yellhorn_mcp.server --runs 5 --output imports.json
+
+Exits with status 1 if a module's median import time exceeds the budget or a lazily loaded
+module was imported, so it can gate CI.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Modules whose startup cost is measured by default
+TARGET_MODULES = ("yellhorn_mcp.cli",)
+
+# Packages that must only be imported on first use, not at startup
+LAZY_MODULES = ("google.genai", "google.api_core", "openai", "tiktoken", "jedi", "aiohttp")
+
+# Median import time allowed for each target module, in milliseconds
+DEFAULT_BUDGET_MS = 1500.0
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """Parse ``-X importtime`` output.
+
+    Args:
+        stderr: Standard error of the interpreter.
+
+    Returns:
+        One ``(module, self_us, cumulative_us)`` row per imported module, in import order.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # Column header
+        rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return rows
+
+
+def _is_lazy(module: str) -> bool:
+    return any(module == lazy or module.startswith(lazy + ".") for lazy in LAZY_MODULES)
+
+
+def _import_once(module: str, python: str) -> list[tuple[str, int, int]]:
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+    return parse_importtime(proc.stderr)
+
+
+def measure_import(module: str, runs: int = 5, top: int = 10, python: str = sys.executable) -> dict:
+    """Measure the import time of a module in fresh interpreters.
+
+    A first, discarded run compiles bytecode so that it is not counted.
+
+    Args:
+        module: Dotted module name.
+        runs: Measured runs.
+        top: Number of slowest imports (by self time) to list.
+        python: Interpreter to run.
+
+    Returns:
+        Dict with "median_ms", "min_ms", "max_ms", the lazily loaded packages that were
+        imported ("lazy_modules_loaded") and the slowest imports of the last run ("slowest").
+    """
+    _import_once(module, python)
+    totals = []
+    rows: list[tuple[str, int, int]] = []
+    for _ in range(runs):
+        rows = _import_once(module, python)
+        totals.append(max(cumulative for name, _, cumulative in rows if name == module))
+    slowest = sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+    return {
+        "module": module,
+        "runs": runs,
+        "median_ms": statistics.median(totals) / 1000,
+        "min_ms": min(totals) / 1000,
+        "max_ms": max(totals) / 1000,
+        "lazy_modules_loaded": sorted(name for name, _, _ in rows if _is_lazy(name)),
+        "slowest": [{"module": name, "self_ms": self_us / 1000} for name, self_us, _ in slowest],
+    }
+
+
+def check_budget(result: dict, budget_ms: float) -> list[str]:
+    """Return the budget violations of one measurement (empty if within budget)."""
+    problems = []
+    if result["median_ms"] > budget_ms:
+        problems.append(
+            f"{result['module']} imports in {result['median_ms']:.0f} ms "
+            f"(budget {budget_ms:.0f} ms)"
+        )
+    if result["lazy_modules_loaded"]:
+        problems.append(
+            f"{result['module']} imports lazily loaded modules: "
+            + ", ".join(result["lazy_modules_loaded"])
+        )
+    return problems
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the import-time benchmark from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="yellhorn-mcp import-time", description="Measure server and CLI import time"
+    )
+    parser.add_argument(
+        "--module",
+        dest="modules",
+        action="append",
+        help=f"Module to import (repeatable; default: {', '.join(TARGET_MODULES)})",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Measured runs (default: 5)")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help=f"Allowed median import time per module (default: {DEFAULT_BUDGET_MS:.0f})",
+    )
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument("--output", type=Path, help="Write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = [
+        measure_import(module, args.runs, args.top) for module in args.modules or TARGET_MODULES
+    ]
+    problems = [problem for result in results for problem in check_budget(result, args.budget_ms)]
+
+    output = json.dumps({"budget_ms": args.budget_ms, "modules": results}, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+    for result in results:
+        print(f"{result['module']}: median {result['median_ms']:.0f} ms", file=sys.stderr)
+    for problem in problems:
+        print(f"Budget exceeded: {problem}", file=sys.stderr)
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
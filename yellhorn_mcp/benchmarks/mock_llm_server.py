@@ -0,0 +1,441 @@
+"""Local stand-in for the OpenAI Responses and Gemini APIs, for offline load testing.
+
+The server answers ``POST /v1/responses`` (OpenAI Responses API) and
+``POST /v1beta/models/{model}:generateContent`` / ``:streamGenerateContent`` (Gemini),
+including server-sent-event streaming, and the Gemini ``cachedContents`` endpoints. Each
+request waits for a sampled time-to-first-token and then "generates" its output tokens at
+a configured throughput, and a configured share of requests fail with 429 or 500, so the
+server's concurrency, rate-limit and retry handling can be exercised without API keys.
+
+Point the real SDK clients at it through their standard environment variables::
+
+    yellhorn-mcp mock-llm --port 8765 --latency lognormal:0.8,0.5 --error-rate-429 0.05
+    export OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=mock
+    export GOOGLE_GEMINI_BASE_URL=http://127.0.0.1:8765 GEMINI_API_KEY=mock
+
+``GET /stats`` reports request, error and concurrency counts.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable
+
+from aiohttp import web
+
+# Rough characters per token used to size prompts without a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Request keys whose string values are structure, not prompt text
+_STRUCTURAL_KEYS = {"role", "type", "id", "name", "mime_type", "mimeType"}
+
+_FILLER = (
+    "The implementation follows the existing module layout and keeps the public interface "
+    "unchanged while the new behavior is covered by focused unit tests."
+).split()
+
+
+class LatencyDistribution:
+    """Samples time-to-first-token delays in seconds."""
+
+    KINDS = ("fixed", "uniform", "normal", "lognormal")
+
+    def __init__(self, kind: str = "fixed", a: float = 0.0, b: float = 0.0):
+        """Initialize a distribution.
+
+        Args:
+            kind: "fixed" (``a`` seconds), "uniform" (between ``a`` and ``b``), "normal"
+                (mean ``a``, standard deviation ``b``) or "lognormal" (median ``a``,
+                sigma ``b``).
+            a: First parameter.
+            b: Second parameter.
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution {kind!r}")
+        self.kind = kind
+        self.a = a
+        self.b = b
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """Parse a "kind:a,b" specification such as "lognormal:0.8,0.5" or "fixed:0.2"."""
+        kind, _, params = spec.partition(":")
+        values = [float(value) for value in params.split(",") if value.strip()]
+        if len(values) > 2:
+            raise ValueError(f"Too many latency parameters in {spec!r}")
+        return cls(kind, *values)
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one delay in seconds (never negative)."""
+        if self.kind == "uniform":
+            value = rng.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            value = rng.gauss(self.a, self.b)
+        elif self.kind == "lognormal":
+            value = self.a * rng.lognormvariate(0.0, self.b) if self.a > 0 else 0.0
+        else:
+            value = self.a
+        return max(value, 0.0)
+
+
+class MockLLMConfig:
+    """Behavior of the mock provider."""
+
+    def __init__(
+        self,
+        latency: LatencyDistribution | None = None,
+        tokens_per_second: float = 200.0,
+        output_tokens: int = 400,
+        error_rate_429: float = 0.0,
+        error_rate_500: float = 0.0,
+        retry_after_seconds: int = 1,
+        seed: int | None = None,
+    ):
+        """Initialize the configuration.
+
+        Args:
+            latency: Time-to-first-token distribution (default: no delay).
+            tokens_per_second: Simulated output throughput; 0 returns output immediately.
+            output_tokens: Number of tokens in each response.
+            error_rate_429: Share of requests answered with 429 (rate limited).
+            error_rate_500: Share of requests answered with 500 (server error).
+            retry_after_seconds: ``Retry-After`` header value for 429 responses.
+            seed: Optional random seed for reproducible latencies and errors.
+        """
+        self.latency = latency or LatencyDistribution()
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.error_rate_429 = error_rate_429
+        self.error_rate_500 = error_rate_500
+        self.retry_after_seconds = retry_after_seconds
+        self.seed = seed
+
+
+def _count_text_tokens(value: Any) -> int:
+    """Estimate the tokens of all strings in a JSON request body."""
+    if isinstance(value, str):
+        return max(len(value) // CHARS_PER_TOKEN, 1) if value else 0
+    if isinstance(value, dict):
+        return sum(
+            _count_text_tokens(item) for key, item in value.items() if key not in _STRUCTURAL_KEYS
+        )
+    if isinstance(value, list):
+        return sum(_count_text_tokens(item) for item in value)
+    return 0
+
+
+class MockLLMServer:
+    """aiohttp application emulating the provider endpoints Yellhorn uses."""
+
+    def __init__(self, config: MockLLMConfig | None = None):
+        """Initialize the server.
+
+        Args:
+            config: Provider behavior; defaults to instant, error-free responses.
+        """
+        self.config = config or MockLLMConfig()
+        self._rng = random.Random(self.config.seed)
+        self._cached_tokens: dict[str, int] = {}
+        self._runner: web.AppRunner | None = None
+        self.stats = {
+            "requests": 0,
+            "completed": 0,
+            "rate_limited": 0,
+            "server_errors": 0,
+            "active": 0,
+            "max_active": 0,
+        }
+        self.app = web.Application()
+        self.app.add_routes(
+            [
+                web.post("/v1/responses", self.handle_openai_response),
+                web.post("/v1beta/models/{target}", self.handle_gemini_generate),
+                web.post("/v1beta/cachedContents", self.handle_cache_create),
+                web.patch("/v1beta/cachedContents/{cache_id}", self.handle_cache_update),
+                web.delete("/v1beta/cachedContents/{cache_id}", self.handle_cache_delete),
+                web.get("/stats", self.handle_stats),
+            ]
+        )
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start listening and return the base URL (port 0 picks a free port)."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{bound_port}"
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _response_text(self, model: str, prompt_tokens: int) -> list[str]:
+        """Return the response split into one piece per output token."""
+        header = f"## Summary\nMock response from {model} for a {prompt_tokens}-token prompt.\n\n"
+        words = [header] + [
+            f"{_FILLER[index % len(_FILLER)]} " for index in range(self.config.output_tokens)
+        ]
+        return words[: max(self.config.output_tokens, 1)]
+
+    def _injected_error(self) -> int | None:
+        roll = self._rng.random()
+        if roll < self.config.error_rate_429:
+            self.stats["rate_limited"] += 1
+            return 429
+        if roll < self.config.error_rate_429 + self.config.error_rate_500:
+            self.stats["server_errors"] += 1
+            return 500
+        return None
+
+    async def _generate(self, pieces: list[str]) -> AsyncIterator[str]:
+        """Yield response pieces after the first-token delay, paced at the throughput."""
+        await asyncio.sleep(self.config.latency.sample(self._rng))
+        start = time.monotonic()
+        for index, piece in enumerate(pieces):
+            if self.config.tokens_per_second > 0:
+                due = start + index / self.config.tokens_per_second
+                delay = due - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield piece
+
+    async def _serve(
+        self,
+        request: web.Request,
+        error_body: Callable[[int], dict],
+        handler: Callable[[], Any],
+    ) -> web.StreamResponse:
+        """Track concurrency and inject errors around a request handler."""
+        self.stats["requests"] += 1
+        self.stats["active"] += 1
+        self.stats["max_active"] = max(self.stats["max_active"], self.stats["active"])
+        try:
+            status = self._injected_error()
+            if status is not None:
+                headers = {"Retry-After": str(self.config.retry_after_seconds)}
+                if status == 500:
+                    headers = {}
+                return web.json_response(error_body(status), status=status, headers=headers)
+            response = await handler()
+            self.stats["completed"] += 1
+            return response
+        finally:
+            self.stats["active"] -= 1
+
+    async def _stream_events(
+        self, request: web.Request, events: AsyncIterator[str]
+    ) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        async for event in events:
+            await response.write(event.encode("utf-8"))
+        await response.write_eof()
+        return response
+
+    # OpenAI Responses API
+
+    async def handle_openai_response(self, request: web.Request) -> web.StreamResponse:
+        """Answer ``POST /v1/responses`` in the OpenAI Responses format."""
+        body = await request.json()
+
+        def error_body(status: int) -> dict:
+            kind = "rate_limit_exceeded" if status == 429 else "server_error"
+            return {"error": {"message": f"Mock {kind}", "type": kind, "code": kind}}
+
+        async def handler() -> web.StreamResponse:
+            model = body.get("model", "mock")
+            prompt_tokens = _count_text_tokens([body.get("input"), body.get("instructions")])
+            pieces = self._response_text(model, prompt_tokens)
+            response_id = f"resp_{uuid.uuid4().hex}"
+            item_id = f"msg_{uuid.uuid4().hex}"
+
+            def response_object(text: str, status: str) -> dict:
+                return {
+                    "id": response_id,
+                    "object": "response",
+                    "created_at": int(time.time()),
+                    "model": model,
+                    "status": status,
+                    "output": [
+                        {
+                            "type": "message",
+                            "id": item_id,
+                            "status": status,
+                            "role": "assistant",
+                            "content": [{"type": "output_text", "text": text, "annotations": []}],
+                        }
+                    ],
+                    "parallel_tool_calls": True,
+                    "tool_choice": "auto",
+                    "tools": [],
+                    "usage": {
+                        "input_tokens": prompt_tokens,
+                        "input_tokens_details": {"cached_tokens": 0},
+                        "output_tokens": len(pieces),
+                        "output_tokens_details": {"reasoning_tokens": 0},
+                        "total_tokens": prompt_tokens + len(pieces),
+                    },
+                }
+
+            if not body.get("stream"):
+                text = "".join([piece async for piece in self._generate(pieces)])
+                return web.json_response(response_object(text, "completed"))
+
+            async def events() -> AsyncIterator[str]:
+                sequence = 0
+
+                def event(kind: str, data: dict) -> str:
+                    nonlocal sequence
+                    sequence += 1
+                    payload = {"type": kind, "sequence_number": sequence, **data}
+                    return f"event: {kind}\ndata: {json.dumps(payload)}\n\n"
+
+                yield event("response.created", {"response": response_object("", "in_progress")})
+                text = []
+                async for piece in self._generate(pieces):
+                    text.append(piece)
+                    yield event(
+                        "response.output_text.delta",
+                        {"item_id": item_id, "output_index": 0, "content_index": 0, "delta": piece},
+                    )
+                yield event(
+                    "response.completed", {"response": response_object("".join(text), "completed")}
+                )
+
+            return await self._stream_events(request, events())
+
+        return await self._serve(request, error_body, handler)
+
+    # Gemini API
+
+    async def handle_gemini_generate(self, request: web.Request) -> web.StreamResponse:
+        """Answer ``generateContent`` and ``streamGenerateContent`` in the Gemini format."""
+        model, _, method = request.match_info["target"].partition(":")
+        if method not in ("generateContent", "streamGenerateContent"):
+            raise web.HTTPNotFound()
+        body = await request.json()
+
+        def error_body(status: int) -> dict:
+            state = "RESOURCE_EXHAUSTED" if status == 429 else "INTERNAL"
+            return {"error": {"code": status, "message": f"Mock {state}", "status": state}}
+
+        async def handler() -> web.StreamResponse:
+            cached_tokens = self._cached_tokens.get(body.get("cachedContent", ""), 0)
+            prompt_tokens = _count_text_tokens(body.get("contents")) + cached_tokens
+            pieces = self._response_text(model, prompt_tokens)
+
+            def chunk(text: str, done: bool, output_tokens: int) -> dict:
+                candidate: dict[str, Any] = {
+                    "content": {"parts": [{"text": text}], "role": "model"},
+                    "index": 0,
+                }
+                if done:
+                    candidate["finishReason"] = "STOP"
+                usage = {
+                    "promptTokenCount": prompt_tokens,
+                    "candidatesTokenCount": output_tokens,
+                    "totalTokenCount": prompt_tokens + output_tokens,
+                }
+                if cached_tokens:
+                    usage["cachedContentTokenCount"] = cached_tokens
+                return {"candidates": [candidate], "usageMetadata": usage, "modelVersion": model}
+
+            if method == "generateContent":
+                text = "".join([piece async for piece in self._generate(pieces)])
+                return web.json_response(chunk(text, True, len(pieces)))
+
+            async def events() -> AsyncIterator[str]:
+                generated = 0
+                async for piece in self._generate(pieces):
+                    generated += 1
+                    done = generated == len(pieces)
+                    yield f"data: {json.dumps(chunk(piece, done, generated))}\r\n\r\n"
+
+            return await self._stream_events(request, events())
+
+        return await self._serve(request, error_body, handler)
+
+    async def handle_cache_create(self, request: web.Request) -> web.Response:
+        """Answer ``POST /v1beta/cachedContents``."""
+        body = await request.json()
+        name = f"cachedContents/{uuid.uuid4().hex}"
+        self._cached_tokens[name] = _count_text_tokens(body.get("contents"))
+        return web.json_response(
+            {
+                "name": name,
+                "model": body.get("model"),
+                "usageMetadata": {"totalTokenCount": self._cached_tokens[name]},
+            }
+        )
+
+    async def handle_cache_update(self, request: web.Request) -> web.Response:
+        """Answer ``PATCH /v1beta/cachedContents/{id}`` (TTL refresh)."""
+        name = f"cachedContents/{request.match_info['cache_id']}"
+        if name not in self._cached_tokens:
+            raise web.HTTPNotFound()
+        return web.json_response({"name": name})
+
+    async def handle_cache_delete(self, request: web.Request) -> web.Response:
+        """Answer ``DELETE /v1beta/cachedContents/{id}``."""
+        self._cached_tokens.pop(f"cachedContents/{request.match_info['cache_id']}", None)
+        return web.json_response({})
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        """Answer ``GET /stats`` with request, error and concurrency counts."""
+        return web.json_response(self.stats)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the mock provider from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="yellhorn-mcp mock-llm",
+        description="Serve mock OpenAI Responses and Gemini endpoints for load testing",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to bind (default: 8765)")
+    parser.add_argument(
+        "--latency",
+        type=LatencyDistribution.parse,
+        default=LatencyDistribution(),
+        help="Time to first token: fixed:S, uniform:MIN,MAX, normal:MEAN,STD or "
+        "lognormal:MEDIAN,SIGMA in seconds (default: fixed:0)",
+    )
+    parser.add_argument(
+        "--tokens-per-second",
+        type=float,
+        default=200.0,
+        help="Simulated output throughput; 0 for instant output (default: 200)",
+    )
+    parser.add_argument(
+        "--output-tokens", type=int, default=400, help="Tokens per response (default: 400)"
+    )
+    parser.add_argument(
+        "--error-rate-429", type=float, default=0.0, help="Share of requests rate limited"
+    )
+    parser.add_argument(
+        "--error-rate-500", type=float, default=0.0, help="Share of requests failing with 500"
+    )
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible runs")
+    args = parser.parse_args(argv)
+
+    server = MockLLMServer(
+        MockLLMConfig(
+            latency=args.latency,
+            tokens_per_second=args.tokens_per_second,
+            output_tokens=args.output_tokens,
+            error_rate_429=args.error_rate_429,
+            error_rate_500=args.error_rate_500,
+            seed=args.seed,
+        )
+    )
+    web.run_app(server.app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
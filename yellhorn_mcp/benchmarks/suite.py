@@ -0,0 +1,292 @@
+"""Offline performance benchmarks for snapshotting, formatting and chunking.
+
+Generates synthetic repositories (see ``synthetic_repo``) and times the context-building
+steps on them without any network or API access::
+
+    yellhorn-mcp bench --sizes 1k,10k --repeat 3 --output results.json
+    yellhorn-mcp bench --sizes 1k,10k --compare results.json
+
+Results are written as JSON with the Yellhorn version and source commit, so runs on
+different commits can be compared with ``--compare``.
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from yellhorn_mcp import __version__
+from yellhorn_mcp.benchmarks.synthetic_repo import SIZES, SyntheticRepository, load_or_generate
+from yellhorn_mcp.formatters.codebase_snapshot import get_codebase_snapshot
+from yellhorn_mcp.formatters.context_fetcher import apply_token_limit
+from yellhorn_mcp.formatters.prompt_formatter import format_codebase_for_prompt
+from yellhorn_mcp.llm_manager import ChunkingStrategy
+from yellhorn_mcp.token_counter import TokenCounter
+from yellhorn_mcp.utils.lsp_utils import get_lsp_diff, get_lsp_snapshot
+
+# Version of the JSON result layout
+RESULTS_SCHEMA = 1
+
+BENCHMARKS = (
+    "get_codebase_snapshot",
+    "get_lsp_snapshot",
+    "get_lsp_diff",
+    "format_codebase_for_prompt",
+    "apply_token_limit",
+    "split_by_sentences",
+    "split_by_paragraphs",
+)
+
+
+def _silent(message: str) -> None:
+    pass
+
+
+async def _timed(func: Callable[[], Any], repeat: int) -> tuple[dict, Any]:
+    """Run ``func`` ``repeat`` times and return its timings and last result."""
+    runs = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        if inspect.isawaitable(result):
+            result = await result
+        runs.append(time.perf_counter() - start)
+    timing = {
+        "runs": repeat,
+        "min": min(runs),
+        "median": statistics.median(runs),
+        "max": max(runs),
+    }
+    return timing, result
+
+
+async def run_benchmarks(
+    repository: SyntheticRepository,
+    model: str = "gpt-4o",
+    repeat: int = 3,
+    token_limit: int = 100_000,
+    token_counter: TokenCounter | None = None,
+) -> dict:
+    """Time each context-building step on one repository.
+
+    Args:
+        repository: Repository to benchmark.
+        model: Model whose tokenizer is used.
+        repeat: Runs per benchmark.
+        token_limit: Budget for ``apply_token_limit``; the limited context is chunked into
+            pieces of a quarter of this budget.
+        token_counter: Optional counter for the chunking benchmarks.
+
+    Returns:
+        Dict with "files", "context_chars", "chunks" and per-benchmark timings under
+        "benchmarks" (seconds: "min", "median", "max").
+    """
+    token_counter = token_counter or TokenCounter()
+    timings: dict[str, dict] = {}
+    path = repository.path
+
+    timings["get_codebase_snapshot"], (file_paths, file_contents) = await _timed(
+        lambda: get_codebase_snapshot(path, log_function=_silent), repeat
+    )
+    timings["get_lsp_snapshot"], _ = await _timed(
+        lambda: get_lsp_snapshot(path, file_paths), repeat
+    )
+    timings["get_lsp_diff"], _ = await _timed(
+        lambda: get_lsp_diff(
+            path, repository.base_ref, repository.head_ref, repository.changed_files
+        ),
+        repeat,
+    )
+    timings["format_codebase_for_prompt"], context = await _timed(
+        lambda: format_codebase_for_prompt(file_paths, file_contents), repeat
+    )
+    timings["apply_token_limit"], limited = await _timed(
+        lambda: apply_token_limit(context, token_limit, model, _silent), repeat
+    )
+    chunk_tokens = max(token_limit // 4, 1)
+    timings["split_by_sentences"], chunks = await _timed(
+        lambda: ChunkingStrategy.split_by_sentences(limited, chunk_tokens, token_counter, model),
+        repeat,
+    )
+    timings["split_by_paragraphs"], _ = await _timed(
+        lambda: ChunkingStrategy.split_by_paragraphs(limited, chunk_tokens, token_counter, model),
+        repeat,
+    )
+    return {
+        "files": len(file_paths),
+        "context_chars": len(context),
+        "chunks": len(chunks),
+        "benchmarks": timings,
+    }
+
+
+def _source_commit() -> str | None:
+    """Return the git commit of the Yellhorn source tree, if it is a checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+async def run_suite(
+    sizes: dict[str, int],
+    workdir: Path,
+    model: str = "gpt-4o",
+    repeat: int = 3,
+    token_limit: int = 100_000,
+    token_counter: TokenCounter | None = None,
+    log_function: Callable[[str], None] = _silent,
+) -> dict:
+    """Generate (or reuse) one repository per size under ``workdir`` and benchmark each.
+
+    Args:
+        sizes: File counts keyed by size label.
+        workdir: Directory holding the synthetic repositories.
+        model: Model whose tokenizer is used.
+        repeat: Runs per benchmark.
+        token_limit: Budget for ``apply_token_limit``.
+        token_counter: Optional counter for the chunking benchmarks.
+        log_function: Function to use for progress messages.
+
+    Returns:
+        JSON-serializable results with run metadata and a "sizes" mapping.
+    """
+    token_counter = token_counter or TokenCounter()
+    results: dict[str, dict] = {}
+    for label, file_count in sizes.items():
+        log_function(f"Preparing {label} repository ({file_count} files)")
+        repository = load_or_generate(workdir / label, file_count)
+        log_function(f"Benchmarking {label} repository")
+        results[label] = {
+            "file_count": file_count,
+            **await run_benchmarks(repository, model, repeat, token_limit, token_counter),
+        }
+    return {
+        "schema": RESULTS_SCHEMA,
+        "yellhorn_version": __version__,
+        "commit": _source_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "model": model,
+        "repeat": repeat,
+        "token_limit": token_limit,
+        "sizes": results,
+    }
+
+
+def compare_results(baseline: dict, current: dict) -> str:
+    """Format the median timings of two result sets side by side.
+
+    Args:
+        baseline: Results of an earlier run.
+        current: Results of this run.
+
+    Returns:
+        A plain-text table with one line per size and benchmark present in both.
+    """
+    lines = [
+        f"{'size':<6} {'benchmark':<28} {'baseline':>10} {'current':>10} {'change':>8}",
+    ]
+    for label, result in current["sizes"].items():
+        previous = baseline.get("sizes", {}).get(label)
+        if previous is None:
+            continue
+        for name in BENCHMARKS:
+            if name not in result["benchmarks"] or name not in previous["benchmarks"]:
+                continue
+            before = previous["benchmarks"][name]["median"]
+            after = result["benchmarks"][name]["median"]
+            change = f"{after / before - 1:+.1%}" if before else "n/a"
+            lines.append(f"{label:<6} {name:<28} {before:>9.4f}s {after:>9.4f}s {change:>8}")
+    return "\n".join(lines)
+
+
+def parse_sizes(value: str) -> dict[str, int]:
+    """Parse a comma-separated list of size labels ("1k") or file counts ("2500")."""
+    sizes = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        if item in SIZES:
+            sizes[item] = SIZES[item]
+        elif item.isdigit() and int(item) > 0:
+            sizes[item] = int(item)
+        else:
+            raise argparse.ArgumentTypeError(
+                f"Unknown size {item!r}; use {', '.join(SIZES)} or a file count"
+            )
+    return sizes
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="yellhorn-mcp bench", description="Benchmark context building offline"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=parse_sizes,
+        default=parse_sizes("1k,10k"),
+        help="Comma-separated repository sizes: 1k, 10k, 100k or file counts (default: 1k,10k)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark (default: 3)")
+    parser.add_argument("--model", default="gpt-4o", help="Model whose tokenizer to use")
+    parser.add_argument(
+        "--token-limit",
+        type=int,
+        default=100_000,
+        help="Token budget for apply_token_limit and chunking (default: 100000)",
+    )
+    parser.add_argument(
+        "--workdir",
+        type=Path,
+        help="Keep the synthetic repositories here and reuse them on later runs "
+        "(default: a temporary directory)",
+    )
+    parser.add_argument("--output", type=Path, help="Write JSON results here instead of stdout")
+    parser.add_argument("--compare", type=Path, help="Earlier JSON results to compare against")
+    args = parser.parse_args(argv)
+
+    def log(message: str) -> None:
+        print(message, file=sys.stderr)
+
+    with tempfile.TemporaryDirectory(prefix="yellhorn-bench-") as temp_dir:
+        workdir = args.workdir or Path(temp_dir)
+        results = asyncio.run(
+            run_suite(
+                args.sizes,
+                workdir,
+                args.model,
+                args.repeat,
+                args.token_limit,
+                log_function=log,
+            )
+        )
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+    if args.compare:
+        log(compare_results(json.loads(args.compare.read_text()), results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Deterministic synthetic git repositories for the offline benchmarks.
+
+A generated repository mixes Python packages, Go packages, Markdown/text files and
+binary blobs in nested directories. Some directories carry their own ``.gitignore`` with
+ignored build logs, and a root ``.yellhornignore`` hides a generated-code directory, so
+the snapshot code exercises its filtering paths. Two commits are made: the base commit
+with every file and a head commit that changes a fraction of the source files, which
+gives ``get_lsp_diff`` something to compare.
+"""
+
+import json
+import random
+import subprocess
+from pathlib import Path
+
+# Named repository sizes accepted by the benchmark command
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+# Files generated per directory
+FILES_PER_DIR = 50
+
+# Relative share of each file kind
+KIND_WEIGHTS = {"python": 45, "go": 25, "text": 20, "binary": 10}
+
+# Fraction of source files changed by the head commit
+CHANGED_RATIO = 0.01
+
+# Written inside .git so it is neither tracked nor part of the snapshot
+METADATA_FILE = "yellhorn-synthetic.json"
+
+_WORDS = (
+    "token context snapshot workplan judgement diff review cache index budget prompt model "
+    "file path import module package signature request response latency chunk"
+).split()
+
+_EXTENSIONS = {"python": ".py", "go": ".go", "text": ".md", "binary": ".bin"}
+
+
+class SyntheticRepository:
+    """A generated repository and the refs the benchmarks compare."""
+
+    def __init__(
+        self,
+        path: Path,
+        file_count: int,
+        base_ref: str,
+        head_ref: str,
+        changed_files: list[str],
+    ):
+        self.path = path
+        self.file_count = file_count
+        self.base_ref = base_ref
+        self.head_ref = head_ref
+        self.changed_files = changed_files
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary (without the path)."""
+        return {
+            "file_count": self.file_count,
+            "base_ref": self.base_ref,
+            "head_ref": self.head_ref,
+            "changed_files": self.changed_files,
+        }
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(_WORDS, k=rng.randint(6, 14))
+    return " ".join(words).capitalize() + "."
+
+
+def _python_source(rng: random.Random, module: str, siblings: list[str]) -> str:
+    lines = [f'"""{_sentence(rng)}"""', "", "import os"]
+    lines.extend(f"from . import {name}" for name in rng.sample(siblings, min(2, len(siblings))))
+    for index in range(rng.randint(1, 3)):
+        class_name = f"{module.title().replace('_', '')}Handler{index}"
+        lines.extend(
+            [
+                "",
+                "",
+                f"class {class_name}:",
+                f'    """{_sentence(rng)}"""',
+                "",
+                "    def __init__(self, path: str, limit: int = 10):",
+                "        self.path = path",
+                "        self.limit = limit",
+            ]
+        )
+        for method in range(rng.randint(2, 5)):
+            lines.extend(
+                [
+                    "",
+                    f"    def process_{method}(self, items: list[str]) -> list[str]:",
+                    f'        """{_sentence(rng)}"""',
+                    "        # Keep the first items within the limit",
+                    "        return [os.path.join(self.path, item) for item in items[: self.limit]]",
+                ]
+            )
+    for index in range(rng.randint(1, 4)):
+        lines.extend(
+            [
+                "",
+                "",
+                f"def helper_{index}(value: int) -> int:",
+                f'    """{_sentence(rng)}"""',
+                f"    return value * {rng.randint(2, 9)}",
+            ]
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _go_source(rng: random.Random, package: str) -> str:
+    lines = [f"// Package {package} {_sentence(rng).lower()}", f"package {package}", ""]
+    lines.extend(['import "strings"', ""])
+    for index in range(rng.randint(1, 3)):
+        name = f"Worker{index}"
+        lines.extend(
+            [
+                f"// {name} {_sentence(rng).lower()}",
+                f"type {name} struct {{",
+                "\tName  string",
+                "\tLimit int",
+                "}",
+                "",
+                f"// Run {_sentence(rng).lower()}",
+                f"func (w *{name}) Run(items []string) string {{",
+                "\treturn strings.Join(items[:w.Limit], w.Name)",
+                "}",
+                "",
+            ]
+        )
+    return "\n".join(lines)
+
+
+def _text_source(rng: random.Random, title: str) -> str:
+    paragraphs = [
+        " ".join(_sentence(rng) for _ in range(rng.randint(3, 8))) for _ in range(rng.randint(2, 6))
+    ]
+    return f"# {title}\n\n" + "\n\n".join(paragraphs) + "\n"
+
+
+def _git(repo_path: Path, *args: str) -> str:
+    result = subprocess.run(
+        [
+            "git",
+            "-c",
+            "user.name=Yellhorn Bench",
+            "-c",
+            "user.email=bench@example.com",
+            "-c",
+            "commit.gpgsign=false",
+            *args,
+        ],
+        cwd=repo_path,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip()
+
+
+def generate_repository(repo_path: Path, file_count: int, seed: int = 0) -> SyntheticRepository:
+    """Generate a synthetic git repository with two commits.
+
+    Args:
+        repo_path: Directory to create the repository in (created if missing).
+        file_count: Number of source, text and binary files to generate. Package
+            ``__init__.py`` files and ignore files come on top.
+        seed: Random seed; the same seed and size always give the same repository.
+
+    Returns:
+        The generated repository with its base and head refs.
+    """
+    rng = random.Random(seed)
+    repo_path.mkdir(parents=True, exist_ok=True)
+    _git(repo_path, "init", "-q")
+
+    kinds = rng.choices(list(KIND_WEIGHTS), weights=list(KIND_WEIGHTS.values()), k=file_count)
+    sources: list[str] = []
+    for start in range(0, file_count, FILES_PER_DIR):
+        dir_index = start // FILES_PER_DIR
+        directory = repo_path / "src" / f"group_{dir_index // 20:03d}" / f"pkg_{dir_index:04d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        batch = kinds[start : start + FILES_PER_DIR]
+        modules = [f"module_{index:02d}" for index, kind in enumerate(batch) if kind == "python"]
+        for index, kind in enumerate(batch):
+            name = f"module_{index:02d}{_EXTENSIONS[kind]}"
+            file_path = directory / name
+            if kind == "python":
+                others = [module for module in modules if module != f"module_{index:02d}"]
+                file_path.write_text(_python_source(rng, f"module_{index:02d}", others))
+            elif kind == "go":
+                file_path.write_text(_go_source(rng, f"pkg_{dir_index:04d}"))
+            elif kind == "text":
+                file_path.write_text(_text_source(rng, f"Notes {dir_index}.{index}"))
+            else:
+                file_path.write_bytes(b"\x00" + rng.randbytes(rng.randint(256, 4096)))
+            if kind in ("python", "go"):
+                sources.append(file_path.relative_to(repo_path).as_posix())
+        if modules:
+            (directory / "__init__.py").write_text("")
+        # Every fifth directory has ignored build output and its own .gitignore
+        if dir_index % 5 == 0:
+            (directory / ".gitignore").write_text("*.log\nbuild/\n")
+            (directory / "build.log").write_text("ignored\n" * 100)
+            (directory / "build").mkdir(exist_ok=True)
+            (directory / "build" / "output.py").write_text("IGNORED = True\n")
+
+    generated = repo_path / "generated"
+    generated.mkdir(exist_ok=True)
+    (generated / "client.py").write_text("GENERATED = True\n" * 200)
+    (repo_path / ".yellhornignore").write_text("generated/\n")
+    (repo_path / ".gitignore").write_text("__pycache__/\n*.pyc\n")
+
+    _git(repo_path, "add", "-A")
+    _git(repo_path, "commit", "-q", "-m", "Synthetic base")
+    base_ref = _git(repo_path, "rev-parse", "HEAD")
+
+    changed = (
+        sorted(rng.sample(sources, max(1, int(len(sources) * CHANGED_RATIO)))) if sources else []
+    )
+    for path in changed:
+        with open(repo_path / path, "a") as handle:
+            if path.endswith(".py"):
+                handle.write("\n\ndef added_in_head(value: int) -> int:\n    return value + 1\n")
+            else:
+                handle.write("\n// AddedInHead is new in the head commit\nfunc AddedInHead() {}\n")
+    if changed:
+        _git(repo_path, "commit", "-q", "-am", "Synthetic head")
+    head_ref = _git(repo_path, "rev-parse", "HEAD")
+
+    repository = SyntheticRepository(repo_path, file_count, base_ref, head_ref, changed)
+    (repo_path / ".git" / METADATA_FILE).write_text(json.dumps(repository.to_dict()))
+    return repository
+
+
+def load_or_generate(repo_path: Path, file_count: int, seed: int = 0) -> SyntheticRepository:
+    """Reuse a repository generated earlier at ``repo_path`` or generate it.
+
+    Args:
+        repo_path: Directory of the repository.
+        file_count: Number of source, text and binary files to generate.
+        seed: Random seed.
+
+    Returns:
+        The repository; an existing one is reused only if it has the same file count.
+    """
+    metadata_path = repo_path / ".git" / METADATA_FILE
+    if metadata_path.exists():
+        metadata = json.loads(metadata_path.read_text())
+        if metadata.get("file_count") == file_count:
+            return SyntheticRepository(
+                repo_path,
+                file_count,
+                metadata["base_ref"],
+                metadata["head_ref"],
+                metadata["changed_files"],
+            )
+    if repo_path.exists() and any(repo_path.iterdir()):
+        raise ValueError(f"{repo_path} exists and is not a synthetic repository of that size")
+    return generate_repository(repo_path, file_count, seed)
@@ -7,27 +7,41 @@ application, making it easier to integrate with other programs or launch directl
 
 import argparse
 import asyncio
+import importlib
 import logging
 import os
 import sys
 from pathlib import Path
 
-import uvicorn
-
 from yellhorn_mcp.server import is_git_repository, mcp
 
 logging.basicConfig(
     stream=sys.stderr, level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s"
 )
 
+# Subcommands that run instead of the server, mapped to the module whose main() handles them
+SUBCOMMANDS = {
+    "bench": "yellhorn_mcp.benchmarks.suite",
+    "import-time": "yellhorn_mcp.benchmarks.import_time",
+    "index": "yellhorn_mcp.utils.precomputed_index",
+    "mock-llm": "yellhorn_mcp.benchmarks.mock_llm_server",
+}
+
 
 def main():
     """
     Run the Yellhorn MCP server as a standalone command.
 
     This function parses command-line arguments, validates environment variables,
-    and launches the MCP server.
+    and launches the MCP server. ``yellhorn-mcp bench ...`` runs the offline benchmark
+    suite, ``yellhorn-mcp import-time ...`` the import-time benchmark,
+    ``yellhorn-mcp index ...`` the repository indexer and ``yellhorn-mcp mock-llm ...`` the
+    mock LLM provider instead.
     """
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        importlib.import_module(SUBCOMMANDS[sys.argv[1]]).main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(description="Yellhorn MCP Server")
 
     parser.add_argument(
@@ -50,9 +64,11 @@ def main():
         "--codebase-reasoning",
         dest="codebase_reasoning",
         default=os.getenv("YELLHORN_MCP_REASONING", "full"),
-        choices=["full", "lsp", "none"],
+        choices=["full", "compact", "relevant", "lsp", "none"],
         help="Control codebase context for AI processing: "
-        "'full' (all code), 'lsp' (function signatures only), 'none' (no code). "
+        "'full' (all code), 'compact' (code without license headers, comments and blank runs), "
+        "'relevant' (files matching the task in full, signatures for the rest), "
+        "'lsp' (function signatures only), 'none' (no code). "
         "Default: full or YELLHORN_MCP_REASONING env var.",
     )
 
@@ -1,12 +1,28 @@
 """Formatters package for codebase processing and formatting utilities."""
 
 from .codebase_snapshot import get_codebase_snapshot
-from .prompt_formatter import format_codebase_for_prompt, build_file_structure_context
-from .context_fetcher import get_codebase_context
+from .prompt_formatter import (
+    PromptBuilder,
+    build_codebase_prompt,
+    build_file_structure_context,
+    format_codebase_for_prompt,
+    join_codebase_prompt,
+    stream_codebase_prompt,
+)
+from .context_fetcher import get_codebase_context, get_diff_scoped_context
+from .snapshot_cache import RepositorySnapshot, SnapshotCache, get_shared_snapshot
 
 __all__ = [
     "get_codebase_snapshot",
     "build_file_structure_context", 
     "format_codebase_for_prompt",
+    "build_codebase_prompt",
+    "join_codebase_prompt",
+    "PromptBuilder",
+    "stream_codebase_prompt",
     "get_codebase_context",
+    "get_diff_scoped_context",
+    "RepositorySnapshot",
+    "SnapshotCache",
+    "get_shared_snapshot",
 ]
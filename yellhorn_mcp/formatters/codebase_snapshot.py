@@ -1,8 +1,14 @@
 """Codebase snapshot functionality for fetching and filtering repository files."""
 
-from pathlib import Path
-from yellhorn_mcp.utils.git_utils import run_git_command
 import fnmatch
+import os
+import re
+from pathlib import Path
+
+from yellhorn_mcp.formatters.snapshot_cache import RepositorySnapshot
+from yellhorn_mcp.metrics import observe_snapshot
+from yellhorn_mcp.tracing import traced
+from yellhorn_mcp.utils.git_utils import YellhornMCPError, run_git_command
 
 # Global set of file patterns and extensions to always ignore
 # These are files that should never be included in AI context as they are:
@@ -395,8 +401,161 @@ def matches_pattern(path: str, pattern: str) -> bool:
         # File pattern
         return fnmatch.fnmatch(path, pattern)
 
+
+class IgnoreMatcher:
+    """Compiled form of a list of ignore patterns.
+
+    Produces the same results as calling ``matches_pattern`` for every pattern, but
+    folds all patterns into two regular expressions and a prefix tuple so each path
+    is checked in a single pass instead of once per pattern.
+    """
+
+    def __init__(self, patterns):
+        """Compile the given patterns.
+
+        Args:
+            patterns: Iterable of gitignore-style patterns (directory patterns end in "/").
+        """
+        patterns = list(patterns)
+        dir_patterns = [p for p in patterns if p.endswith("/")]
+        file_patterns = [p for p in patterns if not p.endswith("/")]
+
+        self.patterns = patterns
+        self._dir_prefixes = tuple(dir_patterns)
+        self._dir_regex = self._compile(dir_patterns)
+        self._file_regex = self._compile(file_patterns)
+
+    @staticmethod
+    def _compile(patterns: list[str]) -> re.Pattern | None:
+        if not patterns:
+            return None
+        return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def matches(self, path: str) -> bool:
+        """Check whether a repository-relative path matches any of the patterns.
+
+        Args:
+            path: Repository-relative file path using "/" separators.
+
+        Returns:
+            True if the path matches at least one pattern.
+        """
+        if self._file_regex is not None and self._file_regex.match(path):
+            return True
+        if self._dir_prefixes and path.startswith(self._dir_prefixes):
+            return True
+        if self._dir_regex is not None and self._dir_regex.match(path + "/"):
+            return True
+        return False
+
+
+# Compiled once at import time since the always-ignore list never changes
+ALWAYS_IGNORE_MATCHER = IgnoreMatcher(sorted(ALWAYS_IGNORE_PATTERNS))
+
+
+def read_ignore_patterns(file_path: Path) -> list[str]:
+    """Read non-empty, non-comment lines from an ignore-style file.
+
+    Args:
+        file_path: Path to the ignore file.
+
+    Returns:
+        List of patterns, or an empty list if the file does not exist.
+    """
+    if not file_path.exists():
+        return []
+    return [
+        line.strip()
+        for line in file_path.read_text().strip().split("\n")
+        if line.strip() and not line.strip().startswith("#")
+    ]
+
+
+async def list_git_files(repo_path: Path) -> list[str]:
+    """List tracked and untracked, non-ignored files in a single git call.
+
+    Git applies .gitignore, .git/info/exclude and the global excludes file itself,
+    so ignored build outputs and vendored directories are never enumerated.
+
+    Args:
+        repo_path: Path to the repository.
+
+    Returns:
+        Sorted list of repository-relative file paths.
+
+    Raises:
+        YellhornMCPError: If the git command fails (e.g. not a git repository).
+    """
+    output = await run_git_command(
+        repo_path, ["ls-files", "-z", "--cached", "--others", "--exclude-standard"]
+    )
+    return sorted({f for f in output.split("\0") if f})
+
+
+def _walk_files(repo_path: Path) -> list[str]:
+    """Fallback enumeration for directories that are not git repositories."""
+    file_paths = []
+    for root, dirs, files in os.walk(repo_path):
+        # Skip hidden directories; everything else is filtered by the ignore matchers
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for file in files:
+            if file.startswith("."):
+                continue
+            relative_path = os.path.relpath(os.path.join(root, file), repo_path)
+            file_paths.append(relative_path.replace(os.sep, "/"))
+    return sorted(file_paths)
+
+
+async def enumerate_repository_files(
+    repo_path: Path,
+    ignore_file_path: str = ".yellhornignore",
+    log_function=print,
+    snapshot: RepositorySnapshot | None = None,
+) -> list[str]:
+    """List the files that are candidates for AI context.
+
+    Uses the same git enumeration and compiled ignore rules as the snapshot path,
+    but does not apply .yellhorncontext, so it can be used to build that file.
+
+    Args:
+        repo_path: Path to the repository.
+        ignore_file_path: Repository-relative path of the ignore file to apply.
+        log_function: Function to use for logging.
+        snapshot: Optional shared snapshot whose file list is reused instead of calling git.
+
+    Returns:
+        Sorted list of repository-relative file paths.
+    """
+    try:
+        all_files = snapshot.file_paths if snapshot else await list_git_files(repo_path)
+    except YellhornMCPError as e:
+        log_function(f"git ls-files unavailable ({e}), walking the directory instead")
+        all_files = _walk_files(repo_path)
+
+    ignore_patterns = read_ignore_patterns(repo_path / ignore_file_path)
+    ignore_whitelist = IgnoreMatcher(p[1:] for p in ignore_patterns if p.startswith("!"))
+    ignore_blacklist = IgnoreMatcher(p for p in ignore_patterns if not p.startswith("!"))
+
+    file_paths = [
+        f
+        for f in all_files
+        if not ALWAYS_IGNORE_MATCHER.matches(f)
+        and (ignore_whitelist.matches(f) or not ignore_blacklist.matches(f))
+    ]
+    log_function(f"Enumerated {len(file_paths)} of {len(all_files)} files after ignore rules")
+    return file_paths
+
+
+@observe_snapshot
+@traced("codebase_snapshot")
 async def get_codebase_snapshot(
-    repo_path: Path, just_paths: bool = False, log_function=print
+    repo_path: Path,
+    just_paths: bool = False,
+    log_function=print,
+    snapshot: RepositorySnapshot | None = None,
 ) -> tuple[list[str], dict[str, str]]:
     """Get a snapshot of the codebase.
 
@@ -404,6 +563,7 @@ async def get_codebase_snapshot(
         repo_path: Path to the repository.
         just_paths: If True, return only file paths without contents.
         log_function: Function to use for logging.
+        snapshot: Optional shared snapshot; its file list and content cache are reused.
 
     Returns:
         Tuple of (file_paths, file_contents).
@@ -411,42 +571,17 @@ async def get_codebase_snapshot(
     mode_str = "paths" if just_paths else "full"
     log_function(f"Getting codebase snapshot in mode: {mode_str}")
 
-    # Get the .gitignore patterns
-    gitignore_patterns = []
-    gitignore_path = repo_path / ".gitignore"
-    if gitignore_path.exists():
-        gitignore_patterns = [
-            line.strip()
-            for line in gitignore_path.read_text().strip().split("\n")
-            if line.strip() and not line.strip().startswith("#")
-        ]
+    # Get the .gitignore patterns (git applies them itself; read for logging only)
+    gitignore_patterns = read_ignore_patterns(repo_path / ".gitignore")
+    if gitignore_patterns:
         log_function(f"Found .gitignore with {len(gitignore_patterns)} patterns")
 
-    # Get tracked files
-    tracked_files = await run_git_command(repo_path, ["ls-files"])
-    tracked_file_list = tracked_files.strip().split("\n") if tracked_files else []
-
-    # Get untracked files (not ignored by .gitignore)
-    untracked_files = await run_git_command(
-        repo_path, ["ls-files", "--others", "--exclude-standard"]
-    )
-    untracked_file_list = untracked_files.strip().split("\n") if untracked_files else []
-
-    # Combine all files
-    all_files = set(tracked_file_list + untracked_file_list)
-
-    # Filter out empty strings
-    all_files = {f for f in all_files if f}
+    # Get tracked and untracked (not ignored by .gitignore) files
+    all_files = set(snapshot.file_paths if snapshot else await list_git_files(repo_path))
 
     # Check for additional ignore files (.yellhornignore and .yellhorncontext)
-    yellhornignore_path = repo_path / ".yellhornignore"
-    yellhornignore_patterns = []
-    if yellhornignore_path.exists():
-        yellhornignore_patterns = [
-            line.strip()
-            for line in yellhornignore_path.read_text().strip().split("\n")
-            if line.strip() and not line.strip().startswith("#")
-        ]
+    yellhornignore_patterns = read_ignore_patterns(repo_path / ".yellhornignore")
+    if yellhornignore_patterns:
         log_function(f"Found .yellhornignore with {len(yellhornignore_patterns)} patterns")
 
     # Parse .yellhorncontext patterns (supports blacklist, whitelist, and negation)
@@ -456,14 +591,8 @@ async def get_codebase_snapshot(
     context_negation_patterns = []
 
     if yellhorncontext_path.exists():
-        lines = [
-            line.strip()
-            for line in yellhorncontext_path.read_text().strip().split("\n")
-            if line.strip() and not line.strip().startswith("#")
-        ]
-
         # Separate patterns by type
-        for line in lines:
+        for line in read_ignore_patterns(yellhorncontext_path):
             if line.startswith("!"):
                 # Blacklist pattern (exclude this directory/file)
                 context_blacklist_patterns.append(line[1:])  # Remove the '!' prefix
@@ -500,24 +629,24 @@ async def get_codebase_snapshot(
         else:
             # Blacklist pattern in yellhornignore
             yellhornignore_blacklist_patterns.append(pattern)
+
+    # Compile each pattern group once instead of matching pattern-by-pattern per file
+    context_whitelist = IgnoreMatcher(context_whitelist_patterns)
+    context_blacklist = IgnoreMatcher(context_blacklist_patterns)
+    ignore_whitelist = IgnoreMatcher(yellhornignore_whitelist_patterns)
+    ignore_blacklist = IgnoreMatcher(yellhornignore_blacklist_patterns)
     
     # Process each file and categorize it (excluding always-ignored files)
     for file_path in sorted(all_files):
         # Skip files matching always-ignore patterns
-        should_ignore = False
-        for pattern in ALWAYS_IGNORE_PATTERNS:
-            if matches_pattern(file_path, pattern):
-                should_ignore = True
-                break
-        
-        if should_ignore:
+        if ALWAYS_IGNORE_MATCHER.matches(file_path):
             always_ignored_count += 1
             continue
         # Determine which category this file belongs to
-        is_context_whitelisted = any(matches_pattern(file_path, p) for p in context_whitelist_patterns)
-        is_context_blacklisted = any(matches_pattern(file_path, p) for p in context_blacklist_patterns)
-        is_ignore_whitelisted = any(matches_pattern(file_path, p) for p in yellhornignore_whitelist_patterns)
-        is_ignore_blacklisted = any(matches_pattern(file_path, p) for p in yellhornignore_blacklist_patterns)
+        is_context_whitelisted = context_whitelist.matches(file_path)
+        is_context_blacklisted = context_blacklist.matches(file_path)
+        is_ignore_whitelisted = ignore_whitelist.matches(file_path)
+        is_ignore_blacklisted = ignore_blacklist.matches(file_path)
         
         # If we have context whitelist patterns, only include files that match them
         if context_whitelist_patterns and not is_context_whitelisted:
@@ -580,6 +709,16 @@ async def get_codebase_snapshot(
     skipped_large_files = 0
 
     for file_path in file_paths:
+        if snapshot:
+            content = snapshot.read_text(file_path, max_size=MAX_FILE_SIZE)
+            if content is not None:
+                file_contents[file_path] = content
+            elif (repo_path / file_path).is_file() and (
+                (repo_path / file_path).stat().st_size > MAX_FILE_SIZE
+            ):
+                skipped_large_files += 1
+            continue
+
         full_path = repo_path / file_path
         try:
             # Check file size first
@@ -1,13 +1,62 @@
 """Context fetching orchestration for different codebase reasoning modes."""
 
+import os
 from pathlib import Path
 from typing import Callable, Optional
 from .codebase_snapshot import get_codebase_snapshot
-from .prompt_formatter import format_codebase_for_prompt, build_file_structure_context
+from .snapshot_cache import RepositorySnapshot
+from .prompt_formatter import (
+    build_codebase_prompt,
+    build_file_structure_context,
+    stream_codebase_prompt,
+)
+from yellhorn_mcp.utils.dependency_index import DependencyIndex
+from yellhorn_mcp.utils.compact_utils import compact_source
+from yellhorn_mcp.utils.dependency_utils import find_referenced_paths
 from yellhorn_mcp.utils.lsp_utils import get_lsp_snapshot
-from yellhorn_mcp.token_counter import TokenCounter
+from yellhorn_mcp.utils.precomputed_index import get_precomputed_index
+from yellhorn_mcp.utils.retrieval_index import BM25Index
+from yellhorn_mcp.token_counter import get_token_counter
+from yellhorn_mcp.tracing import traced
+from yellhorn_mcp.utils.timing_utils import phase, timed_phase
 
+# Files larger than this are listed but never inlined into diff-scoped or relevant context
+MAX_SCOPED_FILE_SIZE = 1024 * 1024
 
+# Number of best-matching files included in full by the "relevant" reasoning mode
+RELEVANT_TOP_K = 20
+
+
+def near_duplicate_threshold() -> float | None:
+    """Read the near-duplicate similarity threshold from ``YELLHORN_MCP_NEAR_DUPLICATES``.
+
+    Returns:
+        The threshold, or None if near-duplicate detection is off (unset or invalid).
+    """
+    value = os.getenv("YELLHORN_MCP_NEAR_DUPLICATES", "").strip()
+    try:
+        threshold = float(value)
+    except ValueError:
+        return None
+    return threshold if 0 < threshold <= 1 else None
+
+
+def _read_file_text(
+    repo_path: Path, file_path: str, snapshot: Optional[RepositorySnapshot]
+) -> str | None:
+    """Read a file through the snapshot if given, skipping files over MAX_SCOPED_FILE_SIZE."""
+    if snapshot is not None:
+        return snapshot.read_text(file_path, max_size=MAX_SCOPED_FILE_SIZE)
+    full_path = repo_path / file_path
+    try:
+        if full_path.stat().st_size > MAX_SCOPED_FILE_SIZE:
+            return None
+        return full_path.read_text(encoding="utf-8", errors="ignore")
+    except (OSError, ValueError):
+        return None
+
+
+@timed_phase("token_limit")
 def apply_token_limit(content: str, token_limit: int, model: str, log_function) -> str:
     """Apply token limit to content by truncating if necessary.
     
@@ -20,7 +69,7 @@ def apply_token_limit(content: str, token_limit: int, model: str, log_function)
     Returns:
         Content, possibly truncated to fit within token limit.
     """
-    token_counter = TokenCounter()
+    token_counter = get_token_counter()
     current_tokens = token_counter.count_tokens(content, model)
     
     if current_tokens <= token_limit:
@@ -58,39 +107,259 @@ def apply_token_limit(content: str, token_limit: int, model: str, log_function)
     return truncated_content
 
 
+def _read_compact_text(
+    repo_path: Path, file_path: str, snapshot: Optional[RepositorySnapshot]
+) -> str | None:
+    """Read a file like ``_read_file_text`` and compact it for the "compact" mode."""
+    content = _read_file_text(repo_path, file_path, snapshot)
+    if content is None:
+        return None
+    return compact_source(file_path, content)
+
+
+@timed_phase("format")
+def _format_within_budget(
+    file_paths: list[str],
+    file_contents: dict[str, str] | None,
+    token_limit: Optional[int],
+    model: Optional[str],
+    log_function,
+    omitted_files: Optional[list[str]] = None,
+    read_file: Optional[Callable[[str], str | None]] = None,
+    content_tokens: Optional[Callable[[str, str], Optional[int]]] = None,
+) -> str:
+    """Format the codebase, leaving out files once the token budget is spent.
+
+    With ``read_file`` the files in ``file_paths`` are read lazily in that order and
+    ``file_contents`` is ignored; ``content_tokens`` may then supply precomputed token
+    counts. Duplicate files are shown as references to their first copy. Falls back to
+    ``apply_token_limit`` only if the file tree alone exceeds the budget.
+    """
+    token_counter = get_token_counter() if token_limit and model else None
+    threshold = near_duplicate_threshold()
+    if read_file is not None:
+        builder = stream_codebase_prompt(
+            file_paths,
+            read_file,
+            token_limit,
+            model,
+            token_counter,
+            near_duplicate_threshold=threshold,
+            content_tokens=content_tokens,
+        )
+    else:
+        builder = build_codebase_prompt(
+            file_paths,
+            file_contents or {},
+            token_limit,
+            model,
+            token_counter,
+            near_duplicate_threshold=threshold,
+        )
+    if builder.duplicates:
+        log_function(
+            f"Referenced {len(builder.duplicates)} duplicate files instead of repeating them"
+        )
+    if builder.truncated:
+        log_function(
+            f"Context reached token limit ({token_limit}), "
+            f"{len(builder.omitted_files)} files left out"
+        )
+        if omitted_files is not None:
+            omitted_files.extend(builder.omitted_files)
+    content = builder.build()
+    if builder.over_budget:
+        content = apply_token_limit(content, token_limit, model, log_function)
+    return content
+
+
+@traced("codebase_context")
 async def get_codebase_context(
     repo_path: Path, 
     reasoning_mode: str, 
     log_function: Optional[Callable[[str], None]] =print,
     token_limit: Optional[int] = None,
-    model: Optional[str] = None
+    model: Optional[str] = None,
+    snapshot: Optional[RepositorySnapshot] = None,
+    query: Optional[str] = None,
+    retrieval_index: Optional[BM25Index] = None,
+    omitted_files: Optional[list[str]] = None,
 ) -> str:
     """Fetches and formats the codebase context based on the reasoning mode.
 
     Args:
         repo_path: Path to the repository.
-        reasoning_mode: Mode for codebase analysis ("full", "lsp", "file_structure", "none").
+        reasoning_mode: Mode for codebase analysis ("full", "compact", "lsp", "relevant",
+            "file_structure", "none"). "compact" is "full" without license headers,
+            comments and blank-line runs. "relevant"
+            includes the files that best match ``query`` in full and signatures of the
+            remaining files.
         log_function: Function to use for logging.
         token_limit: Optional maximum number of tokens to include in the context.
         model: Optional model name for token counting (required if token_limit is set).
+        snapshot: Optional shared repository snapshot to reuse instead of re-reading files.
+        query: Task description used to rank files in "relevant" mode.
+        retrieval_index: Optional shared BM25 index for "relevant" mode; the repository's
+            persisted index is loaded if omitted.
+        omitted_files: Optional list that receives the paths of files left out to fit
+            ``token_limit``.
 
     Returns:
         Formatted codebase context string, possibly truncated to fit token limit.
     """
-    file_paths, file_contents = await get_codebase_snapshot(
-        repo_path, just_paths=(reasoning_mode!="full"), log_function=log_function
-    )
+    # With a budget, "full" mode reads files one at a time in priority order and stops
+    # reading once the budget is spent, instead of reading everything up front
+    stream_full = reasoning_mode == "full" and bool(token_limit and model)
+    with phase("snapshot"):
+        file_paths, file_contents = await get_codebase_snapshot(
+            repo_path,
+            just_paths=(reasoning_mode != "full" or stream_full),
+            log_function=log_function,
+            snapshot=snapshot,
+        )
     codebase_prompt_content = ""
     if reasoning_mode == "lsp":
-        file_paths, file_contents = await get_lsp_snapshot(repo_path, file_paths)
-        codebase_prompt_content = await format_codebase_for_prompt(file_paths, file_contents)
+        with phase("lsp"):
+            file_paths, file_contents = await get_lsp_snapshot(repo_path, file_paths)
+        codebase_prompt_content = _format_within_budget(
+            file_paths, file_contents, token_limit, model, log_function, omitted_files
+        )
     elif reasoning_mode == "file_structure":
         codebase_prompt_content = build_file_structure_context(file_paths)
+        if token_limit and model:
+            codebase_prompt_content = apply_token_limit(
+                codebase_prompt_content, token_limit, model, log_function
+            )
+    elif stream_full:
+        precomputed = get_precomputed_index(repo_path)
+        codebase_prompt_content = _format_within_budget(
+            file_paths,
+            None,
+            token_limit,
+            model,
+            log_function,
+            omitted_files,
+            read_file=lambda path: _read_file_text(repo_path, path, snapshot),
+            content_tokens=precomputed.token_lookup(model) if precomputed else None,
+        )
     elif reasoning_mode == "full":
-        codebase_prompt_content = await format_codebase_for_prompt(file_paths, file_contents)
+        codebase_prompt_content = _format_within_budget(
+            file_paths, file_contents, token_limit, model, log_function
+        )
+    elif reasoning_mode == "compact":
+        codebase_prompt_content = _format_within_budget(
+            file_paths,
+            None,
+            token_limit,
+            model,
+            log_function,
+            omitted_files,
+            read_file=lambda path: _read_compact_text(repo_path, path, snapshot),
+        )
+    elif reasoning_mode == "relevant":
+        with phase("retrieval"):
+            if retrieval_index is None:
+                retrieval_index = BM25Index.for_repository(repo_path)
+            retrieval_index.update(repo_path, file_paths)
+            relevant = [path for path, _ in retrieval_index.search(query or "", RELEVANT_TOP_K)]
+        log_function(f"Relevant context: {len(relevant)} of {len(file_paths)} files in full")
 
-    # Apply token limit if specified
-    if token_limit and model:
-        codebase_prompt_content = apply_token_limit(codebase_prompt_content, token_limit, model, log_function)
+        relevant_set = set(relevant)
+        with phase("lsp"):
+            _, file_contents = await get_lsp_snapshot(
+                repo_path, [path for path in file_paths if path not in relevant_set]
+            )
+        for path in relevant:
+            content = _read_file_text(repo_path, path, snapshot)
+            if content is not None:
+                file_contents[path] = content
+        codebase_prompt_content = _format_within_budget(
+            file_paths, file_contents, token_limit, model, log_function, omitted_files
+        )
 
     return codebase_prompt_content
+
+
+@traced("codebase_context")
+async def get_diff_scoped_context(
+    repo_path: Path,
+    reasoning_mode: str,
+    changed_files: list[str],
+    workplan_content: str = "",
+    log_function: Optional[Callable[[str], None]] = print,
+    token_limit: Optional[int] = None,
+    model: Optional[str] = None,
+    snapshot: Optional[RepositorySnapshot] = None,
+    hops: int = 1,
+    dependency_index: Optional[DependencyIndex] = None,
+    omitted_files: Optional[list[str]] = None,
+) -> str:
+    """Fetches codebase context scoped to the neighborhood of a diff.
+
+    The scope is the changed files, the files within ``hops`` import steps of them (Python
+    imports, Go imports and Go package membership) and the files referenced by the workplan.
+    Only files in scope are included in full ("full"), compacted ("compact") or as
+    signatures ("lsp"); the rest of the repository appears in the file-structure listing only.
+
+    Args:
+        repo_path: Path to the repository.
+        reasoning_mode: Mode for codebase analysis ("full", "compact", "lsp",
+            "file_structure", "none"). Modes other than "full", "compact" and "lsp" are
+            delegated to ``get_codebase_context``.
+        changed_files: Repository-relative paths touched by the diff.
+        workplan_content: Workplan text whose referenced paths are added to the scope.
+        log_function: Function to use for logging.
+        token_limit: Optional maximum number of tokens to include in the context.
+        model: Optional model name for token counting (required if token_limit is set).
+        snapshot: Optional shared repository snapshot to reuse instead of re-reading files.
+        hops: Number of import steps to follow from the changed files.
+        dependency_index: Optional shared import-graph index; the repository's persisted
+            index is loaded if omitted.
+        omitted_files: Optional list that receives the paths of files left out to fit
+            ``token_limit``.
+
+    Returns:
+        Formatted codebase context string, possibly truncated to fit token limit.
+    """
+    if reasoning_mode not in ("full", "compact", "lsp"):
+        return await get_codebase_context(
+            repo_path,
+            reasoning_mode,
+            log_function,
+            token_limit,
+            model,
+            snapshot,
+            omitted_files=omitted_files,
+        )
+
+    with phase("snapshot"):
+        file_paths, _ = await get_codebase_snapshot(
+            repo_path, just_paths=True, log_function=log_function, snapshot=snapshot
+        )
+
+    known = set(file_paths)
+    seeds = [path for path in changed_files if path in known]
+    with phase("dependency_scope"):
+        if dependency_index is None:
+            dependency_index = DependencyIndex.for_repository(repo_path)
+        dependency_index.update(repo_path, file_paths)
+        scope = dependency_index.neighbors(seeds, hops)
+        scope |= find_referenced_paths(workplan_content, file_paths)
+    log_function(
+        f"Diff-scoped context: {len(scope)} of {len(file_paths)} files "
+        f"({len(seeds)} changed, {hops}-hop import neighbors, workplan references)"
+    )
+
+    if reasoning_mode == "lsp":
+        with phase("lsp"):
+            _, scoped_contents = await get_lsp_snapshot(repo_path, sorted(scope))
+    else:
+        read = _read_compact_text if reasoning_mode == "compact" else _read_file_text
+        scoped_contents = {}
+        for file_path in sorted(scope):
+            content = read(repo_path, file_path, snapshot)
+            if content is not None:
+                scoped_contents[file_path] = content
+    return _format_within_budget(
+        file_paths, scoped_contents, token_limit, model, log_function, omitted_files
+    )
@@ -1,41 +1,280 @@
 """Prompt formatting utilities for combining codebase structure and contents."""
 
-
 from collections import defaultdict
+from typing import Callable, Optional
 
+from yellhorn_mcp.token_counter import TokenCounter, get_token_counter
+from yellhorn_mcp.utils.dedup_utils import DuplicateDetector
+
+# Appended when files are left out to stay within the token budget
+TRUNCATION_NOTICE = "\n... [Content truncated due to token limit]"
+
+# Heading of the codebase context that opens workplan and judgement prompts
+CODEBASE_CONTEXT_HEADER = "# Codebase Context\n"
+
+
+class PromptBuilder:
+    """Collects prompt fragments in a list and joins them once at the end.
+
+    When a token budget is given, each fragment is counted as it is added and optional
+    fragments that would exceed the budget are refused, so the budget is enforced during
+    assembly rather than by truncating the finished string.
+    """
+
+    def __init__(
+        self,
+        token_limit: Optional[int] = None,
+        model: Optional[str] = None,
+        token_counter: Optional[TokenCounter] = None,
+    ):
+        """Initialize an empty builder.
+
+        Args:
+            token_limit: Optional maximum number of tokens for the assembled prompt.
+            model: Model name for token counting (required if token_limit is set).
+            token_counter: Optional counter to reuse; a new one is created if omitted.
+        """
+        self.token_limit = token_limit if token_limit and model else None
+        self.model = model
+        self._token_counter = token_counter
+        if self.token_limit is not None and self._token_counter is None:
+            self._token_counter = get_token_counter()
+        self._fragments: list[str] = []
+        self.fragment_tokens: list[int] = []
+        self.total_tokens = 0
+        # Files left out of the assembled prompt to respect the budget
+        self.omitted_files: list[str] = []
+        # Files shown as a reference to the earlier file they duplicate
+        self.duplicates: dict[str, str] = {}
+
+    def count(self, fragment: str) -> int:
+        """Count a fragment's tokens, or return 0 if no budget is enforced."""
+        if self.token_limit is None:
+            return 0
+        return self._token_counter.count_tokens(fragment, self.model)
+
+    def remaining(self) -> Optional[int]:
+        """Return the tokens left in the budget, or None if there is no budget."""
+        if self.token_limit is None:
+            return None
+        return self.token_limit - self.total_tokens
+
+    def add(
+        self,
+        fragment: str,
+        required: bool = False,
+        reserve: int = 0,
+        tokens: Optional[int] = None,
+    ) -> bool:
+        """Append a fragment if it fits in the budget.
+
+        Args:
+            fragment: Text to append.
+            required: Append even if the budget would be exceeded.
+            reserve: Tokens that must stay free after this fragment (e.g. for closing tags).
+            tokens: The fragment's token count, if already known.
+
+        Returns:
+            True if the fragment was appended.
+        """
+        if tokens is None or self.token_limit is None:
+            tokens = self.count(fragment)
+        remaining = self.remaining()
+        if not required and remaining is not None and tokens + reserve > remaining:
+            return False
+        self._fragments.append(fragment)
+        self.fragment_tokens.append(tokens)
+        self.total_tokens += tokens
+        return True
+
+    @property
+    def truncated(self) -> bool:
+        """Whether files were left out to respect the budget."""
+        return bool(self.omitted_files)
+
+    @property
+    def over_budget(self) -> bool:
+        """Whether required fragments pushed the prompt past the budget."""
+        remaining = self.remaining()
+        return remaining is not None and remaining < 0
+
+    def build(self) -> str:
+        """Join the collected fragments into the prompt string."""
+        return "".join(self._fragments)
+
+
+def _file_header(file_path: str) -> str:
+    return f"\n--- File: {file_path} ---\n"
+
+
+def format_file_block(file_path: str, content: str) -> str:
+    """Format one file for the ``<file_contents>`` section of the prompt."""
+    newline = "" if content.endswith("\n") else "\n"
+    return f"{_file_header(file_path)}{content}{newline}"
+
+
+def _count_file_block(
+    builder: PromptBuilder, file_path: str, content: str, content_tokens: int
+) -> int:
+    """Count a file block from its content's known token count."""
+    tokens = builder.count(_file_header(file_path)) + content_tokens
+    return tokens if content.endswith("\n") else tokens + builder.count("\n")
+
+
+def _add_file_contents(
+    builder: PromptBuilder,
+    candidates: list[str],
+    read_file: Callable[[str], str | None],
+    detector: Optional[DuplicateDetector],
+    content_tokens: Optional[Callable[[str, str], Optional[int]]] = None,
+) -> None:
+    """Append file blocks in order, reading each file only when it is reached.
+
+    Stops at the first file that does not fit in the builder's budget and records it and
+    all later candidates in ``builder.omitted_files`` without reading them. Files the
+    detector matches to an earlier file are shown as a reference to it and recorded in
+    ``builder.duplicates``. ``content_tokens`` may supply known token counts of file
+    contents, so those files are not tokenized again.
+    """
+    closing = "</file_contents>"
+    reserve = builder.count(closing) + builder.count(TRUNCATION_NOTICE)
+    builder.add("\n\n<file_contents>\n", required=True)
+    for index, file_path in enumerate(candidates):
+        content = read_file(file_path)
+        # Skip unreadable and empty files
+        if content is None or not content.strip():
+            continue
+        match = detector.check(file_path, content) if detector is not None else None
+        if match is not None:
+            original, similarity = match
+            if similarity == 1.0:
+                content = f"(identical to {original})"
+            else:
+                content = f"(near-duplicate of {original}, {similarity:.0%} similar)"
+            builder.duplicates[file_path] = original
+        tokens = None
+        if content_tokens is not None and match is None:
+            known = content_tokens(file_path, content)
+            if known is not None:
+                tokens = _count_file_block(builder, file_path, content, known)
+        if not builder.add(format_file_block(file_path, content), reserve=reserve, tokens=tokens):
+            builder.omitted_files = candidates[index:]
+            builder.add(TRUNCATION_NOTICE, required=True)
+            break
+    builder.add(closing, required=True)
 
-async def format_codebase_for_prompt(file_paths: list[str], file_contents: dict[str, str]) -> str:
-    """Format the codebase information for inclusion in the prompt.
+
+def build_codebase_prompt(
+    file_paths: list[str],
+    file_contents: dict[str, str],
+    token_limit: Optional[int] = None,
+    model: Optional[str] = None,
+    token_counter: Optional[TokenCounter] = None,
+    deduplicate: bool = True,
+    near_duplicate_threshold: Optional[float] = None,
+) -> PromptBuilder:
+    """Assemble the codebase structure and contents, stopping once the budget is spent.
+
+    The file tree is always included. File blocks are added in path order until the next
+    one would exceed ``token_limit``; the rest are left out and a truncation notice is added.
 
     Args:
         file_paths: List of file paths.
         file_contents: Dictionary mapping file paths to their contents.
+        token_limit: Optional maximum number of tokens for the result.
+        model: Model name for token counting (required if token_limit is set).
+        token_counter: Optional counter to reuse.
+        deduplicate: Show files identical to an earlier file as a reference to it.
+        near_duplicate_threshold: Optional MinHash similarity above which files are also
+            shown as a reference to an earlier, similar file.
 
     Returns:
-        Formatted string with codebase structure and contents.
+        The builder holding the assembled fragments and their token counts.
     """
-    # Start with the file structure tree
-    codebase_info = build_file_structure_context(file_paths)
-
-    # Add file contents if available
+    builder = PromptBuilder(token_limit, model, token_counter)
+    builder.add(build_file_structure_context(file_paths), required=True)
     if file_contents:
-        codebase_info += "\n\n<file_contents>\n"
-        for file_path in sorted(file_contents.keys()):
-            content = file_contents[file_path]
-            # Skip empty files
-            if not content.strip():
-                continue
+        candidates = [path for path in sorted(file_contents) if file_contents[path].strip()]
+        detector = DuplicateDetector(near_duplicate_threshold) if deduplicate else None
+        _add_file_contents(builder, candidates, file_contents.get, detector)
+    return builder
+
+
+def stream_codebase_prompt(
+    file_paths: list[str],
+    read_file: Callable[[str], str | None],
+    token_limit: Optional[int] = None,
+    model: Optional[str] = None,
+    token_counter: Optional[TokenCounter] = None,
+    deduplicate: bool = True,
+    near_duplicate_threshold: Optional[float] = None,
+    content_tokens: Optional[Callable[[str, str], Optional[int]]] = None,
+) -> PromptBuilder:
+    """Assemble the codebase context, reading files lazily in priority order.
+
+    Unlike ``build_codebase_prompt``, file contents are not needed up front: each file is
+    read only when it is reached, and no file is read once the budget is spent.
 
-            # Add file header and content
-            codebase_info += f"\n--- File: {file_path} ---\n"
-            codebase_info += content
-            if not content.endswith("\n"):
-                codebase_info += "\n"
+    Args:
+        file_paths: File paths in priority order; all of them appear in the file tree.
+        read_file: Returns a file's text, or None if it cannot be included.
+        token_limit: Optional maximum number of tokens for the result.
+        model: Model name for token counting (required if token_limit is set).
+        token_counter: Optional counter to reuse.
+        deduplicate: Show files identical to an earlier file as a reference to it.
+        near_duplicate_threshold: Optional MinHash similarity above which files are also
+            shown as a reference to an earlier, similar file.
+        content_tokens: Optional lookup of a file's known content token count, given its
+            path and contents (e.g. ``PrecomputedIndex.tokens``); returns None if unknown.
+
+    Returns:
+        The builder holding the assembled fragments; ``omitted_files`` lists the files left
+        out to fit the budget.
+    """
+    builder = PromptBuilder(token_limit, model, token_counter)
+    builder.add(build_file_structure_context(file_paths), required=True)
+    if file_paths:
+        detector = DuplicateDetector(near_duplicate_threshold) if deduplicate else None
+        _add_file_contents(builder, file_paths, read_file, detector, content_tokens)
+    return builder
 
-        codebase_info += "</file_contents>"
 
-    return codebase_info
+def join_codebase_prompt(codebase_info: str, *sections: str) -> tuple[str, int]:
+    """Join the codebase context and the request-specific sections into one prompt.
+
+    The codebase context comes first, so requests against the same commit share a long
+    identical prefix that providers can serve from their prompt cache. The fragments are
+    joined once, so the codebase context is not copied into intermediate strings.
+
+    Args:
+        codebase_info: Formatted codebase context.
+        *sections: Request-specific prompt sections, in order.
 
+    Returns:
+        Tuple of (prompt, length of its codebase section, i.e. the cacheable prefix).
+    """
+    prefix_length = len(CODEBASE_CONTEXT_HEADER) + len(codebase_info) + 2
+    return "".join((CODEBASE_CONTEXT_HEADER, codebase_info, "\n\n", *sections)), prefix_length
+
+
+async def format_codebase_for_prompt(
+    file_paths: list[str],
+    file_contents: dict[str, str],
+    token_limit: Optional[int] = None,
+    model: Optional[str] = None,
+) -> str:
+    """Format the codebase information for inclusion in the prompt.
+
+    Args:
+        file_paths: List of file paths.
+        file_contents: Dictionary mapping file paths to their contents.
+        token_limit: Optional maximum number of tokens; files past the budget are left out.
+        model: Model name for token counting (required if token_limit is set).
+
+    Returns:
+        Formatted string with codebase structure and contents.
+    """
+    return build_codebase_prompt(file_paths, file_contents, token_limit, model).build()
 
 
 def build_file_structure_context(file_paths: list[str]) -> str:
@@ -0,0 +1,312 @@
+"""Per-HEAD repository snapshot shared between tool calls.
+
+A common flow is ``curate_context`` followed immediately by ``create_workplan``. Without
+sharing, each call enumerates the repository with git and re-reads every file. The
+``SnapshotCache`` stored in the lifespan context keeps the enumerated file list and file
+contents for the current HEAD, index and worktree state so back-to-back calls only pay for
+repository I/O once.
+
+When a ``RepositoryWatcher`` (see ``yellhorn_mcp.utils.watch_utils``) watches a repository,
+it reports changed paths through ``SnapshotCache.mark_changed``. Until then the cached snapshot
+is known to be current, so ``get`` skips ``git status`` and cached file contents are returned
+without a ``stat`` call; only the changed paths are read again.
+"""
+
+import asyncio
+import hashlib
+import time
+from pathlib import Path
+from typing import Iterable
+
+from mcp.server.fastmcp import Context
+
+from yellhorn_mcp.utils.git_utils import YellhornMCPError, run_git_command
+from yellhorn_mcp.utils.timing_utils import phase
+
+# Snapshots older than this are rebuilt even if the fingerprint still matches
+SNAPSHOT_MAX_AGE_SECONDS = 300.0
+
+
+def _status_paths(status_output: str) -> list[str]:
+    """Extract the paths mentioned in ``git status --porcelain=v2 -z`` output."""
+    paths = []
+    tokens = status_output.split("\0")
+    i = 0
+    while i < len(tokens):
+        entry = tokens[i]
+        i += 1
+        if not entry or entry.startswith("#"):
+            continue
+        kind = entry[0]
+        if kind == "1":
+            paths.append(entry.split(" ", 8)[-1])
+        elif kind == "2":
+            paths.append(entry.split(" ", 9)[-1])
+            # Renames are followed by the original path as a separate token
+            if i < len(tokens):
+                paths.append(tokens[i])
+                i += 1
+        elif kind == "u":
+            paths.append(entry.split(" ", 10)[-1])
+        elif kind in "?!":
+            paths.append(entry[2:])
+    return paths
+
+
+def _stat_key(path: Path) -> tuple[int, int] | None:
+    """Return (mtime_ns, size) for a path, or None if it cannot be stat'ed."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+async def compute_repository_fingerprint(repo_path: Path) -> str:
+    """Fingerprint the HEAD, index and worktree state of a repository.
+
+    Uses a single ``git status`` call, which reports the HEAD commit and every staged,
+    unstaged and untracked change, plus the modification times of the changed paths so
+    that further edits to an already-modified file are also detected.
+
+    Args:
+        repo_path: Path to the repository.
+
+    Returns:
+        Hex digest identifying the current repository state.
+
+    Raises:
+        YellhornMCPError: If git status fails.
+    """
+    status = await run_git_command(
+        repo_path,
+        ["status", "--porcelain=v2", "--branch", "-z", "--untracked-files=all"],
+    )
+    digest = hashlib.sha1(status.encode("utf-8", errors="surrogateescape"))
+    for rel_path in _status_paths(status):
+        digest.update(f"\0{rel_path}:{_stat_key(repo_path / rel_path)}".encode(errors="replace"))
+    return digest.hexdigest()
+
+
+class RepositorySnapshot:
+    """File list and lazily read file contents for one repository state."""
+
+    def __init__(
+        self,
+        repo_path: Path,
+        fingerprint: str,
+        file_paths: list[str],
+        contents: dict[str, tuple[tuple[int, int], str]] | None = None,
+        watched: bool = False,
+    ):
+        """Initialize the snapshot.
+
+        Args:
+            repo_path: Path to the repository.
+            fingerprint: Repository fingerprint the file list was taken at.
+            file_paths: Output of ``git ls-files`` for that state.
+            contents: Optional content cache carried over from a previous snapshot.
+            watched: Whether a watcher drops changed files from the content cache, so cached
+                contents can be returned without checking the file's mtime and size.
+        """
+        self.repo_path = repo_path
+        self.fingerprint = fingerprint
+        self.file_paths = file_paths
+        self.created_at = time.monotonic()
+        self.watched = watched
+        self._contents = contents if contents is not None else {}
+        self._file_set: set[str] | None = None
+
+    def __contains__(self, file_path: str) -> bool:
+        if self._file_set is None:
+            self._file_set = set(self.file_paths)
+        return file_path in self._file_set
+
+    def read_text(self, file_path: str, max_size: int | None = None) -> str | None:
+        """Read a file through the content cache.
+
+        Cached contents are reused only while the file's mtime and size are unchanged. In a
+        watched snapshot they are reused until the watcher reports the file as changed.
+
+        Args:
+            file_path: Repository-relative path.
+            max_size: Skip files larger than this many bytes.
+
+        Returns:
+            File contents, or None if the file is missing, unreadable or too large.
+        """
+        if self.watched:
+            cached = self._contents.get(file_path)
+            if cached is not None:
+                return cached[1] if max_size is None or cached[0][1] <= max_size else None
+
+        full_path = self.repo_path / file_path
+        stat_key = _stat_key(full_path)
+        if stat_key is None:
+            self._contents.pop(file_path, None)
+            return None
+        if max_size is not None and stat_key[1] > max_size:
+            return None
+
+        cached = self._contents.get(file_path)
+        if cached is not None and cached[0] == stat_key:
+            return cached[1]
+
+        try:
+            content = full_path.read_text(encoding="utf-8", errors="ignore")
+        except (OSError, ValueError):
+            return None
+        self._contents[file_path] = (stat_key, content)
+        return content
+
+
+class SnapshotCache:
+    """Holds the most recent ``RepositorySnapshot`` for each repository."""
+
+    def __init__(self, max_age: float = SNAPSHOT_MAX_AGE_SECONDS):
+        """Initialize the cache.
+
+        Args:
+            max_age: Maximum snapshot age in seconds before it is rebuilt.
+        """
+        self.max_age = max_age
+        self._snapshots: dict[Path, RepositorySnapshot] = {}
+        self._lock = asyncio.Lock()
+        # Repositories with a running watcher, the number of changes each has reported, and
+        # those whose cached snapshot has not been affected by a change since it was taken
+        self._watched: set[Path] = set()
+        self._changes: dict[Path, int] = {}
+        self._current: set[Path] = set()
+
+    async def get(self, repo_path: Path) -> RepositorySnapshot:
+        """Return a snapshot matching the current repository state.
+
+        Args:
+            repo_path: Path to the repository.
+
+        Returns:
+            The cached snapshot if HEAD, index and worktree are unchanged, otherwise a new one.
+
+        Raises:
+            YellhornMCPError: If the repository cannot be inspected with git.
+        """
+        # Imported here to avoid a circular import with codebase_snapshot
+        from yellhorn_mcp.formatters.codebase_snapshot import list_git_files
+
+        async with self._lock:
+            current = self._snapshots.get(repo_path)
+            fresh = current is not None and time.monotonic() - current.created_at <= self.max_age
+            if fresh and repo_path in self._current:
+                return current
+
+            changes = self._changes.get(repo_path, 0)
+            watched = repo_path in self._watched
+            fingerprint = await compute_repository_fingerprint(repo_path)
+            if fresh and current.fingerprint == fingerprint:
+                snapshot = current
+            else:
+                # File contents are validated by mtime/size on read (or dropped by the watcher
+                # when they change), so they can be carried over for files still listed
+                file_paths = await list_git_files(repo_path)
+                contents = None
+                if current is not None:
+                    contents = {
+                        path: current._contents[path]
+                        for path in file_paths
+                        if path in current._contents
+                    }
+                snapshot = RepositorySnapshot(repo_path, fingerprint, file_paths, contents, watched)
+                self._snapshots[repo_path] = snapshot
+
+            # Trust the snapshot until the next change unless one arrived while it was taken
+            if watched and self._changes.get(repo_path, 0) == changes:
+                self._current.add(repo_path)
+            return snapshot
+
+    def current(self, repo_path: Path) -> RepositorySnapshot | None:
+        """Return the cached snapshot of a repository without checking that it is current."""
+        return self._snapshots.get(repo_path)
+
+    def watch(self, repo_path: Path) -> None:
+        """Start trusting change reports from a watcher for a repository.
+
+        The cached snapshot is dropped, since changes made before the watcher started were
+        not reported.
+
+        Args:
+            repo_path: Path to the watched repository.
+        """
+        self._watched.add(repo_path)
+        self._changes[repo_path] = self._changes.get(repo_path, 0) + 1
+        self._current.discard(repo_path)
+        self._snapshots.pop(repo_path, None)
+
+    def unwatch(self, repo_path: Path) -> None:
+        """Stop relying on a watcher; snapshots are validated with git again."""
+        self._watched.discard(repo_path)
+        self._current.discard(repo_path)
+        current = self._snapshots.get(repo_path)
+        if current is not None:
+            current.watched = False
+
+    def mark_changed(self, repo_path: Path, paths: Iterable[str] | None) -> None:
+        """Record paths a watcher saw change.
+
+        Changed files are dropped from the content cache. If a path was added or removed, or
+        an ignore file changed, the file list is taken again with git on the next ``get``.
+
+        Args:
+            repo_path: Path to the repository.
+            paths: Repository-relative paths that changed, or None if the changes are unknown
+                (e.g. the watcher dropped events), in which case the snapshot is discarded.
+        """
+        self._changes[repo_path] = self._changes.get(repo_path, 0) + 1
+        current = self._snapshots.get(repo_path)
+        if paths is None or current is None:
+            self._current.discard(repo_path)
+            self._snapshots.pop(repo_path, None)
+            return
+
+        for path in paths:
+            current._contents.pop(path, None)
+            if (
+                path not in current
+                or path.rsplit("/", 1)[-1] == ".gitignore"
+                or not (repo_path / path).is_file()
+            ):
+                self._current.discard(repo_path)
+
+    def invalidate(self, repo_path: Path | None = None) -> None:
+        """Drop cached snapshots.
+
+        Args:
+            repo_path: Repository to drop. If None, all snapshots are dropped.
+        """
+        if repo_path is None:
+            self._snapshots.clear()
+            self._current.clear()
+        else:
+            self._snapshots.pop(repo_path, None)
+            self._current.discard(repo_path)
+
+
+async def get_shared_snapshot(ctx: Context | None, repo_path: Path) -> RepositorySnapshot | None:
+    """Fetch the shared snapshot for a tool call, if the server provides a cache.
+
+    Args:
+        ctx: Optional server context whose lifespan context may hold a ``snapshot_cache``.
+        repo_path: Path to the repository.
+
+    Returns:
+        The current snapshot, or None if no cache is available or git cannot be used.
+    """
+    if ctx is None:
+        return None
+    cache = ctx.request_context.lifespan_context.get("snapshot_cache")
+    if not isinstance(cache, SnapshotCache):
+        return None
+    try:
+        with phase("snapshot"):
+            return await cache.get(repo_path)
+    except YellhornMCPError:
+        return None
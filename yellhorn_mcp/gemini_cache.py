@@ -0,0 +1,165 @@
+"""Explicit Gemini context caching for repeated codebase prompts.
+
+Workplan, revision and judgement prompts start with the codebase context. For Gemini models
+that prefix can be uploaded once as a cached-content object and referenced by later calls,
+which are then billed at the cache rate and skip re-processing the prefix. One object is
+kept per (model, scope) where the scope names a repository and reasoning mode; when the
+prefix for a scope changes (HEAD moved), the old object is deleted and a new one created.
+
+Cached objects are billed for storage, so one is only created the second time the same
+prefix is seen within the TTL, and the TTL is kept short and extended on every hit. Each
+lookup reports the storage time it bought so callers can include it in cost estimates.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, Callable, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Lifetime of a cached-content object; it is extended on every call that reuses it
+DEFAULT_TTL_SECONDS = 300
+
+# Prefixes shorter than this (about 4096 tokens) are below Gemini's minimum cache size
+MIN_CACHED_PREFIX_CHARS = 16_384
+
+
+class CachedPrefix(NamedTuple):
+    """A cached-content object referenced by one request."""
+
+    name: str
+    # Cache lifetime this request bought: the TTL on creation, the extension on refresh
+    storage_seconds: float
+
+
+class _CacheEntry:
+    """A cached-content object created for one scope."""
+
+    def __init__(self, name: str, digest: str, expires_at: float):
+        self.name = name
+        self.digest = digest
+        self.expires_at = expires_at
+
+
+class GeminiContextCache:
+    """Creates, refreshes and evicts Gemini cached-content objects for prompt prefixes."""
+
+    def __init__(
+        self,
+        client: Any,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize an empty cache.
+
+        Args:
+            client: ``genai.Client`` (or a fake exposing ``aio.caches``).
+            ttl_seconds: Lifetime of each cached-content object.
+            clock: Monotonic time source, replaceable in tests.
+        """
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: dict[tuple[str, str, bool], _CacheEntry] = {}
+        self._locks: dict[tuple[str, str, bool], asyncio.Lock] = {}
+        # Digest and time of the last uncached sighting of each scope's prefix
+        self._seen: dict[tuple[str, str, bool], tuple[str, float]] = {}
+
+    async def get(
+        self, model: str, scope: str, prefix: str, tools: Optional[list] = None
+    ) -> Optional[CachedPrefix]:
+        """Return the cached-content object holding ``prefix``.
+
+        The object is created when the same prefix is requested a second time within the
+        TTL, its TTL is extended on every later hit, and it is replaced when the scope's
+        prefix changes.
+
+        Args:
+            model: Gemini model name.
+            scope: Identifies the context, e.g. repository path and reasoning mode.
+            prefix: Prompt prefix to cache.
+            tools: Tools for the request. Gemini does not accept tools next to cached
+                content, so they are stored in the cached object instead.
+
+        Returns:
+            The cached-content name and the storage time bought for it, or None if the
+            prefix is too short, has not been seen before, or the cache could not be created
+            (the caller then sends the full prompt).
+        """
+        if len(prefix) < MIN_CACHED_PREFIX_CHARS:
+            return None
+        key = (model, scope, bool(tools))
+        digest = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            now = self._clock()
+            entry = self._entries.get(key)
+            if entry is not None and (entry.digest != digest or entry.expires_at <= now):
+                del self._entries[key]
+                await self._delete(entry.name)
+                entry = None
+
+            if entry is None:
+                seen = self._seen.get(key)
+                if seen is None or seen[0] != digest or now - seen[1] > self.ttl_seconds:
+                    # A one-off prompt would pay for storage it never reads back
+                    self._seen[key] = (digest, now)
+                    return None
+                del self._seen[key]
+                entry = await self._create(model, scope, prefix, digest, tools)
+                if entry is None:
+                    return None
+                self._entries[key] = entry
+                return CachedPrefix(entry.name, float(self.ttl_seconds))
+            return CachedPrefix(entry.name, await self._refresh(entry))
+
+    async def clear(self) -> None:
+        """Delete every cached-content object this cache created."""
+        entries = list(self._entries.values())
+        self._entries.clear()
+        self._seen.clear()
+        for entry in entries:
+            await self._delete(entry.name)
+
+    async def _create(
+        self, model: str, scope: str, prefix: str, digest: str, tools: Optional[list]
+    ) -> Optional[_CacheEntry]:
+        from google.genai import types
+
+        config = types.CreateCachedContentConfig(
+            contents=[prefix],
+            ttl=f"{self.ttl_seconds}s",
+            display_name=f"yellhorn:{scope}"[:128],
+            tools=tools or None,
+        )
+        try:
+            cached = await self.client.aio.caches.create(model=f"models/{model}", config=config)
+        except Exception as e:
+            logger.warning(f"Could not create Gemini context cache for {scope}: {e}")
+            return None
+        logger.info(f"Created Gemini context cache {cached.name} for {scope}")
+        return _CacheEntry(cached.name, digest, self._clock() + self.ttl_seconds)
+
+    async def _refresh(self, entry: _CacheEntry) -> float:
+        from google.genai import types
+
+        config = types.UpdateCachedContentConfig(ttl=f"{self.ttl_seconds}s")
+        try:
+            await self.client.aio.caches.update(name=entry.name, config=config)
+        except Exception as e:
+            # Keep using the object until its current TTL runs out
+            logger.warning(f"Could not extend Gemini context cache {entry.name}: {e}")
+            return 0.0
+        # Only the extension beyond the current expiry is billed again
+        expires_at = self._clock() + self.ttl_seconds
+        extension = max(expires_at - entry.expires_at, 0.0)
+        entry.expires_at = expires_at
+        return extension
+
+    async def _delete(self, name: str) -> None:
+        try:
+            await self.client.aio.caches.delete(name=name)
+        except Exception as e:
+            # The object expires on its own; failing to delete it early is harmless
+            logger.debug(f"Could not delete Gemini context cache {name}: {e}")
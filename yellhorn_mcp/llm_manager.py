@@ -4,12 +4,11 @@ import asyncio
 import json
 import logging
 import re
+import sys
 import time
-from typing import Any, Dict, List, Optional, Union
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
-from google import genai
-from google.api_core import exceptions as google_exceptions
-from openai import AsyncOpenAI, RateLimitError
 from tenacity import (
     RetryCallState,
     before_sleep_log,
@@ -20,7 +19,15 @@ from tenacity import (
     wait_exponential,
 )
 
+from .gemini_cache import DEFAULT_TTL_SECONDS, GeminiContextCache
+from .metrics import LLM_CHUNKS, LLM_RETRIES, observe_llm_call, record_llm_usage
 from .token_counter import TokenCounter
+from .tracing import add_span_event, set_span_attributes, span, traced
+from .utils.timing_utils import record_phase
+
+if TYPE_CHECKING:
+    from google import genai
+    from openai import AsyncOpenAI
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -33,6 +40,14 @@ def log_retry_attempt(retry_state: RetryCallState) -> None:
 
     attempt = retry_state.attempt_number
     wait_time = retry_state.outcome_timestamp - retry_state.start_time
+    next_action = getattr(retry_state, "next_action", None)
+    if next_action is not None:
+        record_phase("retry_wait", next_action.sleep)
+    LLM_RETRIES.labels(retry_state.fn.__name__).inc()
+    add_span_event(
+        "retry",
+        {"yellhorn.retry.function": retry_state.fn.__name__, "yellhorn.retry.attempt": attempt},
+    )
 
     logger.warning(
         f"Retrying {retry_state.fn.__name__} after {wait_time:.1f} seconds "
@@ -40,6 +55,36 @@ def log_retry_attempt(retry_state: RetryCallState) -> None:
     )
 
 
+def _record_usage(model: str, prompt: str, usage: "UsageMetadata") -> None:
+    """Count a response's usage in the metrics and on the current LLM attempt's span."""
+    record_llm_usage(model, usage)
+    set_span_attributes(
+        {
+            "gen_ai.request.model": model,
+            "gen_ai.usage.input_tokens": usage.prompt_tokens,
+            "gen_ai.usage.output_tokens": usage.completion_tokens,
+            "yellhorn.usage.cached_input_tokens": usage.cached_tokens,
+            "yellhorn.prompt.chars": len(prompt),
+        }
+    )
+
+
+def _sdk_rate_limit_errors() -> tuple[type, ...]:
+    """Return the rate-limit exception types of the provider SDKs that are loaded.
+
+    The SDKs are imported lazily; an exception can only be an instance of one of their
+    classes if the SDK module has already been imported.
+    """
+    errors: list[type] = []
+    openai_module = sys.modules.get("openai")
+    if openai_module is not None:
+        errors.append(openai_module.RateLimitError)
+    google_exceptions = sys.modules.get("google.api_core.exceptions")
+    if google_exceptions is not None:
+        errors.extend((google_exceptions.ResourceExhausted, google_exceptions.TooManyRequests))
+    return tuple(errors)
+
+
 def is_retryable_error(exception: Exception) -> bool:
     """Check if the exception is retryable."""
     # Handle ClientError from google.generativeai which wraps the actual error
@@ -52,16 +97,7 @@ def is_retryable_error(exception: Exception) -> bool:
             return True
 
     # Check for standard retryable exceptions
-    if any(
-        isinstance(exception, exc_type)
-        for exc_type in [
-            RateLimitError,
-            google_exceptions.ResourceExhausted,
-            google_exceptions.TooManyRequests,
-            ConnectionError,
-            asyncio.TimeoutError,
-        ]
-    ):
+    if isinstance(exception, (ConnectionError, asyncio.TimeoutError, *_sdk_rate_limit_errors())):
         return True
 
     # Check for error messages in string representation
@@ -85,6 +121,11 @@ api_retry = retry(
 )
 
 
+def _token_count(value: Any) -> int:
+    """Return a reported token count, treating missing or non-integer values as 0."""
+    return value if isinstance(value, int) and not isinstance(value, bool) else 0
+
+
 class UsageMetadata:
     """
     Unified usage metadata class that handles both OpenAI and Gemini formats.
@@ -107,6 +148,10 @@ class UsageMetadata:
         self.prompt_tokens: int = 0
         self.completion_tokens: int = 0
         self.total_tokens: int = 0
+        # Prompt tokens served from the provider's prompt cache (included in prompt_tokens)
+        self.cached_tokens: int = 0
+        # Storage bought for explicitly created cached content: cached tokens x hours
+        self.cache_storage_token_hours: float = 0.0
         self.model: Optional[str] = None
 
         if data is None:
@@ -117,22 +162,30 @@ class UsageMetadata:
             self.prompt_tokens = data.get("prompt_tokens", 0)
             self.completion_tokens = data.get("completion_tokens", 0)
             self.total_tokens = data.get("total_tokens", 0)
+            self.cached_tokens = data.get("cached_tokens", 0)
             self.model = data.get("model")
         elif hasattr(data, "input_tokens"):
             # Response format
             self.prompt_tokens = getattr(data, "input_tokens", 0)
             self.completion_tokens = getattr(data, "output_tokens", 0)
             self.total_tokens = getattr(data, "total_tokens", 0)
+            self.cached_tokens = _token_count(
+                getattr(getattr(data, "input_tokens_details", None), "cached_tokens", 0)
+            )
         elif hasattr(data, "prompt_tokens"):
             # OpenAI CompletionUsage format
             self.prompt_tokens = getattr(data, "prompt_tokens", 0)
             self.completion_tokens = getattr(data, "completion_tokens", 0)
             self.total_tokens = getattr(data, "total_tokens", 0)
+            self.cached_tokens = _token_count(
+                getattr(getattr(data, "prompt_tokens_details", None), "cached_tokens", 0)
+            )
         elif hasattr(data, "prompt_token_count"):
             # Gemini GenerateContentResponseUsageMetadata format
             self.prompt_tokens = getattr(data, "prompt_token_count", 0)
             self.completion_tokens = getattr(data, "candidates_token_count", 0)
             self.total_tokens = getattr(data, "total_token_count", 0)
+            self.cached_tokens = _token_count(getattr(data, "cached_content_token_count", 0))
 
     @property
     def prompt_token_count(self) -> int:
@@ -156,6 +209,10 @@ class UsageMetadata:
             "completion_tokens": self.completion_tokens,
             "total_tokens": self.total_tokens,
         }
+        if self.cached_tokens:
+            result["cached_tokens"] = self.cached_tokens
+        if self.cache_storage_token_hours:
+            result["cache_storage_token_hours"] = self.cache_storage_token_hours
         if self.model:
             result["model"] = self.model
         return result
@@ -381,8 +438,8 @@ class LLMManager:
 
     def __init__(
         self,
-        openai_client: Optional[AsyncOpenAI] = None,
-        gemini_client: Optional[genai.Client] = None,
+        openai_client: Optional["AsyncOpenAI"] = None,
+        gemini_client: Optional["genai.Client"] = None,
         config: Optional[Dict[str, Any]] = None,
     ):
         """
@@ -404,8 +461,40 @@ class LLMManager:
         self.aggregation_strategy = self.config.get("aggregation_strategy", "concatenate")
         self.chunk_strategy = self.config.get("chunk_strategy", "sentences")
 
-        # Track usage metadata from last call
-        self._last_usage_metadata = None
+        # Explicit Gemini context caching for prompts that start with a cacheable prefix
+        self.gemini_cache: Optional[GeminiContextCache] = None
+        if gemini_client is not None and self.config.get("gemini_context_cache", False):
+            self.gemini_cache = GeminiContextCache(
+                gemini_client, self.config.get("gemini_cache_ttl_seconds", DEFAULT_TTL_SECONDS)
+            )
+
+        # Track usage metadata and raw Gemini response from the last call. These live in
+        # context variables so concurrent calls (e.g. asyncio.gather over judgement batches)
+        # each see the metadata of their own call rather than whichever finished last.
+        self._usage_var: ContextVar[Optional[UsageMetadata]] = ContextVar(
+            f"llm_usage_{id(self)}", default=None
+        )
+        self._gemini_response_var: ContextVar[Any] = ContextVar(
+            f"llm_gemini_response_{id(self)}", default=None
+        )
+
+    @property
+    def _last_usage_metadata(self) -> Optional[UsageMetadata]:
+        """Usage metadata recorded by the last call in the current context."""
+        return self._usage_var.get()
+
+    @_last_usage_metadata.setter
+    def _last_usage_metadata(self, value: Optional[UsageMetadata]) -> None:
+        self._usage_var.set(value)
+
+    @property
+    def _last_gemini_response(self) -> Any:
+        """Raw Gemini response from the last call in the current context."""
+        return self._gemini_response_var.get()
+
+    @_last_gemini_response.setter
+    def _last_gemini_response(self, value: Any) -> None:
+        self._gemini_response_var.set(value)
 
     def _is_openai_model(self, model: str) -> bool:
         """Check if model is an OpenAI model."""
@@ -440,7 +529,10 @@ class LLMManager:
             temperature: Temperature for generation
             system_message: Optional system message
             response_format: Optional response format (e.g., "json")
-            **kwargs: Additional model-specific parameters
+            **kwargs: Additional model-specific parameters. ``cacheable_prefix_length`` (the
+                length of a leading part of ``prompt``) and ``cache_scope`` (e.g. repository
+                and reasoning mode) let Gemini calls reference an explicitly cached copy of
+                that prefix.
 
         Returns:
             Generated response (string or dict if JSON format)
@@ -478,6 +570,7 @@ class LLMManager:
             raise ValueError(f"Unknown model type: {model}")
 
     @api_retry
+    @traced("llm.openai")
     async def _call_openai(
         self,
         prompt: str,
@@ -507,6 +600,10 @@ class LLMManager:
         if not self.openai_client:
             raise ValueError("OpenAI client not initialized")
 
+        # OpenAI caches repeated prompt prefixes automatically
+        kwargs.pop("cacheable_prefix_length", None)
+        kwargs.pop("cache_scope", None)
+
         # Build params for Responses API
         params = {
             "model": model,
@@ -533,7 +630,8 @@ class LLMManager:
 
         try:
             # Use the new Responses API endpoint
-            response = await self.openai_client.responses.create(**params)
+            with observe_llm_call(model):
+                response = await self.openai_client.responses.create(**params)
 
             # Extract content from new response structure
             # Handle case where output might be a list (Deep Research models sometimes return multiple outputs)
@@ -545,6 +643,7 @@ class LLMManager:
             # Store usage metadata (same structure as before)
             if hasattr(response, "usage"):
                 self._last_usage_metadata = UsageMetadata(response.usage)
+                _record_usage(model, prompt, self._last_usage_metadata)
 
             if response_format == "json":
                 try:
@@ -559,6 +658,7 @@ class LLMManager:
             raise
 
     @api_retry
+    @traced("llm.gemini")
     async def _call_gemini(
         self,
         prompt: str,
@@ -588,6 +688,9 @@ class LLMManager:
         if not self.gemini_client:
             raise ValueError("Gemini client not configured")
 
+        prefix_length = kwargs.pop("cacheable_prefix_length", None)
+        cache_scope = kwargs.pop("cache_scope", None)
+
         # Combine system message with prompt if provided
         full_prompt = prompt
         if system_message:
@@ -634,6 +737,25 @@ class LLMManager:
                     value = getattr(generation_config, attr)
                     config_dict[attr] = value
 
+        # Reference a cached copy of the prompt prefix and send only the rest
+        contents = full_prompt
+        cached_prefix = None
+        if (
+            self.gemini_cache is not None
+            and prefix_length
+            and cache_scope
+            and prefix_length <= len(prompt)
+        ):
+            cached_prefix = await self.gemini_cache.get(
+                model, cache_scope, prompt[:prefix_length], config_dict.get("tools")
+            )
+            if cached_prefix:
+                config_dict.pop("tools", None)
+                config_dict["cached_content"] = cached_prefix.name
+                contents = prompt[prefix_length:]
+                if system_message:
+                    contents = f"{system_message}\n\n{contents}"
+
         # Create config instance
         if config_class == GenerateContentConfig:
             config = config_class(**config_dict)
@@ -642,10 +764,11 @@ class LLMManager:
 
         try:
             # Prepare API call parameters
-            api_params = {"model": f"models/{model}", "contents": full_prompt, "config": config}
+            api_params = {"model": f"models/{model}", "contents": contents, "config": config}
 
             # Make the API call
-            response = await self.gemini_client.aio.models.generate_content(**api_params)
+            with observe_llm_call(model):
+                response = await self.gemini_client.aio.models.generate_content(**api_params)
 
             # Extract text from response
             if hasattr(response, "text"):
@@ -655,8 +778,13 @@ class LLMManager:
 
             # Store usage metadata if available
             if hasattr(response, "usage_metadata"):
-                usage = response.usage_metadata
-                self._last_usage_metadata = UsageMetadata(usage)
+                usage = UsageMetadata(response.usage_metadata)
+                if cached_prefix:
+                    usage.cache_storage_token_hours = (
+                        _token_count(usage.cached_tokens) * cached_prefix.storage_seconds / 3600
+                    )
+                self._last_usage_metadata = usage
+                _record_usage(model, prompt, usage)
 
             self._last_gemini_response = response
 
@@ -704,6 +832,10 @@ class LLMManager:
         Returns:
             Aggregated response (string or dict if JSON format)
         """
+        # Chunks do not start with the cacheable prefix
+        kwargs.pop("cacheable_prefix_length", None)
+        kwargs.pop("cache_scope", None)
+
         # Calculate available tokens for content
         model_limit = self.token_counter.get_model_limit(model)
         system_tokens = self.token_counter.count_tokens(system_message or "", model)
@@ -714,6 +846,7 @@ class LLMManager:
 
         # Log the number of chunks created
         logger.info(f"Split prompt into {len(chunks)} chunks for model {model}")
+        LLM_CHUNKS.labels(model).inc(len(chunks))
 
         # Process chunks
         responses = []
@@ -732,9 +865,15 @@ class LLMManager:
                 f"Making LLM call {i+1}/{len(chunks)} to model {model} with chunk size: {len(chunk_prompt)} characters"
             )
 
-            response = await self._single_call(
-                chunk_prompt, model, temperature, system_message, response_format, **kwargs
-            )
+            chunk_attributes = {
+                "yellhorn.chunk.index": i,
+                "yellhorn.chunk.count": len(chunks),
+                "yellhorn.chunk.chars": len(chunk_prompt),
+            }
+            with span("llm.chunk", chunk_attributes):
+                response = await self._single_call(
+                    chunk_prompt, model, temperature, system_message, response_format, **kwargs
+                )
             responses.append(response)
 
             # Debug log for response received
@@ -747,6 +886,10 @@ class LLMManager:
                 total_usage.prompt_tokens += self._last_usage_metadata.prompt_tokens
                 total_usage.completion_tokens += self._last_usage_metadata.completion_tokens
                 total_usage.total_tokens += self._last_usage_metadata.total_tokens
+                total_usage.cached_tokens += self._last_usage_metadata.cached_tokens
+                total_usage.cache_storage_token_hours += (
+                    self._last_usage_metadata.cache_storage_token_hours
+                )
 
         # Store aggregated usage
         self._last_usage_metadata = total_usage
@@ -0,0 +1,392 @@
+"""Prometheus-compatible metrics for the Yellhorn MCP server.
+
+A small in-process registry of counters, gauges and fixed-bucket histograms, rendered in the
+Prometheus text exposition format. Every metric is defined once below with a bounded label
+set (model, command, job kind), so a scrape costs the same no matter how long the server has
+been running. Set ``YELLHORN_MCP_METRICS_PORT`` to serve ``/metrics`` over HTTP.
+"""
+
+import functools
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+if TYPE_CHECKING:
+    from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers fast subprocesses through multi-minute LLM calls
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _as_count(value: Any) -> int:
+    # SDK usage objects occasionally carry None (or non-numeric placeholders) for counts
+    return value if isinstance(value, int) else 0
+
+
+def _label_text(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """Base class holding one value (or histogram state) per label combination."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> "_Bound":
+        """Return this metric bound to one combination of label values."""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        return _Bound(self, tuple(str(value) for value in values))
+
+    def clear(self) -> None:
+        """Drop all recorded values."""
+        with self._lock:
+            self._values.clear()
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Render HELP, TYPE and sample lines."""
+        with self._lock:
+            samples = self._samples()
+        header = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        return "\n".join(header + samples)
+
+
+class _Bound:
+    """A metric bound to label values, as returned by ``labels``."""
+
+    __slots__ = ("_metric", "_key")
+
+    def __init__(self, metric: _Metric, key: tuple[str, ...]):
+        self._metric = metric
+        self._key = key
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._metric._inc(self._key, amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._metric._inc(self._key, -amount)
+
+    def set(self, value: float) -> None:
+        self._metric._set(self._key, value)
+
+    def observe(self, value: float) -> None:
+        self._metric._observe(self._key, value)
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration of the block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._inc((), amount)
+
+    def _inc(self, key: tuple[str, ...], amount: float) -> None:
+        if amount < 0 and self.kind == "counter":
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_label_text(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._inc((), -amount)
+
+    def set(self, value: float) -> None:
+        self._set((), value)
+
+    def _set(self, key: tuple[str, ...], value: float) -> None:
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    """Distribution of observations over fixed cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float) -> None:
+        self._observe((), value)
+
+    def time(self):
+        """Observe the duration of the block in seconds."""
+        return _Bound(self, ()).time()
+
+    def _observe(self, key: tuple[str, ...], value: float) -> None:
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = state[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for key, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                labels = _label_text(self.labelnames, key, le)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _label_text(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ordered collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> Any:
+        """Add a metric and return it."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+    def clear(self) -> None:
+        """Drop the values of every metric (for tests)."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+LLM_CALL_SECONDS = REGISTRY.register(
+    Histogram(
+        "yellhorn_llm_call_duration_seconds",
+        "Duration of individual LLM API requests (each retry attempt counts).",
+        ("model",),
+    )
+)
+LLM_CALLS = REGISTRY.register(
+    Counter("yellhorn_llm_calls_total", "LLM API requests by outcome.", ("model", "outcome"))
+)
+LLM_TOKENS = REGISTRY.register(
+    Counter(
+        "yellhorn_llm_tokens_total",
+        "Tokens reported by LLM APIs; type is input, cached_input or output.",
+        ("model", "type"),
+    )
+)
+LLM_COST = REGISTRY.register(
+    Counter("yellhorn_llm_cost_usd_total", "Estimated LLM cost in USD.", ("model",))
+)
+LLM_RETRIES = REGISTRY.register(
+    Counter("yellhorn_llm_retries_total", "Retried LLM API requests.", ("function",))
+)
+LLM_CHUNKS = REGISTRY.register(
+    Counter("yellhorn_llm_chunks_total", "Prompt chunks sent for oversized prompts.", ("model",))
+)
+SNAPSHOT_SECONDS = REGISTRY.register(
+    Histogram("yellhorn_snapshot_duration_seconds", "Duration of codebase snapshots.")
+)
+SNAPSHOT_FILES = REGISTRY.register(
+    Histogram(
+        "yellhorn_snapshot_files",
+        "Files included in codebase snapshots.",
+        buckets=(10, 100, 500, 1_000, 5_000, 10_000, 50_000, 100_000),
+    )
+)
+SUBPROCESS_SECONDS = REGISTRY.register(
+    Histogram("yellhorn_subprocess_duration_seconds", "Duration of git/gh commands.", ("command",))
+)
+SUBPROCESSES = REGISTRY.register(
+    Counter("yellhorn_subprocesses_total", "git/gh commands by outcome.", ("command", "outcome"))
+)
+JOBS_IN_FLIGHT = REGISTRY.register(
+    Gauge("yellhorn_background_jobs_in_flight", "Background jobs currently running.", ("kind",))
+)
+JOBS = REGISTRY.register(Counter("yellhorn_background_jobs_total", "Started jobs.", ("kind",)))
+
+
+@contextmanager
+def observe_llm_call(model: str) -> Iterator[None]:
+    """Time one LLM API request and count it as a success or error."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        LLM_CALL_SECONDS.labels(model).observe(time.perf_counter() - start)
+        LLM_CALLS.labels(model, outcome).inc()
+
+
+def record_llm_usage(model: str, usage: Any) -> None:
+    """Count the tokens and estimated cost of one LLM response.
+
+    Args:
+        model: Model name.
+        usage: ``UsageMetadata`` of the response.
+    """
+    # Imported here because cost_tracker_utils imports llm_manager, which imports this module
+    from yellhorn_mcp.utils.cost_tracker_utils import calculate_cost
+
+    input_tokens = _as_count(usage.prompt_tokens)
+    output_tokens = _as_count(usage.completion_tokens)
+    cached_tokens = _as_count(usage.cached_tokens)
+    LLM_TOKENS.labels(model, "input").inc(input_tokens)
+    LLM_TOKENS.labels(model, "output").inc(output_tokens)
+    if cached_tokens:
+        LLM_TOKENS.labels(model, "cached_input").inc(cached_tokens)
+    storage = getattr(usage, "cache_storage_token_hours", 0.0)
+    cost = calculate_cost(
+        model,
+        input_tokens,
+        output_tokens,
+        cached_tokens,
+        storage if isinstance(storage, (int, float)) else 0.0,
+    )
+    if cost:
+        LLM_COST.labels(model).inc(cost)
+
+
+def observe_subprocess(command: str) -> Callable[[Callable], Callable]:
+    """Decorator timing and counting an async git/gh command runner."""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                result = await func(*args, **kwargs)
+                outcome = "success"
+                return result
+            finally:
+                SUBPROCESS_SECONDS.labels(command).observe(time.perf_counter() - start)
+                SUBPROCESSES.labels(command, outcome).inc()
+
+        return wrapper
+
+    return decorator
+
+
+def observe_snapshot(func: Callable) -> Callable:
+    """Decorator recording the duration and file count of an async snapshot function.
+
+    The wrapped function must return ``(file_paths, file_contents)``.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with SNAPSHOT_SECONDS.time():
+            file_paths, file_contents = await func(*args, **kwargs)
+        SNAPSHOT_FILES.observe(len(file_paths))
+        return file_paths, file_contents
+
+    return wrapper
+
+
+def job_started(kind: str) -> None:
+    """Count a background job as started and in flight."""
+    JOBS.labels(kind).inc()
+    JOBS_IN_FLIGHT.labels(kind).inc()
+
+
+def job_finished(kind: str) -> None:
+    """Count a background job as no longer in flight."""
+    JOBS_IN_FLIGHT.labels(kind).dec()
+
+
+async def start_metrics_server(
+    host: str, port: int, registry: MetricsRegistry = REGISTRY
+) -> "web.AppRunner":
+    """Serve ``GET /metrics`` for Prometheus scrapes.
+
+    Args:
+        host: Interface to bind.
+        port: Port to bind (0 picks a free port).
+        registry: Registry to expose.
+
+    Returns:
+        The running app runner; call ``cleanup()`` on it to stop the server.
+    """
+
+    from aiohttp import web
+
+    async def handle_metrics(request: web.Request) -> web.Response:
+        return web.Response(
+            body=registry.render().encode("utf-8"), headers={"Content-Type": CONTENT_TYPE}
+        )
+
+    app = web.Application()
+    app.add_routes([web.get("/metrics", handle_metrics)])
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info(f"Serving Prometheus metrics at http://{host}:{port}/metrics")
+    return runner
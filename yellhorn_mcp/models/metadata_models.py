@@ -37,8 +37,14 @@ class CompletionMetadata(BaseModel):
     )
     generation_time_seconds: float = Field(description="Time taken for LLM generation")
     input_tokens: int | None = Field(default=None, description="Number of input tokens")
+    cached_input_tokens: int | None = Field(
+        default=None, description="Input tokens served from the provider's prompt cache"
+    )
     output_tokens: int | None = Field(default=None, description="Number of output tokens")
     total_tokens: int | None = Field(default=None, description="Total tokens used")
+    cache_storage_token_hours: float | None = Field(
+        default=None, description="Storage bought for explicitly cached content (tokens x hours)"
+    )
     estimated_cost: float | None = Field(default=None, description="Estimated cost in USD")
     model_version_used: str | None = Field(
         default=None, description="Actual model version reported by API"
@@ -55,4 +61,8 @@ class CompletionMetadata(BaseModel):
         default=None, description="Total characters in the prompt"
     )
     warnings: list[str] | None = Field(default=None, description="Any warnings to report")
+    phase_timings: dict[str, float] | None = Field(
+        default=None,
+        description="Seconds spent per job phase; nested phases use '/'-separated paths",
+    )
     timestamp: datetime | None = Field(default=None, description="Timestamp of completion")
@@ -6,20 +6,441 @@ by analyzing the codebase and creating .yellhorncontext files.
 
 import asyncio
 import json
-import os
 import re
-from collections import defaultdict
+from collections import Counter, defaultdict
 from pathlib import Path
 from typing import Any, List, Optional, Set
 
 from mcp.server.fastmcp import Context
 
 from yellhorn_mcp.llm_manager import LLMManager
-from yellhorn_mcp.formatters.codebase_snapshot import get_codebase_snapshot
+from yellhorn_mcp.metrics import job_finished, job_started
+from yellhorn_mcp.formatters.codebase_snapshot import (
+    enumerate_repository_files,
+    get_codebase_snapshot,
+)
 from yellhorn_mcp.formatters.prompt_formatter import format_codebase_for_prompt, build_file_structure_context
+from yellhorn_mcp.formatters.snapshot_cache import RepositorySnapshot, get_shared_snapshot
+from yellhorn_mcp.tracing import traced
 from yellhorn_mcp.utils.git_utils import YellhornMCPError
+from yellhorn_mcp.utils.timing_utils import PhaseTimer, phase, phase_timing_enabled, timed_phase
 
 
+# Curation strategies: "single" sends the whole tree in one call, "hierarchical" partitions
+# the tree, selects directories per partition in parallel and then runs a reduce pass.
+CURATION_MODES = ("auto", "single", "hierarchical")
+
+# In "auto" mode, repositories with more files than this are curated hierarchically
+HIERARCHICAL_FILE_THRESHOLD = 2000
+
+# Upper bound on the number of files in a single partition prompt
+PARTITION_MAX_FILES = 400
+
+# Maximum number of partition calls in flight at once
+PARTITION_CONCURRENCY = 8
+
+CURATION_SYSTEM_MESSAGE = """You are an expert software developer tasked with analyzing a codebase structure to identify important directories for AI context.
+
+Your goal is to identify the most important directories that should be included when an AI assistant analyzes this codebase for the user's task.
+
+Analyze the directories and identify the ones that:
+1. Contain core application code relevant to the user's task
+2. Likely contain important business logic
+3. Would be essential for understanding the codebase architecture
+4. Are needed to implement the requested task
+
+Ignore directories that:
+1. Contain only build artifacts or generated code
+2. Store dependencies or vendor code
+3. Contain temporary or cache files
+4. Probably aren't relevant to the user's specific task
+
+Return your analysis as a list of important directories, one per line, in this format:
+
+```context
+dir1
+dir2
+dir3
+```
+
+Don't include explanations for your choices, just return the list in the specified format."""
+
+PARTITION_SYSTEM_MESSAGE = """You are an expert software developer helping to curate AI context for a large codebase.
+
+You will be shown ONE part of the codebase together with the user's task. Other parts are reviewed separately, so only judge the directories shown to you.
+
+Select the directories from this part that contain code relevant to the task, core business logic, or architecture needed to implement it. Skip build artifacts, generated code, vendored dependencies and caches. If nothing in this part is relevant, return an empty block.
+
+Return the selected directories, one per line, in this format:
+
+```context
+dir1
+dir2
+```
+
+Don't include explanations for your choices, just return the list in the specified format."""
+
+REDUCE_SYSTEM_MESSAGE = """You are an expert software developer helping to curate AI context for a large codebase.
+
+Different parts of the codebase were reviewed independently and each review proposed candidate directories for the user's task. Merge these proposals into the final list of directories that should be included in AI context. Drop candidates that are unlikely to matter for the task and prefer a parent directory over listing many of its children.
+
+Only return directories from the candidate list, one per line, in this format:
+
+```context
+dir1
+dir2
+```
+
+Don't include explanations for your choices, just return the list in the specified format."""
+
+
+def extract_directories(file_paths: list[str]) -> list[str]:
+    """Collect every directory that contains at least one of the given files.
+
+    Args:
+        file_paths: Repository-relative file paths.
+
+    Returns:
+        Sorted list of directories, including "." when files exist at the root.
+    """
+    all_dirs = set()
+    for file_path in file_paths:
+        # Get all parent directories of this file
+        parts = file_path.split("/")
+        for i in range(1, len(parts)):
+            dir_path = "/".join(parts[:i])
+            if dir_path:  # Skip empty strings
+                all_dirs.add(dir_path)
+
+    # Add root directory ('.') if there are files at the root level
+    if any("/" not in f for f in file_paths):
+        all_dirs.add(".")
+
+    return sorted(all_dirs)
+
+
+def _split_by_directory(file_paths: list[str], depth: int, max_files: int) -> list[list[str]]:
+    """Group files by their directory component at ``depth``, recursing into large groups."""
+    buckets: dict[str, list[str]] = defaultdict(list)
+    for file_path in file_paths:
+        parts = file_path.split("/")
+        # Files that live directly at this level are grouped under ""
+        buckets[parts[depth] if len(parts) > depth + 1 else ""].append(file_path)
+
+    groups = []
+    for key in sorted(buckets):
+        bucket = buckets[key]
+        if len(bucket) <= max_files:
+            groups.append(bucket)
+        elif key:
+            groups.extend(_split_by_directory(bucket, depth + 1, max_files))
+        else:
+            groups.extend(bucket[i : i + max_files] for i in range(0, len(bucket), max_files))
+    return groups
+
+
+def partition_file_paths(
+    file_paths: list[str], max_files: int = PARTITION_MAX_FILES
+) -> list[list[str]]:
+    """Partition the file tree by top-level subsystem for hierarchical curation.
+
+    Files are grouped by top-level directory. Groups larger than ``max_files`` are split by
+    their next directory level, and small neighbouring groups are packed together so the
+    number of partitions (and therefore LLM calls) stays low.
+
+    Args:
+        file_paths: Repository-relative file paths.
+        max_files: Maximum number of files per partition.
+
+    Returns:
+        List of partitions, each a list of file paths. Every file appears in exactly one.
+    """
+    partitions: list[list[str]] = []
+    current: list[str] = []
+    for group in _split_by_directory(sorted(file_paths), 0, max_files):
+        if current and len(current) + len(group) > max_files:
+            partitions.append(current)
+            current = []
+        current.extend(group)
+    if current:
+        partitions.append(current)
+    return partitions
+
+
+def parse_context_directories(result: Any, valid_dirs: set[str] | list[str]) -> set[str]:
+    """Extract directory paths from an LLM response.
+
+    Args:
+        result: Raw LLM response.
+        valid_dirs: Directories that may be returned; anything else is discarded.
+
+    Returns:
+        Set of directories found in ```context blocks, or on bare lines if no block matched.
+    """
+    # Ensure result is a string
+    result_str = result if isinstance(result, str) else str(result)
+    valid = set(valid_dirs)
+    important_dirs = set()
+
+    # Find all context blocks (```context followed by content and closing ```)
+    context_blocks = re.findall(r"```context\n([\s\S]*?)\n```", result_str, re.MULTILINE)
+
+    # Process each block
+    for block in context_blocks:
+        for line in block.split("\n"):
+            line = line.strip()
+            # Skip empty lines and comments
+            if line and not line.startswith("#"):
+                # Validate that the directory exists in our list
+                if line in valid or line == ".":
+                    important_dirs.add(line)
+
+    # If we didn't find any directories in context blocks, try to extract them directly
+    if not important_dirs:
+        for line in result_str.split("\n"):
+            line = line.strip()
+            # Only add if it looks like a directory path (no spaces, existing in our list)
+            # and not part of a code block
+            if line and " " not in line and (line in valid or line == ".") and not line.startswith("```"):
+                important_dirs.add(line)
+
+    return important_dirs
+
+
+@timed_phase("curation_context")
+async def build_curation_context(
+    repo_path: Path,
+    file_paths: list[str],
+    codebase_reasoning_mode: str,
+    snapshot: RepositorySnapshot | None = None,
+) -> str:
+    """Render the codebase view shown to the model during curation.
+
+    Args:
+        repo_path: Path to the repository.
+        file_paths: Files to include.
+        codebase_reasoning_mode: "lsp", "full", or anything else for file structure only.
+        snapshot: Optional shared snapshot used to read file contents in "full" mode.
+
+    Returns:
+        The formatted directory context.
+    """
+    if codebase_reasoning_mode == "lsp":
+        # Get LSP snapshot of the codebase
+        from yellhorn_mcp.utils.lsp_utils import get_lsp_snapshot
+
+        lsp_file_paths, lsp_file_contents = await get_lsp_snapshot(repo_path, file_paths)
+        return await format_codebase_for_prompt(lsp_file_paths, lsp_file_contents)
+
+    if codebase_reasoning_mode == "full":
+        # Get file contents for filtered files
+        file_contents = {}
+        for file_path in file_paths:
+            if snapshot:
+                content = snapshot.read_text(file_path)
+                if content is not None:
+                    file_contents[file_path] = content
+                continue
+            full_path = repo_path / file_path
+            if full_path.is_file():
+                try:
+                    with open(full_path, "r", encoding="utf-8", errors="ignore") as f:
+                        file_contents[file_path] = f.read()
+                except Exception:
+                    # Skip files that can't be read
+                    pass
+        return await format_codebase_for_prompt(file_paths, file_contents)
+
+    # Default to file structure mode
+    return build_file_structure_context(file_paths)
+
+
+async def _curate_single_pass(
+    repo_path: Path,
+    llm_manager: LLMManager,
+    model: str,
+    file_paths: list[str],
+    sorted_dirs: list[str],
+    codebase_reasoning_mode: str,
+    ctx: Context | None,
+    snapshot: RepositorySnapshot | None = None,
+) -> set[str]:
+    """Select important directories with a single LLM call over the whole tree."""
+    if ctx:
+        mode_descriptions = {
+            "lsp": "Using LSP mode for codebase analysis",
+            "full": "Using full mode with file contents for codebase analysis",
+        }
+        await ctx.log(
+            level="info",
+            message=mode_descriptions.get(
+                codebase_reasoning_mode, "Using file structure mode for codebase analysis"
+            ),
+        )
+
+    directory_context = await build_curation_context(
+        repo_path, file_paths, codebase_reasoning_mode, snapshot
+    )
+
+    # Log peek of directory_context
+    if ctx:
+        await ctx.log(
+            level="info",
+            message=(
+                f"Directory context:\n{directory_context[:500]}..."
+                if len(directory_context) > 500
+                else f"Directory context:\n{directory_context}"
+            ),
+        )
+        await ctx.log(
+            level="info",
+            message=f"Analyzing directory structure with {model}",
+        )
+
+    try:
+        with phase("llm_call"):
+            result = await llm_manager.call_llm(
+                model=model,
+                prompt=directory_context,
+                system_message=CURATION_SYSTEM_MESSAGE,
+                temperature=0.0,
+            )
+        all_important_dirs = parse_context_directories(result, sorted_dirs)
+
+        # Log the directories found
+        if ctx:
+            dirs_str = ", ".join(sorted(list(all_important_dirs))[:5])
+            if len(all_important_dirs) > 5:
+                dirs_str += f", ... ({len(all_important_dirs) - 5} more)"
+
+            await ctx.log(
+                level="info",
+                message=f"Analysis complete, found {len(all_important_dirs)} important directories: {dirs_str}",
+            )
+
+    except Exception as e:
+        if ctx:
+            await ctx.log(
+                level="error",
+                message=f"Error during LLM analysis: {str(e)} ({type(e).__name__})",
+            )
+        # Continue with fallback behavior
+        all_important_dirs = set(sorted_dirs)
+
+    return all_important_dirs
+
+
+async def _curate_hierarchical(
+    repo_path: Path,
+    llm_manager: LLMManager,
+    model: str,
+    user_task: str,
+    file_paths: list[str],
+    codebase_reasoning_mode: str,
+    ctx: Context | None,
+    snapshot: RepositorySnapshot | None = None,
+) -> set[str]:
+    """Select important directories with a parallel map pass per partition and a reduce pass.
+
+    Each partition prompt shares the same system message and contains only that partition's
+    tree, followed by the task, keeping prompts small and cacheable. All partitions run
+    concurrently, so wall time is bounded by the slowest partition rather than the sum.
+    """
+    partitions = partition_file_paths(file_paths, PARTITION_MAX_FILES)
+    if ctx:
+        await ctx.log(
+            level="info",
+            message=f"Using hierarchical curation across {len(partitions)} partitions with {model}",
+        )
+
+    semaphore = asyncio.Semaphore(PARTITION_CONCURRENCY)
+
+    async def select_partition(index: int, partition: list[str]) -> set[str]:
+        partition_dirs = extract_directories(partition)
+        async with semaphore:
+            try:
+                partition_context = await build_curation_context(
+                    repo_path, partition, codebase_reasoning_mode, snapshot
+                )
+                with phase("llm_call"):
+                    result = await llm_manager.call_llm(
+                        model=model,
+                        prompt=f"{partition_context}\n\nTask: {user_task}",
+                        system_message=PARTITION_SYSTEM_MESSAGE,
+                        temperature=0.0,
+                    )
+                selected = parse_context_directories(result, partition_dirs)
+            except Exception as e:
+                if ctx:
+                    await ctx.log(
+                        level="error",
+                        message=(
+                            f"Error analyzing partition {index + 1}/{len(partitions)}: "
+                            f"{str(e)} ({type(e).__name__})"
+                        ),
+                    )
+                # Keep the whole partition rather than silently dropping it
+                selected = set(partition_dirs)
+        if ctx:
+            await ctx.log(
+                level="info",
+                message=(
+                    f"Partition {index + 1}/{len(partitions)} ({len(partition)} files): "
+                    f"selected {len(selected)} directories"
+                ),
+            )
+        return selected
+
+    partition_results = await asyncio.gather(
+        *(select_partition(i, partition) for i, partition in enumerate(partitions))
+    )
+    candidates = set().union(*partition_results) if partition_results else set()
+
+    # A single partition already saw the whole tree, so there is nothing to reduce
+    if len(partitions) <= 1 or len(candidates) <= 1:
+        return candidates
+
+    file_counts: Counter[str] = Counter()
+    for file_path in file_paths:
+        parts = file_path.split("/")
+        if len(parts) == 1:
+            file_counts["."] += 1
+        for i in range(1, len(parts)):
+            file_counts["/".join(parts[:i])] += 1
+    candidate_list = "\n".join(f"{d} ({file_counts[d]} files)" for d in sorted(candidates))
+
+    try:
+        with phase("reduce_call"):
+            result = await llm_manager.call_llm(
+                model=model,
+                prompt=f"Candidate directories:\n{candidate_list}\n\nTask: {user_task}",
+                system_message=REDUCE_SYSTEM_MESSAGE,
+                temperature=0.0,
+            )
+        final_dirs = parse_context_directories(result, candidates)
+    except Exception as e:
+        if ctx:
+            await ctx.log(
+                level="error",
+                message=f"Error during reduce pass: {str(e)} ({type(e).__name__})",
+            )
+        final_dirs = set()
+
+    if not final_dirs:
+        # Fall back to the union of the partition selections
+        final_dirs = candidates
+
+    if ctx:
+        await ctx.log(
+            level="info",
+            message=(
+                f"Reduce pass kept {len(final_dirs)} of {len(candidates)} candidate directories"
+            ),
+        )
+    return final_dirs
+
+
+@traced("job context_curation")
 async def process_context_curation_async(
     repo_path: Path,
     llm_manager: LLMManager,
@@ -30,6 +451,7 @@ async def process_context_curation_async(
     ignore_file_path: str = ".yellhornignore",
     depth_limit: int = 0,
     disable_search_grounding: bool = False,
+    curation_mode: str = "auto",
     ctx: Context | None = None,
 ) -> str:
     """Analyze codebase and create a context curation file.
@@ -44,6 +466,9 @@ async def process_context_curation_async(
         ignore_file_path: Path to the ignore file.
         depth_limit: Maximum directory depth to analyze (0 = no limit).
         disable_search_grounding: Whether to disable search grounding.
+        curation_mode: "single" for one LLM call over the whole tree, "hierarchical" for a
+            parallel per-partition map pass followed by a reduce pass, or "auto" to choose
+            hierarchical only for repositories above HIERARCHICAL_FILE_THRESHOLD files.
         ctx: Optional context for logging.
 
     Returns:
@@ -52,6 +477,13 @@ async def process_context_curation_async(
     Raises:
         YellhornMCPError: If context curation fails.
     """
+    # Create a simple logging function that uses ctx if available
+    def context_log(msg: str):
+        if ctx:
+            asyncio.create_task(ctx.log(level="info", message=msg))
+
+    job_started("context_curation")
+    timer = PhaseTimer(enabled=phase_timing_enabled()).start()
     try:
         # Store original search grounding setting
         original_search_grounding = None
@@ -64,32 +496,22 @@ async def process_context_curation_async(
         if ctx:
             await ctx.log(level="info", message="Starting context curation process")
 
-        # Get all files in the repository
-        all_file_paths = []
-        for root, dirs, files in os.walk(repo_path):
-            # Skip hidden directories and common ignore patterns
-            dirs[:] = [
-                d
-                for d in dirs
-                if not d.startswith(".") and d not in ["node_modules", "__pycache__", "venv", "env"]
-            ]
-
-            for file in files:
-                if not file.startswith(".") and not file.endswith(".pyc"):
-                    file_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(file_path, repo_path)
-                    all_file_paths.append(relative_path)
+        # Reuse the per-HEAD snapshot shared with other tools when the server provides one
+        snapshot = await get_shared_snapshot(ctx, repo_path)
 
-        if ctx:
-            await ctx.log(level="info", message=f"Found {len(all_file_paths)} files in repository")
-
-        # Use all files without ignore filtering
-        filtered_file_paths = all_file_paths.copy()
+        # Enumerate candidate files via git (respects .gitignore) plus the compiled ignore rules
+        with phase("enumerate_files"):
+            filtered_file_paths = await enumerate_repository_files(
+                repo_path,
+                ignore_file_path=ignore_file_path,
+                log_function=context_log,
+                snapshot=snapshot,
+            )
 
         if ctx:
             await ctx.log(
                 level="info",
-                message=f"Using all {len(filtered_file_paths)} files without ignore filtering",
+                message=f"Found {len(filtered_file_paths)} files in repository after ignore rules",
             )
 
         # Apply depth limit if specified
@@ -107,21 +529,7 @@ async def process_context_curation_async(
                 )
 
         # Extract and analyze directories from filtered files
-        all_dirs = set()
-        for file_path in filtered_file_paths:
-            # Get all parent directories of this file
-            parts = file_path.split("/")
-            for i in range(1, len(parts)):
-                dir_path = "/".join(parts[:i])
-                if dir_path:  # Skip empty strings
-                    all_dirs.add(dir_path)
-
-        # Add root directory ('.') if there are files at the root level
-        if any("/" not in f for f in filtered_file_paths):
-            all_dirs.add(".")
-
-        # Sort directories for consistent output
-        sorted_dirs = sorted(list(all_dirs))
+        sorted_dirs = extract_directories(filtered_file_paths)
 
         if ctx:
             await ctx.log(
@@ -136,178 +544,44 @@ async def process_context_curation_async(
             else codebase_reasoning
         )
 
-        if codebase_reasoning_mode == "lsp":
-            # Use LSP mode to get detailed code structure
-            if ctx:
-                await ctx.log(
-                    level="info",
-                    message="Using LSP mode for codebase analysis",
-                )
-            # Get LSP snapshot of the codebase
-            from yellhorn_mcp.utils.lsp_utils import get_lsp_snapshot
-
-            lsp_file_paths, lsp_file_contents = await get_lsp_snapshot(repo_path)
-
-            # Use all LSP results without filtering
-            filtered_lsp_paths = lsp_file_paths
-            filtered_lsp_contents = lsp_file_contents
-
-            # Format with LSP structure
-            directory_context = await format_codebase_for_prompt(
-                filtered_lsp_paths, filtered_lsp_contents
-            )
-
-        elif codebase_reasoning_mode == "full":
-            # Use full mode with file contents
-            if ctx:
-                await ctx.log(
-                    level="info",
-                    message="Using full mode with file contents for codebase analysis",
-                )
-
-            # Get file contents for filtered files
-            file_contents = {}
-            for file_path in filtered_file_paths:
-                full_path = repo_path / file_path
-                if full_path.is_file():
-                    try:
-                        with open(full_path, "r", encoding="utf-8", errors="ignore") as f:
-                            file_contents[file_path] = f.read()
-                    except Exception:
-                        # Skip files that can't be read
-                        pass
-
-            # Format with full file contents
-            directory_context = await format_codebase_for_prompt(filtered_file_paths, file_contents)
-
-        else:
-            # Default to file structure mode
-            if ctx:
-                await ctx.log(
-                    level="info",
-                    message="Using file structure mode for codebase analysis",
-                )
-            directory_context = build_file_structure_context(filtered_file_paths)
-
-        # Log peek of directory_context
-        if ctx:
-            await ctx.log(
-                level="info",
-                message=(
-                    f"Directory context:\n{directory_context[:500]}..."
-                    if len(directory_context) > 500
-                    else f"Directory context:\n{directory_context}"
-                ),
-            )
-
-        # Construct the system message
-        system_message = """You are an expert software developer tasked with analyzing a codebase structure to identify important directories for AI context.
-
-Your goal is to identify the most important directories that should be included when an AI assistant analyzes this codebase for the user's task.
-
-Analyze the directories and identify the ones that:
-1. Contain core application code relevant to the user's task
-2. Likely contain important business logic
-3. Would be essential for understanding the codebase architecture
-4. Are needed to implement the requested task
-
-Ignore directories that:
-1. Contain only build artifacts or generated code
-2. Store dependencies or vendor code
-3. Contain temporary or cache files
-4. Probably aren't relevant to the user's specific task
-
-Return your analysis as a list of important directories, one per line, in this format:
-
-```context
-dir1
-dir2
-dir3
-```
-
-Don't include explanations for your choices, just return the list in the specified format."""
-
-        # Construct the prompt with user task and directory context
-        prompt = f"""{directory_context}"""
-
         # Use LLMManager for unified LLM calls
         if not llm_manager:
             raise YellhornMCPError("LLM Manager not initialized")
 
-        # Additional kwargs for the LLM call
-        llm_kwargs = {}
-
-        if ctx:
-            await ctx.log(
-                level="info",
-                message=f"Analyzing directory structure with {model}",
+        if curation_mode not in CURATION_MODES:
+            raise YellhornMCPError(
+                f"Invalid curation_mode '{curation_mode}'. Must be one of: {', '.join(CURATION_MODES)}"
             )
-
-        # Track important directories
-        all_important_dirs = set()
-
-        # Use LLMManager to handle the LLM call
-        try:
-            result = await llm_manager.call_llm(
-                model=model,
-                prompt=prompt,
-                system_message=system_message,
-                temperature=0.0,
-                **llm_kwargs,
+        if curation_mode == "auto":
+            curation_mode = (
+                "hierarchical"
+                if len(filtered_file_paths) > HIERARCHICAL_FILE_THRESHOLD
+                else "single"
             )
 
-            # Extract directory paths from all context blocks using regex
-            import re
-
-            # Ensure result is a string
-            result_str = result if isinstance(result, str) else str(result)
-
-            # Find all context blocks (```context followed by content and closing ```)
-            context_blocks = re.findall(r"```context\n([\s\S]*?)\n```", result_str, re.MULTILINE)
-
-            # Process each block
-            for block in context_blocks:
-                for line in block.split("\n"):
-                    line = line.strip()
-                    # Skip empty lines and comments
-                    if line and not line.startswith("#"):
-                        # Validate that the directory exists in our sorted_dirs list
-                        if line in sorted_dirs or line == ".":
-                            all_important_dirs.add(line)
-
-            # If we didn't find any directories in context blocks, try to extract them directly
-            if not all_important_dirs:
-                for line in result_str.split("\n"):
-                    line = line.strip()
-                    # Only add if it looks like a directory path (no spaces, existing in our list)
-                    # and not part of a code block
-                    if (
-                        line
-                        and " " not in line
-                        and (line in sorted_dirs or line == ".")
-                        and not line.startswith("```")
-                    ):
-                        all_important_dirs.add(line)
-
-            # Log the directories found
-            if ctx:
-                dirs_str = ", ".join(sorted(list(all_important_dirs))[:5])
-                if len(all_important_dirs) > 5:
-                    dirs_str += f", ... ({len(all_important_dirs) - 5} more)"
-
-                await ctx.log(
-                    level="info",
-                    message=f"Analysis complete, found {len(all_important_dirs)} important directories: {dirs_str}",
+        with phase("curation"):
+            if curation_mode == "hierarchical":
+                all_important_dirs = await _curate_hierarchical(
+                    repo_path,
+                    llm_manager,
+                    model,
+                    user_task,
+                    filtered_file_paths,
+                    codebase_reasoning_mode,
+                    ctx,
+                    snapshot,
                 )
-
-        except Exception as e:
-            if ctx:
-                await ctx.log(
-                    level="error",
-                    message=f"Error during LLM analysis: {str(e)} ({type(e).__name__})",
+            else:
+                all_important_dirs = await _curate_single_pass(
+                    repo_path,
+                    llm_manager,
+                    model,
+                    filtered_file_paths,
+                    sorted_dirs,
+                    codebase_reasoning_mode,
+                    ctx,
+                    snapshot,
                 )
-            # Continue with fallback behavior
-            all_important_dirs = set(sorted_dirs)
 
         # If we didn't get any important directories, include all directories
         if not all_important_dirs:
@@ -426,3 +700,6 @@ Don't include explanations for your choices, just return the list in the specifi
         if ctx:
             await ctx.log(level="error", message=error_message)
         raise YellhornMCPError(error_message)
+    finally:
+        timer.finish("context curation")
+        job_finished("context_curation")
@@ -10,9 +10,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable
 
-from google import genai
 from mcp.server.fastmcp import Context
-from openai import AsyncOpenAI
 
 from yellhorn_mcp import __version__
 from yellhorn_mcp.integrations.github_integration import (
@@ -21,18 +19,54 @@ from yellhorn_mcp.integrations.github_integration import (
     update_github_issue,
 )
 from yellhorn_mcp.llm_manager import LLMManager, UsageMetadata
+from yellhorn_mcp.metrics import job_finished, job_started
 from yellhorn_mcp.models.metadata_models import CompletionMetadata, SubmissionMetadata
-from yellhorn_mcp.token_counter import TokenCounter
-from yellhorn_mcp.formatters.context_fetcher import get_codebase_context
+from yellhorn_mcp.token_counter import get_token_counter
+from yellhorn_mcp.tracing import set_span_attributes, traced
+from yellhorn_mcp.formatters.context_fetcher import (
+    get_codebase_context,
+    get_diff_scoped_context,
+)
+from yellhorn_mcp.formatters.prompt_formatter import join_codebase_prompt
+from yellhorn_mcp.formatters.snapshot_cache import get_shared_snapshot
 from yellhorn_mcp.utils.comment_utils import (
     extract_urls,
     format_completion_comment,
+    format_omitted_files_warning,
     format_submission_comment,
 )
 from yellhorn_mcp.utils.cost_tracker_utils import calculate_cost, format_metrics_section
-from yellhorn_mcp.utils.git_utils import YellhornMCPError, run_git_command
+from yellhorn_mcp.utils.dependency_index import get_shared_dependency_index
+from yellhorn_mcp.utils.diff_utils import FileDiff, batch_file_diffs, split_diff_by_file
+from yellhorn_mcp.utils.git_utils import YellhornMCPError, get_remote_url, run_git_command
+from yellhorn_mcp.utils.judgement_cache import (
+    JudgementFragmentStore,
+    fragment_key,
+    hash_workplan,
+)
+from yellhorn_mcp.utils.retrieval_index import get_shared_retrieval_index
+from yellhorn_mcp.utils.timing_utils import (
+    PhaseTimer,
+    phase,
+    phase_timing_enabled,
+)
+
+# Diffs whose per-file batches exceed this many tokens are judged in parallel batches
+# followed by a synthesis pass instead of a single prompt
+JUDGEMENT_BATCH_MAX_TOKENS = 60_000
 
+# Maximum number of batch judgements in flight at once
+JUDGEMENT_BATCH_CONCURRENCY = 8
 
+# "diff" limits codebase context to the changed files and their import neighbors;
+# "repository" uses the same whole-repository context as workplan generation
+JUDGEMENT_CONTEXT_SCOPES = ("diff", "repository")
+
+# Per-file section headers of LSP-mode diffs from get_lsp_diff
+_LSP_DIFF_FILE = re.compile(r"^## (.+) \((?:Added|Deleted|Modified)\)$", re.MULTILINE)
+
+
+@traced("git_diff")
 async def get_git_diff(
     repo_path: Path, base_ref: str, head_ref: str, codebase_reasoning: str = "full"
 ) -> str:
@@ -87,6 +121,194 @@ async def get_git_diff(
         raise YellhornMCPError(f"Failed to generate git diff: {str(e)}")
 
 
+def _format_batch_prompt(
+    workplan_content: str, batch: list[FileDiff], index: int, total: int
+) -> str:
+    """Build the prompt for judging one batch of file diffs.
+
+    The workplan comes first so every batch prompt shares the same prefix.
+    """
+    file_list = "\n".join(f"- `{path}`" for path in dict.fromkeys(fd.path for fd in batch))
+    batch_diff = "".join(file_diff.text for file_diff in batch)
+    return (
+        "You are an expert software reviewer. A code diff is being judged against the workplan "
+        "below one batch of whole files at a time. Other files are reviewed separately and "
+        "merged afterwards, so only report on the files in this batch.\n\n"
+        f"# Original Workplan\n{workplan_content}\n\n"
+        f"# Code Diff (batch {index} of {total})\n"
+        f"Files in this batch:\n{file_list}\n\n"
+        f"{batch_diff}\n\n"
+        "# Task\n"
+        "Review each file in this batch against the workplan. Respond with exactly one section "
+        "per file, using the file path as a level-3 heading in backticks, for example:\n\n"
+        "### `path/to/file.py`\n"
+        "- **Workplan items addressed**: which workplan steps this file implements, fully or "
+        "partially.\n"
+        "- **Issues**: bugs, correctness problems, missing error handling, tests or "
+        "documentation.\n"
+        "- **Outside the workplan**: changes the workplan does not call for.\n\n"
+        "Be concise and specific. Respond only with Markdown, starting with the first file "
+        "heading."
+    )
+
+
+def parse_file_fragments(response: str, paths: list[str]) -> dict[str, str]:
+    """Split a batch response into per-file fragments.
+
+    Args:
+        response: Markdown response with one "### `path`" section per file.
+        paths: Paths that were in the batch; headings for other paths are ignored.
+
+    Returns:
+        Mapping of path to that file's findings. Paths without a section are omitted.
+    """
+    wanted = set(paths)
+    fragments: dict[str, str] = {}
+    headings = list(re.finditer(r"^#{2,4}\s+`?([^`\n]+?)`?\s*$", response, re.MULTILINE))
+    for i, heading in enumerate(headings):
+        path = heading.group(1).strip()
+        if path not in wanted:
+            continue
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(response)
+        body = response[heading.end() : end].strip()
+        # Files split across batches at hunk boundaries produce several sections
+        fragments[path] = f"{fragments[path]}\n{body}" if path in fragments else body
+    return fragments
+
+
+async def judge_file_diffs(
+    llm_manager: LLMManager,
+    model: str,
+    workplan_content: str,
+    file_diffs: list[FileDiff],
+    ctx: Context | None = None,
+    fragment_store: JudgementFragmentStore | None = None,
+) -> tuple[dict[str, str], UsageMetadata, int, int]:
+    """Judge file diffs against the workplan in concurrent token-bounded batches.
+
+    Files with a cached fragment for the same workplan and blobs are not sent again. New
+    fragments are written back to the store.
+
+    Args:
+        llm_manager: LLM Manager instance for API calls.
+        model: Model name to use.
+        workplan_content: The original workplan content.
+        file_diffs: Per-file diffs from ``split_diff_by_file``.
+        ctx: Optional context for logging.
+        fragment_store: Optional persistent store of per-file fragments.
+
+    Returns:
+        Tuple of (fragments by path in diff order, summed usage, total prompt characters,
+        number of files reused from the store).
+
+    Raises:
+        YellhornMCPError: If every batch fails.
+    """
+    workplan_hash = hash_workplan(workplan_content)
+    keys = {fd.path: fragment_key(workplan_hash, fd) for fd in file_diffs}
+
+    cached: dict[str, str] = {}
+    if fragment_store is not None:
+        for path, key in keys.items():
+            fragment = fragment_store.get(key) if key else None
+            if fragment is not None:
+                cached[path] = fragment
+    pending = [fd for fd in file_diffs if fd.path not in cached]
+
+    if ctx:
+        await ctx.log(
+            level="info",
+            message=(
+                f"Judging {len({fd.path for fd in pending})} changed files, "
+                f"reusing {len(cached)} cached file judgements"
+            ),
+        )
+
+    batches = (
+        batch_file_diffs(pending, JUDGEMENT_BATCH_MAX_TOKENS, llm_manager.token_counter, model)
+        if pending
+        else []
+    )
+    semaphore = asyncio.Semaphore(JUDGEMENT_BATCH_CONCURRENCY)
+    total = len(batches)
+
+    async def judge_batch(index: int, batch: list[FileDiff]) -> tuple[str, UsageMetadata, int]:
+        batch_prompt = _format_batch_prompt(workplan_content, batch, index, total)
+        async with semaphore:
+            response = await llm_manager.call_llm_with_usage(
+                prompt=batch_prompt, model=model, temperature=0.0
+            )
+        if ctx:
+            await ctx.log(level="info", message=f"Judged diff batch {index}/{total}")
+        return str(response["content"]), response["usage_metadata"], len(batch_prompt)
+
+    results = await asyncio.gather(
+        *(judge_batch(i, batch) for i, batch in enumerate(batches, start=1)),
+        return_exceptions=True,
+    )
+
+    usage = UsageMetadata()
+    prompt_chars = 0
+    fresh: dict[str, str] = {}
+    # Paths with at least one failed piece, mapped to the first error type
+    failed: dict[str, str] = {}
+    failures = 0
+    for index, (batch, result) in enumerate(zip(batches, results), start=1):
+        batch_paths = list(dict.fromkeys(fd.path for fd in batch))
+        if isinstance(result, BaseException):
+            failures += 1
+            if ctx:
+                await ctx.log(
+                    level="warning",
+                    message=f"Diff batch {index}/{total} failed: {str(result)}",
+                )
+            for path in batch_paths:
+                failed.setdefault(path, type(result).__name__)
+            continue
+
+        content, batch_usage, batch_chars = result
+        usage.prompt_tokens += batch_usage.prompt_tokens
+        usage.completion_tokens += batch_usage.completion_tokens
+        usage.total_tokens += batch_usage.total_tokens
+        usage.cached_tokens += batch_usage.cached_tokens
+        prompt_chars += batch_chars
+        for path, fragment in parse_file_fragments(content, batch_paths).items():
+            fresh[path] = f"{fresh[path]}\n{fragment}" if path in fresh else fragment
+
+    if total and failures == total:
+        raise YellhornMCPError(f"All {total} diff batches failed to be judged")
+
+    # Persist only fragments of files whose every piece was judged
+    if fragment_store is not None:
+        for path, fragment in fresh.items():
+            if keys.get(path) and path not in failed:
+                fragment_store.put(keys[path], fragment)
+
+    # Files split across batches may have been reviewed only in part
+    for path, error in failed.items():
+        scope = "part of this file" if path in fresh else "this file"
+        note = f"_Review of {scope} failed ({error}); treat it as unreviewed._"
+        fresh[path] = f"{fresh[path]}\n{note}" if path in fresh else note
+
+    fragments = {}
+    for path in dict.fromkeys(fd.path for fd in file_diffs):
+        fragments[path] = cached.get(path) or fresh.get(path) or "_No findings reported._"
+    return fragments, usage, prompt_chars, len(cached)
+
+
+def _changed_files(diff_content: str, file_diffs: list[FileDiff]) -> list[str]:
+    """List the files touched by a diff in any of the formats produced by ``get_git_diff``."""
+    if file_diffs:
+        return list(dict.fromkeys(fd.path for fd in file_diffs))
+    lsp_files = _LSP_DIFF_FILE.findall(diff_content)
+    if lsp_files:
+        return lsp_files
+    if diff_content.startswith("Changed files between "):
+        return [line.strip() for line in diff_content.splitlines()[1:] if line.strip()]
+    return []
+
+
+@traced("job judgement")
 async def process_judgement_async(
     repo_path: Path,
     llm_manager: LLMManager,
@@ -105,6 +327,8 @@ async def process_judgement_async(
     _meta: dict[str, Any] | None = None,
     ctx: Context | None = None,
     github_command_func: Callable | None = None,
+    fragment_store: JudgementFragmentStore | None = None,
+    context_scope: str = "diff",
 ) -> None:
     """Judge a code diff against a workplan asynchronously.
 
@@ -121,49 +345,118 @@ async def process_judgement_async(
         parent_workplan_issue_number: Parent workplan issue number.
         subissue_to_update: Optional existing sub-issue to update.
         debug: If True, add a comment with the full prompt.
-        codebase_reasoning: Mode for codebase context.
+        codebase_reasoning: Mode for codebase context ("full", "compact", "lsp", "relevant",
+            "file_structure" or "none"). "relevant" ranks files against the workplan with
+            the "repository" scope and inlines the diff neighborhood in full with "diff".
         disable_search_grounding: If True, disables search grounding.
         _meta: Optional metadata from the caller.
         ctx: Optional context for logging.
         github_command_func: Optional GitHub command function (for mocking).
+        fragment_store: Optional store of per-file judgement fragments. When provided, patch
+            diffs are judged per file and files whose blobs are unchanged since a previous
+            judgement of the same workplan reuse the cached findings.
+        context_scope: "diff" to include only the changed files, their import neighbors and
+            the workplan-referenced files in the codebase context, or "repository" for the
+            whole-repository context.
     """
+    job_started("judgement")
+    set_span_attributes({"yellhorn.issue_number": parent_workplan_issue_number})
+    timer = PhaseTimer(enabled=phase_timing_enabled()).start()
     try:
         # Get codebase info based on reasoning mode
         codebase_info = ""
+        omitted_files: list[str] = []
 
         # Create a simple logging function
         def context_log(msg: str):
             if ctx:
                 asyncio.create_task(ctx.log(level="info", message=msg))
 
-        # Use get_codebase_context for all reasoning modes
-        if codebase_reasoning in ["lsp", "file_structure", "full"]:
+        # Patch diffs are judged per file when they are too large for one prompt or when a
+        # fragment store is configured, so that even a small first judgement leaves per-file
+        # findings for the next one to reuse, then merged in a synthesis pass. A diff with
+        # fewer characters than the batch budget always fits in one batch, so small diffs skip
+        # tokenization entirely.
+        file_diffs = split_diff_by_file(diff_content) if "diff --git " in diff_content else []
+        needs_batching = bool(file_diffs) and (
+            len(diff_content) > JUDGEMENT_BATCH_MAX_TOKENS
+            and llm_manager.token_counter.count_tokens(diff_content, model)
+            > JUDGEMENT_BATCH_MAX_TOKENS
+        )
+
+        if codebase_reasoning in ["lsp", "file_structure", "full", "compact", "relevant"]:
             # Calculate token limit for codebase context
-            token_counter = TokenCounter()
+            token_counter = get_token_counter()
             model_limit = token_counter.get_model_limit(model)
             # Reserve tokens for prompt template, workplan, diff, and response
             # Estimate: prompt template ~1000, workplan ~2000, diff ~2000, safety margin ~4000
             codebase_token_limit = int((model_limit - 9000) * 0.7)
-            
-            codebase_info = await get_codebase_context(
-                repo_path, 
-                codebase_reasoning, 
-                context_log,
-                token_limit=codebase_token_limit,
-                model=model
-            )
-
-        # Construct prompt
-        prompt = f"""You are an expert software reviewer tasked with judging whether a code diff successfully implements a given workplan.
-
-# Original Workplan
-{workplan_content}
+            with phase("codebase_context"):
+                snapshot = await get_shared_snapshot(ctx, repo_path)
+
+                if context_scope == "diff":
+                    # The diff neighborhood is already the set of files relevant to the
+                    # judgement, so "relevant" inlines it in full
+                    codebase_info = await get_diff_scoped_context(
+                        repo_path,
+                        "full" if codebase_reasoning == "relevant" else codebase_reasoning,
+                        _changed_files(diff_content, file_diffs),
+                        workplan_content,
+                        context_log,
+                        token_limit=codebase_token_limit,
+                        model=model,
+                        snapshot=snapshot,
+                        dependency_index=get_shared_dependency_index(ctx, repo_path),
+                        omitted_files=omitted_files,
+                    )
+                else:
+                    codebase_info = await get_codebase_context(
+                        repo_path,
+                        codebase_reasoning,
+                        context_log,
+                        token_limit=codebase_token_limit,
+                        model=model,
+                        snapshot=snapshot,
+                        query=workplan_content,
+                        retrieval_index=get_shared_retrieval_index(ctx, repo_path),
+                        omitted_files=omitted_files,
+                    )
 
-# Code Diff
-{diff_content}
+        batch_usage = UsageMetadata()
+        batch_prompt_chars = 0
+        if file_diffs and (needs_batching or fragment_store is not None):
+            with phase("batch_judgement"):
+                fragments, batch_usage, batch_prompt_chars, reused = await judge_file_diffs(
+                    llm_manager, model, workplan_content, file_diffs, ctx, fragment_store
+                )
+            changed_files = "\n".join(f"- `{path}`" for path in fragments)
+            findings = "\n\n".join(
+                f"### `{path}`\n{fragment}" for path, fragment in fragments.items()
+            )
+            reuse_note = (
+                f" Findings for {reused} of {len(fragments)} files are unchanged from a "
+                "previous judgement of the same workplan."
+                if reused
+                else ""
+            )
+            diff_sections = (
+                f"# Changed Files\n{changed_files}\n\n"
+                "# Per-File Review Findings\n"
+                f"Each changed file was reviewed separately against the workplan.{reuse_note} "
+                "Merge these findings into one judgement covering the whole diff.\n\n",
+                findings,
+            )
+        else:
+            diff_sections = ("# Code Diff\n", diff_content)
 
-# Codebase Context
-{codebase_info}
+        # Construct prompt with the codebase context first, so judgements against the same
+        # commit share a cacheable prefix
+        introduction = (
+            "You are an expert software reviewer tasked with judging whether a code diff "
+            "successfully implements a given workplan.\n\n"
+            "# Original Workplan\n"
+        )
+        instructions = f"""
 
 # Task
 Review the code diff against the original workplan and provide a detailed judgement. Consider:
@@ -202,6 +495,14 @@ Extract any URLs mentioned in the workplan or that would be helpful for understa
 
 IMPORTANT: Respond *only* with the Markdown content for the judgement. Do *not* wrap your entire response in a single Markdown code block (```). Start directly with the '## Judgement Summary' heading.
 """
+        prompt, prefix_length = join_codebase_prompt(
+            codebase_info,
+            introduction,
+            workplan_content,
+            "\n\n",
+            *diff_sections,
+            instructions,
+        )
         # Check if we should use search grounding
         use_search_grounding = not disable_search_grounding
         if _meta and "original_search_grounding" in _meta:
@@ -213,6 +514,11 @@ IMPORTANT: Respond *only* with the Markdown content for the judgement. Do *not*
         llm_kwargs = {}
         is_openai_model = llm_manager._is_openai_model(model)
 
+        # Let Gemini reuse a cached copy of the codebase context for this scope
+        if not is_openai_model:
+            llm_kwargs["cacheable_prefix_length"] = prefix_length
+            llm_kwargs["cache_scope"] = f"{repo_path}:judge:{codebase_reasoning}:{context_scope}"
+
         # Handle search grounding for Gemini models
         if not is_openai_model and use_search_grounding:
             if ctx:
@@ -241,9 +547,10 @@ IMPORTANT: Respond *only* with the Markdown content for the judgement. Do *not*
         # Call LLM through the manager with citation support
         if is_openai_model:
             # OpenAI models don't support citations
-            response_data = await llm_manager.call_llm_with_usage(
-                prompt=prompt, model=model, temperature=0.0, **llm_kwargs
-            )
+            with phase("llm_call"):
+                response_data = await llm_manager.call_llm_with_usage(
+                    prompt=prompt, model=model, temperature=0.0, **llm_kwargs
+                )
             judgement_content = response_data["content"]
             usage_metadata = response_data["usage_metadata"]
             completion_metadata = CompletionMetadata(
@@ -251,15 +558,17 @@ IMPORTANT: Respond *only* with the Markdown content for the judgement. Do *not*
                 status="✅ Judgement generated successfully",
                 generation_time_seconds=0.0,  # Will be calculated below
                 input_tokens=usage_metadata.prompt_tokens,
+                cached_input_tokens=usage_metadata.cached_tokens,
                 output_tokens=usage_metadata.completion_tokens,
                 total_tokens=usage_metadata.total_tokens,
                 timestamp=None,  # Will be set below
             )
         else:
             # Gemini models - use citation-aware call
-            response_data = await llm_manager.call_llm_with_citations(
-                prompt=prompt, model=model, temperature=0.0, **llm_kwargs
-            )
+            with phase("llm_call"):
+                response_data = await llm_manager.call_llm_with_citations(
+                    prompt=prompt, model=model, temperature=0.0, **llm_kwargs
+                )
 
             judgement_content = response_data["content"]
             usage_metadata = response_data["usage_metadata"]
@@ -278,8 +587,10 @@ IMPORTANT: Respond *only* with the Markdown content for the judgement. Do *not*
                 status="✅ Judgement generated successfully",
                 generation_time_seconds=0.0,  # Will be calculated below
                 input_tokens=usage_metadata.prompt_tokens,
+                cached_input_tokens=usage_metadata.cached_tokens,
                 output_tokens=usage_metadata.completion_tokens,
                 total_tokens=usage_metadata.total_tokens,
+                cache_storage_token_hours=usage_metadata.cache_storage_token_hours or None,
                 search_results_used=getattr(
                     response_data.get("grounding_metadata"), "grounding_chunks", None
                 )
@@ -293,6 +604,22 @@ IMPORTANT: Respond *only* with the Markdown content for the judgement. Do *not*
                 f"Failed to generate judgement: Received an empty response from {api_name} API."
             )
 
+        # Include the batch judgements in the reported usage; without batches, unknown
+        # token counts stay unknown
+        if batch_usage.total_tokens:
+            completion_metadata.input_tokens = (
+                completion_metadata.input_tokens or 0
+            ) + batch_usage.prompt_tokens
+            completion_metadata.output_tokens = (
+                completion_metadata.output_tokens or 0
+            ) + batch_usage.completion_tokens
+            completion_metadata.total_tokens = (
+                completion_metadata.total_tokens or 0
+            ) + batch_usage.total_tokens
+            completion_metadata.cached_input_tokens = (
+                completion_metadata.cached_input_tokens or 0
+            ) + batch_usage.cached_tokens
+
         # Calculate generation time if we have metadata
         if completion_metadata and _meta and "start_time" in _meta:
             generation_time = (datetime.now(timezone.utc) - _meta["start_time"]).total_seconds()
@@ -306,12 +633,21 @@ IMPORTANT: Respond *only* with the Markdown content for the judgement. Do *not*
             and completion_metadata.output_tokens
         ):
             completion_metadata.estimated_cost = calculate_cost(
-                model, completion_metadata.input_tokens, completion_metadata.output_tokens
+                model,
+                completion_metadata.input_tokens,
+                completion_metadata.output_tokens,
+                completion_metadata.cached_input_tokens or 0,
+                completion_metadata.cache_storage_token_hours or 0.0,
             )
 
         # Add context size
         if completion_metadata:
-            completion_metadata.context_size_chars = len(prompt)
+            completion_metadata.context_size_chars = len(prompt) + batch_prompt_chars
+            if omitted_files:
+                completion_metadata.warnings = [
+                    *(completion_metadata.warnings or []),
+                    format_omitted_files_warning(omitted_files),
+                ]
 
         # Construct metadata section for the final body
         metadata_section = f"""## Comparison Metadata
@@ -335,16 +671,17 @@ IMPORTANT: Respond *only* with the Markdown content for the judgement. Do *not*
         # Create or update the sub-issue
         if subissue_to_update:
             # Update existing issue
-            await update_github_issue(
-                repo_path=repo_path,
-                issue_number=subissue_to_update,
-                title=judgement_title,
-                body=full_body,
-                github_command_func=github_command_func,
-            )
+            with phase("update_issue"):
+                await update_github_issue(
+                    repo_path=repo_path,
+                    issue_number=subissue_to_update,
+                    title=judgement_title,
+                    body=full_body,
+                    github_command_func=github_command_func,
+                )
 
             # Construct the URL for the updated issue
-            repo_info = await run_git_command(repo_path, ["remote", "get-url", "origin"])
+            repo_info = await get_remote_url(repo_path)
             # Clean up the repo URL to get the proper format
             if repo_info.endswith(".git"):
                 repo_info = repo_info[:-4]
@@ -353,13 +690,14 @@ IMPORTANT: Respond *only* with the Markdown content for the judgement. Do *not*
 
             subissue_url = f"{repo_info}/issues/{subissue_to_update}"
         else:
-            subissue_url = await create_judgement_subissue(
-                repo_path,
-                parent_workplan_issue_number,
-                judgement_title,
-                full_body,
-                github_command_func=github_command_func,
-            )
+            with phase("update_issue"):
+                subissue_url = await create_judgement_subissue(
+                    repo_path,
+                    parent_workplan_issue_number,
+                    judgement_title,
+                    full_body,
+                    github_command_func=github_command_func,
+                )
 
         if ctx:
             await ctx.log(
@@ -394,6 +732,7 @@ IMPORTANT: Respond *only* with the Markdown content for the judgement. Do *not*
             )
 
             # Post completion comment to the sub-issue
+            completion_metadata.phase_timings = dict(timer.phases) or None
             completion_comment = format_completion_comment(completion_metadata)
             # Extract sub-issue number from URL or use the provided one
             if subissue_to_update:
@@ -437,3 +776,6 @@ IMPORTANT: Respond *only* with the Markdown content for the judgement. Do *not*
 
         # Re-raise as YellhornMCPError to signal failure outward
         raise YellhornMCPError(error_msg)
+    finally:
+        timer.finish(f"judgement of #{parent_workplan_issue_number}")
+        job_finished("judgement")
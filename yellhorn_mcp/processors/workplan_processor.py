@@ -10,9 +10,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable
 
-from google import genai
 from mcp.server.fastmcp import Context
-from openai import AsyncOpenAI
 
 from yellhorn_mcp import __version__
 from yellhorn_mcp.integrations.github_integration import (
@@ -20,20 +18,32 @@ from yellhorn_mcp.integrations.github_integration import (
     update_issue_with_workplan,
 )
 from yellhorn_mcp.llm_manager import LLMManager, UsageMetadata
+from yellhorn_mcp.metrics import job_finished, job_started
 from yellhorn_mcp.models.metadata_models import CompletionMetadata, SubmissionMetadata
-from yellhorn_mcp.token_counter import TokenCounter
+from yellhorn_mcp.token_counter import get_token_counter
+from yellhorn_mcp.tracing import set_span_attributes, traced
 from yellhorn_mcp.utils.comment_utils import (
     extract_urls,
     format_completion_comment,
+    format_omitted_files_warning,
     format_submission_comment,
 )
 from yellhorn_mcp.utils.cost_tracker_utils import calculate_cost, format_metrics_section
 from yellhorn_mcp.utils.git_utils import YellhornMCPError, run_git_command
+from yellhorn_mcp.utils.retrieval_index import get_shared_retrieval_index
+from yellhorn_mcp.utils.timing_utils import (
+    PhaseTimer,
+    current_timer,
+    phase,
+    phase_timing_enabled,
+)
 from yellhorn_mcp.formatters import (
     get_codebase_snapshot,
     build_file_structure_context,
     format_codebase_for_prompt,
     get_codebase_context,
+    get_shared_snapshot,
+    join_codebase_prompt,
 )
 
 
@@ -54,6 +64,8 @@ async def _generate_and_update_issue(
     _meta: dict[str, Any] | None,
     ctx: Context | None,
     github_command_func: Callable | None = None,
+    context_warnings: list[str] | None = None,
+    cacheable_prefix_length: int | None = None,
 ) -> None:
     """Generate content with AI and update the GitHub issue.
 
@@ -71,6 +83,10 @@ async def _generate_and_update_issue(
         _meta: Optional metadata from caller.
         ctx: Optional context for logging.
         github_command_func: Optional GitHub command function (for mocking).
+        context_warnings: Optional warnings about the codebase context (e.g. files left out
+            to fit the token limit) to report in the completion comment.
+        cacheable_prefix_length: Optional length of the leading part of ``prompt`` (the
+            codebase context) that Gemini models may serve from an explicit context cache.
     """
     # Use LLM Manager for unified LLM calls
     if not llm_manager:
@@ -100,6 +116,11 @@ async def _generate_and_update_issue(
     llm_kwargs = {}
     is_openai_model = llm_manager._is_openai_model(model)
 
+    # Let Gemini reuse a cached copy of the codebase context for this repository and mode
+    if not is_openai_model and cacheable_prefix_length:
+        llm_kwargs["cacheable_prefix_length"] = cacheable_prefix_length
+        llm_kwargs["cache_scope"] = f"{repo_path}:{codebase_reasoning}"
+
     # Handle search grounding for Gemini models
     search_tools = None
     if not is_openai_model and use_search_grounding:
@@ -127,9 +148,10 @@ async def _generate_and_update_issue(
         # Call LLM through the manager with citation support
         if is_openai_model:
             # OpenAI models don't support citations
-            response_data = await llm_manager.call_llm_with_usage(
-                prompt=prompt, model=model, temperature=0.0, **llm_kwargs
-            )
+            with phase("llm_call"):
+                response_data = await llm_manager.call_llm_with_usage(
+                    prompt=prompt, model=model, temperature=0.0, **llm_kwargs
+                )
             workplan_content = response_data["content"]
             usage_metadata = response_data["usage_metadata"]
             completion_metadata = CompletionMetadata(
@@ -137,15 +159,17 @@ async def _generate_and_update_issue(
                 status="✅ Workplan generated successfully",
                 generation_time_seconds=0.0,  # Will be calculated below
                 input_tokens=usage_metadata.prompt_tokens,
+                cached_input_tokens=usage_metadata.cached_tokens,
                 output_tokens=usage_metadata.completion_tokens,
                 total_tokens=usage_metadata.total_tokens,
                 timestamp=None,  # Will be set below
             )
         else:
             # Gemini models - use citation-aware call
-            response_data = await llm_manager.call_llm_with_citations(
-                prompt=prompt, model=model, temperature=0.0, tools=search_tools, **llm_kwargs
-            )
+            with phase("llm_call"):
+                response_data = await llm_manager.call_llm_with_citations(
+                    prompt=prompt, model=model, temperature=0.0, tools=search_tools, **llm_kwargs
+                )
 
             workplan_content = response_data["content"]
             usage_metadata = response_data["usage_metadata"]
@@ -164,8 +188,10 @@ async def _generate_and_update_issue(
                 status="✅ Workplan generated successfully",
                 generation_time_seconds=0.0,  # Will be calculated below
                 input_tokens=usage_metadata.prompt_tokens,
+                cached_input_tokens=usage_metadata.cached_tokens,
                 output_tokens=usage_metadata.completion_tokens,
                 total_tokens=usage_metadata.total_tokens,
+                cache_storage_token_hours=usage_metadata.cache_storage_token_hours or None,
                 search_results_used=getattr(
                     response_data.get("grounding_metadata"), "grounding_chunks", None
                 )
@@ -214,25 +240,35 @@ async def _generate_and_update_issue(
         and completion_metadata.output_tokens
     ):
         completion_metadata.estimated_cost = calculate_cost(
-            model, completion_metadata.input_tokens, completion_metadata.output_tokens
+            model,
+            completion_metadata.input_tokens,
+            completion_metadata.output_tokens,
+            completion_metadata.cached_input_tokens or 0,
+            completion_metadata.cache_storage_token_hours or 0.0,
         )
 
     # Add context size
     if completion_metadata:
         completion_metadata.context_size_chars = len(prompt)
+        if context_warnings:
+            completion_metadata.warnings = [
+                *(completion_metadata.warnings or []),
+                *context_warnings,
+            ]
 
     # Add the prefix to the workplan content
     full_body = f"{content_prefix}{workplan_content}"
 
     # Update the GitHub issue with the generated workplan
-    await update_issue_with_workplan(
-        repo_path,
-        issue_number,
-        full_body,
-        completion_metadata,
-        title,
-        github_command_func=github_command_func,
-    )
+    with phase("update_issue"):
+        await update_issue_with_workplan(
+            repo_path,
+            issue_number,
+            full_body,
+            completion_metadata,
+            title,
+            github_command_func=github_command_func,
+        )
     if ctx:
         await ctx.log(
             level="info",
@@ -241,12 +277,16 @@ async def _generate_and_update_issue(
 
     # Add completion comment if we have submission metadata
     if completion_metadata and _meta:
+        timer = current_timer()
+        if timer is not None:
+            completion_metadata.phase_timings = dict(timer.phases)
         completion_comment = format_completion_comment(completion_metadata)
         await add_issue_comment(
             repo_path, issue_number, completion_comment, github_command_func=github_command_func
         )
 
 
+@traced("job workplan")
 async def process_workplan_async(
     repo_path: Path,
     llm_manager: LLMManager,
@@ -277,6 +317,9 @@ async def process_workplan_async(
         ctx: Optional context for logging.
         github_command_func: Optional GitHub command function (for mocking).
     """
+    job_started("workplan")
+    set_span_attributes({"yellhorn.issue_number": issue_number})
+    timer = PhaseTimer(enabled=phase_timing_enabled()).start()
     try:
         # Create a simple logging function that uses ctx if available
         def context_log(msg: str):
@@ -285,22 +328,31 @@ async def process_workplan_async(
 
         # Get codebase info based on reasoning mode
         # Calculate token limit for codebase context (70% of model's context window)
-        token_counter = TokenCounter()
+        token_counter = get_token_counter()
         model_limit = token_counter.get_model_limit(model)
         # Reserve tokens for prompt template, task details, and response
         # Estimate: prompt template ~1000, task details ~500, safety margin for response ~4000
         codebase_token_limit = int((model_limit - 5500) * 0.7)
         
-        codebase_info = await get_codebase_context(
-            repo_path, 
-            codebase_reasoning, 
-            context_log, 
-            token_limit=codebase_token_limit,
-            model=model
-        )
+        omitted_files: list[str] = []
+        with phase("codebase_context"):
+            codebase_info = await get_codebase_context(
+                repo_path,
+                codebase_reasoning,
+                context_log,
+                token_limit=codebase_token_limit,
+                model=model,
+                snapshot=await get_shared_snapshot(ctx, repo_path),
+                query=f"{title}\n{detailed_description}",
+                retrieval_index=get_shared_retrieval_index(ctx, repo_path)
+                if codebase_reasoning == "relevant"
+                else None,
+                omitted_files=omitted_files,
+            )
 
-        # Construct prompt
-        prompt = f"""You are an expert software developer tasked with creating a detailed workplan that will be published as a GitHub issue.
+        # Construct prompt: the codebase context first (see join_codebase_prompt), then the
+        # task-specific sections
+        instructions = f"""You are an expert software developer tasked with creating a detailed workplan that will be published as a GitHub issue.
 
 # Task Title
 {title}
@@ -308,9 +360,6 @@ async def process_workplan_async(
 # Task Details
 {detailed_description}
 
-# Codebase Context
-{codebase_info}
-
 # Instructions
 Create a comprehensive implementation plan with the following structure:
 
@@ -363,10 +412,12 @@ IMPORTANT: Respond *only* with the Markdown content for the GitHub issue body. D
         content_prefix = f"# {title}\n\n"
 
         # If not disable_search_grounding, use search grounding
-        if not disable_search_grounding:
-            prompt += (
-                "Search the internet for latest package versions and describe how to use them."
-            )
+        grounding_request = (
+            ""
+            if disable_search_grounding
+            else "Search the internet for latest package versions and describe how to use them."
+        )
+        prompt, prefix_length = join_codebase_prompt(codebase_info, instructions, grounding_request)
 
         # Generate and update issue using the helper
         await _generate_and_update_issue(
@@ -383,6 +434,10 @@ IMPORTANT: Respond *only* with the Markdown content for the GitHub issue body. D
             _meta,
             ctx,
             github_command_func,
+            context_warnings=(
+                [format_omitted_files_warning(omitted_files)] if omitted_files else None
+            ),
+            cacheable_prefix_length=prefix_length,
         )
 
     except Exception as e:
@@ -402,8 +457,12 @@ IMPORTANT: Respond *only* with the Markdown content for the GitHub issue body. D
                 await ctx.log(
                     level="error", message=f"Failed to add error comment to issue: {str(e)}"
                 )
+    finally:
+        timer.finish(f"workplan #{issue_number}")
+        job_finished("workplan")
 
 
+@traced("job revision")
 async def process_revision_async(
     repo_path: Path,
     llm_manager: LLMManager,
@@ -434,6 +493,9 @@ async def process_revision_async(
         ctx: Optional context for logging.
         github_command_func: Optional GitHub command function (for mocking).
     """
+    job_started("revision")
+    set_span_attributes({"yellhorn.issue_number": issue_number})
+    timer = PhaseTimer(enabled=phase_timing_enabled()).start()
     try:
         # Create a simple logging function that uses ctx if available
         def context_log(msg: str):
@@ -442,19 +504,27 @@ async def process_revision_async(
 
         # Get codebase info based on reasoning mode
         # Calculate token limit for codebase context (70% of model's context window)
-        token_counter = TokenCounter()
+        token_counter = get_token_counter()
         model_limit = token_counter.get_model_limit(model)
         # Reserve tokens for prompt template, task details, and response
         # Estimate: prompt template ~1000, task details ~500, safety margin for response ~4000
         codebase_token_limit = int((model_limit - 5500) * 0.7)
         
-        codebase_info = await get_codebase_context(
-            repo_path, 
-            codebase_reasoning, 
-            context_log, 
-            token_limit=codebase_token_limit,
-            model=model
-        )
+        omitted_files: list[str] = []
+        with phase("codebase_context"):
+            codebase_info = await get_codebase_context(
+                repo_path,
+                codebase_reasoning,
+                context_log,
+                token_limit=codebase_token_limit,
+                model=model,
+                snapshot=await get_shared_snapshot(ctx, repo_path),
+                query=f"{revision_instructions}\n{original_workplan}",
+                retrieval_index=get_shared_retrieval_index(ctx, repo_path)
+                if codebase_reasoning == "relevant"
+                else None,
+                omitted_files=omitted_files,
+            )
 
         # Extract title from original workplan (assumes first line is # Title)
         title_line = original_workplan.split("\n")[0] if original_workplan else ""
@@ -464,8 +534,8 @@ async def process_revision_async(
             else "Workplan Revision"
         )
 
-        # Construct revision prompt
-        prompt = f"""You are an expert software developer tasked with revising an existing workplan based on revision instructions.
+        # Construct revision prompt, codebase context first as in process_workplan_async
+        instructions = f"""You are an expert software developer tasked with revising an existing workplan based on revision instructions.
 
 # Original Workplan
 {original_workplan}
@@ -473,9 +543,6 @@ async def process_revision_async(
 # Revision Instructions
 {revision_instructions}
 
-# Codebase Context
-{codebase_info}
-
 # Instructions
 Revise the "Original Workplan" based on the "Revision Instructions" and the provided "Codebase Context".
 Your output should be the complete, revised workplan in the same format as the original.
@@ -489,6 +556,7 @@ The revised workplan should:
 Respond directly with the complete revised workplan in Markdown format.
 IMPORTANT: Respond *only* with the Markdown content for the GitHub issue body. Do *not* wrap your entire response in a single Markdown code block (```). Start directly with the '## Summary' heading.
 """
+        prompt, prefix_length = join_codebase_prompt(codebase_info, instructions)
 
         # Add the title as header prefix
         content_prefix = f"# {title}\n\n"
@@ -510,6 +578,10 @@ IMPORTANT: Respond *only* with the Markdown content for the GitHub issue body. D
             _meta,
             ctx,
             github_command_func,
+            context_warnings=(
+                [format_omitted_files_warning(omitted_files)] if omitted_files else None
+            ),
+            cacheable_prefix_length=prefix_length,
         )
 
     except Exception as e:
@@ -529,3 +601,6 @@ IMPORTANT: Respond *only* with the Markdown content for the GitHub issue body. D
                 await ctx.log(
                     level="error", message=f"Failed to add error comment to issue: {str(e)}"
                 )
+    finally:
+        timer.finish(f"revision of #{issue_number}")
+        job_finished("revision")
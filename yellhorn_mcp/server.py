@@ -17,6 +17,7 @@ The server requires GitHub CLI to be installed and authenticated for GitHub oper
 """
 
 import asyncio
+import importlib
 import json
 import logging
 import os
@@ -27,25 +28,32 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-from google import genai
 from mcp.server.fastmcp import Context, FastMCP
-from openai import AsyncOpenAI
 
 from yellhorn_mcp import __version__
+from yellhorn_mcp.formatters.codebase_snapshot import list_git_files
+from yellhorn_mcp.formatters.snapshot_cache import SnapshotCache, get_shared_snapshot
 from yellhorn_mcp.integrations.github_integration import (
     add_issue_comment,
     create_github_issue,
     get_issue_body,
 )
 from yellhorn_mcp.llm_manager import LLMManager, UsageMetadata
+from yellhorn_mcp.metrics import start_metrics_server
 from yellhorn_mcp.models.metadata_models import SubmissionMetadata
 from yellhorn_mcp.processors.context_processor import process_context_curation_async
-from yellhorn_mcp.processors.judgement_processor import get_git_diff, process_judgement_async
+from yellhorn_mcp.processors.judgement_processor import (
+    JUDGEMENT_CONTEXT_SCOPES,
+    get_git_diff,
+    process_judgement_async,
+)
 from yellhorn_mcp.processors.workplan_processor import (
     process_revision_async,
     process_workplan_async,
 )
+from yellhorn_mcp.tracing import configure_tracing, shutdown_tracing, traced
 from yellhorn_mcp.utils.comment_utils import extract_urls, format_submission_comment
+from yellhorn_mcp.utils.dependency_index import DependencyIndex
 from yellhorn_mcp.utils.git_utils import (
     YellhornMCPError,
     get_default_branch,
@@ -55,6 +63,12 @@ from yellhorn_mcp.utils.git_utils import (
     read_resource,
     run_git_command,
 )
+from yellhorn_mcp.utils.judgement_cache import JudgementFragmentStore
+from yellhorn_mcp.utils.precomputed_index import close_precomputed_index, load_precomputed_index
+from yellhorn_mcp.utils.retrieval_index import BM25Index
+from yellhorn_mcp.utils.symbol_index import SymbolIndex, get_shared_symbol_index
+from yellhorn_mcp.utils.warmup_utils import warm_up, warmup_enabled
+from yellhorn_mcp.utils.watch_utils import RepositoryWatcher, watch_mode
 
 logging.basicConfig(
     stream=sys.stderr, level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s"
@@ -94,6 +108,9 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
         gemini_api_key = os.getenv("GEMINI_API_KEY")
         if not gemini_api_key:
             raise ValueError("GEMINI_API_KEY is required for Gemini models")
+        # Provider SDKs are imported here so only the configured one is loaded
+        from google import genai
+
         # Configure Gemini API
         gemini_client = genai.Client(api_key=gemini_api_key)
     # For OpenAI models, require OpenAI API key
@@ -101,8 +118,9 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
         openai_api_key = os.getenv("OPENAI_API_KEY")
         if not openai_api_key:
             raise ValueError("OPENAI_API_KEY is required for OpenAI models")
-        # Import here to avoid loading the module if not needed
+        # Import here to avoid loading the modules if not needed
         import httpx
+        from openai import AsyncOpenAI
 
         # Configure OpenAI API with a custom httpx client to avoid proxy issues
         http_client = httpx.AsyncClient()
@@ -118,6 +136,9 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
                 "overlap_ratio": 0.1,  # 10% overlap between chunks
                 "chunk_strategy": "paragraph",  # Use paragraph-based chunking
                 "aggregation_strategy": "concatenate",  # Concatenate chunk responses
+                # Upload the codebase context once per HEAD and reasoning mode (Gemini only)
+                "gemini_context_cache": os.getenv("YELLHORN_MCP_GEMINI_CACHE", "on").lower()
+                != "off",
             },
         )
 
@@ -126,7 +147,33 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
     if not is_git_repository(repo_path):
         raise ValueError(f"Path {repo_path} is not a Git repository")
 
+    # Persist per-file judgement fragments so re-judgements only send changed files
+    judgement_cache = None
+    if os.getenv("YELLHORN_MCP_JUDGEMENT_CACHE", "on").lower() != "off":
+        judgement_cache = JudgementFragmentStore.for_repository(repo_path)
+
+    snapshot_cache = SnapshotCache()
+    dependency_index = DependencyIndex.for_repository(repo_path)
+    retrieval_index = BM25Index.for_repository(repo_path)
+    symbol_index = SymbolIndex.for_repository(repo_path)
+    indexes = [
+        ("symbol", symbol_index),
+        ("dependency", dependency_index),
+        ("retrieval", retrieval_index),
+    ]
+
+    configure_tracing(repo_path)
+    metrics_runner = None
+    watcher = None
+    warmup_task = None
     try:
+        # Serve Prometheus metrics only when a port is configured
+        metrics_port = os.getenv("YELLHORN_MCP_METRICS_PORT")
+        if metrics_port:
+            metrics_runner = await start_metrics_server(
+                os.getenv("YELLHORN_MCP_METRICS_HOST", "127.0.0.1"), int(metrics_port)
+            )
+
         # Logging happens outside lifespan context via logging statements since
         # the server context is not available here
         logging.info(f"Starting Yellhorn MCP server at http://127.0.0.1:8000")
@@ -136,6 +183,19 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
             f"Google Search Grounding: {'enabled' if use_search_grounding else 'disabled'}"
         )
 
+        # Reuse token counts and signatures built ahead of time with `yellhorn-mcp index`
+        await load_precomputed_index(repo_path)
+
+        # Keep the snapshot and indexes current as files change, instead of on each request
+        backend = watch_mode()
+        if backend != "off":
+            watcher = RepositoryWatcher(repo_path, snapshot_cache, indexes, backend=backend)
+            await watcher.start()
+
+        # Pay tokenizer loading, git enumeration and index parsing before the first request
+        if warmup_enabled():
+            warmup_task = asyncio.create_task(warm_up(repo_path, model, snapshot_cache, indexes))
+
         yield {
             "repo_path": repo_path,
             "gemini_client": gemini_client,
@@ -143,10 +203,25 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
             "llm_manager": llm_manager,
             "model": model,
             "use_search_grounding": use_search_grounding,
+            "snapshot_cache": snapshot_cache,
+            "judgement_cache": judgement_cache,
+            "dependency_index": dependency_index,
+            "retrieval_index": retrieval_index,
+            "symbol_index": symbol_index,
         }
     finally:
-        # Cleanup if needed
-        pass
+        if warmup_task is not None:
+            warmup_task.cancel()
+            await asyncio.gather(warmup_task, return_exceptions=True)
+        if watcher is not None:
+            await watcher.stop()
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
+        symbol_index.close()
+        close_precomputed_index(repo_path)
+        shutdown_tracing()
+        if llm_manager is not None and llm_manager.gemini_cache is not None:
+            await llm_manager.gemini_cache.clear()
 
 
 # Initialize MCP server
@@ -178,12 +253,15 @@ The AI will analyze your entire codebase (respecting .gitignore) to create a det
 
 Codebase reasoning modes:
 - "full": Complete file contents (most comprehensive)
+- "compact": File contents without license headers, comments and blank runs
 - "lsp": Function signatures and docstrings only (lighter weight)
+- "relevant": Files matching the description in full, signatures for the rest
 - "file_structure": Directory tree only (fastest)
 - "none": No codebase context
 
 Returns the created issue URL and number immediately.""",
 )
+@traced("tool create_workplan")
 async def create_workplan(
     ctx: Context,
     title: str,
@@ -200,7 +278,11 @@ async def create_workplan(
         detailed_description: Detailed description of what needs to be implemented.
         codebase_reasoning: Reasoning mode for codebase analysis:
                - "full": Include complete file contents (most comprehensive)
+               - "compact": Include file contents without license headers, comments,
+                 docstring bodies and blank-line runs; identical files appear once
                - "lsp": Include only function signatures and docstrings (lighter weight)
+               - "relevant": Include the files most relevant to the description (ranked
+                 with a local BM25 index) in full and signatures of the remaining files
                - "file_structure": Include only directory/file structure (fastest)
                - "none": No codebase context (relies only on description)
         debug: If True, adds a comment to the issue with the full prompt used for generation.
@@ -316,6 +398,7 @@ async def create_workplan(
     name="get_workplan",
     description="Retrieves the workplan content (GitHub issue body) for a specified issue number.",
 )
+@traced("tool get_workplan")
 async def get_workplan(ctx: Context, issue_number: str) -> str:
     """Retrieves the workplan content for a specified issue number.
 
@@ -336,6 +419,53 @@ async def get_workplan(ctx: Context, issue_number: str) -> str:
         raise YellhornMCPError(f"Failed to retrieve workplan: {str(e)}")
 
 
+@mcp.tool(
+    name="search_symbols",
+    description="""Looks up where Python and Go functions, classes, methods and types are defined.
+
+Matches symbol names case-insensitively: exact matches first, then prefix matches, then
+approximate (fuzzy) matches. Prefix the query with a class or type name ("Server.start")
+to search that type's methods only.
+
+Returns a JSON list of symbols with name, kind, signature, file path, line and the first
+docstring line. Answered from a persistent index; only files whose contents changed since the
+last search are parsed again.""",
+)
+@traced("tool search_symbols")
+async def search_symbols(
+    ctx: Context,
+    query: str,
+    kind: str | None = None,
+    limit: int = 20,
+) -> str:
+    """Searches the repository's symbol index.
+
+    Args:
+        ctx: Server context.
+        query: Symbol name or prefix, optionally qualified as "Class.method".
+        kind: Optional kind filter: "function", "class", "method", "struct", "interface"
+            or "type".
+        limit: Maximum number of results.
+
+    Returns:
+        JSON string containing the matching symbols.
+
+    Raises:
+        YellhornMCPError: If the search fails.
+    """
+    try:
+        repo_path: Path = ctx.request_context.lifespan_context["repo_path"]
+        snapshot = await get_shared_snapshot(ctx, repo_path)
+        file_paths = snapshot.file_paths if snapshot else await list_git_files(repo_path)
+
+        index = get_shared_symbol_index(ctx, repo_path)
+        # Stat'ing and parsing changed files must not hold up other requests
+        await asyncio.to_thread(index.update, repo_path, file_paths)
+        return json.dumps(index.search(query, kind=kind, limit=limit), indent=2)
+    except Exception as e:
+        raise YellhornMCPError(f"Failed to search symbols: {str(e)}")
+
+
 @mcp.tool(
     name="revise_workplan",
     description="""Updates an existing workplan based on revision instructions.
@@ -349,6 +479,7 @@ The AI will use the same codebase analysis mode and model as the original workpl
 
 Returns the issue URL and number immediately.""",
 )
+@traced("tool revise_workplan")
 async def revise_workplan(
     ctx: Context,
     issue_number: str,
@@ -482,6 +613,7 @@ src/models/
 tests/api/
 *.config.js""",
 )
+@traced("tool curate_context")
 async def curate_context(
     ctx: Context,
     user_task: str,
@@ -490,6 +622,7 @@ async def curate_context(
     output_path: str = ".yellhorncontext",
     depth_limit: int = 0,
     disable_search_grounding: bool = False,
+    curation_mode: str = "auto",
 ) -> str:
     """Analyzes codebase structure and creates a context curation file.
 
@@ -505,6 +638,10 @@ async def curate_context(
         output_path: Path where the .yellhorncontext file will be created.
         depth_limit: Maximum directory depth to analyze (0 means no limit).
         disable_search_grounding: If True, disables Google Search Grounding.
+        curation_mode: How to query the model:
+               - "auto": Hierarchical for very large repositories, single otherwise (default)
+               - "single": One call over the whole directory tree
+               - "hierarchical": Parallel per-subsystem selection followed by a reduce pass
 
     Returns:
         Success message with the created file path.
@@ -543,6 +680,7 @@ async def curate_context(
             codebase_reasoning=codebase_reasoning,
             ignore_file_path=ignore_file_path,
             depth_limit=depth_limit,
+            curation_mode=curation_mode,
             ctx=ctx,
         )
 
@@ -588,6 +726,7 @@ Supports comparing:
 
 Returns the sub-issue URL immediately.""",
 )
+@traced("tool judge_workplan")
 async def judge_workplan(
     ctx: Context,
     issue_number: str,
@@ -598,6 +737,7 @@ async def judge_workplan(
     disable_search_grounding: bool = False,
     subissue_to_update: str | None = None,
     pr_url: str | None = None,
+    context_scope: str = "diff",
 ) -> str:
     """Triggers an asynchronous code judgement for changes against a workplan.
 
@@ -608,11 +748,20 @@ async def judge_workplan(
         head_ref: The head git reference (default: "HEAD").
         codebase_reasoning: Reasoning mode for codebase analysis:
                - "full": Include complete file contents and full diff
+               - "compact": Like "full" with comments, license headers and blank-line
+                 runs removed from the file contents
                - "lsp": Include function signatures and diff of changed functions
+               - "relevant": Include the files most relevant to the judgement in full: the
+                 diff neighborhood with the "diff" scope, or the files best matching the
+                 workplan with the "repository" scope
                - "file_structure": Include only file structure and list of changed files
                - "none": No codebase context, only diff summary
         debug: If True, adds a comment with the full prompt used for generation.
         disable_search_grounding: If True, disables Google Search Grounding.
+        context_scope: Which files the codebase context covers:
+               - "diff": The changed files, their import neighbors and the files the
+                 workplan references; the rest of the tree is listed by path only
+               - "repository": The whole repository, as in create_workplan
 
     Returns:
         JSON string containing the sub-issue URL and number.
@@ -622,6 +771,11 @@ async def judge_workplan(
     """
     original_search_grounding = True
     try:
+        if context_scope not in JUDGEMENT_CONTEXT_SCOPES:
+            raise YellhornMCPError(
+                f"Invalid context_scope '{context_scope}'. Must be one of: "
+                f"{', '.join(JUDGEMENT_CONTEXT_SCOPES)}"
+            )
         repo_path: Path = ctx.request_context.lifespan_context["repo_path"]
         model = ctx.request_context.lifespan_context["model"]
         gemini_client = ctx.request_context.lifespan_context.get("gemini_client")
@@ -780,6 +934,8 @@ async def judge_workplan(
                 },
                 ctx=ctx,
                 github_command_func=ctx.request_context.lifespan_context.get("github_command_func"),
+                fragment_store=ctx.request_context.lifespan_context.get("judgement_cache"),
+                context_scope=context_scope,
             )
         )
 
@@ -802,16 +958,15 @@ async def judge_workplan(
         raise YellhornMCPError(f"Failed to create judgement: {str(e)}")
 
 
-from yellhorn_mcp.integrations.gemini_integration import async_generate_content_with_config
-from yellhorn_mcp.integrations.github_integration import (
-    add_issue_comment as add_github_issue_comment,
-)
-from yellhorn_mcp.processors.judgement_processor import get_git_diff
 from yellhorn_mcp.formatters import (
     build_file_structure_context,
     format_codebase_for_prompt,
     get_codebase_snapshot,
 )
+from yellhorn_mcp.integrations.github_integration import (
+    add_issue_comment as add_github_issue_comment,
+)
+from yellhorn_mcp.processors.judgement_processor import get_git_diff
 from yellhorn_mcp.utils.comment_utils import format_completion_comment, format_submission_comment
 
 # Re-export for backward compatibility with tests
@@ -831,7 +986,21 @@ from yellhorn_mcp.utils.git_utils import (
     update_github_issue,
 )
 from yellhorn_mcp.utils.lsp_utils import get_lsp_diff, get_lsp_snapshot
-from yellhorn_mcp.utils.search_grounding_utils import _get_gemini_search_tools
+
+# Re-exports that import google.genai, resolved on first access by __getattr__
+_LAZY_EXPORTS = {
+    "_get_gemini_search_tools": "yellhorn_mcp.utils.search_grounding_utils",
+    "async_generate_content_with_config": "yellhorn_mcp.integrations.gemini_integration",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Export for use by the CLI
 __all__ = [
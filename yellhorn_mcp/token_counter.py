@@ -1,8 +1,9 @@
 """Token counting utility using tiktoken for accurate token estimation."""
 
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-import tiktoken
+if TYPE_CHECKING:
+    import tiktoken
 
 
 class TokenCounter:
@@ -51,7 +52,7 @@ class TokenCounter:
                 - default_encoding: Default encoding to use (default: "cl100k_base")
                 - default_token_limit: Default token limit for unknown models (default: 8192)
         """
-        self._encoding_cache: Dict[str, tiktoken.Encoding] = {}
+        self._encoding_cache: Dict[str, "tiktoken.Encoding"] = {}
         self.config = config or {}
 
         # Initialize with config overrides if provided
@@ -63,7 +64,7 @@ class TokenCounter:
             # Update default encodings with any overrides from config
             self.MODEL_TO_ENCODING = {**self.MODEL_TO_ENCODING, **self.config["model_encodings"]}
 
-    def _get_encoding(self, model: str) -> tiktoken.Encoding:
+    def _get_encoding(self, model: str) -> "tiktoken.Encoding":
         """Get the appropriate encoding for a model, with caching."""
         # Get encoding name from config overrides with flexible matching
         config_encodings = self.config.get("model_encodings", {})
@@ -80,6 +81,9 @@ class TokenCounter:
             encoding_name = self.config.get("default_encoding", "cl100k_base")
 
         if encoding_name not in self._encoding_cache:
+            # Imported on first use; most server starts never count tokens before a request
+            import tiktoken
+
             try:
                 self._encoding_cache[encoding_name] = tiktoken.get_encoding(encoding_name)
             except Exception:
@@ -89,6 +93,14 @@ class TokenCounter:
 
         return self._encoding_cache[encoding_name]
 
+    def encoding_name(self, model: str) -> str:
+        """Return the name of the encoding used to count tokens for a model."""
+        return self._get_encoding(model).name
+
+    def preload(self, model: str) -> None:
+        """Load the encoding for a model now instead of on the first count."""
+        self._get_encoding(model)
+
     def count_tokens(self, text: str, model: str) -> int:
         """
         Count the number of tokens in the given text for the specified model.
@@ -208,3 +220,18 @@ class TokenCounter:
         total_used = prompt_tokens + response_tokens + safety_margin
 
         return self.get_model_limit(model) - total_used
+
+
+_default_counter: Optional[TokenCounter] = None
+
+
+def get_token_counter() -> TokenCounter:
+    """Return the process-wide ``TokenCounter`` used by the processors and formatters.
+
+    Sharing one counter keeps its loaded encodings across requests; the server's start-up
+    warm-up preloads the configured model's encoding into it.
+    """
+    global _default_counter
+    if _default_counter is None:
+        _default_counter = TokenCounter()
+    return _default_counter
@@ -0,0 +1,217 @@
+"""Optional OpenTelemetry tracing for the Yellhorn MCP server.
+
+With ``YELLHORN_MCP_TRACING`` set to "otlp" or "file" (and the ``tracing`` extra installed),
+each tool call starts a trace that follows the work into its background job: codebase
+snapshots, every ``git``/``gh`` command, every LLM request attempt and every prompt chunk are
+child spans carrying token and byte counts. ``asyncio.create_task`` copies the caller's
+context, so jobs launched by a tool are parented to the tool's span without passing anything.
+
+Without tracing configured, ``span`` returns a shared no-op context manager and the helpers
+return after one global lookup.
+"""
+
+import functools
+import inspect
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, ContextManager
+
+from yellhorn_mcp import __version__
+from yellhorn_mcp.utils.cache_utils import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+TRACING_MODES = ("off", "otlp", "file")
+
+_tracer: Any = None
+_provider: Any = None
+_get_current_span: Callable[[], Any] | None = None
+
+
+class _NoopSpan:
+    """Stand-in for a span when tracing is off."""
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def tracing_mode() -> str:
+    """Return the configured exporter: "off" (default), "otlp" or "file"."""
+    return os.getenv("YELLHORN_MCP_TRACING", "off").lower()
+
+
+def _json_file_exporter(path: Path) -> Any:
+    """Create a span exporter appending one JSON object per span to ``path``."""
+    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+    class JsonFileSpanExporter(SpanExporter):
+        def __init__(self):
+            self._lock = threading.Lock()
+
+        def export(self, spans) -> SpanExportResult:
+            lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+            with self._lock, path.open("a", encoding="utf-8") as f:
+                f.write(lines)
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self) -> None:
+            pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return JsonFileSpanExporter()
+
+
+def configure_tracing(repo_path: Path, exporter: Any = None) -> bool:
+    """Set up tracing according to ``YELLHORN_MCP_TRACING``.
+
+    The OTLP exporter reads the standard ``OTEL_EXPORTER_OTLP_*`` variables. The file exporter
+    writes to ``YELLHORN_MCP_TRACE_FILE`` or ``traces/spans.jsonl`` in the repository's cache
+    directory.
+
+    Args:
+        repo_path: Path to the repository (locates the default trace file).
+        exporter: Span exporter to use instead of the configured one (for tests).
+
+    Returns:
+        True if tracing is active.
+    """
+    mode = tracing_mode()
+    if mode == "off" and exporter is None:
+        return False
+    if mode not in TRACING_MODES:
+        logger.warning(f"Unknown YELLHORN_MCP_TRACING value {mode!r}; tracing disabled")
+        return False
+
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+        if exporter is None and mode == "otlp":
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+            exporter = OTLPSpanExporter()
+    except ImportError:
+        logger.warning(
+            "YELLHORN_MCP_TRACING is set but OpenTelemetry is not installed; "
+            "install yellhorn-mcp[tracing]. Tracing disabled."
+        )
+        return False
+
+    if exporter is None:
+        trace_file = os.getenv("YELLHORN_MCP_TRACE_FILE")
+        path = (
+            Path(trace_file) if trace_file else get_cache_dir(repo_path, "traces") / "spans.jsonl"
+        )
+        exporter = _json_file_exporter(path)
+        logger.info(f"Writing trace spans to {path}")
+
+    global _tracer, _provider, _get_current_span
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": "yellhorn-mcp", "service.version": __version__})
+    )
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    _tracer = _provider.get_tracer("yellhorn_mcp", __version__)
+    _get_current_span = trace.get_current_span
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and turn tracing off."""
+    global _tracer, _provider, _get_current_span
+    if _provider is not None:
+        _provider.shutdown()
+    _tracer = _provider = _get_current_span = None
+
+
+def span(name: str, attributes: dict[str, Any] | None = None) -> ContextManager:
+    """Open a child span of the current span; a no-op when tracing is off.
+
+    Args:
+        name: Span name.
+        attributes: Initial span attributes.
+
+    Returns:
+        A context manager yielding the span.
+    """
+    if _tracer is None:
+        return _NOOP_SPAN
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+def set_span_attributes(attributes: dict[str, Any]) -> None:
+    """Set attributes on the current span, if tracing is on."""
+    if _get_current_span is not None:
+        _get_current_span().set_attributes(attributes)
+
+
+def add_span_event(name: str, attributes: dict[str, Any] | None = None) -> None:
+    """Record an event (e.g. a retry) on the current span, if tracing is on."""
+    if _get_current_span is not None:
+        _get_current_span().add_event(name, attributes=attributes)
+
+
+def traced(name: str) -> Callable[[Callable], Callable]:
+    """Decorator running every call of a function (sync or async) in span ``name``."""
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def traced_command(executable: str) -> Callable[[Callable], Callable]:
+    """Decorator tracing an async ``(repo_path, command, ...) -> str`` command runner.
+
+    The span is named after the subcommand (e.g. "git diff") and records the argument count
+    and the size of the output in bytes. Only the first arguments are recorded, since later
+    ones can hold issue bodies.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _tracer is None:
+                return await func(*args, **kwargs)
+            command = args[1] if len(args) > 1 else kwargs.get("command", [])
+            attributes = {
+                "process.executable.name": executable,
+                "yellhorn.command": " ".join([executable, *command[:3]]),
+                "yellhorn.command.args": len(command),
+            }
+            name = f"{executable} {command[0]}" if command else executable
+            with _tracer.start_as_current_span(name, attributes=attributes) as command_span:
+                result = await func(*args, **kwargs)
+                if isinstance(result, str):
+                    command_span.set_attribute("yellhorn.output.bytes", len(result.encode()))
+                return result
+
+        return wrapper
+
+    return decorator
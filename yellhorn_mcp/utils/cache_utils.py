@@ -0,0 +1,58 @@
+"""Location and atomic-write helpers for Yellhorn's persistent on-disk caches."""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+
+def get_cache_dir(repo_path: Path, namespace: str, create: bool = True) -> Path:
+    """Return the directory used to persist a cache for a repository.
+
+    The location is, in order of preference:
+
+    1. ``$YELLHORN_MCP_CACHE_DIR/<repo hash>/<namespace>`` if the variable is set.
+    2. ``<repo>/.git/yellhorn/<namespace>``, which git never tracks or reports as untracked.
+    3. ``~/.cache/yellhorn-mcp/<repo hash>/<namespace>`` (e.g. for linked worktrees).
+
+    Args:
+        repo_path: Path to the repository.
+        namespace: Cache name, e.g. "judgements".
+        create: Whether to create the directory if it does not exist.
+
+    Returns:
+        Path to the cache directory.
+    """
+    repo_key = hashlib.sha1(str(Path(repo_path).resolve()).encode()).hexdigest()[:16]
+    override = os.getenv("YELLHORN_MCP_CACHE_DIR")
+    if override:
+        cache_dir = Path(override) / repo_key / namespace
+    elif (repo_path / ".git").is_dir():
+        cache_dir = repo_path / ".git" / "yellhorn" / namespace
+    else:
+        cache_dir = Path.home() / ".cache" / "yellhorn-mcp" / repo_key / namespace
+    if create:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def git_blob_id(content: bytes) -> str:
+    """Compute the git blob ID of file contents, as ``git hash-object`` would."""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+def atomic_write_text(path: Path, content: str) -> None:
+    """Write a file atomically so concurrent readers never see a partial file.
+
+    Args:
+        path: Destination path.
+        content: Text to write.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
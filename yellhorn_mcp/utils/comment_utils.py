@@ -5,6 +5,9 @@ from datetime import datetime
 
 from yellhorn_mcp.models.metadata_models import CompletionMetadata, SubmissionMetadata
 
+# Files named individually in the omitted-files warning; the rest are only counted
+MAX_LISTED_OMITTED_FILES = 10
+
 
 def format_submission_comment(metadata: SubmissionMetadata) -> str:
     """Format a submission metadata comment for GitHub issues.
@@ -82,10 +85,16 @@ def format_completion_comment(metadata: CompletionMetadata) -> str:
         lines.extend(["", "### Token Usage"])
         if metadata.input_tokens is not None:
             lines.append(f"**Input Tokens**: {metadata.input_tokens:,}  ")
+        if metadata.cached_input_tokens:
+            lines.append(f"**Cached Input Tokens**: {metadata.cached_input_tokens:,}  ")
         if metadata.output_tokens is not None:
             lines.append(f"**Output Tokens**: {metadata.output_tokens:,}  ")
         if metadata.total_tokens is not None:
             lines.append(f"**Total Tokens**: {metadata.total_tokens:,}  ")
+        if metadata.cache_storage_token_hours:
+            lines.append(
+                f"**Cache Storage**: {metadata.cache_storage_token_hours:,.0f} token-hours  "
+            )
         if metadata.estimated_cost is not None:
             lines.append(f"**Estimated Cost**: ${metadata.estimated_cost:.4f}  ")
 
@@ -99,6 +108,13 @@ def format_completion_comment(metadata: CompletionMetadata) -> str:
     if metadata.finish_reason:
         lines.append(f"**Finish Reason**: `{metadata.finish_reason}`  ")
 
+    # Phase breakdown, nested phases indented under their parent
+    if metadata.phase_timings:
+        lines.extend(["", "**Phase Timings**:"])
+        for path, seconds in metadata.phase_timings.items():
+            indent = "  " * path.count("/")
+            lines.append(f"{indent}- `{path.rsplit('/', 1)[-1]}`: {seconds:.2f}s")
+
     # Safety ratings (if present)
     if metadata.safety_ratings:
         lines.extend(["", "### Safety Ratings"])
@@ -116,6 +132,25 @@ def format_completion_comment(metadata: CompletionMetadata) -> str:
     return "\n".join(lines)
 
 
+def format_omitted_files_warning(omitted_files: list[str]) -> str:
+    """Format a completion warning for files left out of the codebase context.
+
+    Args:
+        omitted_files: Paths of the files that did not fit in the token limit.
+
+    Returns:
+        Warning text naming up to MAX_LISTED_OMITTED_FILES of the files.
+    """
+    listed = ", ".join(f"`{path}`" for path in omitted_files[:MAX_LISTED_OMITTED_FILES])
+    remaining = len(omitted_files) - MAX_LISTED_OMITTED_FILES
+    if remaining > 0:
+        listed += f" and {remaining} more"
+    return (
+        f"{len(omitted_files)} files were left out of the codebase context to fit the "
+        f"token limit: {listed}"
+    )
+
+
 def extract_urls(text: str) -> list[str]:
     """Extract URLs from text using a regular expression.
 
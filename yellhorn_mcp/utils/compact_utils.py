@@ -0,0 +1,248 @@
+"""Lossy source compaction for the "compact" codebase reasoning mode.
+
+Compaction removes text that costs tokens but rarely helps the model: license banners,
+trailing whitespace and runs of blank lines and, optionally, comments. Python comments
+are found with ``tokenize`` and multi-line docstrings are cut to their summary line.
+C-style languages use a small regex lexer that skips string literals, and other
+languages with ``#`` comments only lose whole-line comments.
+"""
+
+import ast
+import io
+import re
+import tokenize
+from pathlib import PurePosixPath
+
+# Extensions whose comments start with "#"
+HASH_COMMENT_EXTENSIONS = frozenset(
+    {".py", ".pyi", ".sh", ".bash", ".zsh", ".rb", ".pl", ".r", ".yaml", ".yml", ".toml"}
+)
+
+# Extensions with "//" line comments and "/* */" block comments
+C_STYLE_EXTENSIONS = frozenset(
+    {
+        ".go",
+        ".js",
+        ".jsx",
+        ".mjs",
+        ".ts",
+        ".tsx",
+        ".java",
+        ".kt",
+        ".scala",
+        ".c",
+        ".h",
+        ".cc",
+        ".cpp",
+        ".hpp",
+        ".cs",
+        ".rs",
+        ".swift",
+        ".php",
+    }
+)
+
+_LICENSE_MARKER = re.compile(
+    r"copyright|licen[cs]e|spdx-license-identifier|all rights reserved", re.IGNORECASE
+)
+_C_STYLE_TOKEN = re.compile(
+    "|".join(
+        [
+            r"//[^\n]*",
+            r"/\*.*?\*/",
+            r'"(?:\\.|[^"\\\n])*"',
+            r"'(?:\\.|[^'\\\n])*'",
+            r"`[^`]*`",
+        ]
+    ),
+    re.DOTALL,
+)
+_BLANK_RUN = re.compile(r"\n{3,}")
+_TRAILING_WHITESPACE = re.compile(r"[ \t]+$", re.MULTILINE)
+_STRING_PREFIX = re.compile(r"^([rRbBuUfF]*)('''|\"\"\")")
+
+
+def _extension(file_path: str) -> str:
+    return PurePosixPath(file_path).suffix.lower()
+
+
+def strip_license_header(file_path: str, source: str) -> str:
+    """Remove a leading comment block that contains license or copyright text.
+
+    Shebang and encoding lines are kept. Only files with a known comment syntax are changed.
+
+    Args:
+        file_path: Repository-relative path, used to pick the comment syntax.
+        source: File contents.
+
+    Returns:
+        The contents without the license header.
+    """
+    extension = _extension(file_path)
+    if extension in HASH_COMMENT_EXTENSIONS:
+        prefixes: tuple[str, ...] = ("#",)
+    elif extension in C_STYLE_EXTENSIONS:
+        prefixes = ("//", "/*", "*")
+    else:
+        return source
+
+    lines = source.splitlines(keepends=True)
+    start = 0
+    while start < len(lines) and (
+        lines[start].startswith("#!") or re.match(r"#.*coding[:=]", lines[start])
+    ):
+        start += 1
+    end = start
+    while end < len(lines) and (not lines[end].strip() or lines[end].lstrip().startswith(prefixes)):
+        end += 1
+    if not _LICENSE_MARKER.search("".join(lines[start:end])):
+        return source
+    return "".join(lines[:start] + lines[end:])
+
+
+def _docstring_summary(lines: list[str], node: ast.Constant) -> str | None:
+    """Rebuild a multi-line docstring literal as its first non-empty line."""
+    first = lines[node.lineno - 1]
+    indent = first[: node.col_offset]
+    match = _STRING_PREFIX.match(first[node.col_offset :])
+    if match is None:
+        return None
+    prefix, quote = match.groups()
+    body = "".join(lines[node.lineno - 1 : node.end_lineno])[
+        node.col_offset + len(prefix) + len(quote) :
+    ]
+    summary = next((line.strip() for line in body.splitlines() if line.strip()), "")
+    # A trailing backslash or quote would merge with the closing quotes
+    if summary.endswith(("\\", quote[0])):
+        return None
+    return f"{indent}{prefix}{quote}{summary}{quote}\n"
+
+
+def strip_python_comments(source: str) -> str:
+    """Remove comments and cut multi-line docstrings to their summary line.
+
+    Args:
+        source: Python source code.
+
+    Returns:
+        The compacted source, or the original if it cannot be tokenized or parsed.
+    """
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(source).readline))
+        tree = ast.parse(source)
+    except (tokenize.TokenError, SyntaxError, ValueError):
+        return source
+
+    lines = source.splitlines(keepends=True)
+    replacements: dict[int, str | None] = {}
+    for token in tokens:
+        if token.type != tokenize.COMMENT:
+            continue
+        row, col = token.start
+        code = lines[row - 1][:col].rstrip()
+        replacements[row] = f"{code}\n" if code else None
+
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        if not node.body or not isinstance(node.body[0], ast.Expr):
+            continue
+        value = node.body[0].value
+        if not (isinstance(value, ast.Constant) and isinstance(value.value, str)):
+            continue
+        if value.end_lineno == value.lineno:
+            continue
+        summary = _docstring_summary(lines, value)
+        if summary is None:
+            continue
+        replacements[value.lineno] = summary
+        for row in range(value.lineno + 1, value.end_lineno + 1):
+            replacements[row] = None
+
+    compacted = []
+    for row, line in enumerate(lines, start=1):
+        if row not in replacements:
+            compacted.append(line)
+        elif replacements[row] is not None:
+            compacted.append(replacements[row])
+    return "".join(compacted)
+
+
+def strip_c_style_comments(source: str) -> str:
+    """Remove ``//`` and ``/* */`` comments, leaving string literals untouched.
+
+    Block comments are replaced by the newlines they spanned so line structure survives.
+
+    Args:
+        source: Source code in a C-style language.
+
+    Returns:
+        The source without comments.
+    """
+
+    def replace(match: re.Match) -> str:
+        text = match.group(0)
+        if text.startswith("//"):
+            return ""
+        if text.startswith("/*"):
+            return "\n" * text.count("\n")
+        return text
+
+    return _C_STYLE_TOKEN.sub(replace, source)
+
+
+def strip_hash_comments(source: str) -> str:
+    """Remove whole-line ``#`` comments, keeping a shebang on the first line.
+
+    Args:
+        source: Source code in a language with ``#`` comments.
+
+    Returns:
+        The source without comment-only lines.
+    """
+    lines = source.splitlines(keepends=True)
+    return "".join(
+        line
+        for index, line in enumerate(lines)
+        if not line.lstrip().startswith("#") or (index == 0 and line.startswith("#!"))
+    )
+
+
+def collapse_whitespace(source: str) -> str:
+    """Strip trailing whitespace and collapse runs of blank lines into one.
+
+    Indentation is preserved.
+
+    Args:
+        source: File contents.
+
+    Returns:
+        The contents with collapsed whitespace.
+    """
+    source = _TRAILING_WHITESPACE.sub("", source)
+    source = _BLANK_RUN.sub("\n\n", source).strip("\n")
+    return f"{source}\n" if source else ""
+
+
+def compact_source(file_path: str, source: str, strip_comments: bool = True) -> str:
+    """Compact a file for the "compact" codebase reasoning mode.
+
+    Args:
+        file_path: Repository-relative path, used to pick the comment syntax.
+        source: File contents.
+        strip_comments: Also remove comments (and shorten Python docstrings). If False,
+            only license headers and whitespace are removed.
+
+    Returns:
+        The compacted contents.
+    """
+    source = strip_license_header(file_path, source)
+    if strip_comments:
+        extension = _extension(file_path)
+        if extension in (".py", ".pyi"):
+            source = strip_python_comments(source)
+        elif extension in C_STYLE_EXTENSIONS:
+            source = strip_c_style_comments(source)
+        elif extension in HASH_COMMENT_EXTENSIONS:
+            source = strip_hash_comments(source)
+    return collapse_whitespace(source)
@@ -13,6 +13,10 @@ MODEL_PRICING = {
     "gemini-2.5-pro": {
         "input": {"default": 1.25},
         "output": {"default": 10.00},
+        "cache": {
+            "default": 0.31,
+            "storage": 4.50,  # per 1M tokens per hour
+        },
     },
     "gemini-2.5-flash": {
         "input": {
@@ -50,15 +54,15 @@ MODEL_PRICING = {
         "output": {"default": 15.00},  # $15 per 1M output tokens
     },
     "gpt-4o-mini": {
-        "input": {"default": 0.15},  # $0.15 per 1M input tokens
+        "input": {"default": 0.15, "cached": 0.075},  # $0.15 per 1M input tokens
         "output": {"default": 0.60},  # $0.60 per 1M output tokens
     },
     "o4-mini": {
-        "input": {"default": 1.1},  # $1.1 per 1M input tokens
+        "input": {"default": 1.1, "cached": 0.275},  # $1.1 per 1M input tokens
         "output": {"default": 4.4},  # $4.4 per 1M output tokens
     },
     "o3": {
-        "input": {"default": 10.0},  # $10 per 1M input tokens
+        "input": {"default": 10.0, "cached": 2.50},  # $10 per 1M input tokens
         "output": {"default": 40.0},  # $40 per 1M output tokens
     },
     # Deep Research Models
@@ -73,13 +77,37 @@ MODEL_PRICING = {
 }
 
 
-def calculate_cost(model: str, input_tokens: int, output_tokens: int) -> float | None:
+def cached_input_rate(model: str) -> float | None:
+    """Returns the price per 1M cached input tokens, or None if the model has no cache rate.
+
+    Args:
+        model: The model name (Gemini or OpenAI).
+    """
+    pricing = MODEL_PRICING.get(model)
+    if not pricing:
+        return None
+    if "cached" in pricing["input"]:
+        return pricing["input"]["cached"]
+    return pricing.get("cache", {}).get("default")
+
+
+def calculate_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cached_input_tokens: int = 0,
+    cache_storage_token_hours: float = 0.0,
+) -> float | None:
     """Calculates the estimated cost for a model API call.
 
     Args:
         model: The model name (Gemini or OpenAI).
-        input_tokens: Number of input tokens used.
+        input_tokens: Number of input tokens used, including cached tokens.
         output_tokens: Number of output tokens generated.
+        cached_input_tokens: Input tokens served from the provider's prompt cache, billed at
+            the model's cached rate when it has one.
+        cache_storage_token_hours: Storage bought for explicitly created cached content
+            (tokens x hours), billed at the model's cache storage rate when it has one.
 
     Returns:
         The estimated cost in USD, or None if pricing is unavailable for the model.
@@ -91,9 +119,14 @@ def calculate_cost(model: str, input_tokens: int, output_tokens: int) -> float |
     # Calculate costs (convert to millions for rate multiplication)
     input_rate = pricing["input"]["default"]
     output_rate = pricing["output"]["default"]
-    input_cost = (input_tokens / 1_000_000) * input_rate
+    cached_rate = cached_input_rate(model)
+    cached_tokens = min(cached_input_tokens or 0, input_tokens) if cached_rate is not None else 0
+    input_cost = ((input_tokens - cached_tokens) / 1_000_000) * input_rate
+    cached_cost = (cached_tokens / 1_000_000) * (cached_rate or 0.0)
     output_cost = (output_tokens / 1_000_000) * output_rate
-    return input_cost + output_cost
+    storage_rate = pricing.get("cache", {}).get("storage", 0.0)
+    storage_cost = ((cache_storage_token_hours or 0.0) / 1_000_000) * storage_rate
+    return input_cost + cached_cost + output_cost + storage_cost
 
 
 def format_metrics_section(model: str, usage: UsageMetadata | None) -> str:
@@ -120,7 +153,15 @@ def format_metrics_section(model: str, usage: UsageMetadata | None) -> str:
         return na_metrics
 
     # Calculate cost
-    cost = calculate_cost(model, input_tokens, output_tokens)
+    cached_tokens = getattr(usage, "cached_tokens", 0)
+    storage = getattr(usage, "cache_storage_token_hours", 0.0)
+    storage = storage if isinstance(storage, (int, float)) else 0.0
+    if isinstance(cached_tokens, int) and cached_tokens > 0:
+        cost = calculate_cost(model, input_tokens, output_tokens, cached_tokens, storage)
+        cached_str = f" ({cached_tokens} cached)"
+    else:
+        cost = calculate_cost(model, input_tokens, output_tokens)
+        cached_str = ""
     cost_str = f"${cost:.4f}" if cost is not None else "N/A"
 
     # If total_tokens is None, calculate it
@@ -129,7 +170,7 @@ def format_metrics_section(model: str, usage: UsageMetadata | None) -> str:
 
     return f"""\n\n---\n## Completion Metrics
 *   **Model Used**: `{model}`
-*   **Input Tokens**: {input_tokens}
+*   **Input Tokens**: {input_tokens}{cached_str}
 *   **Output Tokens**: {output_tokens}
 *   **Total Tokens**: {total_tokens}
 *   **Estimated Cost**: {cost_str}"""
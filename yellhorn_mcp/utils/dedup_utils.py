@@ -0,0 +1,133 @@
+"""Detection of duplicate file contents for prompt assembly.
+
+Byte-identical files (vendored copies, generated clients, fixtures) are matched exactly.
+Near-duplicates can optionally be matched with MinHash signatures over word shingles,
+using locality-sensitive hashing so each file is only compared with likely candidates.
+"""
+
+import random
+import re
+import zlib
+
+# Words per shingle for near-duplicate detection
+SHINGLE_SIZE = 5
+
+# Number of MinHash permutations and LSH bands (rows per band = permutations / bands)
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16
+
+# Files with fewer shingles than this are only matched exactly
+MIN_SHINGLES = 10
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_WORD = re.compile(r"\w+")
+
+# Fixed seed so signatures are stable between runs
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[int]:
+    """Hash the overlapping word n-grams of a text.
+
+    Args:
+        text: File contents.
+        size: Words per shingle.
+
+    Returns:
+        Set of 32-bit shingle hashes.
+    """
+    words = _WORD.findall(text)
+    return {
+        zlib.crc32(" ".join(words[i : i + size]).encode("utf-8"))
+        for i in range(max(len(words) - size + 1, 0))
+    }
+
+
+def minhash_signature(shingle_hashes: set[int]) -> tuple[int, ...]:
+    """Compute the MinHash signature of a set of shingle hashes.
+
+    Args:
+        shingle_hashes: Non-empty set from ``shingles``.
+
+    Returns:
+        One minimum per permutation.
+    """
+    return tuple(
+        min((a * h + b) % _MERSENNE_PRIME for h in shingle_hashes) for a, b in _PERMUTATIONS
+    )
+
+
+def estimate_similarity(first: tuple[int, ...], second: tuple[int, ...]) -> float:
+    """Estimate the Jaccard similarity of two shingle sets from their signatures."""
+    return sum(x == y for x, y in zip(first, second)) / len(first)
+
+
+class DuplicateDetector:
+    """Recognizes files whose contents repeat an earlier file.
+
+    Files are checked in the order they are added to the prompt; the first copy of each
+    cluster is the original that later copies refer to.
+    """
+
+    def __init__(self, near_duplicate_threshold: float | None = None):
+        """Initialize an empty detector.
+
+        Args:
+            near_duplicate_threshold: Minimum estimated Jaccard similarity for two files to
+                count as near-duplicates. If None, only identical files are matched.
+        """
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self._originals: dict[str, str] = {}
+        # Near-duplicates, which later identical copies resolve to
+        self._aliases: dict[str, tuple[str, float]] = {}
+        self._signatures: dict[str, tuple[int, ...]] = {}
+        self._buckets: dict[tuple[int, tuple[int, ...]], list[str]] = {}
+
+    def check(self, file_path: str, content: str) -> tuple[str, float] | None:
+        """Match a file against the files checked before it.
+
+        Files that match nothing are remembered as originals.
+
+        Args:
+            file_path: Repository-relative path of the file.
+            content: File contents.
+
+        Returns:
+            (original path, similarity) for a duplicate, where similarity is 1.0 for an
+            identical file, or None if the file is new.
+        """
+        original = self._originals.setdefault(content, file_path)
+        if original != file_path:
+            return self._aliases.get(original, (original, 1.0))
+        if self.near_duplicate_threshold is None:
+            return None
+
+        shingle_hashes = shingles(content)
+        if len(shingle_hashes) < MIN_SHINGLES:
+            return None
+        signature = minhash_signature(shingle_hashes)
+        rows = MINHASH_PERMUTATIONS // MINHASH_BANDS
+        bands = [
+            (band, signature[band * rows : (band + 1) * rows]) for band in range(MINHASH_BANDS)
+        ]
+
+        best: tuple[str, float] | None = None
+        candidates = {path for key in bands for path in self._buckets.get(key, [])}
+        for candidate in sorted(candidates):
+            similarity = estimate_similarity(signature, self._signatures[candidate])
+            if similarity >= self.near_duplicate_threshold and (
+                best is None or similarity > best[1]
+            ):
+                best = (candidate, similarity)
+        if best is not None:
+            self._aliases[file_path] = best
+            return best
+
+        self._signatures[file_path] = signature
+        for key in bands:
+            self._buckets.setdefault(key, []).append(file_path)
+        return None
@@ -0,0 +1,208 @@
+"""Persistent, incrementally updated import-graph index for a repository.
+
+The index stores the imports extracted from every Python and Go file together with the
+file's git blob ID, so after a checkout or an edit only files whose blob changed are parsed
+again. Resolved forward and reverse edges are kept in memory, which makes k-hop
+neighborhood queries a plain graph traversal.
+"""
+
+import json
+import posixpath
+from pathlib import Path
+from typing import Iterable
+
+from mcp.server.fastmcp import Context
+
+from yellhorn_mcp.utils.cache_utils import atomic_write_text, get_cache_dir, git_blob_id
+from yellhorn_mcp.utils.dependency_utils import (
+    dependency_closure,
+    extract_imports,
+    invert_edges,
+    parse_go_module,
+    python_module_names,
+    resolve_dependency_edges,
+)
+
+# Bump when the stored entry layout or the extraction logic changes
+DEPENDENCY_INDEX_VERSION = 1
+
+# Files larger than this are indexed without imports
+MAX_INDEXED_FILE_SIZE = 1024 * 1024
+
+
+def _is_indexed(file_path: str) -> bool:
+    return file_path.endswith((".py", ".go")) or posixpath.basename(file_path) == "go.mod"
+
+
+class DependencyIndex:
+    """Import graph of a repository, persisted between server runs."""
+
+    def __init__(self, cache_path: Path | None = None):
+        """Initialize an empty index.
+
+        Args:
+            cache_path: JSON file the index is loaded from and saved to. If None, the index
+                lives in memory only.
+        """
+        self.cache_path = cache_path
+        # path -> {"stat": [mtime_ns, size], "blob": blob id, "imports": [...]}; go.mod
+        # entries hold {"module": module path} instead of imports
+        self._entries: dict[str, dict] = {}
+        self._file_paths: list[str] = []
+        self.edges: dict[str, set[str]] = {}
+        self.reverse_edges: dict[str, set[str]] = {}
+        self.module_to_file: dict[str, str] = {}
+
+    @classmethod
+    def for_repository(cls, repo_path: Path) -> "DependencyIndex":
+        """Load the index from the repository's default cache location."""
+        index = cls(get_cache_dir(repo_path, "dependencies", create=False) / "index.json")
+        index.load()
+        return index
+
+    def load(self) -> None:
+        """Load the persisted index, leaving it empty if missing, unreadable or outdated."""
+        if self.cache_path is None:
+            return
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") != DEPENDENCY_INDEX_VERSION:
+            return
+        self._entries = data.get("entries", {})
+        self._file_paths = data.get("file_paths", [])
+        self._rebuild_edges()
+
+    def save(self) -> None:
+        """Persist the index if it has a cache path."""
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(
+            self.cache_path,
+            json.dumps(
+                {
+                    "version": DEPENDENCY_INDEX_VERSION,
+                    "file_paths": self._file_paths,
+                    "entries": self._entries,
+                }
+            ),
+        )
+
+    def _rebuild_edges(self) -> None:
+        imports = {
+            path: entry["imports"] for path, entry in self._entries.items() if "imports" in entry
+        }
+        go_modules = {
+            entry["module"]: posixpath.dirname(path)
+            for path, entry in self._entries.items()
+            if entry.get("module")
+        }
+        self.edges = resolve_dependency_edges(self._file_paths, imports, go_modules)
+        self.reverse_edges = invert_edges(self.edges)
+        self.module_to_file = {}
+        for path in self._file_paths:
+            if path.endswith(".py"):
+                for name in python_module_names(path):
+                    self.module_to_file.setdefault(name, path)
+
+    def _index_file(self, repo_path: Path, file_path: str) -> dict | None:
+        """Return an up-to-date entry for a file, reusing the stored one when possible."""
+        full_path = repo_path / file_path
+        try:
+            stat = full_path.stat()
+        except OSError:
+            return None
+        stat_key = [stat.st_mtime_ns, stat.st_size]
+        entry = self._entries.get(file_path)
+        if entry is not None and entry["stat"] == stat_key:
+            return entry
+
+        if stat.st_size > MAX_INDEXED_FILE_SIZE:
+            return {"stat": stat_key, "blob": None, "imports": []}
+        try:
+            content = full_path.read_bytes()
+        except OSError:
+            return None
+        blob = git_blob_id(content)
+        if entry is not None and entry["blob"] == blob:
+            # Touched but unchanged (e.g. by a checkout): keep the extracted imports
+            return {**entry, "stat": stat_key}
+
+        source = content.decode("utf-8", errors="ignore")
+        if posixpath.basename(file_path) == "go.mod":
+            return {"stat": stat_key, "blob": blob, "module": parse_go_module(source)}
+        return {"stat": stat_key, "blob": blob, "imports": extract_imports(file_path, source)}
+
+    def update(self, repo_path: Path, file_paths: list[str]) -> list[str]:
+        """Bring the index up to date with the repository's current files.
+
+        Only files whose size or mtime changed are read, and only files whose blob changed
+        are parsed again. Edges are re-resolved only if something changed.
+
+        Args:
+            repo_path: Path to the repository.
+            file_paths: Current repository-relative file paths (e.g. from ``git ls-files``).
+
+        Returns:
+            Indexed paths that were added, changed or removed.
+        """
+        indexed_paths = [path for path in file_paths if _is_indexed(path)]
+        changed: list[str] = []
+        entries: dict[str, dict] = {}
+        for path in indexed_paths:
+            entry = self._index_file(repo_path, path)
+            if entry is None:
+                continue
+            previous = self._entries.get(path)
+            if previous is None or previous.get("blob") != entry.get("blob"):
+                changed.append(path)
+            entries[path] = entry
+        removed = [path for path in self._entries if path not in entries]
+        changed.extend(removed)
+
+        stats_changed = any(
+            self._entries.get(path, {}).get("stat") != entry["stat"]
+            for path, entry in entries.items()
+        )
+        self._entries = entries
+        if changed or indexed_paths != self._file_paths:
+            self._file_paths = indexed_paths
+            self._rebuild_edges()
+        if changed or stats_changed:
+            self.save()
+        return changed
+
+    def resolve_module(self, module_name: str) -> str | None:
+        """Return the file that defines a Python module, if it is in the repository."""
+        return self.module_to_file.get(module_name)
+
+    def neighbors(self, seeds: Iterable[str], hops: int = 1) -> set[str]:
+        """Return the files within ``hops`` import steps of the seeds, in either direction.
+
+        Args:
+            seeds: Starting files.
+            hops: Maximum number of import steps to follow.
+
+        Returns:
+            The seeds plus every file reached.
+        """
+        return dependency_closure(self.edges, seeds, hops, self.reverse_edges)
+
+
+def get_shared_dependency_index(ctx: Context | None, repo_path: Path) -> DependencyIndex:
+    """Return the server's dependency index, or load one if the server provides none.
+
+    Args:
+        ctx: Optional server context whose lifespan context may hold a ``dependency_index``.
+        repo_path: Path to the repository.
+
+    Returns:
+        The shared index, or a freshly loaded index for the repository.
+    """
+    if ctx is not None:
+        index = ctx.request_context.lifespan_context.get("dependency_index")
+        if isinstance(index, DependencyIndex):
+            return index
+    return DependencyIndex.for_repository(repo_path)
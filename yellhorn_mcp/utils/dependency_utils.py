@@ -0,0 +1,270 @@
+"""Import-graph extraction for Python and Go sources.
+
+Used to scope codebase context to the neighborhood of a set of files: the files they
+import, the files that import them, and (for Go) the other files of the same package.
+"""
+
+import ast
+import posixpath
+import re
+from collections import deque
+from typing import Callable, Iterable
+
+# Top-level directories that hold importable packages without being part of module names
+PYTHON_SOURCE_ROOTS = ("src", "lib")
+
+_GO_MODULE_LINE = re.compile(r"^module\s+(\S+)", re.MULTILINE)
+_GO_IMPORT_BLOCK = re.compile(r"^import\s*\((.*?)\)", re.MULTILINE | re.DOTALL)
+_GO_IMPORT_LINE = re.compile(r'^import\s+(?:[\w.]+\s+)?"([^"]+)"', re.MULTILINE)
+_GO_QUOTED = re.compile(r'"([^"]+)"')
+_PATH_TOKEN = re.compile(r"[\w.\-/]+")
+
+
+def python_module_names(file_path: str) -> list[str]:
+    """Return the dotted module names a Python file can be imported as.
+
+    Args:
+        file_path: Repository-relative path ending in ".py".
+
+    Returns:
+        Module names, e.g. ["pkg.mod"] for "pkg/mod.py" and ["src.pkg", "pkg"] for
+        "src/pkg/__init__.py".
+    """
+    parts = file_path[: -len(".py")].split("/")
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    if not parts:
+        return []
+    names = [".".join(parts)]
+    if len(parts) > 1 and parts[0] in PYTHON_SOURCE_ROOTS:
+        names.append(".".join(parts[1:]))
+    return names
+
+
+def extract_python_imports(source: str, file_path: str) -> list[str]:
+    """Extract the module names a Python file imports.
+
+    Relative imports are resolved against the file's package. For ``from x import y`` both
+    ``x`` and ``x.y`` are returned, since ``y`` may be a submodule.
+
+    Args:
+        source: Python source code.
+        file_path: Repository-relative path of the file.
+
+    Returns:
+        Candidate module names; unparsable files yield an empty list.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+
+    package_parts = file_path.split("/")[:-1]
+    modules: list[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                if node.level - 1 > len(package_parts):
+                    continue
+                base_parts = package_parts[: len(package_parts) - (node.level - 1)]
+                if node.module:
+                    base_parts = base_parts + node.module.split(".")
+                base = ".".join(base_parts)
+            else:
+                base = node.module or ""
+            if base:
+                modules.append(base)
+            modules.extend(
+                f"{base}.{alias.name}" if base else alias.name
+                for alias in node.names
+                if alias.name != "*"
+            )
+    return modules
+
+
+def extract_go_imports(source: str) -> list[str]:
+    """Extract the import paths of a Go file from its import declarations.
+
+    Args:
+        source: Go source code.
+
+    Returns:
+        Import paths, e.g. ["fmt", "example.com/app/internal/store"].
+    """
+    imports = []
+    for block in _GO_IMPORT_BLOCK.findall(source):
+        imports.extend(_GO_QUOTED.findall(block))
+    imports.extend(_GO_IMPORT_LINE.findall(source))
+    return imports
+
+
+def parse_go_module(go_mod: str) -> str | None:
+    """Return the module path declared by a go.mod file, or None if there is none."""
+    match = _GO_MODULE_LINE.search(go_mod)
+    return match.group(1) if match else None
+
+
+def extract_imports(file_path: str, source: str) -> list[str]:
+    """Extract the imports of a Python or Go file.
+
+    Args:
+        file_path: Repository-relative path; the extension selects the language.
+        source: File contents.
+
+    Returns:
+        Python module names or Go import paths; other file types yield an empty list.
+    """
+    if file_path.endswith(".py"):
+        return extract_python_imports(source, file_path)
+    if file_path.endswith(".go"):
+        return extract_go_imports(source)
+    return []
+
+
+def resolve_dependency_edges(
+    file_paths: list[str], imports: dict[str, list[str]], go_modules: dict[str, str]
+) -> dict[str, set[str]]:
+    """Resolve extracted imports to forward edges between repository files.
+
+    Python imports are resolved to files through the module names of every ``.py`` file.
+    Go imports are resolved to package directories through the module paths of the
+    repository's ``go.mod`` files, and every file of a Go package is linked to the other
+    files of the package.
+
+    Args:
+        file_paths: Repository-relative file paths.
+        imports: Output of ``extract_imports`` per file.
+        go_modules: Mapping from Go module path to the directory holding its go.mod.
+
+    Returns:
+        Mapping from each importing file to the files it depends on.
+    """
+    module_index: dict[str, str] = {}
+    go_packages: dict[str, list[str]] = {}
+    for path in file_paths:
+        if path.endswith(".py"):
+            for name in python_module_names(path):
+                module_index.setdefault(name, path)
+        elif path.endswith(".go"):
+            go_packages.setdefault(posixpath.dirname(path), []).append(path)
+
+    edges: dict[str, set[str]] = {}
+    for path in file_paths:
+        targets: set[str] = set()
+        if path.endswith(".py"):
+            for module in imports.get(path, ()):
+                target = module_index.get(module)
+                if target and target != path:
+                    targets.add(target)
+        elif path.endswith(".go"):
+            package_dir = posixpath.dirname(path)
+            targets.update(p for p in go_packages[package_dir] if p != path)
+            for import_path in imports.get(path, ()):
+                for module_path, module_dir in go_modules.items():
+                    if import_path == module_path or import_path.startswith(module_path + "/"):
+                        rel = import_path[len(module_path) :].lstrip("/")
+                        target_dir = posixpath.join(module_dir, rel) if module_dir else rel
+                        targets.update(go_packages.get(target_dir.rstrip("/"), []))
+                        break
+        if targets:
+            edges[path] = targets
+    return edges
+
+
+def build_dependency_edges(
+    file_paths: list[str], read_text: Callable[[str], str | None]
+) -> dict[str, set[str]]:
+    """Build forward import edges between the files of a repository from scratch.
+
+    Args:
+        file_paths: Repository-relative file paths.
+        read_text: Returns the contents of a file, or None if it cannot be read.
+
+    Returns:
+        Mapping from each importing file to the files it depends on.
+    """
+    imports: dict[str, list[str]] = {}
+    go_modules: dict[str, str] = {}
+    for path in file_paths:
+        if path.endswith((".py", ".go")):
+            imports[path] = extract_imports(path, read_text(path) or "")
+        elif posixpath.basename(path) == "go.mod":
+            module_path = parse_go_module(read_text(path) or "")
+            if module_path:
+                go_modules[module_path] = posixpath.dirname(path)
+    return resolve_dependency_edges(file_paths, imports, go_modules)
+
+
+def invert_edges(edges: dict[str, set[str]]) -> dict[str, set[str]]:
+    """Return reverse edges, mapping each file to the files that import it."""
+    reverse: dict[str, set[str]] = {}
+    for source, targets in edges.items():
+        for target in targets:
+            reverse.setdefault(target, set()).add(source)
+    return reverse
+
+
+def dependency_closure(
+    edges: dict[str, set[str]],
+    seeds: Iterable[str],
+    hops: int = 1,
+    reverse_edges: dict[str, set[str]] | None = None,
+) -> set[str]:
+    """Collect the files within ``hops`` import steps of the seeds, in either direction.
+
+    Args:
+        edges: Forward edges from ``build_dependency_edges``.
+        seeds: Starting files.
+        hops: Maximum number of import steps to follow.
+        reverse_edges: Precomputed ``invert_edges(edges)``; computed if omitted.
+
+    Returns:
+        The seeds plus every file that imports, or is imported by, a file already reached.
+    """
+    if reverse_edges is None:
+        reverse_edges = invert_edges(edges)
+
+    reached = set(seeds)
+    frontier = deque((seed, 0) for seed in reached)
+    while frontier:
+        path, depth = frontier.popleft()
+        if depth >= hops:
+            continue
+        for neighbor in (*edges.get(path, ()), *reverse_edges.get(path, ())):
+            if neighbor not in reached:
+                reached.add(neighbor)
+                frontier.append((neighbor, depth + 1))
+    return reached
+
+
+def find_referenced_paths(text: str, file_paths: list[str]) -> set[str]:
+    """Find the repository files a piece of text refers to.
+
+    A reference is a token equal to a file path, or to a directory, in which case the files
+    directly inside the directory are included.
+
+    Args:
+        text: Free text such as a workplan.
+        file_paths: Repository-relative file paths.
+
+    Returns:
+        Referenced file paths.
+    """
+    known = set(file_paths)
+    by_dir: dict[str, list[str]] = {}
+    for path in file_paths:
+        by_dir.setdefault(posixpath.dirname(path), []).append(path)
+
+    referenced: set[str] = set()
+    for token in _PATH_TOKEN.findall(text):
+        # Drop sentence punctuation and "./" prefixes
+        token = token.rstrip(".").removeprefix("./")
+        if not token:
+            continue
+        if token in known:
+            referenced.add(token)
+        elif "/" in token and token.rstrip("/") in by_dir:
+            referenced.update(by_dir[token.rstrip("/")])
+    return referenced
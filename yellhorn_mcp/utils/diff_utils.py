@@ -0,0 +1,143 @@
+"""Utilities for splitting unified diffs into per-file pieces and token-bounded batches."""
+
+import re
+
+from yellhorn_mcp.token_counter import TokenCounter
+
+_HUNK_HEADER = re.compile(r"^@@ ", re.MULTILINE)
+
+
+class FileDiff:
+    """The portion of a unified diff that touches a single file."""
+
+    def __init__(self, path: str, header: str, hunks: list[str]):
+        """Initialize the file diff.
+
+        Args:
+            path: Repository-relative path of the file (the new path for renames).
+            header: Lines preceding the first hunk ("diff --git", "index", "---", "+++").
+            hunks: Hunk texts, each starting with an "@@" line.
+        """
+        self.path = path
+        self.header = header
+        self.hunks = hunks
+
+    @property
+    def text(self) -> str:
+        """The file diff as unified diff text."""
+        return self.header + "".join(self.hunks)
+
+    def __repr__(self) -> str:
+        return f"FileDiff(path={self.path!r}, hunks={len(self.hunks)})"
+
+
+def _parse_path(header: str) -> str:
+    """Extract the file path from a per-file diff header."""
+    new_path = old_path = None
+    for line in header.splitlines():
+        if line.startswith("+++ "):
+            new_path = line[4:].strip()
+        elif line.startswith("--- "):
+            old_path = line[4:].strip()
+
+    for candidate in (new_path, old_path):
+        if candidate and candidate != "/dev/null":
+            return candidate[2:] if candidate[:2] in ("a/", "b/") else candidate
+
+    # Binary files and pure renames have no ---/+++ lines; fall back to "diff --git a/x b/y"
+    match = re.match(r"diff --git a/(.*) b/(.*)", header)
+    return match.group(2) if match else header.split("\n", 1)[0]
+
+
+def split_diff_by_file(diff: str) -> list[FileDiff]:
+    """Split a unified diff (as produced by ``git diff --patch``) at file boundaries.
+
+    Args:
+        diff: Unified diff text.
+
+    Returns:
+        One FileDiff per file, in diff order. Text before the first "diff --git" line is dropped.
+    """
+    sections = re.split(r"^(?=diff --git )", diff, flags=re.MULTILINE)
+    file_diffs = []
+    for section in sections:
+        if not section.startswith("diff --git "):
+            continue
+        starts = [m.start() for m in _HUNK_HEADER.finditer(section)]
+        if not starts:
+            file_diffs.append(FileDiff(_parse_path(section), section, []))
+            continue
+        header = section[: starts[0]]
+        hunks = [section[start:end] for start, end in zip(starts, starts[1:] + [len(section)])]
+        file_diffs.append(FileDiff(_parse_path(header), header, hunks))
+    return file_diffs
+
+
+def _split_oversized(
+    file_diff: FileDiff, max_tokens: int, token_counter: TokenCounter, model: str
+) -> list[FileDiff]:
+    """Split a file diff at hunk boundaries so each piece fits in ``max_tokens``.
+
+    Every piece repeats the file header. A single hunk larger than the budget is kept whole.
+    """
+    pieces: list[FileDiff] = []
+    current: list[str] = []
+    header_tokens = token_counter.count_tokens(file_diff.header, model)
+    current_tokens = header_tokens
+    for hunk in file_diff.hunks:
+        hunk_tokens = token_counter.count_tokens(hunk, model)
+        if current and current_tokens + hunk_tokens > max_tokens:
+            pieces.append(FileDiff(file_diff.path, file_diff.header, current))
+            current, current_tokens = [], header_tokens
+        current.append(hunk)
+        current_tokens += hunk_tokens
+    if current or not pieces:
+        pieces.append(FileDiff(file_diff.path, file_diff.header, current))
+    return pieces
+
+
+def batch_file_diffs(
+    file_diffs: list[FileDiff], max_tokens: int, token_counter: TokenCounter, model: str
+) -> list[list[FileDiff]]:
+    """Group file diffs into batches of at most ``max_tokens`` tokens.
+
+    Files are never split across batches unless a single file exceeds the budget, in which
+    case it is split at hunk boundaries. Batches are packed largest-first (first-fit
+    decreasing), so no batch exceeds the budget and the number of batches stays low.
+
+    Args:
+        file_diffs: Per-file diffs from ``split_diff_by_file``.
+        max_tokens: Token budget for the diff text of one batch.
+        token_counter: Token counter used to size each file.
+        model: Model name for token counting.
+
+    Returns:
+        List of batches; files within a batch keep their original diff order.
+    """
+    sized: list[tuple[int, int, FileDiff]] = []
+    for order, file_diff in enumerate(file_diffs):
+        tokens = token_counter.count_tokens(file_diff.text, model)
+        if tokens > max_tokens and len(file_diff.hunks) > 1:
+            for piece in _split_oversized(file_diff, max_tokens, token_counter, model):
+                sized.append((token_counter.count_tokens(piece.text, model), order, piece))
+        else:
+            sized.append((tokens, order, file_diff))
+
+    # First-fit decreasing bin packing
+    bins: list[list[tuple[int, FileDiff]]] = []
+    bin_tokens: list[int] = []
+    for tokens, order, file_diff in sorted(sized, key=lambda item: (-item[0], item[1])):
+        for i, used in enumerate(bin_tokens):
+            if used + tokens <= max_tokens:
+                bins[i].append((order, file_diff))
+                bin_tokens[i] += tokens
+                break
+        else:
+            bins.append([(order, file_diff)])
+            bin_tokens.append(tokens)
+
+    # Keep diff order within each batch and present batches in diff order of their first file
+    ordered_bins = sorted(
+        (sorted(b, key=lambda item: item[0]) for b in bins), key=lambda b: b[0][0]
+    )
+    return [[file_diff for _, file_diff in b] for b in ordered_bins]
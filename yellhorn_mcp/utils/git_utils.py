@@ -15,6 +15,10 @@ from mcp import Resource
 from mcp.server.fastmcp import Context
 from pydantic import FileUrl
 
+from yellhorn_mcp.metrics import observe_subprocess
+from yellhorn_mcp.tracing import traced_command
+from yellhorn_mcp.utils.timing_utils import timed_phase
+
 
 class YellhornMCPError(Exception):
     """Base exception for Yellhorn MCP errors."""
@@ -22,6 +26,14 @@ class YellhornMCPError(Exception):
     pass
 
 
+# Per-repository caches for metadata that only changes on explicit user action
+_default_branch_cache: dict[Path, str] = {}
+_remote_url_cache: dict[tuple[Path, str], str] = {}
+
+
+@observe_subprocess("git")
+@traced_command("git")
+@timed_phase("git")
 async def run_git_command(repo_path: Path, command: list[str]) -> str:
     """
     Run a Git command in the repository.
@@ -55,6 +67,9 @@ async def run_git_command(repo_path: Path, command: list[str]) -> str:
         raise YellhornMCPError("Git executable not found. Please ensure Git is installed.")
 
 
+@observe_subprocess("gh")
+@traced_command("gh")
+@timed_phase("github")
 async def run_github_command(
     repo_path: Path, command: list[str], github_command_func: Callable | None = None
 ) -> str:
@@ -409,32 +424,58 @@ async def post_github_pr_review(repo_path: Path, pr_url: str, review_content: st
         raise YellhornMCPError(f"Failed to post GitHub PR review: {str(e)}")
 
 
-async def get_default_branch(repo_path: Path) -> str:
+async def get_default_branch(repo_path: Path, refresh: bool = False) -> str:
     """
     Get the default branch name for a repository.
 
+    The branch is resolved locally from ``refs/remotes/origin/HEAD`` so no network
+    round-trip to the remote is needed. A resolved branch is cached per repository for the
+    lifetime of the process; pass ``refresh=True`` to resolve it again. The "main" guess
+    used when nothing resolves is not cached, so a later fetch or ``git remote set-head``
+    is picked up.
+
     Args:
         repo_path: Path to the repository.
+        refresh: If True, ignore any cached value and resolve the branch again.
 
     Returns:
         The default branch name (e.g., "main" or "master").
+    """
+    if not refresh and repo_path in _default_branch_cache:
+        return _default_branch_cache[repo_path]
 
-    Raises:
-        YellhornMCPError: If the command fails.
+    branch = await _resolve_default_branch(repo_path)
+    if branch is None:
+        return "main"
+    _default_branch_cache[repo_path] = branch
+    return branch
+
+
+async def _resolve_default_branch(repo_path: Path) -> str | None:
     """
-    try:
-        # Try to get the default branch using git
-        try:
-            result = await run_git_command(repo_path, ["remote", "show", "origin"])
+    Resolve the default branch name without contacting the remote.
 
-            # Parse the output to find the default branch
-            import re
+    Args:
+        repo_path: Path to the repository.
 
-            match = re.search(r"HEAD branch: ([^\s]+)", result)
-            if match:
-                return match.group(1)
+    Returns:
+        The default branch name, or None if it cannot be determined.
+    """
+    try:
+        # origin/HEAD is a local symbolic ref set by clone (or `git remote set-head`)
+        try:
+            result = await run_git_command(
+                repo_path, ["symbolic-ref", "--short", "refs/remotes/origin/HEAD"]
+            )
+            branch = result.strip()
+            if branch.startswith("refs/remotes/"):
+                branch = branch[len("refs/remotes/") :]
+            if branch.startswith("origin/"):
+                branch = branch[len("origin/") :]
+            if branch:
+                return branch
         except Exception:
-            # remote show origin failed, try fallback
+            # origin/HEAD is not set, try fallback
             pass
 
         # Fallback to common default branch names
@@ -442,15 +483,54 @@ async def get_default_branch(repo_path: Path) -> str:
             try:
                 await run_git_command(repo_path, ["show-ref", f"refs/heads/{branch}"])
                 return branch
-            except:
+            except Exception:
                 continue
 
-        # If we can't determine the default branch, return "main" as a guess
-        return "main"
+        return None
     except Exception as e:
-        # If all else fails, default to "main"
         print(f"Warning: Could not determine default branch: {str(e)}")
-        return "main"
+        return None
+
+
+async def get_remote_url(repo_path: Path, remote: str = "origin", refresh: bool = False) -> str:
+    """
+    Get the URL of a git remote, cached per repository.
+
+    Args:
+        repo_path: Path to the repository.
+        remote: Name of the remote (default: "origin").
+        refresh: If True, ignore any cached value and query git again.
+
+    Returns:
+        The remote URL as configured in the repository.
+
+    Raises:
+        YellhornMCPError: If the remote does not exist.
+    """
+    key = (repo_path, remote)
+    if not refresh and key in _remote_url_cache:
+        return _remote_url_cache[key]
+
+    url = await run_git_command(repo_path, ["remote", "get-url", remote])
+    _remote_url_cache[key] = url
+    return url
+
+
+def clear_git_metadata_cache(repo_path: Path | None = None) -> None:
+    """
+    Drop cached default branch and remote URL values.
+
+    Args:
+        repo_path: Repository whose entries should be dropped. Clears all entries if None.
+    """
+    if repo_path is None:
+        _default_branch_cache.clear()
+        _remote_url_cache.clear()
+        return
+
+    _default_branch_cache.pop(repo_path, None)
+    for key in [k for k in _remote_url_cache if k[0] == repo_path]:
+        del _remote_url_cache[key]
 
 
 def is_git_repository(path: Path) -> bool:
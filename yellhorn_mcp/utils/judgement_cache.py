@@ -0,0 +1,78 @@
+"""Persistent per-file judgement fragments for incremental re-judgement.
+
+A fragment is the reviewer's findings for one file of a diff. Fragments are keyed by
+(workplan hash, file path, base blob, head blob), so when a PR receives another commit only
+the files whose blobs changed need to be judged again.
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from yellhorn_mcp.utils.cache_utils import atomic_write_text, get_cache_dir
+from yellhorn_mcp.utils.diff_utils import FileDiff
+
+_INDEX_LINE = re.compile(r"^index ([0-9a-f]+)\.\.([0-9a-f]+)", re.MULTILINE)
+
+
+def hash_workplan(workplan_content: str) -> str:
+    """Hash workplan content for use in fragment keys."""
+    return hashlib.sha256(workplan_content.encode("utf-8")).hexdigest()
+
+
+def fragment_key(workplan_hash: str, file_diff: FileDiff) -> tuple[str, str, str, str] | None:
+    """Build the cache key for a file diff.
+
+    Blob IDs come from the ``index <base>..<head>`` line of the diff header, so no extra git
+    calls are needed.
+
+    Args:
+        workplan_hash: Result of ``hash_workplan``.
+        file_diff: The file diff to key.
+
+    Returns:
+        (workplan hash, path, base blob, head blob), or None if the header has no index line
+        (e.g. pure renames), in which case the file is always judged.
+    """
+    match = _INDEX_LINE.search(file_diff.header)
+    if not match:
+        return None
+    return workplan_hash, file_diff.path, match.group(1), match.group(2)
+
+
+class JudgementFragmentStore:
+    """On-disk store of per-file judgement fragments, one JSON file per fragment."""
+
+    def __init__(self, cache_dir: Path):
+        """Initialize the store.
+
+        Args:
+            cache_dir: Directory holding the fragment files; created on first write.
+        """
+        self.cache_dir = cache_dir
+
+    @classmethod
+    def for_repository(cls, repo_path: Path) -> "JudgementFragmentStore":
+        """Create a store in the repository's default cache location."""
+        return cls(get_cache_dir(repo_path, "judgements", create=False))
+
+    def _path_for(self, key: tuple[str, str, str, str]) -> Path:
+        digest = hashlib.sha256("\0".join(key).encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def get(self, key: tuple[str, str, str, str]) -> str | None:
+        """Return the cached fragment for a key, or None if absent or unreadable."""
+        try:
+            data = json.loads(self._path_for(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        # Guard against digest collisions by checking the stored key
+        if data.get("key") != list(key):
+            return None
+        return data.get("fragment")
+
+    def put(self, key: tuple[str, str, str, str], fragment: str) -> None:
+        """Persist a fragment for a key."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(self._path_for(key), json.dumps({"key": list(key), "fragment": fragment}))
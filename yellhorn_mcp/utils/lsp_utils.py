@@ -435,6 +435,119 @@ def extract_go_api(file_path: Path) -> list[str]:
         return []
 
 
+def _first_doc_line(doc: str | None) -> str:
+    return doc.strip().splitlines()[0] if doc and doc.strip() else ""
+
+
+def extract_python_symbols(source: str) -> list[dict]:
+    """
+    Extract the public symbols of a Python module with their locations.
+
+    Covers the same definitions as ``extract_python_api`` (non-private module-level
+    functions and classes, and the non-private methods of those classes).
+
+    Args:
+        source: Python source code
+
+    Returns:
+        List of dicts with "name" (``Class.method`` for methods), "kind" ("function",
+        "class" or "method"), "signature", "line" and "doc" (first docstring line).
+        Unparsable sources yield an empty list.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+
+    symbols = []
+    for node in tree.body:
+        if not hasattr(node, "name") or node.name.startswith("_"):
+            continue
+        sig = _sig_from_ast(node)
+        if not sig:
+            continue
+        is_class = isinstance(node, ast.ClassDef)
+        symbols.append(
+            {
+                "name": node.name,
+                "kind": "class" if is_class else "function",
+                "signature": sig,
+                "line": node.lineno,
+                "doc": _first_doc_line(ast.get_docstring(node)),
+            }
+        )
+        if not is_class:
+            continue
+        for method in node.body:
+            if not hasattr(method, "name") or method.name.startswith("_"):
+                continue
+            method_sig = _sig_from_ast(method)
+            if method_sig:
+                symbols.append(
+                    {
+                        "name": f"{node.name}.{method.name}",
+                        "kind": "method",
+                        "signature": method_sig.replace("def ", f"def {node.name}.", 1),
+                        "line": method.lineno,
+                        "doc": _first_doc_line(ast.get_docstring(method)),
+                    }
+                )
+    return symbols
+
+
+_GO_SYMBOL_RE = re.compile(
+    r"^(?:func\s+\(\s*\w*\s*\*?\s*(?P<recv>\w+)[^)]*\)\s+(?P<method>[A-Z]\w*)"
+    r"|func\s+(?P<func>[A-Z]\w*)"
+    r"|type\s+(?P<type>[A-Z]\w*)\s+(?P<type_kind>struct|interface)?)"
+)
+
+
+def extract_go_symbols(source: str) -> list[dict]:
+    """
+    Extract the exported symbols of a Go file with their locations.
+
+    Covers the same declarations as ``extract_go_api``: exported functions, methods
+    and types. The doc line is the first line of the ``//`` comment block preceding
+    the declaration.
+
+    Args:
+        source: Go source code
+
+    Returns:
+        List of dicts with "name" (``Type.Method`` for methods), "kind" ("function",
+        "method", "struct", "interface" or "type"), "signature", "line" and "doc".
+    """
+    symbols = []
+    lines = source.splitlines()
+    for index, line in enumerate(lines):
+        match = _GO_SYMBOL_RE.match(line)
+        if not match:
+            continue
+        if match.group("method"):
+            name, kind = f"{match.group('recv')}.{match.group('method')}", "method"
+        elif match.group("func"):
+            name, kind = match.group("func"), "function"
+        else:
+            name, kind = match.group("type"), match.group("type_kind") or "type"
+
+        # Walk back over the contiguous comment block above the declaration
+        start = index
+        while start > 0 and lines[start - 1].lstrip().startswith("//"):
+            start -= 1
+        doc = lines[start].lstrip()[2:].strip() if start < index else ""
+
+        symbols.append(
+            {
+                "name": name,
+                "kind": kind,
+                "signature": line.split("{", 1)[0].strip(),
+                "line": index + 1,
+                "doc": doc,
+            }
+        )
+    return symbols
+
+
 def _fence(lang: str, text: str) -> str:
     """
     Add code fences around text with specified language.
@@ -465,32 +578,34 @@ async def get_lsp_snapshot(repo_path: Path, file_paths: list[str]) -> tuple[list
         Tuple of (file list, file contents dictionary), where contents contain
         API signatures, class attributes, and docstrings as plain text (no code fences)
     """
+    # Imported here to avoid a circular import with precomputed_index
+    from yellhorn_mcp.utils.precomputed_index import get_precomputed_index
+
     # Filter for supported files
     py_files = [p for p in file_paths if p.endswith(".py")]
     go_files = [p for p in file_paths if p.endswith(".go")]
 
     # Extract signatures from each file
     contents = {}
+    precomputed = get_precomputed_index(repo_path)
+
+    # Process Python files, then Go files
+    for extract, files in ((extract_python_api, py_files), (extract_go_api, go_files)):
+        for file_path in files:
+            # Signatures stored by `yellhorn-mcp index` for unchanged files
+            stored = precomputed.signatures(file_path) if precomputed is not None else None
+            if stored is not None:
+                if stored:
+                    contents[file_path] = stored
+                continue
 
-    # Process Python files
-    for file_path in py_files:
-        full_path = repo_path / file_path
-        if not full_path.is_file():
-            continue
-
-        sigs = extract_python_api(full_path)
-        if sigs:
-            contents[file_path] = "\n".join(sigs)
-
-    # Process Go files
-    for file_path in go_files:
-        full_path = repo_path / file_path
-        if not full_path.is_file():
-            continue
+            full_path = repo_path / file_path
+            if not full_path.is_file():
+                continue
 
-        sigs = extract_go_api(full_path)
-        if sigs:
-            contents[file_path] = "\n".join(sigs)
+            sigs = extract(full_path)
+            if sigs:
+                contents[file_path] = "\n".join(sigs)
 
     return file_paths, contents
 
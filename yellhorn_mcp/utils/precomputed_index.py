@@ -0,0 +1,379 @@
+"""Repository index built ahead of time with ``yellhorn-mcp index``.
+
+For CI and shared servers the per-file work (token counting, signature extraction, index
+parsing) can be done out of band instead of on the first request::
+
+    yellhorn-mcp index --repo-path . --ref origin/main --model gpt-4o
+
+The command lists the files at a ref, counts each file's tokens and extracts its LSP-style
+signatures into a versioned SQLite file keyed by git blob ID, and brings the persisted symbol,
+dependency and retrieval indexes up to date. A ref other than HEAD is checked out into a
+temporary worktree first.
+
+At startup the server opens the file read-only, with reads served from a memory map, and
+validates it against HEAD, reporting how many indexed files still match. An entry is only used
+for content whose git blob ID is the indexed one, so ``get_lsp_snapshot`` reuses the stored
+signatures and budgeted "full" context the stored token counts of unchanged files, while
+edited files are processed as before.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from yellhorn_mcp.token_counter import TokenCounter, get_token_counter
+from yellhorn_mcp.utils.cache_utils import get_cache_dir, git_blob_id
+from yellhorn_mcp.utils.dependency_index import DependencyIndex
+from yellhorn_mcp.utils.git_utils import YellhornMCPError, run_git_command
+from yellhorn_mcp.utils.lsp_utils import extract_go_api, extract_python_api
+from yellhorn_mcp.utils.retrieval_index import BM25Index
+from yellhorn_mcp.utils.symbol_index import MMAP_SIZE, SymbolIndex
+
+logger = logging.getLogger(__name__)
+
+# Bump when the schema or the stored per-file data changes
+PRECOMPUTED_INDEX_VERSION = 1
+
+# Files larger than this are not indexed
+MAX_INDEXED_FILE_SIZE = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    blob TEXT NOT NULL,
+    tokens INTEGER,
+    signatures TEXT
+);
+"""
+
+# Indexes opened by the server, by repository path
+_loaded: dict[Path, "PrecomputedIndex"] = {}
+
+
+def index_path(repo_path: Path) -> Path:
+    """Return the location of a repository's precomputed index."""
+    return get_cache_dir(repo_path, "precomputed", create=False) / "index.sqlite3"
+
+
+async def _list_tree(repo_path: Path, commit: str) -> dict[str, str]:
+    """Map the paths of the regular files in a commit to their blob IDs."""
+    output = await run_git_command(repo_path, ["ls-tree", "-r", "-z", "--full-tree", commit])
+    blobs = {}
+    for entry in output.split("\0"):
+        info, _, path = entry.partition("\t")
+        fields = info.split()
+        # Skip symlinks (120000) and submodules (type "commit")
+        if len(fields) == 3 and fields[1] == "blob" and fields[0] != "120000":
+            blobs[path] = fields[2]
+    return blobs
+
+
+def _signatures(full_path: Path) -> str | None:
+    if full_path.suffix == ".py":
+        return "\n".join(extract_python_api(full_path))
+    if full_path.suffix == ".go":
+        return "\n".join(extract_go_api(full_path))
+    return None
+
+
+class PrecomputedIndex:
+    """Read-only view of a precomputed index, validated against the repository's HEAD."""
+
+    def __init__(self, repo_path: Path, db_path: Path):
+        """Open the index.
+
+        Args:
+            repo_path: Path to the repository.
+            db_path: SQLite file written by ``build_precomputed_index``.
+
+        Raises:
+            YellhornMCPError: If the file cannot be opened or was written by another format
+                version.
+        """
+        self.repo_path = repo_path
+        try:
+            self._conn = sqlite3.connect(
+                f"file:{db_path}?mode=ro", uri=True, check_same_thread=False
+            )
+            self._conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != PRECOMPUTED_INDEX_VERSION:
+                self._conn.close()
+                raise YellhornMCPError(
+                    f"Precomputed index has format version {version}, "
+                    f"expected {PRECOMPUTED_INDEX_VERSION}; run `yellhorn-mcp index` again"
+                )
+            self.metadata = dict(self._conn.execute("SELECT key, value FROM meta"))
+        except sqlite3.Error as e:
+            raise YellhornMCPError(f"Cannot read precomputed index {db_path}: {e}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    async def validate(self) -> int:
+        """Check the index against HEAD.
+
+        Returns:
+            Number of indexed files whose blob at HEAD is the indexed blob.
+
+        Raises:
+            YellhornMCPError: If the repository cannot be inspected with git.
+        """
+        head = await run_git_command(self.repo_path, ["rev-parse", "HEAD"])
+        if head == self.metadata.get("commit"):
+            return self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        head_blobs = await _list_tree(self.repo_path, head)
+        return sum(
+            1
+            for path, blob in self._conn.execute("SELECT path, blob FROM files")
+            if head_blobs.get(path) == blob
+        )
+
+    def _entry(self, file_path: str, content: bytes) -> tuple[int | None, str | None] | None:
+        """Return (tokens, signatures) of a file if ``content`` is its indexed content."""
+        row = self._conn.execute(
+            "SELECT blob, tokens, signatures FROM files WHERE path = ?", (file_path,)
+        ).fetchone()
+        if row is None or row[0] != git_blob_id(content):
+            return None
+        return row[1], row[2]
+
+    def signatures(self, file_path: str) -> str | None:
+        """Return the stored LSP-style signatures of a Python or Go file, if unchanged."""
+        full_path = self.repo_path / file_path
+        try:
+            if full_path.stat().st_size > MAX_INDEXED_FILE_SIZE:
+                return None
+            content = full_path.read_bytes()
+        except OSError:
+            return None
+        entry = self._entry(file_path, content)
+        return entry[1] if entry is not None else None
+
+    def tokens(self, file_path: str, content: str) -> int | None:
+        """Return the stored token count of a file if ``content`` is its indexed content."""
+        entry = self._entry(file_path, content.encode("utf-8"))
+        return entry[0] if entry is not None else None
+
+    def token_lookup(
+        self, model: str, token_counter: TokenCounter | None = None
+    ) -> Callable[[str, str], int | None] | None:
+        """Return ``tokens`` if the index was counted with the model's encoding, else None."""
+        counter = token_counter if token_counter is not None else get_token_counter()
+        try:
+            encoding = counter.encoding_name(model)
+        except Exception:
+            return None
+        return self.tokens if encoding == self.metadata.get("encoding") else None
+
+
+async def load_precomputed_index(repo_path: Path) -> PrecomputedIndex | None:
+    """Open and validate a repository's precomputed index, if one was built.
+
+    The index is registered for ``get_precomputed_index`` until
+    ``close_precomputed_index`` is called.
+
+    Args:
+        repo_path: Path to the repository.
+
+    Returns:
+        The validated index, or None if there is none or it cannot be used.
+    """
+    db_path = index_path(repo_path)
+    if not db_path.is_file():
+        return None
+    try:
+        index = PrecomputedIndex(repo_path, db_path)
+    except YellhornMCPError as e:
+        logger.warning(str(e))
+        return None
+    try:
+        usable = await index.validate()
+    except YellhornMCPError as e:
+        logger.warning(f"Cannot validate precomputed index: {e}")
+        index.close()
+        return None
+    if not usable:
+        logger.info("Precomputed index does not match HEAD; run `yellhorn-mcp index` again")
+        index.close()
+        return None
+    logger.info(
+        f"Loaded precomputed index for {index.metadata.get('ref')} "
+        f"({index.metadata.get('commit', '')[:12]}): {usable} files match HEAD"
+    )
+    close_precomputed_index(repo_path)
+    _loaded[repo_path] = index
+    return index
+
+
+def get_precomputed_index(repo_path: Path) -> PrecomputedIndex | None:
+    """Return the precomputed index the server loaded for a repository, if any."""
+    return _loaded.get(repo_path)
+
+
+def close_precomputed_index(repo_path: Path) -> None:
+    """Close and unregister a repository's precomputed index."""
+    index = _loaded.pop(repo_path, None)
+    if index is not None:
+        index.close()
+
+
+async def build_precomputed_index(
+    repo_path: Path,
+    ref: str = "HEAD",
+    model: str = "gemini-2.5-pro",
+    token_counter: TokenCounter | None = None,
+    log_function: Callable[[str], None] = print,
+) -> dict:
+    """Build the precomputed index of a repository at a ref.
+
+    Args:
+        repo_path: Path to the repository.
+        ref: Commit-ish to index. Other refs than HEAD are checked out into a temporary
+            worktree.
+        model: Model whose encoding is used for the token counts.
+        token_counter: Counter to use. Defaults to the process-wide counter.
+        log_function: Function to use for progress messages.
+
+    Returns:
+        Summary with the indexed "commit", the number of "files" and per-step "timings".
+
+    Raises:
+        YellhornMCPError: If the ref cannot be resolved or checked out.
+    """
+    # Imported here: warmup_utils depends on the formatters, which use this module
+    from yellhorn_mcp.utils.warmup_utils import update_indexes
+
+    counter = token_counter if token_counter is not None else get_token_counter()
+    commit = await run_git_command(repo_path, ["rev-parse", "--verify", f"{ref}^{{commit}}"])
+    head = await run_git_command(repo_path, ["rev-parse", "HEAD"])
+    blobs = await _list_tree(repo_path, commit)
+    timings: dict[str, float] = {}
+
+    worktree = None
+    source = repo_path
+    try:
+        if commit != head:
+            worktree = Path(tempfile.mkdtemp(prefix="yellhorn-index-")) / "worktree"
+            await run_git_command(repo_path, ["worktree", "add", "--detach", str(worktree), commit])
+            source = worktree
+
+        db_path = index_path(repo_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = db_path.with_name(db_path.name + ".tmp")
+        tmp_path.unlink(missing_ok=True)
+        conn = sqlite3.connect(str(tmp_path))
+        try:
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {PRECOMPUTED_INDEX_VERSION}")
+
+            start = time.perf_counter()
+            indexed = 0
+            for path, blob in sorted(blobs.items()):
+                full_path = source / path
+                try:
+                    if full_path.stat().st_size > MAX_INDEXED_FILE_SIZE:
+                        continue
+                    content = full_path.read_bytes()
+                except OSError:
+                    continue
+                # Files modified in the worktree do not match the ref
+                if git_blob_id(content) != blob:
+                    continue
+                try:
+                    # Normalize newlines like the universal-newline reads of the snapshot
+                    text = content.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+                except UnicodeDecodeError:
+                    continue
+                conn.execute(
+                    "INSERT INTO files (path, blob, tokens, signatures) VALUES (?, ?, ?, ?)",
+                    (path, blob, counter.count_tokens(text, model), _signatures(full_path)),
+                )
+                indexed += 1
+            timings["files"] = time.perf_counter() - start
+            log_function(f"Counted tokens and extracted signatures of {indexed} files")
+
+            metadata = {
+                "commit": commit,
+                "ref": ref,
+                "model": model,
+                "encoding": counter.encoding_name(model),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }
+            conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", metadata.items())
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, db_path)
+
+        symbol_index = SymbolIndex.for_repository(repo_path)
+        try:
+            timings.update(
+                await update_indexes(
+                    source,
+                    sorted(blobs),
+                    [
+                        ("symbol", symbol_index),
+                        ("dependency", DependencyIndex.for_repository(repo_path)),
+                        ("retrieval", BM25Index.for_repository(repo_path)),
+                    ],
+                )
+            )
+        finally:
+            symbol_index.close()
+        log_function("Updated the symbol, dependency and retrieval indexes")
+    finally:
+        if worktree is not None:
+            with contextlib.suppress(YellhornMCPError):
+                await run_git_command(repo_path, ["worktree", "remove", "--force", str(worktree)])
+            shutil.rmtree(worktree.parent, ignore_errors=True)
+
+    return {"commit": commit, "files": indexed, "timings": timings}
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run ``yellhorn-mcp index`` from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="yellhorn-mcp index",
+        description="Precompute token counts, signatures and search indexes for a repository",
+    )
+    parser.add_argument(
+        "--repo-path",
+        default=os.getenv("REPO_PATH", os.getcwd()),
+        help="Path to the Git repository (default: current directory or REPO_PATH env var)",
+    )
+    parser.add_argument("--ref", default="HEAD", help="Commit-ish to index (default: HEAD)")
+    parser.add_argument(
+        "--model",
+        default=os.getenv("YELLHORN_MCP_MODEL", "gemini-2.5-pro"),
+        help="Model whose tokenizer is used for token counts (default: YELLHORN_MCP_MODEL)",
+    )
+    args = parser.parse_args(argv)
+
+    repo_path = Path(args.repo_path).resolve()
+    try:
+        summary = asyncio.run(build_precomputed_index(repo_path, args.ref, args.model))
+    except YellhornMCPError as e:
+        logging.error(str(e))
+        sys.exit(1)
+    print(
+        f"Indexed {summary['files']} files at {summary['commit'][:12]} "
+        f"into {index_path(repo_path)} ("
+        + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in summary["timings"].items())
+        + ")"
+    )
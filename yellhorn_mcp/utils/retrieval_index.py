@@ -0,0 +1,245 @@
+"""Offline BM25 retrieval index over repository files.
+
+Files are tokenized into lowercase identifier parts (``parseHTTPResponse`` and
+``parse_http_response`` both yield ``parse``, ``http`` and ``response``) and scored against a
+task description with Okapi BM25. The per-file term frequencies are persisted with each
+file's git blob ID, so only files whose contents changed are tokenized again.
+"""
+
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+
+from mcp.server.fastmcp import Context
+
+from yellhorn_mcp.utils.cache_utils import atomic_write_text, get_cache_dir, git_blob_id
+
+# Bump when the stored entry layout or the tokenizer changes
+RETRIEVAL_INDEX_VERSION = 1
+
+# Files larger than this are not indexed
+MAX_RETRIEVAL_FILE_SIZE = 512 * 1024
+
+# Okapi BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_IDENTIFIER = re.compile(r"[A-Za-z][A-Za-z0-9_]*")
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase identifier tokens.
+
+    Compound identifiers yield their parts (split at underscores and camelCase boundaries)
+    and, if they have more than one part, the whole identifier as well.
+
+    Args:
+        text: Source code or natural language.
+
+    Returns:
+        Tokens of at least two characters, in order of appearance.
+    """
+    tokens = []
+    for identifier in _IDENTIFIER.findall(text):
+        parts = [
+            part.lower()
+            for chunk in identifier.split("_")
+            for part in _CAMEL_BOUNDARY.split(chunk)
+            if len(part) > 1
+        ]
+        tokens.extend(parts)
+        if len(parts) > 1:
+            tokens.append(identifier.lower())
+    return tokens
+
+
+class BM25Index:
+    """Inverted index of repository files, persisted between server runs."""
+
+    def __init__(self, cache_path: Path | None = None):
+        """Initialize an empty index.
+
+        Args:
+            cache_path: JSON file the index is loaded from and saved to. If None, the index
+                lives in memory only.
+        """
+        self.cache_path = cache_path
+        # path -> {"stat": [mtime_ns, size], "blob": blob id, "length": n, "tf": {term: n}}
+        self._entries: dict[str, dict] = {}
+        self._postings: dict[str, dict[str, int]] = {}
+        self._total_length = 0
+        self._document_count = 0
+
+    @classmethod
+    def for_repository(cls, repo_path: Path) -> "BM25Index":
+        """Load the index from the repository's default cache location."""
+        index = cls(get_cache_dir(repo_path, "retrieval", create=False) / "bm25.json")
+        index.load()
+        return index
+
+    def __len__(self) -> int:
+        return self._document_count
+
+    def load(self) -> None:
+        """Load the persisted index, leaving it empty if missing, unreadable or outdated."""
+        if self.cache_path is None:
+            return
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") != RETRIEVAL_INDEX_VERSION:
+            return
+        self._entries = {}
+        self._postings = {}
+        self._total_length = 0
+        self._document_count = 0
+        for path, entry in data.get("entries", {}).items():
+            self._add(path, entry)
+
+    def save(self) -> None:
+        """Persist the index if it has a cache path."""
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(
+            self.cache_path,
+            json.dumps({"version": RETRIEVAL_INDEX_VERSION, "entries": self._entries}),
+        )
+
+    def _add(self, path: str, entry: dict) -> None:
+        self._entries[path] = entry
+        self._total_length += entry["length"]
+        self._document_count += bool(entry["length"])
+        for term, count in entry["tf"].items():
+            self._postings.setdefault(term, {})[path] = count
+
+    def _remove(self, path: str) -> None:
+        entry = self._entries.pop(path)
+        self._total_length -= entry["length"]
+        self._document_count -= bool(entry["length"])
+        for term in entry["tf"]:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(path, None)
+                if not postings:
+                    del self._postings[term]
+
+    def _build_entry(self, repo_path: Path, file_path: str, stat_key: list[int]) -> dict | None:
+        """Tokenize a file, or return None if it is unreadable.
+
+        Binary files get an empty entry so they are not read again until they change.
+        """
+        try:
+            content = (repo_path / file_path).read_bytes()
+        except OSError:
+            return None
+        blob = git_blob_id(content)
+        previous = self._entries.get(file_path)
+        if previous is not None and previous["blob"] == blob:
+            return {**previous, "stat": stat_key}
+        if b"\0" in content[:8192]:
+            return {"stat": stat_key, "blob": blob, "length": 0, "tf": {}}
+        # The path is indexed too, so "auth" matches auth/session.py without mentioning it
+        tokens = tokenize(file_path) + tokenize(content.decode("utf-8", errors="ignore"))
+        return {"stat": stat_key, "blob": blob, "length": len(tokens), "tf": dict(Counter(tokens))}
+
+    def update(self, repo_path: Path, file_paths: list[str]) -> list[str]:
+        """Bring the index up to date with the repository's current files.
+
+        Only files whose size or mtime changed are read, and only files whose blob changed
+        are tokenized again.
+
+        Args:
+            repo_path: Path to the repository.
+            file_paths: Current repository-relative file paths (e.g. from ``git ls-files``).
+
+        Returns:
+            Paths that were added, changed or removed.
+        """
+        changed: list[str] = []
+        dirty = False
+        current = set(file_paths)
+        for path in [p for p in self._entries if p not in current]:
+            self._remove(path)
+            changed.append(path)
+
+        for path in file_paths:
+            try:
+                stat = (repo_path / path).stat()
+            except OSError:
+                stat = None
+            previous = self._entries.get(path)
+            if stat is None or stat.st_size > MAX_RETRIEVAL_FILE_SIZE:
+                if previous is not None:
+                    self._remove(path)
+                    changed.append(path)
+                continue
+            stat_key = [stat.st_mtime_ns, stat.st_size]
+            if previous is not None and previous["stat"] == stat_key:
+                continue
+
+            entry = self._build_entry(repo_path, path, stat_key)
+            dirty = True
+            if previous is not None:
+                self._remove(path)
+            if entry is not None:
+                self._add(path, entry)
+            old_blob = previous["blob"] if previous is not None else None
+            new_blob = entry["blob"] if entry is not None else None
+            if old_blob != new_blob:
+                changed.append(path)
+
+        if changed or dirty:
+            self.save()
+        return changed
+
+    def search(self, query: str, top_k: int = 20) -> list[tuple[str, float]]:
+        """Rank indexed files by BM25 relevance to a query.
+
+        Args:
+            query: Free-text query such as a task description.
+            top_k: Maximum number of results.
+
+        Returns:
+            (path, score) pairs with positive scores, best first.
+        """
+        document_count = self._document_count
+        if not document_count:
+            return []
+        average_length = self._total_length / document_count or 1.0
+
+        scores: dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (document_count - df + 0.5) / (df + 0.5))
+            for path, tf in postings.items():
+                length = self._entries[path]["length"]
+                norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                scores[path] = scores.get(path, 0.0) + idf * tf * (BM25_K1 + 1) / norm
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:top_k]
+
+
+def get_shared_retrieval_index(ctx: Context | None, repo_path: Path) -> BM25Index:
+    """Return the server's retrieval index, or load one if the server provides none.
+
+    Args:
+        ctx: Optional server context whose lifespan context may hold a ``retrieval_index``.
+        repo_path: Path to the repository.
+
+    Returns:
+        The shared index, or a freshly loaded index for the repository.
+    """
+    if ctx is not None:
+        index = ctx.request_context.lifespan_context.get("retrieval_index")
+        if isinstance(index, BM25Index):
+            return index
+    return BM25Index.for_repository(repo_path)
@@ -0,0 +1,274 @@
+"""Persistent symbol table for fast "where is X defined" lookups.
+
+Symbols come from ``extract_python_symbols`` / ``extract_go_symbols`` in ``lsp_utils`` and
+are stored in SQLite together with each file's git blob ID, so only files whose contents
+changed are parsed again. Lookups use an index on the lowercase symbol name; fuzzy
+matching runs over an in-memory list of distinct names.
+"""
+
+import difflib
+import sqlite3
+import threading
+from pathlib import Path
+
+from mcp.server.fastmcp import Context
+
+from yellhorn_mcp.utils.cache_utils import get_cache_dir, git_blob_id
+from yellhorn_mcp.utils.lsp_utils import extract_go_symbols, extract_python_symbols
+
+# Bump when the schema or the extraction logic changes
+SYMBOL_INDEX_VERSION = 1
+
+# Files larger than this are not indexed
+MAX_SYMBOL_FILE_SIZE = 1024 * 1024
+
+# Bytes of the database file SQLite may memory-map
+MMAP_SIZE = 256 * 1024 * 1024
+
+# Minimum similarity ratio for fuzzy matches
+FUZZY_CUTOFF = 0.6
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    blob TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    name TEXT NOT NULL,
+    short_name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    path TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS symbols_short_name ON symbols (short_name);
+CREATE INDEX IF NOT EXISTS symbols_path ON symbols (path);
+"""
+
+_COLUMNS = ("name", "kind", "signature", "path", "line", "doc")
+
+
+def _extract_symbols(file_path: str, source: str) -> list[dict]:
+    if file_path.endswith(".py"):
+        return extract_python_symbols(source)
+    return extract_go_symbols(source)
+
+
+class SymbolIndex:
+    """SQLite-backed table of the Python and Go symbols defined in a repository."""
+
+    def __init__(self, db_path: Path | None = None):
+        """Open or create the index.
+
+        Args:
+            db_path: SQLite database file. If None, the index lives in memory only. A database
+                written by another format version is discarded.
+        """
+        self.db_path = db_path
+        if db_path is not None:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(db_path) if db_path else ":memory:", check_same_thread=False
+        )
+        # Let SQLite serve reads from a memory map of the database file
+        self._conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SYMBOL_INDEX_VERSION:
+            self._conn.executescript("DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS symbols;")
+            self._conn.execute(f"PRAGMA user_version = {SYMBOL_INDEX_VERSION}")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._short_names: list[str] | None = None
+        # Serializes updates run from worker threads with those run on the event loop
+        self._update_lock = threading.Lock()
+
+    @classmethod
+    def for_repository(cls, repo_path: Path) -> "SymbolIndex":
+        """Open the index in the repository's default cache location."""
+        return cls(get_cache_dir(repo_path, "symbols", create=False) / "symbols.sqlite3")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM symbols").fetchone()[0]
+
+    def update(self, repo_path: Path, file_paths: list[str]) -> list[str]:
+        """Bring the index up to date with the repository's current files.
+
+        Only files whose size or mtime changed are read, and only files whose blob changed
+        are parsed again. Safe to call from a worker thread.
+
+        Args:
+            repo_path: Path to the repository.
+            file_paths: Current repository-relative file paths (e.g. from ``git ls-files``).
+
+        Returns:
+            Source paths that were added, changed or removed.
+        """
+        with self._update_lock:
+            return self._update(repo_path, file_paths)
+
+    def _update(self, repo_path: Path, file_paths: list[str]) -> list[str]:
+        stored = {
+            path: (mtime_ns, size, blob)
+            for path, mtime_ns, size, blob in self._conn.execute(
+                "SELECT path, mtime_ns, size, blob FROM files"
+            )
+        }
+        source_paths = [p for p in file_paths if p.endswith((".py", ".go"))]
+        current = set(source_paths)
+        changed = [path for path in stored if path not in current]
+        cursor = self._conn.cursor()
+        for path in changed:
+            self._remove(cursor, path)
+
+        for path in source_paths:
+            full_path = repo_path / path
+            previous = stored.get(path)
+            try:
+                stat = full_path.stat()
+            except OSError:
+                stat = None
+            if stat is None or stat.st_size > MAX_SYMBOL_FILE_SIZE:
+                if previous is not None:
+                    self._remove(cursor, path)
+                    changed.append(path)
+                continue
+            if previous is not None and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+                continue
+            try:
+                content = full_path.read_bytes()
+            except OSError:
+                if previous is not None:
+                    self._remove(cursor, path)
+                    changed.append(path)
+                continue
+            blob = git_blob_id(content)
+            cursor.execute(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, size, blob) VALUES (?, ?, ?, ?)",
+                (path, stat.st_mtime_ns, stat.st_size, blob),
+            )
+            if previous is not None and previous[2] == blob:
+                continue
+
+            changed.append(path)
+            cursor.execute("DELETE FROM symbols WHERE path = ?", (path,))
+            cursor.executemany(
+                "INSERT INTO symbols (name, short_name, kind, signature, path, line, doc) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        symbol["name"],
+                        symbol["name"].rsplit(".", 1)[-1].lower(),
+                        symbol["kind"],
+                        symbol["signature"],
+                        path,
+                        symbol["line"],
+                        symbol["doc"],
+                    )
+                    for symbol in _extract_symbols(path, content.decode("utf-8", errors="ignore"))
+                ],
+            )
+        self._conn.commit()
+        if changed:
+            self._short_names = None
+        return changed
+
+    @staticmethod
+    def _remove(cursor: sqlite3.Cursor, path: str) -> None:
+        cursor.execute("DELETE FROM files WHERE path = ?", (path,))
+        cursor.execute("DELETE FROM symbols WHERE path = ?", (path,))
+
+    def _rows(
+        self, where: str, params: tuple, kind: str | None, qualifier: str, limit: int
+    ) -> list[dict]:
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM symbols WHERE {where}"
+        if kind:
+            sql += " AND kind = ?"
+            params = (*params, kind)
+        if qualifier:
+            # LIKE is case-insensitive for ASCII; escape its wildcards in the qualifier
+            escaped = qualifier.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            sql += " AND name LIKE ? ESCAPE '\\'"
+            params = (*params, f"{escaped}.%")
+        sql += " ORDER BY length(name), name, path LIMIT ?"
+        rows = self._conn.execute(sql, (*params, limit)).fetchall()
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+    def search(
+        self, query: str, kind: str | None = None, limit: int = 20, fuzzy: bool = True
+    ) -> list[dict]:
+        """Find symbols by name.
+
+        Matches are case-insensitive against the symbol's own name (the method name for
+        ``Class.method``). Exact matches come first, then prefix matches, then, if
+        ``fuzzy`` is set and fewer than ``limit`` results were found, close matches.
+
+        Args:
+            query: Symbol name or prefix; a ``Class.`` qualifier narrows method lookups.
+            kind: Optional kind filter, e.g. "class" or "method".
+            limit: Maximum number of results.
+            fuzzy: Whether to fall back to approximate name matching.
+
+        Returns:
+            Dicts with "name", "kind", "signature", "path", "line" and "doc".
+        """
+        qualifier, _, short = query.strip().rpartition(".")
+        short = short.lower()
+        if not short:
+            return []
+
+        results: list[dict] = []
+        seen: set[tuple[str, str, int]] = set()
+
+        def add(rows: list[dict]) -> None:
+            for row in rows:
+                key = (row["name"], row["path"], row["line"])
+                if key not in seen:
+                    seen.add(key)
+                    results.append(row)
+
+        add(self._rows("short_name = ?", (short,), kind, qualifier, limit))
+        if len(results) < limit:
+            # Range scan on the index instead of LIKE, which SQLite cannot index case-insensitively
+            add(
+                self._rows(
+                    "short_name > ? AND short_name < ?",
+                    (short, short + "\uffff"),
+                    kind,
+                    qualifier,
+                    limit,
+                )
+            )
+        if fuzzy and len(results) < limit:
+            if self._short_names is None:
+                self._short_names = [
+                    row[0] for row in self._conn.execute("SELECT DISTINCT short_name FROM symbols")
+                ]
+            for name in difflib.get_close_matches(
+                short, self._short_names, n=limit, cutoff=FUZZY_CUTOFF
+            ):
+                add(self._rows("short_name = ?", (name,), kind, qualifier, limit))
+        return results[:limit]
+
+
+def get_shared_symbol_index(ctx: Context | None, repo_path: Path) -> SymbolIndex:
+    """Return the server's symbol index, or open one if the server provides none.
+
+    Args:
+        ctx: Optional server context whose lifespan context may hold a ``symbol_index``.
+        repo_path: Path to the repository.
+
+    Returns:
+        The shared index, or the repository's persisted index.
+    """
+    if ctx is not None:
+        index = ctx.request_context.lifespan_context.get("symbol_index")
+        if isinstance(index, SymbolIndex):
+            return index
+    return SymbolIndex.for_repository(repo_path)
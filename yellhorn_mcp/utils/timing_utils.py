@@ -0,0 +1,158 @@
+"""Phase timing for background jobs.
+
+A job (workplan, revision, judgement or context curation) starts a ``PhaseTimer``, which
+becomes the current timer of its task. Code anywhere below it marks phases with
+``phase(name)`` without the timer being passed around; phases entered inside another phase
+are recorded under its path (e.g. ``codebase_context/snapshot``), and repeated phases such
+as ``github`` accumulate. Without a current timer ``phase`` returns a shared no-op context
+manager, so instrumented code costs one context-variable lookup when timing is off.
+"""
+
+import functools
+import inspect
+import logging
+import os
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar, Token
+from typing import Any, Callable, ContextManager
+
+logger = logging.getLogger(__name__)
+
+_current_timer: ContextVar["PhaseTimer | None"] = ContextVar("yellhorn_phase_timer", default=None)
+_current_path: ContextVar[str] = ContextVar("yellhorn_phase_path", default="")
+
+_NO_SPAN = nullcontext()
+
+
+def phase_timing_enabled() -> bool:
+    """Return False if ``YELLHORN_MCP_PHASE_TIMING`` is "off"."""
+    return os.getenv("YELLHORN_MCP_PHASE_TIMING", "on").lower() != "off"
+
+
+class _Span:
+    """Context manager timing one entry into a phase."""
+
+    __slots__ = ("_timer", "_name", "_path", "_start", "_token")
+
+    def __init__(self, timer: "PhaseTimer", name: str):
+        self._timer = timer
+        self._name = name
+
+    def __enter__(self) -> "_Span":
+        parent = _current_path.get()
+        self._path = f"{parent}/{self._name}" if parent else self._name
+        self._token = _current_path.set(self._path)
+        # Reserve the slot so phases are listed in the order they started, parents first
+        self._timer.phases.setdefault(self._path, 0.0)
+        self._start = self._timer.clock()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._timer.add(self._path, self._timer.clock() - self._start)
+        _current_path.reset(self._token)
+
+
+class PhaseTimer:
+    """Accumulates wall-clock seconds per phase of one job."""
+
+    def __init__(self, enabled: bool = True, clock: Callable[[], float] = time.perf_counter):
+        """Initialize the timer.
+
+        Args:
+            enabled: If False, ``start`` does not install the timer and nothing is recorded.
+            clock: Monotonic clock returning seconds.
+        """
+        self.enabled = enabled
+        self.clock = clock
+        self.phases: dict[str, float] = {}
+        self._started_at: float | None = None
+        self._token: Token | None = None
+
+    def start(self) -> "PhaseTimer":
+        """Make this the current timer of the running task and return it."""
+        if self.enabled:
+            self._started_at = self.clock()
+            self._token = _current_timer.set(self)
+        return self
+
+    def finish(self, label: str) -> None:
+        """Stop being the current timer and log the breakdown.
+
+        Args:
+            label: Job description for the log line, e.g. "workplan #12".
+        """
+        if self._token is None:
+            return
+        _current_timer.reset(self._token)
+        self._token = None
+        if self.phases:
+            logger.info(f"Phase timings for {label}: {self.format_summary()}")
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since ``start`` (0.0 if the timer was never started)."""
+        return self.clock() - self._started_at if self._started_at is not None else 0.0
+
+    def span(self, name: str) -> ContextManager:
+        """Return a context manager that times ``name`` under the current phase."""
+        return _Span(self, name) if self.enabled else _NO_SPAN
+
+    def add(self, path: str, seconds: float) -> None:
+        """Add ``seconds`` to the phase at ``path``."""
+        self.phases[path] = self.phases.get(path, 0.0) + seconds
+
+    def format_summary(self) -> str:
+        """Format the phases on one line, e.g. "codebase_context=1.20s, llm_call=30.52s"."""
+        parts = [f"{path}={seconds:.2f}s" for path, seconds in self.phases.items()]
+        parts.append(f"total={self.elapsed:.2f}s")
+        return ", ".join(parts)
+
+
+def current_timer() -> PhaseTimer | None:
+    """Return the timer of the running job, if any."""
+    return _current_timer.get()
+
+
+def phase(name: str) -> ContextManager:
+    """Time a phase of the running job; a no-op when no timer is active.
+
+    Args:
+        name: Phase name, nested under the enclosing phase if there is one.
+
+    Returns:
+        A context manager.
+    """
+    timer = _current_timer.get()
+    return timer.span(name) if timer is not None else _NO_SPAN
+
+
+def timed_phase(name: str) -> Callable[[Callable], Callable]:
+    """Decorator timing every call of a function (sync or async) as phase ``name``."""
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with phase(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record_phase(name: str, seconds: float) -> None:
+    """Add time measured elsewhere (e.g. a retry back-off) as a phase of the running job."""
+    timer = _current_timer.get()
+    if timer is not None:
+        parent = _current_path.get()
+        timer.add(f"{parent}/{name}" if parent else name, seconds)
@@ -0,0 +1,101 @@
+"""Background warm-up of the caches used by the first tool call.
+
+Without a warm-up, the first request after server start loads the tokenizer's BPE ranks,
+enumerates the repository with git and parses every source file into the symbol, dependency
+and retrieval indexes. ``warm_up`` runs the same work in a background task started by the
+server lifespan, so the first request finds the caches in their steady state.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+from yellhorn_mcp.formatters.snapshot_cache import SnapshotCache
+from yellhorn_mcp.token_counter import TokenCounter, get_token_counter
+
+logger = logging.getLogger(__name__)
+
+
+def warmup_enabled() -> bool:
+    """Return False if ``YELLHORN_MCP_WARMUP`` is "off"."""
+    return os.getenv("YELLHORN_MCP_WARMUP", "on").lower() != "off"
+
+
+async def update_indexes(
+    repo_path: Path, file_paths: list[str], indexes: Iterable[tuple[str, Any]]
+) -> dict[str, float]:
+    """Bring each index up to date with the given files, yielding to the loop in between.
+
+    Args:
+        repo_path: Path to the repository.
+        file_paths: Current repository-relative file paths.
+        indexes: ``(name, index)`` pairs; each index has an ``update(repo_path, file_paths)``
+            method (``SymbolIndex``, ``DependencyIndex``, ``BM25Index``).
+
+    Returns:
+        Seconds spent updating each index that did not fail, keyed by name.
+    """
+    timings: dict[str, float] = {}
+    for name, index in indexes:
+        await asyncio.sleep(0)
+        start = time.perf_counter()
+        try:
+            index.update(repo_path, file_paths)
+        except Exception as e:
+            logger.warning(f"Failed to update the {name} index: {e}")
+            continue
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+async def warm_up(
+    repo_path: Path,
+    model: str,
+    snapshot_cache: SnapshotCache,
+    indexes: Iterable[tuple[str, Any]] = (),
+    token_counter: TokenCounter | None = None,
+) -> dict[str, float]:
+    """Preload the tokenizer and build the repository caches for the current HEAD.
+
+    The encoding is loaded in a worker thread. The indexes are updated on the event loop,
+    one at a time, because request handlers update the same objects there; the task yields
+    between steps so pending requests are not held up for the whole warm-up. A failing step
+    is logged and skipped.
+
+    Args:
+        repo_path: Path to the repository.
+        model: Model whose encoding is preloaded.
+        snapshot_cache: Shared snapshot cache to fill for the current repository state.
+        indexes: ``(name, index)`` pairs passed to ``update_indexes``.
+        token_counter: Counter to preload. Defaults to the process-wide counter.
+
+    Returns:
+        Seconds spent in each step that completed, keyed by step name.
+    """
+    counter = token_counter if token_counter is not None else get_token_counter()
+    timings: dict[str, float] = {}
+
+    start = time.perf_counter()
+    try:
+        await asyncio.to_thread(counter.preload, model)
+        timings["tokenizer"] = time.perf_counter() - start
+    except Exception as e:
+        logger.warning(f"Warm-up: failed to preload the tokenizer for {model}: {e}")
+
+    start = time.perf_counter()
+    try:
+        snapshot = await snapshot_cache.get(repo_path)
+    except Exception as e:
+        logger.warning(f"Warm-up: failed to snapshot the repository: {e}")
+        return timings
+    timings["snapshot"] = time.perf_counter() - start
+    timings.update(await update_indexes(repo_path, snapshot.file_paths, indexes))
+
+    logger.info(
+        "Warm-up finished: "
+        + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items())
+    )
+    return timings
@@ -0,0 +1,236 @@
+"""Filesystem watcher that keeps the shared repository snapshot and indexes current.
+
+Without a watcher, every tool call runs ``git status`` to decide whether the cached
+``RepositorySnapshot`` is still current, checks the mtime and size of every file it reads,
+and each index update stats the whole tree. A ``RepositoryWatcher`` started by the server
+lifespan reports changed paths to the ``SnapshotCache`` as they happen (see
+``SnapshotCache.mark_changed``), so a tool call only re-reads the files that changed. Once
+changes settle, it refreshes the snapshot and the symbol, dependency and retrieval indexes in
+the background.
+
+Events come from ``watchfiles`` (inotify, FSEvents or ReadDirectoryChangesW; install with
+``pip install yellhorn-mcp[watch]``) or, without it, from polling the mtime and size of the
+snapshot's files and directories. Bursts such as a ``git checkout`` are debounced, and above
+``max_events_per_second`` the watcher stops tracking individual paths and discards the
+snapshot instead, so the next request takes a fresh one with git.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+from yellhorn_mcp.formatters.snapshot_cache import SnapshotCache
+from yellhorn_mcp.utils.warmup_utils import update_indexes
+
+logger = logging.getLogger(__name__)
+
+# Quiet period after the last change before the background refresh runs
+WATCH_DEBOUNCE_SECONDS = 0.5
+
+# Above this many changed paths per second, individual paths are no longer tracked
+WATCH_MAX_EVENTS_PER_SECOND = 1000
+
+# Interval between scans of the polling backend
+WATCH_POLL_INTERVAL_SECONDS = 2.0
+
+# Changes within this long before the watcher started are reported by the first poll, since
+# filesystems with coarse timestamps may date a later write slightly earlier
+_POLL_START_SLACK_NS = 2_000_000_000
+
+
+def watch_mode() -> str:
+    """Return the watcher backend configured by ``YELLHORN_MCP_WATCH``.
+
+    Returns:
+        "off" (the default), "watchfiles" if the setting is "on" and watchfiles is installed,
+        or "poll" if the setting is "poll" or "on" without watchfiles.
+    """
+    mode = os.getenv("YELLHORN_MCP_WATCH", "off").lower()
+    if mode == "poll":
+        return "poll"
+    if mode == "on":
+        return "watchfiles" if importlib.util.find_spec("watchfiles") is not None else "poll"
+    return "off"
+
+
+def _stat_tree(repo_path: Path, file_paths: list[str]) -> dict[str, tuple[int, int] | None]:
+    """Stat the given files and every directory containing them.
+
+    Directories are keyed with a trailing slash (the repository root as "./"); their mtime
+    changes when an entry is added or removed.
+    """
+    state: dict[str, tuple[int, int] | None] = {}
+
+    def stat(key: str, full_path: Path) -> None:
+        try:
+            result = full_path.stat()
+            state[key] = (result.st_mtime_ns, result.st_size)
+        except OSError:
+            state[key] = None
+
+    for path in file_paths:
+        stat(path, repo_path / path)
+        directory = path
+        while directory:
+            directory = directory.rpartition("/")[0]
+            key = f"{directory or '.'}/"
+            if key in state:
+                break
+            stat(key, repo_path / directory)
+    return state
+
+
+class RepositoryWatcher:
+    """Reports file changes in a repository to a ``SnapshotCache`` and refreshes indexes."""
+
+    def __init__(
+        self,
+        repo_path: Path,
+        snapshot_cache: SnapshotCache,
+        indexes: Iterable[tuple[str, Any]] = (),
+        backend: str = "poll",
+        debounce: float = WATCH_DEBOUNCE_SECONDS,
+        max_events_per_second: int = WATCH_MAX_EVENTS_PER_SECOND,
+        poll_interval: float = WATCH_POLL_INTERVAL_SECONDS,
+    ):
+        """Initialize the watcher.
+
+        Args:
+            repo_path: Resolved path to the repository.
+            snapshot_cache: Shared snapshot cache to report changes to.
+            indexes: ``(name, index)`` pairs refreshed after changes settle (see
+                ``update_indexes``).
+            backend: "watchfiles" or "poll".
+            debounce: Quiet period in seconds before the background refresh runs.
+            max_events_per_second: Changed paths per second above which the snapshot is
+                discarded instead of tracking individual paths.
+            poll_interval: Seconds between scans of the polling backend.
+        """
+        self.repo_path = repo_path
+        self.snapshot_cache = snapshot_cache
+        self.indexes = list(indexes)
+        self.backend = backend
+        self.debounce = debounce
+        self.max_events_per_second = max_events_per_second
+        self.poll_interval = poll_interval
+        # Paths changed since the last refresh; cleared when the event rate is exceeded
+        self.dirty: set[str] = set()
+        self.overflowed = False
+        self._window_start = 0.0
+        self._window_events = 0
+        self._changed = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._started_ns = 0
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Start watching and tell the snapshot cache to rely on the reported changes."""
+        self.snapshot_cache.watch(self.repo_path)
+        self._started_ns = time.time_ns()
+        watch = self._watch_native if self.backend == "watchfiles" else self._poll
+        self._tasks = [asyncio.create_task(watch()), asyncio.create_task(self._refresh_loop())]
+        logger.info(f"Watching {self.repo_path} for changes ({self.backend})")
+
+    async def stop(self) -> None:
+        """Stop watching; the snapshot cache falls back to validating snapshots with git."""
+        self._stop.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.snapshot_cache.unwatch(self.repo_path)
+
+    def handle_changes(self, paths: Iterable[str]) -> None:
+        """Record changed paths reported by the backend.
+
+        Args:
+            paths: Repository-relative paths; paths inside ``.git`` are ignored.
+        """
+        paths = [path for path in paths if path != ".git" and not path.startswith(".git/")]
+        if not paths:
+            return
+
+        now = time.monotonic()
+        if now - self._window_start >= 1.0:
+            self._window_start = now
+            self._window_events = 0
+        self._window_events += len(paths)
+
+        if self.overflowed or self._window_events > self.max_events_per_second:
+            if not self.overflowed:
+                logger.info(
+                    f"More than {self.max_events_per_second} file changes per second in "
+                    f"{self.repo_path}; discarding the snapshot until changes settle"
+                )
+            self.overflowed = True
+            self.dirty.clear()
+            self.snapshot_cache.mark_changed(self.repo_path, None)
+        else:
+            self.dirty.update(paths)
+            self.snapshot_cache.mark_changed(self.repo_path, paths)
+        self._changed.set()
+
+    async def refresh(self) -> None:
+        """Take the snapshot, re-read the changed files and update the indexes."""
+        dirty, self.dirty = self.dirty, set()
+        overflowed, self.overflowed = self.overflowed, False
+        try:
+            snapshot = await self.snapshot_cache.get(self.repo_path)
+        except Exception as e:
+            logger.warning(f"Watcher: failed to snapshot the repository: {e}")
+            return
+        for path in dirty:
+            if path in snapshot:
+                snapshot.read_text(path)
+        await update_indexes(self.repo_path, snapshot.file_paths, self.indexes)
+        logger.info(
+            "Watcher: refreshed snapshot and indexes after "
+            + ("a burst of changes" if overflowed else f"{len(dirty)} changed paths")
+        )
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await self._changed.wait()
+            # Wait for a quiet period so a burst of changes triggers a single refresh
+            while self._changed.is_set():
+                self._changed.clear()
+                await asyncio.sleep(self.debounce)
+            await self.refresh()
+
+    async def _watch_native(self) -> None:
+        from watchfiles import awatch
+
+        async for changes in awatch(
+            self.repo_path, debounce=int(self.debounce * 1000), stop_event=self._stop
+        ):
+            paths = []
+            for _, path in changes:
+                try:
+                    paths.append(Path(path).relative_to(self.repo_path).as_posix())
+                except ValueError:
+                    continue
+            self.handle_changes(paths)
+
+    async def _poll(self) -> None:
+        previous: dict[str, tuple[int, int] | None] | None = None
+        while True:
+            snapshot = self.snapshot_cache.current(self.repo_path)
+            if snapshot is not None:
+                state = await asyncio.to_thread(_stat_tree, self.repo_path, snapshot.file_paths)
+                if previous is None:
+                    # Changes made after the watcher started but before this first scan
+                    since = self._started_ns - _POLL_START_SLACK_NS
+                    changed = [path for path, key in state.items() if key and key[0] >= since]
+                else:
+                    changed = [
+                        path
+                        for path in state.keys() | previous.keys()
+                        if state.get(path) != previous.get(path)
+                    ]
+                self.handle_changes(sorted(changed))
+                previous = state
+            await asyncio.sleep(self.poll_interval)